@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""
+Measures the attribute traffic of an AutoUnit train step on a unit: three plain attribute writes, and reads of the
+tracked module, optimizer, LR scheduler and train progress.
+
+Usage: ``python benchmarks/app_state_mixin_attribute_access.py [--iterations N]``
+"""
+
+import argparse
+import timeit
+
+import torch
+from torchtnt.framework._test_utils import DummyAutoUnit
+
+
+def _make_unit() -> DummyAutoUnit:
+    module = torch.nn.Linear(2, 2)
+    unit = DummyAutoUnit(module=module)
+    optimizer = torch.optim.SGD(module.parameters(), lr=0.1)
+    unit.optimizer = optimizer
+    unit.lr_scheduler = torch.optim.lr_scheduler.StepLR(optimizer, step_size=1)
+    return unit
+
+
+def _step(unit: DummyAutoUnit) -> None:
+    unit._is_last_batch = False
+    unit._num_steps = 1
+    unit._loss = 0.5
+    unit.module
+    unit.optimizer
+    unit.lr_scheduler
+    unit.train_progress
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    unit = _make_unit()
+    seconds = min(timeit.repeat(lambda: _step(unit), number=args.iterations, repeat=5))
+    print(f"{seconds / args.iterations * 1e6:.2f}us per step")
+
+
+if __name__ == "__main__":
+    main()
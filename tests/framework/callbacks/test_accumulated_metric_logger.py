@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import unittest
+from unittest.mock import MagicMock
+
+import torch
+from pyre_extensions import none_throws
+from torchtnt.framework._test_utils import DummyAutoUnit, generate_random_dataloader
+from torchtnt.framework.callbacks.accumulated_metric_logger import (
+    AccumulatedMetricLogger,
+)
+from torchtnt.framework.fit import fit
+from torchtnt.framework.train import train
+from torchtnt.utils.loggers.logger import MetricLogger
+
+
+class AccumulatedMetricLoggerTest(unittest.TestCase):
+    def test_train(self) -> None:
+        input_dim = 2
+        my_unit = DummyAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            clip_grad_norm=1.0,
+            accumulate_step_metrics=True,
+        )
+        log_writer = MagicMock(spec=MetricLogger)
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        train(
+            my_unit,
+            dataloader,
+            max_epochs=1,
+            callbacks=[AccumulatedMetricLogger(log_writer, log_every_n_steps=2)],
+        )
+
+        # steps 1-2 are logged at step 4, steps 3-4 and 5 at the end of the epoch
+        self.assertEqual(
+            [call.args[1] for call in log_writer.log_dict.call_args_list], [2, 4, 5]
+        )
+        payload = log_writer.log_dict.call_args_list[0].args[0]
+        self.assertEqual(
+            set(payload),
+            {
+                "train_loss",
+                "train_loss_min",
+                "train_loss_max",
+                "train_grad_norm",
+                "train_grad_norm_min",
+                "train_grad_norm_max",
+            },
+        )
+        self.assertLessEqual(payload["train_loss_min"], payload["train_loss"])
+        self.assertLessEqual(payload["train_loss"], payload["train_loss_max"])
+        self.assertEqual(none_throws(my_unit.train_step_metrics).compute(), {})
+
+    def test_fit(self) -> None:
+        input_dim = 2
+        my_unit = DummyAutoUnit(
+            module=torch.nn.Linear(input_dim, 2), accumulate_step_metrics=True
+        )
+        self.assertIn("train_step_metrics", my_unit.tracked_metrics())
+        self.assertIn("eval_step_metrics", my_unit.tracked_metrics())
+
+        log_writer = MagicMock(spec=MetricLogger)
+        fit(
+            my_unit,
+            train_dataloader=generate_random_dataloader(8, input_dim, 2),
+            eval_dataloader=generate_random_dataloader(4, input_dim, 2),
+            max_epochs=1,
+            evaluate_every_n_steps=2,
+            callbacks=[AccumulatedMetricLogger(log_writer, log_every_n_steps=100)],
+        )
+
+        logged = [
+            (call.args[1], sorted(call.args[0]))
+            for call in log_writer.log_dict.call_args_list
+        ]
+        train_keys = ["train_loss", "train_loss_max", "train_loss_min"]
+        eval_keys = ["eval_loss", "eval_loss_max", "eval_loss_min"]
+        self.assertEqual(
+            logged,
+            [
+                (2, train_keys),
+                (2, eval_keys),
+                (4, train_keys),
+                (4, eval_keys),
+                (4, eval_keys),
+            ],
+        )
+
+    def test_invalid_args(self) -> None:
+        with self.assertRaisesRegex(ValueError, "log_every_n_steps"):
+            AccumulatedMetricLogger(MagicMock(spec=MetricLogger), log_every_n_steps=0)
@@ -11,6 +11,7 @@ import io
 import math
 import os
 import shutil
+import signal
 import tempfile
 import time
 import unittest
@@ -33,7 +34,11 @@ from torchtnt.framework._test_utils import (
 from torchtnt.framework.callbacks.base_checkpointer import (
     BaseCheckpointer as BaseCheckpointer,
 )
-from torchtnt.framework.callbacks.checkpointer_types import RestoreOptions
+from torchtnt.framework.callbacks.checkpointer_types import (
+    AdaptiveCheckpointOptions,
+    PreemptionOptions,
+    RestoreOptions,
+)
 from torchtnt.framework.callbacks.lambda_callback import Lambda
 from torchtnt.framework.evaluate import evaluate
 from torchtnt.framework.fit import fit
@@ -48,10 +53,15 @@ from torchtnt.framework.unit import (
     TTrainData,
     TTrainUnit,
 )
-from torchtnt.utils.checkpoint import BestCheckpointConfig, get_latest_checkpoint_path
-from torchtnt.utils.distributed import get_global_rank, spawn_multi_process
+from torchtnt.utils.checkpoint import (
+    BestCheckpointConfig,
+    get_latest_checkpoint_path,
+    is_emergency_checkpoint,
+)
+from torchtnt.utils.distributed import get_global_rank, PGWrapper, spawn_multi_process
 from torchtnt.utils.env import init_from_env
 from torchtnt.utils.test_utils import skip_if_not_distributed
+from torchtnt.utils.timer import Timer
 
 
 class BaseCheckpointSaver(BaseCheckpointer):
@@ -71,6 +81,9 @@ class BaseCheckpointSaver(BaseCheckpointer):
         keep_last_n_checkpoints: Optional[int] = None,
         best_checkpoint_config: Optional[BestCheckpointConfig] = None,
         process_group: Optional[dist.ProcessGroup] = None,
+        save_every_n_seconds: Optional[float] = None,
+        adaptive_checkpoint_options: Optional[AdaptiveCheckpointOptions] = None,
+        preemption_options: Optional[PreemptionOptions] = None,
     ) -> None:
         super().__init__(
             dirpath,
@@ -82,6 +95,9 @@ class BaseCheckpointSaver(BaseCheckpointer):
             keep_last_n_checkpoints=keep_last_n_checkpoints,
             best_checkpoint_config=best_checkpoint_config,
             process_group=process_group,
+            save_every_n_seconds=save_every_n_seconds,
+            adaptive_checkpoint_options=adaptive_checkpoint_options,
+            preemption_options=preemption_options,
         )
         self._latest_checkpoint_path: str = ""
 
@@ -782,6 +798,265 @@ class BaseCheckpointerTest(unittest.TestCase):
                 ValueError, "Invalid value passed for save_every_n_epochs.*"
             ):
                 BaseCheckpointSaver(temp_dir, save_every_n_epochs=0)
+            with self.assertRaisesRegex(
+                ValueError, "Invalid value passed for save_every_n_seconds.*"
+            ):
+                BaseCheckpointSaver(temp_dir, save_every_n_seconds=0)
+            with self.assertRaisesRegex(ValueError, "initial interval"):
+                BaseCheckpointSaver(
+                    temp_dir, adaptive_checkpoint_options=AdaptiveCheckpointOptions()
+                )
+            with self.assertRaisesRegex(ValueError, "Invalid interval bounds.*"):
+                BaseCheckpointSaver(
+                    temp_dir,
+                    save_every_n_train_steps=1,
+                    adaptive_checkpoint_options=AdaptiveCheckpointOptions(
+                        min_interval_steps=4, max_interval_steps=2
+                    ),
+                )
+            with self.assertRaisesRegex(ValueError, "Invalid preemption_options.*"):
+                BaseCheckpointSaver(
+                    temp_dir,
+                    preemption_options=PreemptionOptions(grace_period_seconds=0),
+                )
+
+    def test_save_every_n_seconds(self) -> None:
+        my_unit = DummyTrainUnit(input_dim=2)
+        dataloader = generate_random_dataloader(10, 2, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpointer = BaseCheckpointSaver(temp_dir, save_every_n_seconds=1e-9)
+            train(my_unit, dataloader, max_steps=3, callbacks=[checkpointer])
+            self.assertEqual(
+                sorted(os.listdir(temp_dir)),
+                [f"epoch_0_train_step_{step}" for step in (1, 2, 3)],
+            )
+
+        my_unit = DummyTrainUnit(input_dim=2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpointer = BaseCheckpointSaver(temp_dir, save_every_n_seconds=3600)
+            train(my_unit, dataloader, max_steps=3, callbacks=[checkpointer])
+            # only the final checkpoint is saved
+            self.assertEqual(os.listdir(temp_dir), ["epoch_1_train_step_3"])
+
+    @skip_if_not_distributed
+    def test_save_every_n_seconds_distributed(self) -> None:
+        spawn_multi_process(
+            2,
+            "gloo",
+            self._test_save_every_n_seconds_distributed,
+        )
+
+    @staticmethod
+    def _test_save_every_n_seconds_distributed() -> None:
+        tc = unittest.TestCase()
+        temp_dir = tempfile.mkdtemp() if get_global_rank() == 0 else ""
+        checkpointer = BaseCheckpointSaver(temp_dir, save_every_n_seconds=1e-9)
+        saved_steps: List[int] = []
+
+        class CheckpointStepUnit(DummyTrainUnit):
+            def on_checkpoint_save(self, state: State, checkpoint_id: str) -> None:
+                saved_steps.append(self.train_progress.num_steps_completed)
+
+        try:
+            my_unit = CheckpointStepUnit(input_dim=2)
+            dataloader = generate_random_dataloader(10, 2, 2)
+            train(my_unit, dataloader, max_steps=4, callbacks=[checkpointer])
+            # the timer of rank 0 is propagated with a delay of one step
+            tc.assertEqual(saved_steps, [2, 3, 4])
+            gathered: List[Optional[List[int]]] = [None, None]
+            dist.all_gather_object(gathered, saved_steps)
+            tc.assertEqual(gathered[0], gathered[1])
+        finally:
+            dist.barrier()  # avoid race condition
+            if get_global_rank() == 0:
+                shutil.rmtree(temp_dir)  # delete temp directory
+
+    @skip_if_not_distributed
+    def test_upkeep_single_collective(self) -> None:
+        spawn_multi_process(
+            2,
+            "gloo",
+            self._test_upkeep_single_collective,
+        )
+
+    @staticmethod
+    def _test_upkeep_single_collective() -> None:
+        tc = unittest.TestCase()
+        temp_dir = tempfile.mkdtemp() if get_global_rank() == 0 else ""
+        checkpointer = BaseCheckpointSaver(
+            temp_dir,
+            save_every_n_train_steps=1,
+            keep_last_n_checkpoints=2,
+            adaptive_checkpoint_options=AdaptiveCheckpointOptions(
+                mtbf_seconds=7200.0, max_interval_steps=2
+            ),
+        )
+        try:
+            my_unit = DummyTrainUnit(input_dim=2)
+            dataloader = generate_random_dataloader(10, 2, 2)
+            timer = Timer()
+            with patch.object(
+                PGWrapper,
+                "broadcast_object_list",
+                autospec=True,
+                side_effect=PGWrapper.broadcast_object_list,
+            ) as mock_broadcast:
+                train(
+                    my_unit,
+                    dataloader,
+                    max_steps=4,
+                    timer=timer,
+                    callbacks=[checkpointer],
+                )
+
+            # the whole upkeep of each checkpoint, including the skipped final one, is a single broadcast
+            num_upkeeps = len(timer.recorded_durations["BaseCheckpointSaver.upkeep"])
+            tc.assertGreaterEqual(num_upkeeps, 3)
+            tc.assertEqual(mock_broadcast.call_count, num_upkeeps)
+            tc.assertEqual(len(os.listdir(checkpointer.dirpath)), 2)
+        finally:
+            dist.barrier()  # avoid race condition
+            if get_global_rank() == 0:
+                shutil.rmtree(temp_dir)  # delete temp directory
+
+    def test_adaptive_interval(self) -> None:
+        my_unit = DummyTrainUnit(input_dim=2)
+        dataloader = generate_random_dataloader(10, 2, 2)
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "torchtnt.framework.callbacks.base_checkpointer.get_optimal_checkpoint_interval",
+            return_value=3600.0,
+        ) as mock_get_interval:
+            checkpointer = BaseCheckpointSaver(
+                temp_dir,
+                save_every_n_train_steps=1,
+                adaptive_checkpoint_options=AdaptiveCheckpointOptions(
+                    mtbf_seconds=7200.0, max_interval_steps=3
+                ),
+            )
+            train(my_unit, dataloader, max_epochs=2, callbacks=[checkpointer])
+
+            # the interval is kept until the save cost is measured at the first checkpoint
+            self.assertEqual(
+                sorted(
+                    os.listdir(temp_dir),
+                    key=lambda p: int(p.rsplit("_", 1)[1]),
+                ),
+                [
+                    "epoch_0_train_step_1",
+                    "epoch_0_train_step_2",
+                    "epoch_0_train_step_5",
+                    "epoch_1_train_step_8",
+                    "epoch_2_train_step_10",
+                ],
+            )
+            save_cost_s, mtbf_s = mock_get_interval.call_args.args
+            self.assertGreater(save_cost_s, 0)
+            self.assertEqual(mtbf_s, 7200.0)
+
+    def test_adaptive_interval_learned_mtbf(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpointer = BaseCheckpointSaver(
+                temp_dir,
+                save_every_n_train_steps=10,
+                adaptive_checkpoint_options=AdaptiveCheckpointOptions(
+                    min_interval_steps=2, max_interval_steps=1000
+                ),
+            )
+            checkpointer._avg_step_time_s = 1.0
+            checkpointer._avg_save_cost_s = 2.0
+            # the initial interval is kept until two runs started
+            checkpointer.on_train_start(get_dummy_train_state(), DummyTrainUnit(2))
+            self.assertEqual(checkpointer._get_adaptive_train_checkpoint_interval(), 10)
+
+            # the runs lasted 400s on average
+            checkpointer._train_start_times = [0.0, 400.0, 800.0]
+            self.assertEqual(checkpointer._get_adaptive_train_checkpoint_interval(), 39)
+
+    def test_preemption(self) -> None:
+        my_unit = DummyTrainUnit(input_dim=2)
+        dataloader = generate_random_dataloader(10, 2, 2)
+
+        def send_sigterm(state: State, unit: TTrainUnit) -> None:
+            if unit.train_progress.num_steps_completed == 3:
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        previous_handler = signal.getsignal(signal.SIGTERM)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpointer = BaseCheckpointSaver(
+                temp_dir,
+                save_every_n_train_steps=100,
+                save_every_n_epochs=1,
+                preemption_options=PreemptionOptions(),
+            )
+            train(
+                my_unit,
+                dataloader,
+                max_epochs=2,
+                callbacks=[Lambda(on_train_step_end=send_sigterm), checkpointer],
+            )
+
+            # training stops at the step during which the signal was received, without saving other checkpoints
+            self.assertEqual(my_unit.train_progress.num_steps_completed, 3)
+            self.assertEqual(os.listdir(temp_dir), ["epoch_0_train_step_3"])
+            emergency_checkpoint = os.path.join(temp_dir, "epoch_0_train_step_3")
+            self.assertTrue(is_emergency_checkpoint(emergency_checkpoint))
+            self.assertEqual(signal.getsignal(signal.SIGTERM), previous_handler)
+
+            restored_checkpoint_path: List[str] = []
+            self.assertTrue(
+                BaseCheckpointSaver.restore_from_latest(
+                    temp_dir,
+                    my_unit,
+                    restored_checkpoint_path=restored_checkpoint_path,
+                )
+            )
+            self.assertEqual(restored_checkpoint_path, [emergency_checkpoint])
+
+    @skip_if_not_distributed
+    def test_preemption_distributed(self) -> None:
+        spawn_multi_process(
+            2,
+            "gloo",
+            self._test_preemption_distributed,
+        )
+
+    @staticmethod
+    def _test_preemption_distributed() -> None:
+        tc = unittest.TestCase()
+        temp_dir = tempfile.mkdtemp() if get_global_rank() == 0 else ""
+        checkpointer = BaseCheckpointSaver(
+            temp_dir,
+            save_every_n_train_steps=100,
+            preemption_options=PreemptionOptions(),
+        )
+
+        def send_sigterm(state: State, unit: TTrainUnit) -> None:
+            # only rank 0 is preempted
+            if get_global_rank() == 0 and unit.train_progress.num_steps_completed == 2:
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        try:
+            my_unit = DummyTrainUnit(input_dim=2)
+            dataloader = generate_random_dataloader(10, 2, 2)
+            train(
+                my_unit,
+                dataloader,
+                max_steps=5,
+                callbacks=[Lambda(on_train_step_end=send_sigterm), checkpointer],
+            )
+            # the ranks agree on the preemption with a delay of one step
+            tc.assertEqual(my_unit.train_progress.num_steps_completed, 3)
+            dist.barrier()
+            tc.assertEqual(os.listdir(checkpointer.dirpath), ["epoch_0_train_step_3"])
+            tc.assertTrue(
+                is_emergency_checkpoint(
+                    os.path.join(checkpointer.dirpath, "epoch_0_train_step_3")
+                )
+            )
+        finally:
+            dist.barrier()  # avoid race condition
+            if get_global_rank() == 0:
+                shutil.rmtree(temp_dir)  # delete temp directory
 
     @skip_if_not_distributed
     def test_process_group_plumbing(self) -> None:
@@ -10,7 +10,9 @@
 import math
 import os
 import shutil
+import signal
 import tempfile
+import threading
 import unittest
 from typing import Any, Dict, Iterator, List, Optional, Tuple
 from unittest import mock
@@ -41,21 +43,40 @@ from torchtnt.framework._test_utils import (
     get_dummy_train_state,
 )
 from torchtnt.framework.callbacks._checkpoint_utils import _PHASE_DL_STATE_KEY_MAPPING
-from torchtnt.framework.callbacks.checkpointer_types import KnobOptions, RestoreOptions
-from torchtnt.framework.callbacks.dcp_saver import DistributedCheckpointSaver
+from torchtnt.framework.callbacks.checkpointer_types import (
+    ChecksumOptions,
+    CompressionOptions,
+    IOTuningOptions,
+    KnobOptions,
+    PreemptionOptions,
+    RestoreOptions,
+    TieredCheckpointOptions,
+)
+from torchtnt.framework.callbacks.dcp_saver import (
+    _deferred_optimizer_restores,
+    _DeferredOptimizerRestore,
+    DistributedCheckpointSaver,
+    IO_TUNING_FNAME,
+)
+from torchtnt.framework.callbacks.lambda_callback import Lambda
 from torchtnt.framework.evaluate import evaluate
 from torchtnt.framework.fit import fit
 from torchtnt.framework.predict import predict
 from torchtnt.framework.state import State
 from torchtnt.framework.train import train
+from torchtnt.framework.unit import TTrainUnit
 from torchtnt.utils.checkpoint import (
     BestCheckpointConfig,
     get_latest_checkpoint_path,
+    is_corrupt_checkpoint,
+    is_emergency_checkpoint,
     Phase,
 )
+from torchtnt.utils.checkpoint_storage import CompressedStorageReader
 from torchtnt.utils.distributed import get_global_rank, spawn_multi_process
 from torchtnt.utils.env import seed
 from torchtnt.utils.test_utils import skip_if_not_distributed
+from torchtnt.utils.timer import Timer
 
 
 class DistributedCheckpointSaverTest(unittest.TestCase):
@@ -1015,6 +1036,597 @@ class DistributedCheckpointSaverTest(unittest.TestCase):
         self.assertIn(train_dl_key, app_state)
         self.assertIs(app_state[train_dl_key], stateful_dataloader)
 
+    def test_tiered_checkpointing(self) -> None:
+        input_dim = 2
+        dataset_len = 20
+        batch_size = 2
+
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(dataset_len, input_dim, batch_size)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dirpath = os.path.join(temp_dir, "durable")
+            local_dirpath = os.path.join(temp_dir, "local")
+            dcp_cb = DistributedCheckpointSaver(
+                dirpath,
+                save_every_n_train_steps=2,
+                knob_options=KnobOptions(1),
+                async_checkpoint=True,
+                tiered_checkpoint_options=TieredCheckpointOptions(
+                    local_dirpath=local_dirpath,
+                    promote_every_n_checkpoints=2,
+                    local_keep_last_n_checkpoints=2,
+                ),
+            )
+            train(my_unit, dataloader, max_epochs=1, callbacks=[dcp_cb])
+
+            self.assertEqual(
+                sorted(os.listdir(local_dirpath)),
+                ["epoch_0_train_step_10", "epoch_0_train_step_8"],
+            )
+            # every second checkpoint, and the last one, are promoted
+            self.assertEqual(
+                sorted(os.listdir(dirpath)),
+                [
+                    "epoch_0_train_step_10",
+                    "epoch_0_train_step_4",
+                    "epoch_0_train_step_8",
+                ],
+            )
+            for ckpt in os.listdir(dirpath):
+                self.assertTrue(
+                    os.path.exists(os.path.join(dirpath, ckpt, ".metadata"))
+                )
+
+            with mock.patch(
+                "torchtnt.framework.callbacks.dcp_saver.DistributedCheckpointSaver.restore"
+            ) as mock_restore:
+                restore_options = RestoreOptions(verify_local_checksums=False)
+                self.assertTrue(
+                    dcp_cb.restore_from_latest(
+                        dirpath,
+                        my_unit,
+                        local_dirpath=local_dirpath,
+                        restore_options=restore_options,
+                    )
+                )
+                self.assertEqual(
+                    mock_restore.call_args.args[0],
+                    os.path.join(local_dirpath, "epoch_0_train_step_10"),
+                )
+                # checksums are not verified for the local tier
+                self.assertFalse(
+                    mock_restore.call_args.kwargs["restore_options"].verify_checksums
+                )
+
+                shutil.rmtree(local_dirpath)
+                self.assertTrue(
+                    dcp_cb.restore_from_latest(
+                        dirpath,
+                        my_unit,
+                        local_dirpath=local_dirpath,
+                        restore_options=restore_options,
+                    )
+                )
+                self.assertEqual(
+                    mock_restore.call_args.args[0],
+                    os.path.join(dirpath, "epoch_0_train_step_10"),
+                )
+                self.assertTrue(
+                    mock_restore.call_args.kwargs["restore_options"].verify_checksums
+                )
+
+            # the promoted checkpoint is complete
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            dcp_cb.restore(os.path.join(dirpath, "epoch_0_train_step_10"), my_new_unit)
+            assert_state_dict_eq(
+                self, my_new_unit.module.state_dict(), my_unit.module.state_dict()
+            )
+
+    def test_tiered_checkpointing_keep_last_n(self) -> None:
+        input_dim = 2
+        dataset_len = 12
+        batch_size = 2
+
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(dataset_len, input_dim, batch_size)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dirpath = os.path.join(temp_dir, "durable")
+            dcp_cb = DistributedCheckpointSaver(
+                dirpath,
+                save_every_n_train_steps=1,
+                keep_last_n_checkpoints=2,
+                knob_options=KnobOptions(1),
+                tiered_checkpoint_options=TieredCheckpointOptions(
+                    local_dirpath=os.path.join(temp_dir, "local"),
+                    local_keep_last_n_checkpoints=1,
+                    max_promotion_bytes_per_sec=1e9,
+                ),
+            )
+            train(my_unit, dataloader, max_epochs=1, callbacks=[dcp_cb])
+
+            self.assertEqual(
+                os.listdir(os.path.join(temp_dir, "local")), ["epoch_0_train_step_6"]
+            )
+            self.assertEqual(
+                sorted(os.listdir(dirpath)),
+                ["epoch_0_train_step_5", "epoch_0_train_step_6"],
+            )
+
+    def test_preemption_tiered(self) -> None:
+        input_dim = 2
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(20, input_dim, 2)
+
+        def send_sigterm(state: State, unit: TTrainUnit) -> None:
+            if unit.train_progress.num_steps_completed == 5:
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dirpath = os.path.join(temp_dir, "durable")
+            local_dirpath = os.path.join(temp_dir, "local")
+            dcp_cb = DistributedCheckpointSaver(
+                dirpath,
+                save_every_n_train_steps=2,
+                knob_options=KnobOptions(1),
+                async_checkpoint=True,
+                tiered_checkpoint_options=TieredCheckpointOptions(
+                    local_dirpath=local_dirpath,
+                    promote_every_n_checkpoints=10,
+                ),
+                preemption_options=PreemptionOptions(grace_period_seconds=60),
+            )
+            train(
+                my_unit,
+                dataloader,
+                max_epochs=1,
+                callbacks=[Lambda(on_train_step_end=send_sigterm), dcp_cb],
+            )
+            self.assertEqual(my_unit.train_progress.num_steps_completed, 5)
+
+            # the emergency checkpoint is promoted right away, and marked in both tiers
+            emergency_checkpoint = os.path.join(dirpath, "epoch_0_train_step_5")
+            self.assertEqual(os.listdir(dirpath), ["epoch_0_train_step_5"])
+            self.assertTrue(is_emergency_checkpoint(emergency_checkpoint))
+            self.assertTrue(
+                is_emergency_checkpoint(
+                    os.path.join(local_dirpath, "epoch_0_train_step_5")
+                )
+            )
+
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            self.assertTrue(
+                DistributedCheckpointSaver.restore_from_latest(dirpath, my_new_unit)
+            )
+            self.assertEqual(my_new_unit.train_progress.num_steps_completed, 5)
+            assert_state_dict_eq(
+                self, my_new_unit.module.state_dict(), my_unit.module.state_dict()
+            )
+
+    def test_deferred_optimizer_restore_loads_on_main_thread(self) -> None:
+        input_dim = 2
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dcp_cb = DistributedCheckpointSaver(temp_dir, knob_options=KnobOptions(1))
+            train(my_unit, dataloader, max_steps=2, callbacks=[dcp_cb])
+
+            # optimizer wrappers may run collectives in state_dict and load_state_dict
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            threads = []
+            load_state_dict = my_new_unit.optimizer.load_state_dict
+
+            def recording_load_state_dict(state_dict: Dict[str, Any]) -> None:
+                threads.append(threading.current_thread())
+                load_state_dict(state_dict)
+
+            with patch.object(
+                my_new_unit.optimizer, "load_state_dict", recording_load_state_dict
+            ):
+                DistributedCheckpointSaver.restore_with_id(
+                    os.path.join(temp_dir, "epoch_1_train_step_2"),
+                    my_new_unit,
+                    restore_options=RestoreOptions(defer_optimizer_restore=True),
+                )
+                _deferred_optimizer_restores[my_new_unit].wait()
+            self.assertEqual(threads, [threading.main_thread()])
+            assert_state_dict_eq(
+                self,
+                my_new_unit.optimizer.state_dict(),
+                my_unit.optimizer.state_dict(),
+            )
+
+    def test_deferred_optimizer_restore(self) -> None:
+        input_dim = 2
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dcp_cb = DistributedCheckpointSaver(temp_dir, knob_options=KnobOptions(1))
+            train(my_unit, dataloader, max_steps=2, callbacks=[dcp_cb])
+            checkpoint_id = os.path.join(temp_dir, "epoch_1_train_step_2")
+
+            # the background load waits until it is released
+            released = threading.Event()
+            load = _DeferredOptimizerRestore._load
+
+            def blocked_load(self: _DeferredOptimizerRestore, *args: Any) -> None:
+                released.wait()
+                load(self, *args)
+
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            with patch.object(_DeferredOptimizerRestore, "_load", blocked_load):
+                DistributedCheckpointSaver.restore_with_id(
+                    checkpoint_id,
+                    my_new_unit,
+                    restore_options=RestoreOptions(defer_optimizer_restore=True),
+                )
+
+            # modules and progress are restored before the optimizer states
+            deferred_restore = _deferred_optimizer_restores[my_new_unit]
+            self.assertFalse(deferred_restore.done())
+            self.assertEqual(my_new_unit.train_progress.num_steps_completed, 2)
+            assert_state_dict_eq(
+                self, my_new_unit.module.state_dict(), my_unit.module.state_dict()
+            )
+
+            released.set()
+            deferred_restore.wait()
+            assert_state_dict_eq(
+                self,
+                my_new_unit.optimizer.state_dict(),
+                my_unit.optimizer.state_dict(),
+            )
+
+            # the first step of the optimizer waits for its states, and the wait is timed
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            with patch.object(_DeferredOptimizerRestore, "_load", blocked_load):
+                released.clear()
+                DistributedCheckpointSaver.restore_with_id(
+                    checkpoint_id,
+                    my_new_unit,
+                    restore_options=RestoreOptions(defer_optimizer_restore=True),
+                )
+            timer = Timer()
+            threading.Timer(0.5, released.set).start()
+            train(
+                my_new_unit,
+                dataloader,
+                max_steps=3,
+                timer=timer,
+                callbacks=[DistributedCheckpointSaver(temp_dir)],
+            )
+            self.assertTrue(_deferred_optimizer_restores[my_new_unit].done())
+            self.assertEqual(
+                len(
+                    timer.recorded_durations[
+                        "DistributedCheckpointSaver.deferred_optimizer_restore"
+                    ]
+                ),
+                1,
+            )
+            self.assertGreater(
+                timer.recorded_durations[
+                    "DistributedCheckpointSaver.wait_for_optimizer_restore"
+                ][0],
+                0.1,
+            )
+
+    def test_save_restore_compressed(self) -> None:
+        input_dim = 2
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dcp_cb = DistributedCheckpointSaver(
+                temp_dir,
+                save_every_n_train_steps=2,
+                knob_options=KnobOptions(2),
+                compression_options=CompressionOptions(codec="zlib"),
+            )
+            train(my_unit, dataloader, max_steps=4, callbacks=[dcp_cb])
+
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            self.assertTrue(
+                DistributedCheckpointSaver.restore_from_latest(
+                    temp_dir, my_new_unit, knob_options=KnobOptions(2)
+                )
+            )
+            self.assertEqual(my_new_unit.train_progress.num_steps_completed, 4)
+            assert_state_dict_eq(
+                self, my_new_unit.module.state_dict(), my_unit.module.state_dict()
+            )
+            assert_state_dict_eq(
+                self,
+                my_new_unit.optimizer.state_dict(),
+                my_unit.optimizer.state_dict(),
+            )
+
+    def test_restore_default_storage_reader(self) -> None:
+        input_dim = 2
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name, kwargs in (
+                ("plain", {}),
+                (
+                    "compressed",
+                    {"compression_options": CompressionOptions(codec="zlib")},
+                ),
+                (
+                    "checksummed",
+                    {"checksum_options": ChecksumOptions(algorithm="crc32")},
+                ),
+            ):
+                dirpath = os.path.join(temp_dir, name)
+                dcp_cb = DistributedCheckpointSaver(
+                    dirpath, save_every_n_train_steps=2, **kwargs
+                )
+                train(
+                    DummyTrainUnit(input_dim=input_dim),
+                    dataloader,
+                    max_steps=2,
+                    callbacks=[dcp_cb],
+                )
+                with patch(
+                    "torchtnt.framework.callbacks.dcp_saver.dcp.load",
+                    wraps=torch.distributed.checkpoint.load,
+                ) as load_mock:
+                    DistributedCheckpointSaver.restore_from_latest(
+                        dirpath,
+                        DummyTrainUnit(input_dim=input_dim),
+                        knob_options=KnobOptions(4),
+                    )
+                storage_reader = load_mock.call_args.kwargs["storage_reader"]
+                # only compressed or checksummed checkpoints need the threaded reader
+                if name == "plain":
+                    self.assertIs(type(storage_reader), FsspecReader)
+                else:
+                    self.assertIsInstance(storage_reader, CompressedStorageReader)
+                    self.assertEqual(storage_reader.thread_count, 4)
+
+    def test_save_restore_step_metrics(self) -> None:
+        input_dim = 2
+        my_unit = DummyAutoUnit(
+            module=torch.nn.Linear(input_dim, 2), accumulate_step_metrics=True
+        )
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dcp_cb = DistributedCheckpointSaver(
+                temp_dir, save_every_n_train_steps=2, knob_options=KnobOptions(1)
+            )
+            train(my_unit, dataloader, max_steps=4, callbacks=[dcp_cb])
+
+            # the fresh unit has not recorded any metrics yet
+            my_new_unit = DummyAutoUnit(
+                module=torch.nn.Linear(input_dim, 2), accumulate_step_metrics=True
+            )
+            self.assertTrue(
+                DistributedCheckpointSaver.restore_from_latest(
+                    temp_dir, my_new_unit, knob_options=KnobOptions(1)
+                )
+            )
+            train_step_metrics = none_throws(my_new_unit.train_step_metrics)
+            self.assertEqual(
+                train_step_metrics.names,
+                none_throws(my_unit.train_step_metrics).names,
+            )
+            self.assertEqual(
+                train_step_metrics.compute(),
+                none_throws(my_unit.train_step_metrics).compute(),
+            )
+
+    def test_checksums(self) -> None:
+        input_dim = 2
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dcp_cb = DistributedCheckpointSaver(
+                temp_dir,
+                save_every_n_train_steps=2,
+                checksum_options=ChecksumOptions(algorithm="crc32"),
+            )
+            train(my_unit, dataloader, max_steps=4, callbacks=[dcp_cb])
+
+            # corrupt the latest checkpoint
+            latest_path = os.path.join(temp_dir, "epoch_0_train_step_4")
+            for fname in os.listdir(latest_path):
+                if fname.endswith(".distcp"):
+                    with open(os.path.join(latest_path, fname), "r+b") as f:
+                        f.seek(os.path.getsize(f.name) // 2)
+                        byte = f.read(1)
+                        f.seek(-1, os.SEEK_CUR)
+                        f.write(bytes([byte[0] ^ 0xFF]))
+
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            with self.assertRaisesRegex(BaseException, "Checksum mismatch"):
+                DistributedCheckpointSaver.restore_from_latest(temp_dir, my_new_unit)
+            self.assertTrue(is_corrupt_checkpoint(latest_path))
+
+            # the verification may be skipped
+            DistributedCheckpointSaver.restore(
+                latest_path,
+                DummyTrainUnit(input_dim=input_dim),
+                restore_options=RestoreOptions(verify_checksums=False),
+            )
+
+            # the corrupt checkpoint is skipped from now on
+            self.assertTrue(
+                DistributedCheckpointSaver.restore_from_latest(temp_dir, my_new_unit)
+            )
+            self.assertEqual(my_new_unit.train_progress.num_steps_completed, 2)
+
+    def test_io_tuning(self) -> None:
+        input_dim = 2
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dcp_cb = DistributedCheckpointSaver(
+                temp_dir,
+                save_every_n_train_steps=1,
+                knob_options=KnobOptions(2),
+                io_tuning_options=IOTuningOptions(max_thread_count=4),
+            )
+            tuner = none_throws(dcp_cb._io_tuner)
+            self.assertEqual(tuner.settings.thread_count, 2)
+            train(my_unit, dataloader, max_steps=4, callbacks=[dcp_cb])
+
+            # every save is measured, with the settings picked by the tuner
+            self.assertEqual(len(tuner.history), 4)
+            self.assertEqual(tuner.history[0]["thread_count"], 2)
+            self.assertEqual(tuner.history[1]["thread_count"], 4)
+            self.assertTrue(os.path.exists(os.path.join(temp_dir, IO_TUNING_FNAME)))
+
+            # checkpoints written with any settings are restored
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            self.assertTrue(
+                DistributedCheckpointSaver.restore_from_latest(temp_dir, my_new_unit)
+            )
+            self.assertEqual(my_new_unit.train_progress.num_steps_completed, 4)
+            assert_state_dict_eq(
+                self, my_new_unit.module.state_dict(), my_unit.module.state_dict()
+            )
+
+            # the next run resumes the tuning
+            new_dcp_cb = DistributedCheckpointSaver(
+                temp_dir,
+                knob_options=KnobOptions(2),
+                io_tuning_options=IOTuningOptions(max_thread_count=4),
+            )
+            new_tuner = none_throws(new_dcp_cb._io_tuner)
+            self.assertEqual(new_tuner.history, tuner.history)
+            self.assertEqual(new_tuner.settings, tuner.best_settings)
+            self.assertEqual(
+                new_dcp_cb.default_writer_options["thread_count"],
+                tuner.best_settings.thread_count,
+            )
+
+    @skip_if_not_distributed
+    def test_tiered_checkpointing_ddp(self) -> None:
+        spawn_multi_process(
+            2,
+            "cpu:gloo,cuda:gloo",
+            self._tiered_checkpointing_ddp,
+        )
+
+    @staticmethod
+    def _tiered_checkpointing_ddp() -> None:
+        input_dim = 2
+        dataset_len = 10
+        batch_size = 2
+        seed(0)
+
+        my_unit = DummyAutoUnit(module=torch.nn.Linear(input_dim, 2), strategy="ddp")
+        dataloader = generate_random_dataloader(dataset_len, input_dim, batch_size)
+        temp_dir = tempfile.mkdtemp() if get_global_rank() == 0 else ""
+
+        dcp_cb = DistributedCheckpointSaver(
+            os.path.join(temp_dir, "durable"),
+            save_every_n_epochs=1,
+            knob_options=KnobOptions(1),
+            async_checkpoint=True,
+            tiered_checkpoint_options=TieredCheckpointOptions(
+                local_dirpath=os.path.join(temp_dir, "local"),
+                promote_every_n_checkpoints=2,
+            ),
+        )
+        dirpath = dcp_cb.dirpath
+        train(my_unit, dataloader, max_epochs=3, callbacks=[dcp_cb])
+        tc = unittest.TestCase()
+        try:
+            tc.assertEqual(
+                sorted(os.listdir(dirpath)),
+                ["epoch_2_train_step_10", "epoch_3_train_step_15"],
+            )
+            my_new_unit = DummyAutoUnit(
+                module=torch.nn.Linear(input_dim, 2), strategy="ddp"
+            )
+            tc.assertTrue(
+                DistributedCheckpointSaver.restore_from_latest(
+                    dirpath,
+                    my_new_unit,
+                    local_dirpath=os.path.join(os.path.dirname(dirpath), "local"),
+                )
+            )
+            assert_state_dict_eq(
+                tc, my_new_unit.module.state_dict(), my_unit.module.state_dict()
+            )
+        finally:
+            dist.barrier()  # avoid race condition
+            if get_global_rank() == 0:
+                shutil.rmtree(temp_dir)  # delete temp directory
+
+    @skip_if_not_distributed
+    def test_deferred_optimizer_restore_ddp(self) -> None:
+        spawn_multi_process(
+            2,
+            "cpu:gloo,cuda:gloo",
+            self._deferred_optimizer_restore_ddp,
+        )
+
+    @staticmethod
+    def _deferred_optimizer_restore_ddp() -> None:
+        input_dim = 2
+        seed(0)
+
+        my_unit = DummyAutoUnit(module=torch.nn.Linear(input_dim, 2), strategy="ddp")
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        temp_dir = tempfile.mkdtemp() if get_global_rank() == 0 else ""
+        dcp_cb = DistributedCheckpointSaver(temp_dir, knob_options=KnobOptions(1))
+        train(my_unit, dataloader, max_steps=2, callbacks=[dcp_cb])
+        tc = unittest.TestCase()
+        try:
+            my_new_unit = DummyAutoUnit(
+                module=torch.nn.Linear(input_dim, 2), strategy="ddp"
+            )
+            tc.assertTrue(
+                DistributedCheckpointSaver.restore_from_latest(
+                    dcp_cb.dirpath,
+                    my_new_unit,
+                    restore_options=RestoreOptions(defer_optimizer_restore=True),
+                )
+            )
+            _deferred_optimizer_restores[my_new_unit].wait()
+            assert_state_dict_eq(
+                tc,
+                my_new_unit.optimizer.state_dict(),
+                my_unit.optimizer.state_dict(),
+            )
+            # training resumes with the restored states
+            train(my_new_unit, dataloader, max_steps=3, callbacks=[dcp_cb])
+            tc.assertEqual(my_new_unit.train_progress.num_steps_completed, 3)
+        finally:
+            dist.barrier()  # avoid race condition
+            if get_global_rank() == 0:
+                shutil.rmtree(temp_dir)  # delete temp directory
+
+    @skip_if_not_distributed
+    def test_io_tuning_ddp(self) -> None:
+        spawn_multi_process(2, "gloo", self._io_tuning_ddp)
+
+    @staticmethod
+    def _io_tuning_ddp() -> None:
+        input_dim = 2
+        my_unit = DummyAutoUnit(module=torch.nn.Linear(input_dim, 2), strategy="ddp")
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        temp_dir = tempfile.mkdtemp() if get_global_rank() == 0 else ""
+        dcp_cb = DistributedCheckpointSaver(
+            temp_dir,
+            save_every_n_train_steps=1,
+            knob_options=KnobOptions(2),
+            io_tuning_options=IOTuningOptions(),
+        )
+        try:
+            train(my_unit, dataloader, max_steps=3, callbacks=[dcp_cb])
+            tc = unittest.TestCase()
+            # only rank 0 measures and tunes the settings
+            num_measurements = len(none_throws(dcp_cb._io_tuner).history)
+            tc.assertEqual(num_measurements, 3 if get_global_rank() == 0 else 0)
+            # and every rank saves with its settings
+            settings = [None, None]
+            dist.all_gather_object(settings, dcp_cb._io_settings)
+            tc.assertEqual(settings[0], settings[1])
+        finally:
+            dist.barrier()  # avoid race condition
+            if get_global_rank() == 0:
+                shutil.rmtree(temp_dir)  # delete temp directory
+
 
 def _raise_no_global_metadata() -> Metadata:
     raise AssertionError("Unknown module type rank_0")
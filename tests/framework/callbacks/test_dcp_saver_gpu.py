@@ -16,7 +16,11 @@ from unittest.mock import MagicMock, patch
 import torch
 from torch import distributed as dist, nn
 from torchtnt.framework._test_utils import DummyAutoUnit, generate_random_dataloader
-from torchtnt.framework.callbacks.dcp_saver import DistributedCheckpointSaver
+from torchtnt.framework.callbacks.checkpointer_types import RestoreOptions
+from torchtnt.framework.callbacks.dcp_saver import (
+    _deferred_optimizer_restores,
+    DistributedCheckpointSaver,
+)
 from torchtnt.framework.train import train
 from torchtnt.utils.distributed import get_global_rank, spawn_multi_process
 from torchtnt.utils.test_utils import skip_if_not_distributed, skip_if_not_gpu
@@ -180,3 +184,63 @@ class DistributedCheckpointSaverGPUTest(unittest.TestCase):
             dist.barrier()  # avoid race condition
             if get_global_rank() == 0:
                 shutil.rmtree(temp_dir)  # delete temp directory
+
+    @skip_if_not_distributed
+    @skip_if_not_gpu
+    def test_deferred_optimizer_restore_fsdp(self) -> None:
+        spawn_multi_process(
+            2,
+            "nccl",
+            self._deferred_optimizer_restore_fsdp,
+        )
+
+    @staticmethod
+    def _deferred_optimizer_restore_fsdp() -> None:
+        input_dim = 2
+        my_unit = DummyAutoUnit(module=torch.nn.Linear(input_dim, 2), strategy="fsdp")
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        if get_global_rank() == 0:
+            temp_dir = tempfile.mkdtemp()
+        else:
+            temp_dir = ""
+
+        dcp_cb = DistributedCheckpointSaver(temp_dir, save_every_n_epochs=1)
+        temp_dir = dcp_cb.dirpath
+        train(my_unit, dataloader, max_epochs=1, callbacks=[dcp_cb])
+        ckpt_path = os.path.join(temp_dir, "epoch_1_train_step_5")
+
+        tc = unittest.TestCase()
+        try:
+            # the FSDP optimizer wrapper runs collectives to load its state, which must not happen in the background
+            my_new_unit = DummyAutoUnit(
+                module=torch.nn.Linear(input_dim, 2), strategy="fsdp"
+            )
+            DistributedCheckpointSaver.restore_with_id(
+                ckpt_path,
+                my_new_unit,
+                restore_options=RestoreOptions(defer_optimizer_restore=True),
+            )
+            _deferred_optimizer_restores[my_new_unit].wait()
+            tc.assertEqual(
+                # pyrefly: ignore [missing-attribute]
+                my_new_unit.optimizer.state_dict(),
+                # pyrefly: ignore [missing-attribute]
+                my_unit.optimizer.state_dict(),
+            )
+
+            # the background load overlaps with the collectives of training
+            my_new_unit = DummyAutoUnit(
+                module=torch.nn.Linear(input_dim, 2), strategy="fsdp"
+            )
+            DistributedCheckpointSaver.restore_with_id(
+                ckpt_path,
+                my_new_unit,
+                restore_options=RestoreOptions(defer_optimizer_restore=True),
+            )
+            train(my_new_unit, dataloader, max_steps=7)
+            tc.assertTrue(_deferred_optimizer_restores[my_new_unit].done())
+            tc.assertEqual(my_new_unit.train_progress.num_steps_completed, 7)
+        finally:
+            dist.barrier()  # avoid race condition
+            if get_global_rank() == 0:
+                shutil.rmtree(temp_dir)  # delete temp directory
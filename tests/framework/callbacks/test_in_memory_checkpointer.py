@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from pyre_extensions import none_throws
+from torchsnapshot.test_utils import assert_state_dict_eq
+from torchtnt.framework._test_utils import (
+    DummyAutoUnit,
+    DummyTrainUnit,
+    generate_random_dataloader,
+)
+from torchtnt.framework.callbacks import in_memory_checkpointer
+from torchtnt.framework.callbacks.checkpointer_types import KnobOptions
+from torchtnt.framework.callbacks.dcp_saver import DistributedCheckpointSaver
+from torchtnt.framework.callbacks.in_memory_checkpointer import InMemoryCheckpointer
+from torchtnt.framework.train import train
+from torchtnt.utils.checkpoint import get_latest_checkpoint_path
+from torchtnt.utils.distributed import spawn_multi_process
+from torchtnt.utils.env import seed
+from torchtnt.utils.test_utils import skip_if_not_distributed
+
+
+class InMemoryCheckpointerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.local_dir: str = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.local_dir)
+
+    def test_save_restore(self) -> None:
+        input_dim = 2
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        checkpointer = InMemoryCheckpointer(
+            "memory://test_save_restore",
+            save_every_n_train_steps=2,
+            local_dir=self.local_dir,
+        )
+        train(my_unit, dataloader, max_steps=4, callbacks=[checkpointer])
+
+        # only the latest checkpoint is held, and a single rank has no peer to replicate to
+        self.assertEqual(
+            [os.path.basename(f) for f in _local_files(self.local_dir)],
+            ["rank00000-own-epoch_0_train_step_4.bin"],
+        )
+
+        my_new_unit = DummyTrainUnit(input_dim=input_dim)
+        self.assertTrue(
+            InMemoryCheckpointer.restore_from_latest(
+                checkpointer.dirpath, my_new_unit, local_dir=self.local_dir
+            )
+        )
+        self.assertEqual(my_new_unit.train_progress.num_steps_completed, 4)
+        assert_state_dict_eq(
+            self, my_new_unit.module.state_dict(), my_unit.module.state_dict()
+        )
+        assert_state_dict_eq(
+            self, my_new_unit.optimizer.state_dict(), my_unit.optimizer.state_dict()
+        )
+
+        InMemoryCheckpointer.delete_local_checkpoints(
+            checkpointer.dirpath, local_dir=self.local_dir
+        )
+        self.assertEqual(_local_files(self.local_dir), [])
+
+    def test_restore_from_storage(self) -> None:
+        input_dim = 2
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpointer = InMemoryCheckpointer(
+                "memory://test_restore_from_storage",
+                save_every_n_train_steps=1,
+                local_dir=self.local_dir,
+            )
+            dcp_cb = DistributedCheckpointSaver(
+                temp_dir, save_every_n_train_steps=2, knob_options=KnobOptions(1)
+            )
+            train(my_unit, dataloader, max_steps=3, callbacks=[checkpointer, dcp_cb])
+
+            # drop the final storage checkpoint, so the in-memory one is more recent
+            shutil.rmtree(os.path.join(temp_dir, "epoch_1_train_step_3"))
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            self.assertTrue(
+                InMemoryCheckpointer.restore_from_latest(
+                    checkpointer.dirpath,
+                    my_new_unit,
+                    storage_dirpath=temp_dir,
+                    local_dir=self.local_dir,
+                )
+            )
+            self.assertEqual(my_new_unit.train_progress.num_steps_completed, 3)
+
+            # falls back to storage once the in-memory checkpoint is lost
+            InMemoryCheckpointer.delete_local_checkpoints(
+                checkpointer.dirpath, local_dir=self.local_dir
+            )
+            my_new_unit = DummyTrainUnit(input_dim=input_dim)
+            with self.assertLogs(in_memory_checkpointer.logger, "INFO") as logs:
+                self.assertTrue(
+                    InMemoryCheckpointer.restore_from_latest(
+                        checkpointer.dirpath,
+                        my_new_unit,
+                        storage_dirpath=temp_dir,
+                        local_dir=self.local_dir,
+                    )
+                )
+            self.assertIn("no node holds an in-memory checkpoint", logs.output[0])
+            self.assertEqual(my_new_unit.train_progress.num_steps_completed, 2)
+
+    def test_restore_no_checkpoint(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertFalse(
+                InMemoryCheckpointer.restore_from_latest(
+                    "memory://test_restore_no_checkpoint",
+                    DummyTrainUnit(input_dim=2),
+                    storage_dirpath=temp_dir,
+                )
+            )
+
+    def test_invalid_buddy_offset(self) -> None:
+        with unittest.mock.patch(
+            "torchtnt.framework.callbacks.in_memory_checkpointer.PGWrapper.get_world_size",
+            return_value=4,
+        ), self.assertRaisesRegex(ValueError, "buddy_offset"):
+            InMemoryCheckpointer("memory://test_invalid_buddy_offset", buddy_offset=4)
+
+    @skip_if_not_distributed
+    def test_recover_lost_rank(self) -> None:
+        with tempfile.TemporaryDirectory() as storage_dirpath:
+            trained = spawn_multi_process(
+                2,
+                "cpu:gloo,cuda:gloo",
+                self._train,
+                self.local_dir,
+                storage_dirpath,
+            )
+            # each rank holds its own checkpoint, and the replica of its peer's
+            self.assertEqual(
+                sorted(os.path.basename(f) for f in _local_files(self.local_dir)),
+                [
+                    "rank00000-own-epoch_3_train_step_15.bin",
+                    "rank00000-replica00001-epoch_3_train_step_15.bin",
+                    "rank00001-own-epoch_3_train_step_15.bin",
+                    "rank00001-replica00000-epoch_3_train_step_15.bin",
+                ],
+            )
+            # drop the final storage checkpoint, so it can only be recovered from memory
+            shutil.rmtree(none_throws(get_latest_checkpoint_path(storage_dirpath)))
+
+            # the host of rank 1 is replaced, so its files are lost, and new workers recover its state from the
+            # replica held by rank 0
+            for path in _local_files(self.local_dir, rank=1):
+                os.remove(path)
+            restored = spawn_multi_process(
+                2,
+                "cpu:gloo,cuda:gloo",
+                self._restore,
+                self.local_dir,
+                storage_dirpath,
+            )
+            for (module_sd, optim_sd), (num_steps, new_module_sd, new_optim_sd) in zip(
+                trained, restored
+            ):
+                self.assertEqual(num_steps, 15)
+                assert_state_dict_eq(self, new_module_sd, module_sd)
+                assert_state_dict_eq(self, new_optim_sd, optim_sd)
+
+            # both hosts are replaced, so the latest storage checkpoint is restored
+            for path in _local_files(self.local_dir):
+                os.remove(path)
+            restored = spawn_multi_process(
+                2,
+                "cpu:gloo,cuda:gloo",
+                self._restore,
+                self.local_dir,
+                storage_dirpath,
+            )
+            self.assertEqual([num_steps for num_steps, _, _ in restored], [10, 10])
+
+    @staticmethod
+    def _train(
+        local_dir: str, storage_dirpath: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        input_dim = 2
+        seed(0)
+
+        my_unit = DummyAutoUnit(module=torch.nn.Linear(input_dim, 2), strategy="ddp")
+        dataloader = generate_random_dataloader(10, input_dim, 2)
+        checkpointer = InMemoryCheckpointer(
+            "memory://test_recover_lost_rank",
+            save_every_n_epochs=1,
+            local_dir=local_dir,
+        )
+        dcp_cb = DistributedCheckpointSaver(
+            storage_dirpath, save_every_n_epochs=2, knob_options=KnobOptions(1)
+        )
+        train(my_unit, dataloader, max_epochs=3, callbacks=[checkpointer, dcp_cb])
+        return my_unit.module.state_dict(), my_unit.optimizer.state_dict()
+
+    @staticmethod
+    def _restore(
+        local_dir: str, storage_dirpath: str
+    ) -> Tuple[int, Dict[str, Any], Dict[str, Any]]:
+        my_new_unit = DummyAutoUnit(module=torch.nn.Linear(2, 2), strategy="ddp")
+        assert InMemoryCheckpointer.restore_from_latest(
+            "memory://test_recover_lost_rank",
+            my_new_unit,
+            storage_dirpath=storage_dirpath,
+            local_dir=local_dir,
+        )
+        return (
+            my_new_unit.train_progress.num_steps_completed,
+            my_new_unit.module.state_dict(),
+            my_new_unit.optimizer.state_dict(),
+        )
+
+
+def _local_files(local_dir: str, rank: Optional[int] = None) -> List[str]:
+    prefix = "rank*" if rank is None else f"rank{rank:05d}-*"
+    return sorted(
+        glob.glob(
+            os.path.join(
+                local_dir, in_memory_checkpointer._ROOT_DIRNAME, "*", prefix + ".bin"
+            )
+        )
+    )
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import os
+import tempfile
+import unittest
+
+import torch
+from torchtnt.framework._test_utils import DummyTrainUnit, generate_random_dataloader
+from torchtnt.framework.callbacks.checkpointer_types import RestoreOptions
+from torchtnt.framework.callbacks.inference_exporter import InferenceExporter
+from torchtnt.framework.train import train
+from torchtnt.utils.inference_export import load_inference_weights
+
+
+class InferenceExporterTest(unittest.TestCase):
+    def test_export_restore(self) -> None:
+        my_unit = DummyTrainUnit(input_dim=2)
+        dataloader = generate_random_dataloader(10, 2, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            exporter = InferenceExporter(
+                temp_dir, save_every_n_train_steps=2, keep_last_n_checkpoints=2
+            )
+            train(my_unit, dataloader, max_steps=5, callbacks=[exporter])
+
+            self.assertEqual(
+                sorted(os.listdir(temp_dir)),
+                ["epoch_0_train_step_4", "epoch_1_train_step_5"],
+            )
+            module_names, weights = load_inference_weights(
+                os.path.join(temp_dir, "epoch_1_train_step_5")
+            )
+            self.assertEqual(module_names, ["module"])
+            self.assertEqual(set(weights), {"module.weight", "module.bias"})
+
+            with torch.device("meta"):
+                my_new_unit = DummyTrainUnit(input_dim=2)
+            self.assertTrue(
+                InferenceExporter.restore_from_latest(temp_dir, my_new_unit)
+            )
+            torch.testing.assert_close(
+                my_new_unit.module.state_dict(), my_unit.module.state_dict()
+            )
+            # progress is not exported
+            self.assertEqual(my_new_unit.train_progress.num_steps_completed, 0)
+
+            my_new_unit = DummyTrainUnit(input_dim=2)
+            weight = my_new_unit.module.weight.detach().clone()
+            InferenceExporter.restore_from_latest(
+                temp_dir,
+                my_new_unit,
+                restore_options=RestoreOptions(restore_modules=False),
+            )
+            torch.testing.assert_close(my_new_unit.module.weight, weight)
+
+    def test_export_dtype(self) -> None:
+        my_unit = DummyTrainUnit(input_dim=2)
+        dataloader = generate_random_dataloader(4, 2, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            exporter = InferenceExporter(temp_dir, dtype=torch.bfloat16)
+            train(my_unit, dataloader, max_steps=2, callbacks=[exporter])
+
+            _, weights = load_inference_weights(
+                os.path.join(temp_dir, "epoch_1_train_step_2")
+            )
+            self.assertEqual(weights["module.weight"].dtype, torch.bfloat16)
+            # the module is not downcast by the export
+            self.assertEqual(my_unit.module.weight.dtype, torch.float32)
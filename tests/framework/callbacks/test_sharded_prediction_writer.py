@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import json
+import os
+import tempfile
+import unittest
+from typing import Any, List
+
+import fsspec
+import numpy as np
+import torch
+
+from torchtnt.framework._test_utils import DummyPredictUnit, generate_random_dataloader
+from torchtnt.framework.callbacks.sharded_prediction_writer import (
+    _PYARROW_AVAILABLE,
+    CSVFormat,
+    JSONLFormat,
+    NpyFormat,
+    ParquetFormat,
+    PredictionOutputFormat,
+    ShardedPredictionWriter,
+)
+from torchtnt.framework.predict import predict
+from torchtnt.framework.state import State
+from torchtnt.framework.unit import PredictUnit, TPredictData
+
+_DATASET_LEN = 10
+_BATCH_SIZE = 2
+
+
+class _StepIndexWriter(ShardedPredictionWriter):
+    def get_step_output_rows(
+        self,
+        state: State,
+        unit: PredictUnit[TPredictData],
+        step_output: Any,
+    ) -> List[Any]:
+        step = unit.predict_progress.num_steps_completed
+        return [{"step": step, "i": 0}, {"step": step, "i": 1}]
+
+
+class _CSVWriter(ShardedPredictionWriter):
+    def get_step_output_rows(
+        self,
+        state: State,
+        unit: PredictUnit[TPredictData],
+        step_output: Any,
+    ) -> List[Any]:
+        return [[str(unit.predict_progress.num_steps_completed)]]
+
+
+class _NpyWriter(ShardedPredictionWriter):
+    def get_step_output_rows(
+        self,
+        state: State,
+        unit: PredictUnit[TPredictData],
+        step_output: Any,
+    ) -> List[Any]:
+        return list(step_output.detach())
+
+
+class _FailingFormat(PredictionOutputFormat):
+    suffix = "txt"
+
+    def serialize(self, rows: List[Any]) -> bytes:
+        raise RuntimeError("serialization failed")
+
+
+class _FailingMergeFormat(JSONLFormat):
+    def merge(
+        self, fs: fsspec.AbstractFileSystem, shard_paths: List[str], output_path: str
+    ) -> None:
+        with fs.open(output_path, "wb") as out:
+            out.write(b"partial")
+        raise RuntimeError("merge failed")
+
+
+def _run_predict(writer: ShardedPredictionWriter) -> None:
+    unit = DummyPredictUnit(2)
+    dataloader = generate_random_dataloader(_DATASET_LEN, 2, _BATCH_SIZE)
+    predict(unit, dataloader, callbacks=[writer])
+
+
+class ShardedPredictionWriterTest(unittest.TestCase):
+    def test_jsonl_shards(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = _StepIndexWriter(
+                dir_path=temp_dir, output_format=JSONLFormat(), rows_per_shard=4
+            )
+            _run_predict(writer)
+
+            # 5 steps with 2 rows each -> shards of 4, 4 and 2 rows
+            self.assertEqual(
+                sorted(os.listdir(temp_dir)),
+                [f"predictions-rank00000-{i:05d}.jsonl" for i in range(3)],
+            )
+            rows = []
+            for i in range(3):
+                with open(writer.shard_path(0, i)) as f:
+                    rows.extend(json.loads(line) for line in f)
+            self.assertEqual(
+                rows, [{"step": s, "i": i} for s in range(1, 6) for i in range(2)]
+            )
+
+    def test_csv_merge(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = _CSVWriter(
+                dir_path=temp_dir,
+                output_format=CSVFormat(header_row=["step"]),
+                rows_per_shard=2,
+                merge_shards=True,
+                delete_shards_after_merge=True,
+            )
+            _run_predict(writer)
+
+            self.assertEqual(os.listdir(temp_dir), ["predictions.csv"])
+            with open(writer.merged_path) as f:
+                self.assertEqual(
+                    f.read().splitlines(), ["step", "1", "2", "3", "4", "5"]
+                )
+
+    def test_npy_merge(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = _NpyWriter(
+                dir_path=temp_dir,
+                output_format=NpyFormat(),
+                rows_per_shard=3,
+                merge_shards=True,
+            )
+            _run_predict(writer)
+
+            # shards are kept alongside the merged file
+            self.assertEqual(len(os.listdir(temp_dir)), 5)
+            merged = np.load(writer.merged_path)
+            self.assertEqual(merged.shape, (_DATASET_LEN, 2))
+            self.assertEqual(merged.dtype, np.float32)
+            np.testing.assert_array_equal(
+                merged,
+                np.concatenate([np.load(writer.shard_path(0, i)) for i in range(4)]),
+            )
+
+    def test_npy_merge_mismatched_shards(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, f"{i}.npy") for i in range(2)]
+            np.save(paths[0], np.zeros((2, 3), dtype=np.float32))
+            np.save(paths[1], np.zeros((2, 4), dtype=np.float32))
+            fs = fsspec.filesystem("file")
+            with self.assertRaisesRegex(ValueError, "Cannot merge shard"):
+                NpyFormat().merge(fs, paths, os.path.join(temp_dir, "merged.npy"))
+
+    def test_merge_ignores_stale_shards(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # left over from an earlier run with more ranks
+            with open(
+                os.path.join(temp_dir, "predictions-rank00001-00000.jsonl"), "w"
+            ) as f:
+                f.write(json.dumps({"step": 0, "i": 0}) + "\n")
+            writer = _StepIndexWriter(
+                dir_path=temp_dir,
+                output_format=JSONLFormat(),
+                rows_per_shard=4,
+                merge_shards=True,
+            )
+            _run_predict(writer)
+
+            with open(writer.merged_path) as f:
+                rows = [json.loads(line) for line in f]
+            self.assertEqual(
+                rows, [{"step": s, "i": i} for s in range(1, 6) for i in range(2)]
+            )
+
+    @unittest.skipUnless(_PYARROW_AVAILABLE, "pyarrow is not installed")
+    def test_parquet_merge(self) -> None:
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = _StepIndexWriter(
+                dir_path=temp_dir,
+                output_format=ParquetFormat(),
+                rows_per_shard=3,
+                merge_shards=True,
+            )
+            _run_predict(writer)
+
+            table = pq.read_table(writer.merged_path)
+            self.assertEqual(table.num_rows, _DATASET_LEN)
+            self.assertEqual(
+                table.column("step").to_pylist(), [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+            )
+
+    def test_failed_merge_leaves_no_merged_file(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = _StepIndexWriter(
+                dir_path=temp_dir,
+                output_format=_FailingMergeFormat(),
+                rows_per_shard=4,
+                merge_shards=True,
+            )
+            with self.assertRaisesRegex(RuntimeError, "merge failed"):
+                _run_predict(writer)
+            # neither a truncated merged file, nor its temporary file, are left behind
+            self.assertEqual(
+                sorted(os.listdir(temp_dir)),
+                [f"predictions-rank00000-{i:05d}.jsonl" for i in range(3)],
+            )
+
+    def test_write_error_is_raised(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = _StepIndexWriter(
+                dir_path=temp_dir, output_format=_FailingFormat(), rows_per_shard=2
+            )
+            with self.assertRaisesRegex(RuntimeError, "serialization failed"):
+                _run_predict(writer)
+            # no partially written shards are left behind
+            self.assertEqual(os.listdir(temp_dir), [])
+
+    def test_invalid_args(self) -> None:
+        with self.assertRaisesRegex(ValueError, "rows_per_shard must be > 0"):
+            _StepIndexWriter(
+                dir_path="foo", output_format=JSONLFormat(), rows_per_shard=0
+            )
+        with self.assertRaisesRegex(ValueError, "max_pending_shards must be > 0"):
+            _StepIndexWriter(
+                dir_path="foo", output_format=JSONLFormat(), max_pending_shards=0
+            )
+
+    def test_npy_format_tensors(self) -> None:
+        data = NpyFormat().serialize([torch.ones(3), torch.zeros(3)])
+        with tempfile.NamedTemporaryFile(suffix=".npy") as f:
+            f.write(data)
+            f.flush()
+            np.testing.assert_array_equal(
+                np.load(f.name), np.array([[1, 1, 1], [0, 0, 0]], dtype=np.float32)
+            )
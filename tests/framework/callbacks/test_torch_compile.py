@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import torch
+from torchtnt.framework._test_utils import (
+    DummyAutoUnit,
+    DummyTrainUnit,
+    generate_random_dataloader,
+    get_dummy_train_state,
+)
+from torchtnt.framework.callbacks.torch_compile import TorchCompile
+from torchtnt.framework.fit import fit
+from torchtnt.framework.train import train
+from torchtnt.utils.prepare_module import TorchCompileParams
+from torchtnt.utils.timer import Timer
+
+
+class TorchCompileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        torch._dynamo.reset()
+
+    def test_shutdown_compile_workers(self) -> None:
+        unit = DummyTrainUnit(input_dim=2)
+        dataloader = generate_random_dataloader(4, 2, 1)
+        with patch(
+            "torchtnt.framework.callbacks.torch_compile.shutdown_compile_workers"
+        ) as shutdown_mock:
+            train(
+                unit,
+                dataloader,
+                max_epochs=1,
+                max_steps_per_epoch=3,
+                callbacks=[TorchCompile(2)],
+            )
+            shutdown_mock.assert_called_once()
+
+    def test_warmup(self) -> None:
+        unit = DummyAutoUnit(
+            module=torch.nn.Linear(2, 2),
+            torch_compile_params=TorchCompileParams(backend="aot_eager"),
+        )
+        weight = unit.module.weight.detach().clone()
+        metric_logger = MagicMock()
+        callback = TorchCompile(
+            warmup_batch=(torch.rand(1, 2), torch.zeros(1, dtype=torch.long)),
+            loggers=metric_logger,
+        )
+        state = get_dummy_train_state()
+        state._timer = Timer()
+
+        with patch(
+            "torchtnt.framework.callbacks.torch_compile.shutdown_compile_workers"
+        ) as shutdown_mock, patch(
+            "torchtnt.framework.callbacks.torch_compile.save_compile_cache"
+        ) as save_mock:
+            callback.on_train_start(state, unit)
+            # workers are shut down, and the cache saved, once warmed up
+            shutdown_mock.assert_called_once()
+            save_mock.assert_called_once()
+
+        self.assertIsNone(unit.module.weight.grad)
+        torch.testing.assert_close(unit.module.weight, weight)
+        self.assertIn("TorchCompile.warmup", state.timer.recorded_durations)
+        self.assertEqual(len(state.timer.recorded_durations["TorchCompile.compile"]), 1)
+        payload, step = metric_logger.log_dict.call_args.args
+        self.assertEqual(step, 0)
+        self.assertEqual(payload["compile/num_recompiles"], 0)
+        self.assertGreater(payload["compile/num_frames"], 0)
+
+    def test_recompiles(self) -> None:
+        unit = DummyAutoUnit(
+            module=torch.nn.Linear(2, 2),
+            torch_compile_params=TorchCompileParams(backend="eager"),
+        )
+        metric_logger = MagicMock()
+        # shapes are static, so a new batch size triggers a recompilation
+        dataloader = [
+            (torch.rand(batch_size, 2), torch.zeros(batch_size, dtype=torch.long))
+            for batch_size in (1, 1, 3)
+        ]
+        train(
+            unit,
+            dataloader,
+            max_epochs=1,
+            callbacks=[TorchCompile(loggers=metric_logger)],
+        )
+
+        logged = [call.args for call in metric_logger.log_dict.call_args_list]
+        self.assertEqual([step for _, step in logged], [1, 3])
+        self.assertEqual(logged[0][0]["compile/num_recompiles"], 0)
+        self.assertEqual(logged[1][0]["compile/num_recompiles"], 1)
+
+    def test_eval_compiles_are_not_recompiles(self) -> None:
+        unit = DummyAutoUnit(
+            module=torch.nn.Linear(2, 2),
+            torch_compile_params=TorchCompileParams(backend="eager"),
+        )
+        metric_logger = MagicMock()
+        dataloader = generate_random_dataloader(4, 2, 2)
+        with patch("torchtnt.framework.callbacks.torch_compile.logger") as logger_mock:
+            fit(
+                unit,
+                dataloader,
+                dataloader,
+                max_epochs=2,
+                callbacks=[TorchCompile(loggers=metric_logger)],
+            )
+
+        # the eval mode graphs compiled during the first evaluation are logged, but are not recompilations
+        logged = [call.args for call in metric_logger.log_dict.call_args_list]
+        self.assertGreater(len(logged), 1)
+        self.assertTrue(
+            all(payload["compile/num_recompiles"] == 0 for payload, _ in logged)
+        )
+        logger_mock.warning.assert_not_called()
+
+    def test_warmup_requires_auto_unit(self) -> None:
+        unit = DummyTrainUnit(input_dim=2)
+        callback = TorchCompile(warmup_batch=torch.rand(1, 2))
+        with self.assertRaisesRegex(RuntimeError, "AutoUnit"):
+            callback.on_train_start(get_dummy_train_state(), unit)
@@ -7,12 +7,14 @@
 
 # pyre-strict
 
+import gc
 import unittest
 from typing import Any, Dict
 from unittest.mock import patch
 
 import torch
 from torch import nn
+from torchtnt.framework import unit as unit_module
 from torchtnt.framework._test_utils import DummyAutoUnit
 from torchtnt.framework.unit import AppStateMixin
 from torchtnt.utils.env import init_from_env
@@ -200,6 +202,75 @@ class AppStateMixinTest(unittest.TestCase):
         self.assertTrue("grad_scaler_e" not in my_unit.tracked_misc_statefuls())
         self.assertTrue("grad_scaler_e" in my_unit.tracked_modules())
 
+    def test_attribute_classification(self) -> None:
+        """
+        Test that tracking is unchanged by the per-type classification cache
+        """
+
+        class DynamicStateful:
+            pass
+
+        my_unit = Dummy()
+        # pyre-fixme[16]: `Dummy` has no attribute `flag`.
+        my_unit.flag = True
+        my_unit.module_b = nn.Linear(1, 1)
+        my_unit.module_c = nn.Linear(1, 1)
+        self.assertNotIn("flag", my_unit.app_state())
+        self.assertIn("module_b", my_unit.tracked_modules())
+        self.assertIn("module_c", my_unit.tracked_modules())
+
+        # objects satisfying the Stateful protocol through instance attributes
+        untracked = DynamicStateful()
+        stateful = DynamicStateful()
+        # pyre-fixme[16]: `DynamicStateful` has no attribute `state_dict`.
+        stateful.state_dict = lambda: {}
+        # pyre-fixme[16]: `DynamicStateful` has no attribute `load_state_dict`.
+        stateful.load_state_dict = lambda sd: None
+        my_unit.untracked = untracked
+        my_unit.stateful = stateful
+        self.assertNotIn("untracked", my_unit.tracked_misc_statefuls())
+        self.assertIs(my_unit.tracked_misc_statefuls()["stateful"], stateful)
+
+        # the classification cache does not keep classes alive
+        del untracked, stateful, DynamicStateful
+        my_unit.untracked = None
+        del my_unit.stateful
+        gc.collect()
+        self.assertNotIn(
+            "DynamicStateful",
+            [cls.__name__ for cls in unit_module._TRACKED_DICT_NAME_BY_TYPE],
+        )
+
+    def test_tracked_attribute_access(self) -> None:
+        """
+        Test reading tracked attributes after reassigning them
+        """
+
+        my_unit = Dummy()
+        other_unit = Dummy()
+        module = nn.Linear(1, 1)
+        my_unit.module_a = module
+        self.assertIs(my_unit.module_a, module)
+        self.assertIsNot(other_unit.module_a, module)
+        # the unit's class is left untouched
+        self.assertNotIn("module_a", vars(Dummy))
+
+        # plain attributes take precedence over tracked objects, as before
+        # pyre-fixme[8]: Attribute has type `Linear`; used as `int`.
+        my_unit.module_a = 1
+        self.assertEqual(my_unit.module_a, 1)
+
+        del my_unit.loss_fn_b
+        self.assertFalse(hasattr(my_unit, "loss_fn_b"))
+        self.assertTrue(hasattr(other_unit, "loss_fn_b"))
+        with self.assertRaises(AttributeError):
+            my_unit.loss_fn_b
+
+        # objects added to the tracked dicts directly are still accessible
+        my_unit.tracked_modules()["module_d"] = module
+        # pyre-fixme[16]: `Dummy` has no attribute `module_d`.
+        self.assertIs(my_unit.module_d, module)
+
     def test_app_state_overload(self) -> None:
         class Override(AppStateMixin):
             def __init__(self) -> None:
@@ -7,11 +7,13 @@
 
 # pyre-strict
 
+import copy
 import unittest
-from typing import Any, Literal, Optional, Tuple, TypeVar
+from typing import Any, Iterable, Iterator, List, Literal, Optional, Tuple, TypeVar
 from unittest.mock import MagicMock, Mock, patch
 
 import torch
+import torch.distributed as dist
 from pyre_extensions import none_throws, ParameterSpecification as ParamSpec
 from torch import nn
 from torch.distributed import GradBucket
@@ -24,11 +26,15 @@ from torchtnt.framework._test_utils import (
 from torchtnt.framework.auto_unit import (
     AutoPredictUnit,
     AutoUnit,
+    EvalCacheParams,
+    GradNormParams,
+    MicroBatchParams,
     SWALRParams,
     SWAParams,
     TrainStepResults,
 )
 from torchtnt.framework.evaluate import evaluate
+from torchtnt.framework.fit import fit
 from torchtnt.framework.predict import predict
 from torchtnt.framework.state import ActivePhase, State
 from torchtnt.framework.train import train
@@ -241,6 +247,36 @@ class TestAutoUnit(unittest.TestCase):
             # 1 warmup + epoch 2 + epoch 3 = 2
             self.assertEqual(update_swa_mock.call_count, 2)
 
+    @unittest.skipUnless(
+        _AVERAGED_MODEL_AVAIL, "AveragedModel needed in version of Pytorch"
+    )
+    def test_stochastic_weight_averaging_cpu_offload(self) -> None:
+        """
+        e2e stochastic weight averaging test with the averaged model offloaded to CPU
+        """
+        my_module = torch.nn.Linear(2, 2)
+        auto_unit = DummyAutoUnit(
+            module=my_module,
+            step_lr_interval="step",
+            swa_params=SWAParams(
+                warmup_steps_or_epochs=1,
+                step_or_epoch_update_freq=1,
+                averaging_method="ema",
+                cpu_offload=True,
+            ),
+        )
+        swa_model = auto_unit.swa_model
+        self.assertIsNotNone(swa_model)
+
+        dataloader = generate_random_dataloader(8, 2, 1)
+        train(auto_unit, dataloader, max_epochs=1, max_steps_per_epoch=4)
+
+        state_dict = auto_unit.app_state()["swa_model"].state_dict()
+        # 1 warmup + 3 updates
+        self.assertEqual(state_dict["n_averaged"].item(), 3)
+        for value in state_dict.values():
+            self.assertEqual(value.device.type, "cpu")
+
     def test_move_data_to_device(self) -> None:
         """
         Test that move_data_to_device is called
@@ -517,6 +553,320 @@ class TestAutoUnit(unittest.TestCase):
         train(my_unit, dataloader, max_epochs=1, max_steps_per_epoch=4)
         self.assertFalse(my_unit._is_last_batch)
 
+    def test_eval_cache(self) -> None:
+        """
+        Test that eval batches are replayed from the cache after the first eval pass
+        """
+        input_dim = 2
+        batch_size = 2
+        max_epochs = 3
+
+        train_dataloader = generate_random_dataloader(8, input_dim, batch_size)
+        eval_dataloader = _CountingIterable(
+            generate_random_dataloader(6, input_dim, batch_size)
+        )
+        my_unit = DummyAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            eval_cache_params=EvalCacheParams(),
+        )
+        timer = Timer()
+        fit(
+            my_unit,
+            train_dataloader=train_dataloader,
+            eval_dataloader=eval_dataloader,
+            max_epochs=max_epochs,
+            timer=timer,
+        )
+
+        self.assertEqual(my_unit.eval_progress.num_epochs_completed, max_epochs)
+        self.assertEqual(my_unit.eval_progress.num_steps_completed, 3 * max_epochs)
+        # the dataloader is only read during the first eval pass
+        self.assertEqual(eval_dataloader.num_iters, 1)
+        self.assertEqual(eval_dataloader.num_batches_yielded, 3)
+        self.assertEqual(
+            len(timer.recorded_durations["DummyAutoUnit.eval_cache_replay"]),
+            3 * (max_epochs - 1),
+        )
+
+    def test_eval_cache_spill_to_host(self) -> None:
+        """
+        Test that batches exceeding the device budget are spilled to host memory and still replayed
+        """
+        input_dim = 2
+        batch_size = 2
+        # each batch is 2 * 2 float32 inputs and 2 int64 targets = 32 bytes
+        batch_bytes = 32
+
+        eval_dataloader = _CountingIterable(
+            generate_random_dataloader(6, input_dim, batch_size)
+        )
+        my_unit = DummyAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            eval_cache_params=EvalCacheParams(
+                max_device_bytes=batch_bytes, max_host_bytes=2 * batch_bytes
+            ),
+        )
+        evaluate(my_unit, eval_dataloader)
+        evaluate(my_unit, eval_dataloader)
+
+        self.assertEqual(my_unit.eval_progress.num_steps_completed, 6)
+        self.assertEqual(eval_dataloader.num_batches_yielded, 3)
+        eval_cache = none_throws(my_unit._eval_cache)
+        self.assertEqual(
+            [spilled for _, spilled in eval_cache._batches], [False, True, True]
+        )
+
+    def test_eval_cache_over_budget(self) -> None:
+        """
+        Test that caching is disabled when the eval set does not fit in the memory budget
+        """
+        input_dim = 2
+        batch_size = 2
+
+        eval_dataloader = _CountingIterable(
+            generate_random_dataloader(6, input_dim, batch_size)
+        )
+        my_unit = DummyAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            eval_cache_params=EvalCacheParams(max_device_bytes=32),
+        )
+        evaluate(my_unit, eval_dataloader)
+        evaluate(my_unit, eval_dataloader)
+
+        self.assertEqual(my_unit.eval_progress.num_steps_completed, 6)
+        self.assertEqual(eval_dataloader.num_batches_yielded, 6)
+        self.assertEqual(len(none_throws(my_unit._eval_cache)._batches), 0)
+
+    def test_eval_cache_invalidated_on_dataloader_change(self) -> None:
+        """
+        Test that the eval cache is invalidated when a different eval dataloader is used
+        """
+        input_dim = 2
+        batch_size = 2
+
+        first_dataloader = _CountingIterable(
+            generate_random_dataloader(6, input_dim, batch_size)
+        )
+        second_dataloader = _CountingIterable(
+            generate_random_dataloader(4, input_dim, batch_size)
+        )
+        my_unit = DummyAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            eval_cache_params=EvalCacheParams(),
+        )
+        evaluate(my_unit, first_dataloader)
+        evaluate(my_unit, second_dataloader)
+        evaluate(my_unit, second_dataloader)
+
+        self.assertEqual(my_unit.eval_progress.num_steps_completed, 7)
+        self.assertEqual(first_dataloader.num_batches_yielded, 3)
+        self.assertEqual(second_dataloader.num_batches_yielded, 2)
+        self.assertEqual(second_dataloader.num_iters, 1)
+
+        # changing max_steps_per_epoch also invalidates the cache
+        # (two batches are drawn since the next batch is prefetched)
+        evaluate(my_unit, second_dataloader, max_steps_per_epoch=1)
+        self.assertEqual(second_dataloader.num_batches_yielded, 4)
+
+    def test_micro_batching_oom(self) -> None:
+        """
+        Test that the number of micro-batches grows after running out of memory, and is checkpointed
+        """
+        input_dim = 2
+        batch_size = 8
+
+        dataloader = generate_random_dataloader(16, input_dim, batch_size)
+        my_unit = OOMAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            max_rows=2,
+            micro_batch_params=MicroBatchParams(),
+        )
+        train(my_unit, dataloader, max_epochs=1)
+
+        self.assertEqual(my_unit.train_progress.num_steps_completed, 2)
+        self.assertEqual(none_throws(my_unit.micro_batch_state).num_micro_batches, 4)
+        # the first step fails with 1 and 2 micro-batches before succeeding with 4
+        self.assertEqual(my_unit.num_chunks_seen, [8, 4] + [2] * 8)
+        self.assertEqual(
+            my_unit.tracked_misc_statefuls()["micro_batch_state"].state_dict(),
+            {"num_micro_batches": 4},
+        )
+
+        # a restarted unit starts from the checkpointed number of micro-batches
+        restarted_unit = OOMAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            max_rows=2,
+            micro_batch_params=MicroBatchParams(),
+        )
+        none_throws(restarted_unit.micro_batch_state).load_state_dict(
+            {"num_micro_batches": 4}
+        )
+        train(restarted_unit, dataloader, max_epochs=1)
+        self.assertEqual(restarted_unit.num_chunks_seen, [2] * 8)
+
+    def test_micro_batching_matches_full_batch(self) -> None:
+        """
+        Test that gradients and outputs of a micro-batched step match a step on the full batch
+        """
+        input_dim = 2
+        batch_size = 6
+        module = torch.nn.Linear(input_dim, 2)
+        inputs = torch.rand(batch_size, input_dim)
+        targets = torch.randint(0, 2, (batch_size,))
+        state = get_dummy_train_state()
+
+        full_unit = DummyAutoUnit(module=copy.deepcopy(module))
+        full_loss, full_outputs = full_unit._forward_backward(
+            state, (inputs, targets), sync_grads=True
+        )
+        micro_unit = DummyAutoUnit(
+            module=copy.deepcopy(module),
+            micro_batch_params=MicroBatchParams(initial_num_micro_batches=4),
+        )
+        micro_loss, micro_outputs = micro_unit._micro_batched_forward_backward(
+            state, (inputs, targets), should_update_weights=True
+        )
+
+        torch.testing.assert_close(micro_loss, full_loss.detach())
+        torch.testing.assert_close(micro_outputs, full_outputs)
+        for full_param, micro_param in zip(
+            full_unit.module.parameters(), micro_unit.module.parameters()
+        ):
+            torch.testing.assert_close(micro_param.grad, full_param.grad)
+
+    def test_micro_batching_max_num_micro_batches(self) -> None:
+        """
+        Test that the out of memory error is raised once the maximum number of micro-batches is reached
+        """
+        input_dim = 2
+        my_unit = OOMAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            max_rows=1,
+            micro_batch_params=MicroBatchParams(max_num_micro_batches=4),
+        )
+        dataloader = generate_random_dataloader(8, input_dim, 8)
+        with self.assertRaisesRegex(RuntimeError, "DefaultCPUAllocator"):
+            train(my_unit, dataloader, max_epochs=1)
+        self.assertEqual(none_throws(my_unit.micro_batch_state).num_micro_batches, 4)
+
+    @skip_if_not_distributed
+    def test_micro_batching_oom_on_one_rank(self) -> None:
+        """
+        Test that all ranks retry a step with more micro-batches when only one of them runs out of memory
+        """
+        spawn_multi_process(2, "gloo", self._test_micro_batching_oom_on_one_rank)
+
+    @staticmethod
+    def _test_micro_batching_oom_on_one_rank() -> None:
+        input_dim = 2
+        rank = dist.get_rank()
+        my_unit = OOMAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            # only rank 0 runs out of memory, with more than 2 rows
+            max_rows=2 if rank == 0 else 8,
+            micro_batch_params=MicroBatchParams(),
+            strategy="ddp",
+        )
+        dataloader = generate_random_dataloader(16, input_dim, 8)
+        train(my_unit, dataloader, max_epochs=1)
+
+        tc = unittest.TestCase()
+        tc.assertEqual(my_unit.train_progress.num_steps_completed, 2)
+        tc.assertEqual(none_throws(my_unit.micro_batch_state).num_micro_batches, 4)
+        # rank 1 never runs out of memory, but abandons its attempts before the backward pass of their last chunk and
+        # retries along with rank 0, which skips the chunks following the one that ran out of memory
+        tc.assertEqual(
+            my_unit.num_chunks_seen, ([8, 4] if rank == 0 else [8, 4, 4]) + [2] * 8
+        )
+
+        # the retried steps leave the replicas in sync
+        for param in my_unit.module.parameters():
+            gathered = [torch.zeros_like(param) for _ in range(2)]
+            dist.all_gather(gathered, param.detach())
+            torch.testing.assert_close(gathered[0], gathered[1])
+
+    @skip_if_not_distributed
+    def test_micro_batching_single_sync_per_step(self) -> None:
+        """
+        Test that ranks which do not run out of memory agree on micro-batching with a single all-reduce per step
+        """
+        spawn_multi_process(2, "gloo", self._test_micro_batching_single_sync_per_step)
+
+    @staticmethod
+    def _test_micro_batching_single_sync_per_step() -> None:
+        input_dim = 2
+        my_unit = OOMAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            max_rows=8,
+            micro_batch_params=MicroBatchParams(initial_num_micro_batches=2),
+            strategy="ddp",
+        )
+        dataloader = generate_random_dataloader(16, input_dim, 8)
+        with patch(
+            "torchtnt.framework.auto_unit.dist.all_reduce",
+            wraps=dist.all_reduce,
+        ) as all_reduce_mock:
+            train(my_unit, dataloader, max_epochs=1)
+
+        tc = unittest.TestCase()
+        tc.assertEqual(my_unit.train_progress.num_steps_completed, 2)
+        tc.assertEqual(all_reduce_mock.call_count, 2)
+
+    def test_grad_norm_params_clipping(self) -> None:
+        """
+        Test that fused gradient norms give the same updates and norms as clip_grad_norm_
+        """
+        input_dim = 2
+        module = torch.nn.Linear(input_dim, 2)
+        dataloader = generate_random_dataloader(8, input_dim, 2)
+
+        default_unit = ResultsAutoUnit(module=copy.deepcopy(module), clip_grad_norm=0.1)
+        train(default_unit, dataloader, max_epochs=1)
+        fused_unit = ResultsAutoUnit(
+            module=copy.deepcopy(module),
+            clip_grad_norm=0.1,
+            grad_norm_params=GradNormParams(log_every_n_steps=100),
+        )
+        train(fused_unit, dataloader, max_epochs=1)
+
+        # norms are needed for clipping, so they are computed every step
+        self.assertEqual(len(fused_unit.results), 4)
+        for default_results, fused_results in zip(
+            default_unit.results, fused_unit.results
+        ):
+            torch.testing.assert_close(
+                fused_results.total_grad_norm, default_results.total_grad_norm
+            )
+            self.assertEqual(
+                list(none_throws(fused_results.param_group_grad_norms)), ["pg:0"]
+            )
+        for param, fused_param in zip(
+            default_unit.module.parameters(), fused_unit.module.parameters()
+        ):
+            torch.testing.assert_close(fused_param, param)
+
+    def test_grad_norm_params_log_every_n_steps(self) -> None:
+        """
+        Test that gradient norms are only computed every n steps when not clipping
+        """
+        input_dim = 2
+        my_unit = ResultsAutoUnit(
+            module=torch.nn.Linear(input_dim, 2),
+            grad_norm_params=GradNormParams(log_every_n_steps=4),
+            gradient_accumulation_steps=2,
+        )
+        dataloader = generate_random_dataloader(16, input_dim, 2)
+        train(my_unit, dataloader, max_epochs=1)
+
+        self.assertEqual(
+            [results.total_grad_norm is not None for results in my_unit.results],
+            [False, False, False, True, False, False, False, True],
+        )
+        self.assertEqual(
+            [results.param_group_grad_norms is not None for results in my_unit.results],
+            [False, False, False, True, False, False, False, True],
+        )
+
     def test_auto_unit_timing_train(self) -> None:
         """
         Test auto timing in AutoUnit for training
@@ -863,6 +1213,24 @@ class TestAutoUnit(unittest.TestCase):
 Batch = Tuple[torch.Tensor, torch.Tensor]
 
 
+class _CountingIterable(Iterable[Batch]):
+    """Wraps a dataloader and counts how many iterators were created and batches were drawn from it"""
+
+    def __init__(self, dataloader: Iterable[Batch]) -> None:
+        self.dataloader = dataloader
+        self.num_iters = 0
+        self.num_batches_yielded = 0
+
+    def __iter__(self) -> Iterator[Batch]:
+        self.num_iters += 1
+        return self._iter()
+
+    def _iter(self) -> Iterator[Batch]:
+        for batch in self.dataloader:
+            self.num_batches_yielded += 1
+            yield batch
+
+
 class DummyLRSchedulerAutoUnit(AutoUnit[Batch]):
     def __init__(
         self,
@@ -910,6 +1278,58 @@ class DummyComplexAutoUnit(AutoUnit[Batch]):
         return my_optimizer, my_lr_scheduler
 
 
+class OOMAutoUnit(AutoUnit[Batch]):
+    """Raises a CPU out of memory error when a batch has more than ``max_rows`` rows"""
+
+    def __init__(
+        self,
+        module: torch.nn.Module,
+        max_rows: int,
+        micro_batch_params: MicroBatchParams,
+        strategy: Optional[str] = None,
+    ) -> None:
+        super().__init__(
+            module=module, micro_batch_params=micro_batch_params, strategy=strategy
+        )
+        self.max_rows = max_rows
+        self.num_chunks_seen: List[int] = []
+
+    def compute_loss(
+        self, state: State, data: Batch
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        inputs, targets = data
+        self.num_chunks_seen.append(inputs.size(0))
+        if inputs.size(0) > self.max_rows:
+            raise RuntimeError(
+                "[enforce fail at alloc_cpu.cpp:83] err == 0. DefaultCPUAllocator: can't allocate memory: you tried to allocate 1024 bytes."
+            )
+        outputs = self.module(inputs)
+        loss = torch.nn.functional.cross_entropy(outputs, targets)
+
+        return loss, outputs
+
+    def configure_optimizers_and_lr_scheduler(
+        self, module: torch.nn.Module
+    ) -> Tuple[torch.optim.Optimizer, TLRScheduler]:
+        my_optimizer = torch.optim.SGD(module.parameters(), lr=0.01)
+        my_lr_scheduler = MagicMock()
+        return my_optimizer, my_lr_scheduler
+
+
+class ResultsAutoUnit(DummyAutoUnit):
+    """Records the results of every train step"""
+
+    # pyre-ignore[2]: Parameter must be annotated.
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.results: List[TrainStepResults] = []
+
+    def on_train_step_end(
+        self, state: State, data: Batch, step: int, results: TrainStepResults
+    ) -> None:
+        self.results.append(results)
+
+
 class LastBatchAutoUnit(AutoUnit[Batch]):
     def __init__(self, module: torch.nn.Module, expected_steps_per_epoch: int) -> None:
         super().__init__(module=module)
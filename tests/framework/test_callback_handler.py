@@ -7,17 +7,26 @@
 
 # pyre-strict
 
+import threading
 import unittest
-from typing import Set, Union
+from typing import List, Set, Tuple, Union
 from unittest.mock import MagicMock
 
+from pyre_extensions import none_throws
+
 from torchtnt.framework._callback_handler import (
     _get_implemented_callback_mapping,
     CallbackHandler,
 )
+from torchtnt.framework._test_utils import (
+    DummyTrainUnit,
+    generate_random_dataloader,
+    get_dummy_train_state,
+)
 from torchtnt.framework.callback import Callback
 from torchtnt.framework.callbacks.lambda_callback import Lambda
 from torchtnt.framework.state import EntryPoint, State
+from torchtnt.framework.train import train
 from torchtnt.framework.unit import (
     TEvalUnit,
     TPredictUnit,
@@ -372,3 +381,70 @@ class CallbackHandlerTest(unittest.TestCase):
                 "on_train_end": [first_callback, second_callback],
             },
         )
+
+    def test_async_callback(self) -> None:
+        class AsyncCallback(Callback):
+            run_async = True
+
+            def __init__(self) -> None:
+                self.steps: List[Tuple[int, str]] = []
+
+            def on_train_step_end(self, state: State, unit: TTrainUnit) -> None:
+                self.steps.append(
+                    (
+                        unit.train_progress.num_steps_completed,
+                        threading.current_thread().name,
+                    )
+                )
+
+        callback = AsyncCallback()
+        unit = DummyTrainUnit(input_dim=2)
+        train(
+            unit,
+            generate_random_dataloader(10, 2, 2),
+            max_epochs=2,
+            callbacks=[callback],
+        )
+
+        # all hooks ran in order on the worker, with the progress at the time of the hook
+        self.assertEqual([step for step, _ in callback.steps], list(range(1, 11)))
+        for _, thread_name in callback.steps:
+            self.assertTrue(thread_name.startswith("tnt_async_callbacks"))
+
+    def test_async_callback_exception(self) -> None:
+        class FailingAsyncCallback(Callback):
+            run_async = True
+
+            def on_train_step_end(self, state: State, unit: TTrainUnit) -> None:
+                if unit.train_progress.num_steps_completed == 2:
+                    raise RuntimeError("async callback failed")
+
+        dummy_callback = DummyCallback()
+        with self.assertRaisesRegex(RuntimeError, "async callback failed"):
+            train(
+                DummyTrainUnit(input_dim=2),
+                generate_random_dataloader(10, 2, 2),
+                max_epochs=1,
+                callbacks=[FailingAsyncCallback(), dummy_callback],
+            )
+        self.assertIn("on_exception", dummy_callback.called_hooks)
+
+    def test_async_callback_exception_raised_at_next_hook(self) -> None:
+        class FailingAsyncCallback(Callback):
+            run_async = True
+
+            def on_train_start(self, state: State, unit: TTrainUnit) -> None:
+                raise RuntimeError("async callback failed")
+
+        callback_handler = CallbackHandler([FailingAsyncCallback()])
+        state = get_dummy_train_state()
+        unit = DummyTrainUnit(input_dim=2)
+        callback_handler.on_train_start(state, unit)
+        worker = none_throws(callback_handler._async_worker)
+        # wait for the hook to fail on the worker
+        worker._pending[0].exception()
+
+        # no async callback implements this hook, but the error is raised nonetheless
+        with self.assertRaisesRegex(RuntimeError, "async callback failed"):
+            callback_handler.on_train_epoch_start(state, unit)
+        worker.drain()
@@ -8,8 +8,9 @@
 # pyre-strict
 
 import math
+import threading
 import unittest
-from typing import Tuple
+from typing import Iterable, Iterator, List, Tuple
 from unittest.mock import MagicMock, patch
 
 import torch
@@ -128,6 +129,39 @@ class FitTest(unittest.TestCase):
         )
         self.assertFalse(my_unit.eval_progress.eval_pending)
 
+    def test_fit_steps_per_loop_evaluate_every_n_steps(self) -> None:
+        """
+        Test that evaluate_every_n_steps is exact when running multiple steps per loop iteration
+        """
+        input_dim = 2
+        batch_size = 2
+        train_dataloader = generate_random_dataloader(16, input_dim, batch_size)
+        eval_dataloader = generate_random_dataloader(6, input_dim, batch_size)
+
+        class EvalStartRecorder(Callback):
+            def __init__(self) -> None:
+                self.train_steps_at_eval: List[int] = []
+
+            def on_eval_start(self, state: State, unit: TTrainUnit) -> None:
+                self.train_steps_at_eval.append(unit.train_progress.num_steps_completed)
+
+        recorder = EvalStartRecorder()
+        my_unit = DummyFitUnit(input_dim=input_dim)
+        fit(
+            my_unit,
+            train_dataloader=train_dataloader,
+            eval_dataloader=eval_dataloader,
+            max_epochs=2,
+            evaluate_every_n_epochs=None,
+            evaluate_every_n_steps=5,
+            callbacks=[recorder],
+            steps_per_loop=3,
+        )
+
+        self.assertEqual(my_unit.train_progress.num_steps_completed, 16)
+        self.assertEqual(recorder.train_steps_at_eval, [5, 10, 15])
+        self.assertEqual(my_unit.eval_progress.num_steps_completed, 9)
+
     def test_fit_resume_pending_eval_runs_eval_before_train_done_check(self) -> None:
         input_dim = 2
         train_dataset_len = 8
@@ -438,6 +472,61 @@ class FitTest(unittest.TestCase):
         self.assertIn("train.next(data_iter)", timer.recorded_durations.keys())
         self.assertIn("evaluate.next(data_iter)", timer.recorded_durations.keys())
 
+    def test_fit_prefetch_eval_dataloader_iter(self) -> None:
+        """
+        Test that eval iterators are created in the background during fit when enabled
+        """
+
+        class IterThreadRecorder(Iterable[object]):
+            def __init__(self, dataloader: Iterable[object]) -> None:
+                self.dataloader = dataloader
+                self.iter_thread_names: List[str] = []
+
+            def __iter__(self) -> Iterator[object]:
+                self.iter_thread_names.append(threading.current_thread().name)
+                return iter(self.dataloader)
+
+        input_dim = 2
+        batch_size = 2
+        max_epochs = 3
+        evaluate_every_n_steps = 5
+        train_dataloader = generate_random_dataloader(16, input_dim, batch_size)
+        eval_dataloader = IterThreadRecorder(
+            generate_random_dataloader(4, input_dim, batch_size)
+        )
+        expected_num_evaluate_calls = (16 // batch_size) * max_epochs // 5
+
+        my_unit = DummyFitUnit(input_dim=input_dim)
+        timer = Timer()
+        fit(
+            my_unit,
+            train_dataloader=train_dataloader,
+            eval_dataloader=eval_dataloader,
+            max_epochs=max_epochs,
+            evaluate_every_n_epochs=None,
+            evaluate_every_n_steps=evaluate_every_n_steps,
+            prefetch_eval_dataloader_iter=True,
+            timer=timer,
+        )
+
+        self.assertEqual(
+            my_unit.eval_progress.num_epochs_completed, expected_num_evaluate_calls
+        )
+        self.assertEqual(
+            my_unit.eval_progress.num_steps_completed, expected_num_evaluate_calls * 2
+        )
+        # all iterators are created off the trainer thread. The loop cannot know that the last
+        # eval at step 20 is the final one, so one extra iterator is prefetched and discarded.
+        self.assertEqual(
+            len(eval_dataloader.iter_thread_names), expected_num_evaluate_calls + 1
+        )
+        for thread_name in eval_dataloader.iter_thread_names:
+            self.assertTrue(thread_name.startswith("tnt_data_iter_prefetch"))
+        self.assertEqual(
+            len(timer.recorded_durations["evaluate.iter(dataloader)_overlapped"]),
+            expected_num_evaluate_calls,
+        )
+
     def test_error_message(self) -> None:
         self.maxDiff = None
         with self.assertRaises(ValueError), self.assertLogs(level="INFO") as log:
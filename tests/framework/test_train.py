@@ -7,13 +7,19 @@
 
 # pyre-strict
 
+import threading
 import unittest
-from typing import Any, Iterator, Mapping, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 from unittest.mock import MagicMock
 
 import torch
 from torch import nn
-from torchtnt.framework._test_utils import DummyTrainUnit, generate_random_dataloader
+from torch.utils.data import DataLoader, SequentialSampler
+from torchtnt.framework._test_utils import (
+    DummyTrainUnit,
+    generate_random_dataloader,
+    generate_random_dataset,
+)
 from torchtnt.framework.callback import Callback
 from torchtnt.framework.state import State
 from torchtnt.framework.train import train
@@ -269,6 +275,157 @@ class TrainTest(unittest.TestCase):
         )
         self.assertIn("train.next(data_iter)", timer.recorded_durations.keys())
 
+    def test_train_prefetch_dataloader_iter(self) -> None:
+        """
+        Test that the next epoch's iterator is created in the background with the next sampler epoch
+        """
+        input_dim = 2
+        batch_size = 2
+        max_epochs = 3
+        # 4 batches per epoch, truncated to 3
+        max_steps_per_epoch = 3
+        dataloader = _IterRecordingDataLoader(
+            generate_random_dataset(8, input_dim),
+            batch_size=batch_size,
+            sampler=_EpochSampler(8),
+        )
+
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        timer = Timer()
+        train(
+            my_unit,
+            dataloader,
+            max_epochs=max_epochs,
+            max_steps_per_epoch=max_steps_per_epoch,
+            timer=timer,
+            prefetch_train_dataloader_iter_steps=1,
+        )
+
+        self.assertEqual(my_unit.train_progress.num_epochs_completed, max_epochs)
+        self.assertEqual(
+            my_unit.train_progress.num_steps_completed, max_epochs * max_steps_per_epoch
+        )
+        # no iterator is prefetched after the last epoch
+        self.assertEqual([epoch for epoch, _ in dataloader.iter_calls], [0, 1, 2])
+        self.assertEqual(dataloader.iter_calls[0][1], threading.main_thread().name)
+        for _, thread_name in dataloader.iter_calls[1:]:
+            self.assertTrue(thread_name.startswith("tnt_data_iter_prefetch"))
+        self.assertEqual(
+            len(timer.recorded_durations["train.iter(dataloader)_overlapped"]), 2
+        )
+
+    def test_train_prefetch_dataloader_iter_unknown_length(self) -> None:
+        """
+        Test that no iterator is prefetched if the epoch length is unknown
+        """
+        dataloader = _IterRecordingIterable(
+            list(generate_random_dataloader(8, 2, batch_size=2))
+        )
+        my_unit = DummyTrainUnit(input_dim=2)
+        train(
+            my_unit,
+            dataloader,
+            max_epochs=2,
+            prefetch_train_dataloader_iter_steps=1,
+        )
+        self.assertEqual(my_unit.train_progress.num_steps_completed, 8)
+        self.assertEqual(
+            dataloader.iter_thread_names, [threading.main_thread().name] * 2
+        )
+
+    def test_train_prefetch_dataloader_iter_persistent_workers(self) -> None:
+        """
+        Test that no iterator is prefetched for dataloaders that reuse their iterator across epochs
+        """
+        input_dim = 2
+        max_epochs = 3
+        dataloader = _IterRecordingDataLoader(
+            generate_random_dataset(8, input_dim),
+            batch_size=2,
+            sampler=_EpochSampler(8),
+            num_workers=1,
+            persistent_workers=True,
+        )
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        with self.assertLogs(level="WARNING") as logs:
+            train(
+                my_unit,
+                dataloader,
+                max_epochs=max_epochs,
+                prefetch_train_dataloader_iter_steps=1,
+            )
+        self.assertIn("it uses persistent workers", logs.output[0])
+
+        # every epoch reads all of its batches
+        self.assertEqual(my_unit.train_progress.num_steps_completed, 4 * max_epochs)
+        self.assertEqual(
+            dataloader.iter_calls,
+            [(epoch, threading.main_thread().name) for epoch in range(max_epochs)],
+        )
+
+    def test_train_prefetch_dataloader_iter_stateful(self) -> None:
+        """
+        Test that no iterator is prefetched for stateful dataloaders
+        """
+        dataloader = _StatefulIterRecordingIterable(
+            list(generate_random_dataloader(8, 2, batch_size=2))
+        )
+        my_unit = DummyTrainUnit(input_dim=2)
+        with self.assertLogs(level="WARNING") as logs:
+            train(
+                my_unit,
+                dataloader,
+                max_epochs=2,
+                max_steps_per_epoch=4,
+                prefetch_train_dataloader_iter_steps=1,
+            )
+        self.assertIn("it is stateful", logs.output[0])
+        self.assertEqual(
+            dataloader.iter_thread_names, [threading.main_thread().name] * 2
+        )
+
+    def test_train_steps_per_loop(self) -> None:
+        """
+        Test train entry point with multiple steps per loop iteration
+        """
+        input_dim = 2
+        dataset_len = 20
+        batch_size = 2
+        max_epochs = 2
+        max_steps_per_epoch = 7
+
+        my_unit = DummyTrainUnit(input_dim=input_dim)
+        every_step_callback = _StepRecordingCallback()
+        cadence_callback = _StepRecordingCallback(step_hook_interval=2)
+
+        dataloader = generate_random_dataloader(dataset_len, input_dim, batch_size)
+        train(
+            my_unit,
+            dataloader,
+            max_epochs=max_epochs,
+            max_steps_per_epoch=max_steps_per_epoch,
+            callbacks=[every_step_callback, cadence_callback],
+            steps_per_loop=3,
+        )
+
+        self.assertEqual(my_unit.train_progress.num_epochs_completed, max_epochs)
+        self.assertEqual(
+            my_unit.train_progress.num_steps_completed,
+            max_epochs * max_steps_per_epoch,
+        )
+        self.assertEqual(every_step_callback.steps, list(range(1, 15)))
+        self.assertEqual(cadence_callback.steps, list(range(2, 15, 2)))
+
+    def test_train_steps_per_loop_stop(self) -> None:
+        """
+        Test that should_stop is honored within a loop iteration running multiple steps
+        """
+        my_unit = StopTrainUnit(input_dim=2, steps_before_stopping=5)
+        dataloader = generate_random_dataloader(20, 2, 2)
+        train(my_unit, dataloader, max_epochs=2, steps_per_loop=4)
+
+        self.assertEqual(my_unit.train_progress.num_steps_completed, 5)
+
     def test_error_message(self) -> None:
         with self.assertRaises(ValueError), self.assertLogs(level="INFO") as log:
             train(TrainUnitWithError(), [1, 2, 3, 4], max_steps=10)
@@ -283,6 +440,15 @@ class TrainTest(unittest.TestCase):
 Batch = Tuple[torch.Tensor, torch.Tensor]
 
 
+class _StepRecordingCallback(Callback):
+    def __init__(self, step_hook_interval: Optional[int] = None) -> None:
+        self.step_hook_interval = step_hook_interval
+        self.steps: List[int] = []
+
+    def on_train_step_end(self, state: State, unit: TTrainUnit) -> None:
+        self.steps.append(unit.train_progress.num_steps_completed)
+
+
 class StopTrainUnit(TrainUnit[Batch]):
     def __init__(self, input_dim: int, steps_before_stopping: int) -> None:
         super().__init__()
@@ -324,3 +490,44 @@ class TrainUnitWithError(TrainUnit[Batch]):
 
 # pyrefly: ignore [redefinition]
 Batch = Tuple[torch.Tensor, torch.Tensor]
+
+
+class _EpochSampler(SequentialSampler):
+    def __init__(self, num_samples: int) -> None:
+        super().__init__(range(num_samples))
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+
+class _IterRecordingDataLoader(DataLoader):
+    """Records the sampler epoch and the thread on which each iterator was created"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.iter_calls: List[Tuple[int, str]] = []
+
+    def __iter__(self) -> Iterator[Any]:
+        self.iter_calls.append(
+            (self.sampler.epoch, threading.current_thread().name)  # pyre-ignore
+        )
+        return super().__iter__()
+
+
+class _IterRecordingIterable:
+    def __init__(self, data: List[Any]) -> None:
+        self.data = data
+        self.iter_thread_names: List[str] = []
+
+    def __iter__(self) -> Iterator[Any]:
+        self.iter_thread_names.append(threading.current_thread().name)
+        return iter(self.data)
+
+
+class _StatefulIterRecordingIterable(_IterRecordingIterable):
+    def state_dict(self) -> Dict[str, Any]:
+        return {}
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        pass
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import unittest
+from typing import Any, Dict, Tuple
+
+import torch
+from torchtnt.framework.auto_unit import AutoUnit
+from torchtnt.framework.state import State
+from torchtnt.framework.train import train
+from torchtnt.utils.data.shape_bucketing import (
+    power_of_two_buckets,
+    quantile_buckets,
+    ShapeBucketer,
+)
+from torchtnt.utils.lr_scheduler import TLRScheduler
+
+
+class BucketedAutoUnit(AutoUnit[Dict[str, torch.Tensor]]):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.shapes = []
+
+    def compute_loss(
+        self, state: State, data: Dict[str, torch.Tensor]
+    ) -> Tuple[torch.Tensor, object]:
+        self.shapes.append(tuple(data["inputs"].shape))
+        outputs = self.module(data["inputs"]).squeeze(-1)
+        mask = data["padding_mask"]
+        loss = ((outputs - data["targets"]) ** 2 * mask).sum() / mask.sum()
+        return loss, outputs
+
+    def configure_optimizers_and_lr_scheduler(
+        self, module: torch.nn.Module
+    ) -> Tuple[torch.optim.Optimizer, TLRScheduler]:
+        optimizer = torch.optim.SGD(module.parameters(), lr=0.01)
+        return optimizer, torch.optim.lr_scheduler.ConstantLR(optimizer)
+
+
+class ShapeBucketingTest(unittest.TestCase):
+    def test_power_of_two_buckets(self) -> None:
+        self.assertEqual(power_of_two_buckets(100, 5), [8, 16, 32, 64, 100])
+        self.assertEqual(power_of_two_buckets(8), [1, 2, 4, 8])
+        with self.assertRaisesRegex(ValueError, "min_size"):
+            power_of_two_buckets(4, 8)
+
+    def test_quantile_buckets(self) -> None:
+        self.assertEqual(quantile_buckets(range(1, 9), 4), [2, 4, 6, 8])
+        self.assertEqual(quantile_buckets({10: 90, 50: 9, 100: 1}, 4), [10, 100])
+        with self.assertRaisesRegex(ValueError, "without observed sizes"):
+            quantile_buckets([], 4)
+
+    def test_pad_mapping_batch(self) -> None:
+        bucketer = ShapeBucketer(
+            [8, 16],
+            length_keys=["tokens", "labels"],
+            batch_size_buckets=[4],
+            pad_values={"labels": -100},
+        )
+        batch = bucketer(
+            {
+                "tokens": torch.ones(3, 5, dtype=torch.long),
+                "labels": torch.ones(3, 5),
+                "weights": torch.ones(3),
+                # has the size of the length in its second dimension, but is not declared as a sequence
+                "features": torch.ones(3, 5),
+                "scale": 2.0,
+            }
+        )
+        self.assertEqual(batch["tokens"].shape, (4, 8))
+        self.assertEqual(batch["features"].shape, (4, 5))
+        self.assertEqual(batch["tokens"].dtype, torch.long)
+        self.assertEqual(batch["labels"][0, 5:].tolist(), [-100] * 3)
+        self.assertEqual(batch["weights"].tolist(), [1, 1, 1, 0])
+        self.assertEqual(batch["scale"], 2.0)
+        mask = batch["padding_mask"]
+        self.assertEqual(mask.shape, (4, 8))
+        self.assertTrue(mask[:3, :5].all())
+        self.assertEqual(mask.sum(), 15)
+
+    def test_pad_overflow(self) -> None:
+        bucketer = ShapeBucketer([8, 16], length_keys=["inputs"])
+        batch, mask = bucketer.pad({"inputs": torch.ones(2, 20, 3)})
+        # batches longer than the largest bucket are not padded
+        self.assertEqual(batch["inputs"].shape, (2, 20, 3))
+        self.assertTrue(mask.all())
+        bucketer.pad({"inputs": torch.ones(2, 7, 3)})
+
+        stats = bucketer.stats()
+        self.assertEqual(stats["bucket_hit_rate"], 0.5)
+        self.assertEqual(stats["bucket_8_rate"], 0.5)
+        self.assertEqual(stats["num_shapes"], 2)
+
+    def test_invalid_batches(self) -> None:
+        with self.assertRaisesRegex(ValueError, "length_keys must be set"):
+            ShapeBucketer([8, 16])
+        bucketer = ShapeBucketer([8, 16], length_keys=["inputs"])
+        with self.assertRaisesRegex(ValueError, "expects mapping batches"):
+            bucketer.pad((torch.ones(2, 5),))
+        with self.assertRaisesRegex(ValueError, "to have length 5"):
+            bucketer.pad({"inputs": [torch.ones(2, 5), torch.ones(2, 6)]})
+        bucketer = ShapeBucketer(batch_size_buckets=[4])
+        with self.assertRaisesRegex(ValueError, "batch size 3"):
+            bucketer.pad({"inputs": torch.ones(3, 5), "vocab": torch.ones(10)})
+
+    def test_fit_quantile_buckets(self) -> None:
+        bucketer = ShapeBucketer(length_keys=["inputs"])
+        for length in (3, 5, 5, 9):
+            bucketer.pad({"inputs": torch.ones(1, length)})
+        self.assertEqual(bucketer.fit_quantile_buckets(2), [5, 9])
+        self.assertEqual(bucketer.stats()["num_shapes"], 0)
+
+        restored = ShapeBucketer()
+        restored.load_state_dict(bucketer.state_dict())
+        self.assertEqual(restored.length_buckets, [5, 9])
+        self.assertEqual(restored.length_counts, bucketer.length_counts)
+
+    def test_auto_unit(self) -> None:
+        unit = BucketedAutoUnit(
+            module=torch.nn.Linear(2, 1),
+            shape_bucketer=ShapeBucketer([4, 8], length_keys=["inputs", "targets"]),
+        )
+        dataloader = [
+            {"inputs": torch.rand(2, length, 2), "targets": torch.rand(2, length)}
+            for length in (1, 3, 5, 7)
+        ]
+        train(unit, dataloader, max_epochs=1)
+        self.assertEqual(unit.shapes, [(2, 4, 2), (2, 4, 2), (2, 8, 2), (2, 8, 2)])
+        self.assertIn("shape_bucketer", unit.app_state())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import tempfile
+import unittest
+from typing import Any, Tuple
+from unittest.mock import MagicMock
+
+import torch
+from torch.utils.data import TensorDataset
+from torchtnt.utils.batch_size_finder import _make_batch, find_batch_size
+
+_INPUT_DIM = 16
+
+
+def _compute_loss(
+    module: torch.nn.Module, batch: Tuple[torch.Tensor, torch.Tensor]
+) -> torch.Tensor:
+    inputs, targets = batch
+    return torch.nn.functional.cross_entropy(module(inputs), targets)
+
+
+def _sample_batch(batch_size: int = 2) -> Tuple[torch.Tensor, torch.Tensor]:
+    return torch.rand(batch_size, _INPUT_DIM), torch.randint(0, 2, (batch_size,))
+
+
+class BatchSizeFinderTest(unittest.TestCase):
+    def test_binsearch_memory_ceiling(self) -> None:
+        result = find_batch_size(
+            _sample_batch(),
+            module=torch.nn.Linear(_INPUT_DIM, 2),
+            compute_loss=_compute_loss,
+            max_memory_bytes=10_000,
+        )
+
+        probes = {probe.batch_size: probe for probe in result.probes}
+        self.assertTrue(probes[result.max_batch_size].fits)
+        self.assertFalse(probes[result.max_batch_size + 1].fits)
+        self.assertEqual([probe.batch_size for probe in result.probes[:3]], [1, 2, 4])
+        self.assertLess(result.max_batch_size, 1024)
+        self.assertTrue(probes[result.best_throughput_batch_size].fits)
+        for probe in result.probes:
+            self.assertEqual(probe.samples_per_sec is not None, probe.fits)
+
+    def test_power_search(self) -> None:
+        result = find_batch_size(
+            _sample_batch(),
+            module=torch.nn.Linear(_INPUT_DIM, 2),
+            compute_loss=_compute_loss,
+            init_batch_size=3,
+            search_mode="power",
+            max_memory_bytes=10_000,
+        )
+        *fitting, last = result.probes
+        self.assertEqual(
+            [probe.batch_size for probe in result.probes],
+            [3 * 2**i for i in range(len(result.probes))],
+        )
+        self.assertTrue(all(probe.fits for probe in fitting))
+        self.assertFalse(last.fits)
+        self.assertEqual(result.max_batch_size, fitting[-1].batch_size)
+
+    def test_max_batch_size(self) -> None:
+        step_fn = MagicMock()
+        result = find_batch_size(
+            TensorDataset(*_sample_batch(5)),
+            step_fn=step_fn,
+            max_batch_size=6,
+            num_warmup_steps=0,
+            num_timed_steps=1,
+        )
+        self.assertEqual(result.max_batch_size, 6)
+        self.assertEqual([probe.batch_size for probe in result.probes], [1, 2, 4, 6])
+        # dataset items are collated, wrapping around the dataset
+        inputs, _ = step_fn.call_args.args[0]
+        self.assertEqual(inputs.shape, (6, _INPUT_DIM))
+
+    def test_init_batch_size_does_not_fit(self) -> None:
+        def step_fn(batch: Any) -> None:
+            raise RuntimeError("DefaultCPUAllocator: can't allocate memory")
+
+        with self.assertRaisesRegex(RuntimeError, "initial batch size 4"):
+            find_batch_size(_sample_batch(), step_fn=step_fn, init_batch_size=4)
+
+    def test_other_errors_are_raised(self) -> None:
+        def step_fn(batch: Any) -> None:
+            raise RuntimeError("foo")
+
+        with self.assertRaisesRegex(RuntimeError, "foo"):
+            find_batch_size(_sample_batch(), step_fn=step_fn)
+
+    def test_cache(self) -> None:
+        module = torch.nn.Linear(_INPUT_DIM, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = find_batch_size(
+                _sample_batch(),
+                module=module,
+                compute_loss=_compute_loss,
+                max_memory_bytes=10_000,
+                cache_dir=temp_dir,
+            )
+
+            step_fn = MagicMock()
+            cached = find_batch_size(
+                _sample_batch(),
+                step_fn=step_fn,
+                module=module,
+                max_memory_bytes=10_000,
+                cache_dir=temp_dir,
+            )
+            step_fn.assert_not_called()
+            self.assertEqual(cached, result)
+
+            # a different precision is cached separately
+            find_batch_size(
+                _sample_batch(),
+                step_fn=step_fn,
+                module=module,
+                precision="bf16",
+                max_batch_size=2,
+                max_memory_bytes=10_000,
+                cache_dir=temp_dir,
+            )
+            step_fn.assert_called()
+
+    def test_make_batch(self) -> None:
+        inputs, targets = _sample_batch(3)
+        batch = _make_batch({"inputs": inputs, "targets": targets, "scale": 2.0}, 7)
+        self.assertEqual(batch["inputs"].shape, (7, _INPUT_DIM))
+        torch.testing.assert_close(batch["inputs"][3:6], inputs)
+        torch.testing.assert_close(batch["targets"][6], targets[0])
+        self.assertEqual(batch["scale"], 2.0)
@@ -5,10 +5,12 @@
 # LICENSE file in the root directory of this source tree.
 
 # pyre-strict
+import math
 import os
 import pickle
 import shutil
 import tempfile
+import time
 import unittest
 from concurrent.futures import Future
 from unittest.mock import call, MagicMock, patch
@@ -28,12 +30,19 @@ from torchtnt.utils.checkpoint import (
     BestCheckpointConfig,
     CheckpointManager,
     CheckpointPath,
+    CheckpointPromoter,
     does_checkpoint_exist,
+    estimate_mtbf,
     get_best_checkpoint_path,
     get_checkpoint_dirpaths,
     get_latest_checkpoint_path,
+    get_latest_tiered_checkpoint_path,
+    get_optimal_checkpoint_interval,
+    is_corrupt_checkpoint,
+    mark_corrupt_checkpoint,
     MetricData,
     Phase,
+    record_train_start,
 )
 from torchtnt.utils.distributed import (
     PGWrapper,
@@ -1034,6 +1043,24 @@ class CheckpointUtilsTest(unittest.TestCase):
         with open(path, "w"):
             pass
 
+    def test_latest_checkpoint_path_skips_corrupt(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path_1 = os.path.join(temp_dir, "epoch_0_step_1")
+            path_2 = os.path.join(temp_dir, "epoch_0_step_2")
+            for path in (path_1, path_2):
+                os.mkdir(path)
+                self._create_snapshot_metadata(path)
+
+            self.assertFalse(is_corrupt_checkpoint(path_2))
+            mark_corrupt_checkpoint(path_2)
+            self.assertTrue(is_corrupt_checkpoint(path_2))
+            self.assertEqual(
+                get_latest_checkpoint_path(temp_dir, METADATA_FNAME), path_1
+            )
+
+            mark_corrupt_checkpoint(path_1)
+            self.assertIsNone(get_latest_checkpoint_path(temp_dir, METADATA_FNAME))
+
     def test_latest_checkpoint_path(self) -> None:
         with tempfile.TemporaryDirectory() as temp_dir:
             self.assertIsNone(get_latest_checkpoint_path(temp_dir))
@@ -1546,6 +1573,121 @@ class CheckpointUtilsTest(unittest.TestCase):
                 )
             )
 
+    def test_latest_tiered_checkpoint_path(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dirpath = os.path.join(temp_dir, "durable")
+            local_dirpath = os.path.join(temp_dir, "local")
+            for path in (
+                os.path.join(dirpath, "epoch_0_step_4"),
+                os.path.join(local_dirpath, "epoch_0_step_4"),
+                os.path.join(local_dirpath, "epoch_0_step_6"),
+                # incomplete, since the metadata file is missing
+                os.path.join(local_dirpath, "epoch_0_step_8"),
+            ):
+                os.makedirs(path)
+                if not path.endswith("8"):
+                    with open(os.path.join(path, METADATA_FNAME), "w"):
+                        pass
+
+            self.assertEqual(
+                get_latest_tiered_checkpoint_path(
+                    dirpath, local_dirpath, metadata_fname=METADATA_FNAME
+                ),
+                os.path.join(local_dirpath, "epoch_0_step_6"),
+            )
+
+            # a more recent durable checkpoint is preferred
+            os.makedirs(os.path.join(dirpath, "epoch_1_step_10"))
+            with open(os.path.join(dirpath, "epoch_1_step_10", METADATA_FNAME), "w"):
+                pass
+            self.assertEqual(
+                get_latest_tiered_checkpoint_path(
+                    dirpath, local_dirpath, metadata_fname=METADATA_FNAME
+                ),
+                os.path.join(dirpath, "epoch_1_step_10"),
+            )
+
+            # fall back to the durable tier if the local tier is lost
+            shutil.rmtree(local_dirpath)
+            self.assertEqual(
+                get_latest_tiered_checkpoint_path(
+                    dirpath, local_dirpath, metadata_fname=METADATA_FNAME
+                ),
+                os.path.join(dirpath, "epoch_1_step_10"),
+            )
+
+    def test_get_optimal_checkpoint_interval(self) -> None:
+        # close to Young's estimate when the save cost is small
+        self.assertAlmostEqual(
+            get_optimal_checkpoint_interval(1.0, 3600.0),
+            math.sqrt(2 * 3600.0),
+            delta=1.0,
+        )
+        self.assertLess(
+            get_optimal_checkpoint_interval(10.0, 3600.0),
+            get_optimal_checkpoint_interval(40.0, 3600.0),
+        )
+        self.assertEqual(get_optimal_checkpoint_interval(100.0, 50.0), 50.0)
+        with self.assertRaisesRegex(ValueError, "positive mean time"):
+            get_optimal_checkpoint_interval(1.0, 0.0)
+
+    def test_estimate_mtbf(self) -> None:
+        self.assertIsNone(estimate_mtbf([]))
+        self.assertIsNone(estimate_mtbf([10.0]))
+        self.assertEqual(estimate_mtbf([300.0, 0.0, 100.0]), 150.0)
+
+    def test_record_train_start(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dirpath = os.path.join(temp_dir, "checkpoints")
+            self.assertEqual(len(record_train_start(dirpath)), 1)
+            start_times = record_train_start(dirpath)
+            self.assertEqual(len(start_times), 2)
+            self.assertLessEqual(start_times[0], start_times[1])
+            # the history does not affect the discovery of checkpoints
+            self.assertEqual(get_checkpoint_dirpaths(dirpath), [])
+
+
+class CheckpointPromoterTest(unittest.TestCase):
+    def test_promote(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            src = os.path.join(temp_dir, "local", "epoch_0_step_1")
+            dst = os.path.join(temp_dir, "durable", "epoch_0_step_1")
+            os.makedirs(os.path.join(src, "shards"))
+            for fname in ("__0_0.distcp", os.path.join("shards", "0"), METADATA_FNAME):
+                with open(os.path.join(src, fname), "wb") as f:
+                    f.write(os.urandom(1000))
+
+            save: Future[None] = Future()
+            promoter = CheckpointPromoter([METADATA_FNAME], max_bytes_per_sec=10000)
+            start = time.monotonic()
+            promotion = promoter.promote(src, dst, wait_for=save)
+            self.assertFalse(promotion.done())
+            save.set_result(None)
+            self.assertTrue(promotion.result())
+            # 3000 bytes at 10000 bytes/s
+            self.assertGreaterEqual(time.monotonic() - start, 0.3)
+            promoter.shutdown()
+
+            for fname in ("__0_0.distcp", os.path.join("shards", "0"), METADATA_FNAME):
+                with open(os.path.join(src, fname), "rb") as f, open(
+                    os.path.join(dst, fname), "rb"
+                ) as g:
+                    self.assertEqual(f.read(), g.read())
+
+    def test_promote_failure(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dst = os.path.join(temp_dir, "durable", "epoch_0_step_1")
+            save: Future[None] = Future()
+            save.set_exception(RuntimeError("save failed"))
+            promoter = CheckpointPromoter([METADATA_FNAME])
+            self.assertFalse(
+                promoter.promote(
+                    os.path.join(temp_dir, "local"), dst, wait_for=save
+                ).result()
+            )
+            promoter.shutdown()
+            self.assertFalse(does_checkpoint_exist(dst, METADATA_FNAME))
+
 
 class MyValLossUnit(TrainUnit[Batch]):
     def __init__(self) -> None:
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import json
+import os
+import tempfile
+import unittest
+from typing import Any, Dict
+
+import torch
+import torch.distributed.checkpoint as dcp
+from torch.distributed.checkpoint.api import CheckpointException
+from torchtnt.utils.checkpoint_storage import (
+    CHECKSUMS_FNAME,
+    CompressedStorageReader,
+    CompressedStorageWriter,
+    get_checksum_algorithm,
+    get_compression_extension,
+    IOConcurrencyTuner,
+    IOSettings,
+    Lz4,
+    MeasuredStorageWriter,
+    needs_compressed_storage_reader,
+    WriteStats,
+    Zlib,
+)
+
+
+class CheckpointStorageTest(unittest.TestCase):
+    def _state_dict(self, seed: int) -> Dict[str, Any]:
+        torch.manual_seed(seed)
+        module = torch.nn.Linear(32, 32)
+        optimizer = torch.optim.Adam(module.parameters())
+        module(torch.randn(4, 32)).sum().backward()
+        optimizer.step()
+        return {
+            "module": module.state_dict(),
+            "optimizer": optimizer.state_dict(),
+            "zeros": torch.zeros(1024) + seed,
+            "progress": {"num_steps": seed},
+        }
+
+    def test_save_restore(self) -> None:
+        state_dict = self._state_dict(seed=1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = CompressedStorageWriter(
+                temp_dir, codec="zlib", thread_count=4, single_file_per_rank=False
+            )
+            dcp.save(state_dict, storage_writer=writer)
+
+            stats = writer.stats
+            self.assertIsNotNone(stats)
+            self.assertLess(stats.bytes_written, stats.uncompressed_bytes)
+            self.assertAlmostEqual(
+                stats.compression_ratio,
+                stats.uncompressed_bytes / stats.bytes_written,
+            )
+
+            restored = self._state_dict(seed=2)
+            dcp.load(
+                restored,
+                storage_reader=CompressedStorageReader(temp_dir, thread_count=4),
+            )
+        torch.testing.assert_close(restored, state_dict)
+
+    def test_downcast_optimizer_moments(self) -> None:
+        state_dict = self._state_dict(seed=1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dcp.save(
+                state_dict,
+                storage_writer=CompressedStorageWriter(
+                    temp_dir, codec="zlib", downcast_optimizer_moments=True
+                ),
+            )
+            restored = self._state_dict(seed=2)
+            dcp.load(restored, storage_reader=CompressedStorageReader(temp_dir))
+
+        # the moments are restored in float32, with bfloat16 precision
+        for param_id, param_state in state_dict["optimizer"]["state"].items():
+            restored_state = restored["optimizer"]["state"][param_id]
+            for key in ("exp_avg", "exp_avg_sq"):
+                self.assertEqual(restored_state[key].dtype, torch.float32)
+                torch.testing.assert_close(
+                    restored_state[key],
+                    param_state[key].to(torch.bfloat16).float(),
+                )
+            self.assertEqual(restored_state["step"], param_state["step"])
+        # other tensors are stored losslessly
+        torch.testing.assert_close(restored["module"], state_dict["module"])
+
+    def test_restore_uncompressed(self) -> None:
+        state_dict = self._state_dict(seed=1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dcp.save(state_dict, checkpoint_id=temp_dir)
+            restored = self._state_dict(seed=2)
+            dcp.load(
+                restored,
+                storage_reader=CompressedStorageReader(temp_dir, thread_count=2),
+            )
+        torch.testing.assert_close(restored, state_dict)
+
+    def test_needs_compressed_storage_reader(self) -> None:
+        state_dict = self._state_dict(seed=1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            plain_dir = os.path.join(temp_dir, "plain")
+            dcp.save(state_dict, checkpoint_id=plain_dir)
+            self.assertFalse(needs_compressed_storage_reader(plain_dir))
+
+            compressed_dir = os.path.join(temp_dir, "compressed")
+            dcp.save(
+                state_dict,
+                storage_writer=CompressedStorageWriter(compressed_dir, codec="zlib"),
+            )
+            self.assertTrue(needs_compressed_storage_reader(compressed_dir))
+
+            checksummed_dir = os.path.join(temp_dir, "checksummed")
+            dcp.save(
+                state_dict,
+                storage_writer=MeasuredStorageWriter(
+                    checksummed_dir, checksum_algorithm="crc32"
+                ),
+            )
+            self.assertTrue(needs_compressed_storage_reader(checksummed_dir))
+            self.assertFalse(
+                needs_compressed_storage_reader(checksummed_dir, verify_checksums=False)
+            )
+
+            # the metadata of a missing checkpoint cannot be read
+            self.assertFalse(
+                needs_compressed_storage_reader(os.path.join(temp_dir, "missing"))
+            )
+
+    def test_get_compression_extension(self) -> None:
+        self.assertIsInstance(get_compression_extension("zlib"), Zlib)
+        if Lz4.is_available():
+            self.assertIsInstance(get_compression_extension("lz4"), Lz4)
+        else:
+            with self.assertRaisesRegex(ValueError, "lz4"):
+                get_compression_extension("lz4")
+        with self.assertRaisesRegex(ValueError, "Unknown compression codec"):
+            get_compression_extension("gzip")
+
+    def test_measured_storage_writer(self) -> None:
+        state_dict = self._state_dict(seed=1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = MeasuredStorageWriter(temp_dir, thread_count=2)
+            dcp.save(state_dict, storage_writer=writer)
+
+        stats = writer.write_stats
+        self.assertIsNotNone(stats)
+        # the zeros alone take 4KB
+        self.assertGreater(stats.bytes_written, 4096)
+        self.assertGreater(stats.write_seconds, 0)
+        self.assertAlmostEqual(
+            stats.throughput, stats.bytes_written / stats.write_seconds
+        )
+
+    def test_io_concurrency_tuner(self) -> None:
+        tuner = IOConcurrencyTuner(
+            IOSettings(thread_count=4, per_thread_copy_ahead=1_000_000),
+            thread_count_bounds=(1, 8),
+            per_thread_copy_ahead_bounds=(1_000_000, 1_000_000),
+            tune_single_file_per_rank=False,
+        )
+
+        def throughput(settings: IOSettings) -> WriteStats:
+            # best with 8 threads
+            return WriteStats(
+                bytes_written=1000 * min(settings.thread_count, 8), write_seconds=1.0
+            )
+
+        tried = []
+        while not tuner.converged:
+            settings = tuner.settings
+            tried.append(settings.thread_count)
+            tuner.record(settings, throughput(settings))
+        # the copy-ahead size is at its bounds, so it is not tried
+        self.assertEqual(tried, [4, 8, 4])
+        self.assertEqual(tuner.settings, IOSettings(8, 1_000_000))
+        self.assertEqual([entry["thread_count"] for entry in tuner.history], [4, 8, 4])
+
+        # stale measurements are ignored
+        tuner.record(IOSettings(1), WriteStats(10**9, 1.0))
+        self.assertEqual(len(tuner.history), 3)
+
+        # the tuning resumes from the best settings
+        new_tuner = IOConcurrencyTuner(
+            IOSettings(), thread_count_bounds=(1, 8), tune_single_file_per_rank=False
+        )
+        new_tuner.load_state_dict(tuner.state_dict())
+        self.assertTrue(new_tuner.converged)
+        self.assertEqual(new_tuner.settings, IOSettings(8, 1_000_000))
+
+        with self.assertRaisesRegex(ValueError, "Invalid thread_count_bounds"):
+            IOConcurrencyTuner(IOSettings(), thread_count_bounds=(0, 8))
+
+    def test_checksums(self) -> None:
+        state_dict = self._state_dict(seed=1)
+        for writer_cls, kwargs in (
+            (MeasuredStorageWriter, {"thread_count": 2}),
+            (CompressedStorageWriter, {"codec": "zlib", "single_file_per_rank": False}),
+        ):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                dcp.save(
+                    state_dict,
+                    storage_writer=writer_cls(
+                        temp_dir, checksum_algorithm="crc32", **kwargs
+                    ),
+                )
+                with open(os.path.join(temp_dir, CHECKSUMS_FNAME)) as f:
+                    manifest = json.load(f)
+                self.assertEqual(manifest["algorithm"], "crc32")
+                self.assertTrue(manifest["files"])
+
+                restored = self._state_dict(seed=2)
+                dcp.load(
+                    restored,
+                    storage_reader=CompressedStorageReader(temp_dir, thread_count=2),
+                )
+                torch.testing.assert_close(restored, state_dict)
+
+                # flip a byte of every data file
+                for fname in os.listdir(temp_dir):
+                    if fname.endswith(".distcp"):
+                        with open(os.path.join(temp_dir, fname), "r+b") as f:
+                            data = bytearray(f.read())
+                            data[len(data) // 2] ^= 0xFF
+                            f.seek(0)
+                            f.write(data)
+
+                reader = CompressedStorageReader(temp_dir, thread_count=2)
+                with self.assertRaisesRegex(CheckpointException, "Checksum mismatch"):
+                    dcp.load(self._state_dict(seed=2), storage_reader=reader)
+                self.assertTrue(reader.corrupt_files)
+
+    def test_get_checksum_algorithm(self) -> None:
+        self.assertEqual(get_checksum_algorithm("crc32"), "crc32")
+        self.assertIn(get_checksum_algorithm(), ("crc32c", "xxh3_64", "crc32"))
+        with self.assertRaisesRegex(ValueError, "Unknown checksum algorithm"):
+            get_checksum_algorithm("md5")
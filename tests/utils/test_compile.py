@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import torch
+from torchtnt.utils import compile as compile_utils
+from torchtnt.utils.compile import (
+    dedup_compile_targets,
+    get_compile_cache_key,
+    get_compile_stats,
+    load_compile_cache,
+    save_compile_cache,
+    warmup_compile,
+)
+
+
+class Block(torch.nn.Module):
+    def __init__(self, dim: int = 4) -> None:
+        super().__init__()
+        self.linear = torch.nn.Linear(dim, dim)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return torch.relu(self.linear(x)) + x
+
+
+class CompileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        torch._dynamo.reset()
+        compile_utils._compile_cache_paths.clear()
+
+    def test_dedup_compile_targets(self) -> None:
+        module = torch.nn.Sequential(Block(), Block(), Block(8))
+        # the linear layers are nested in the blocks
+        modules = list(module) + [block.linear for block in module]
+        targets = dedup_compile_targets(modules)
+        self.assertEqual(targets, list(module))
+
+        for block in module[:2]:
+            block.compile(backend="eager")
+        inputs = torch.rand(2, 4)
+        num_frames = get_compile_stats().num_frames
+        for block in module[:2]:
+            block(inputs)
+        # identical blocks are compiled once
+        self.assertEqual(get_compile_stats().num_frames - num_frames, 1)
+
+    def test_dedup_compile_targets_recompile_limit(self) -> None:
+        modules = [Block(dim) for dim in range(1, 8)]
+        with patch.object(torch._dynamo.config, "recompile_limit", 8):
+            dedup_compile_targets(modules)
+            self.assertEqual(torch._dynamo.config.recompile_limit, 14)
+
+    def test_get_compile_cache_key(self) -> None:
+        key = get_compile_cache_key(Block(), {"backend": "inductor"})
+        self.assertEqual(key, get_compile_cache_key(Block(), {"backend": "inductor"}))
+        self.assertNotEqual(
+            key, get_compile_cache_key(Block(8), {"backend": "inductor"})
+        )
+        self.assertNotEqual(key, get_compile_cache_key(Block(), {"backend": "eager"}))
+
+    def test_compile_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertFalse(load_compile_cache(temp_dir, "foo"))
+            path = os.path.join(temp_dir, "foo.bin")
+            with patch(
+                "torch.compiler.save_cache_artifacts", return_value=(b"bar", None)
+            ):
+                self.assertEqual(save_compile_cache(), [path])
+
+            with patch("torch.compiler.load_cache_artifacts") as load_mock:
+                self.assertTrue(load_compile_cache(temp_dir, "foo"))
+                load_mock.assert_called_once_with(b"bar")
+
+            # unreadable caches are ignored
+            with patch("torch.compiler.load_cache_artifacts", side_effect=RuntimeError):
+                self.assertFalse(load_compile_cache(temp_dir, "foo"))
+
+    def test_compile_cache_saved_on_rank_zero_only(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            load_compile_cache(temp_dir, "foo")
+            with patch(
+                "torch.compiler.save_cache_artifacts", return_value=(b"bar", None)
+            ) as save_mock, patch(
+                "torchtnt.utils.compile.get_global_rank", return_value=1
+            ):
+                self.assertEqual(save_compile_cache(), [])
+                save_mock.assert_not_called()
+            self.assertEqual(os.listdir(temp_dir), [])
+
+    def test_compile_cache_unsupported(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "torchtnt.utils.compile.is_torch_version_geq", return_value=False
+        ):
+            self.assertFalse(load_compile_cache(temp_dir, "foo"))
+            self.assertEqual(save_compile_cache(), [])
+
+    def test_save_compile_cache_without_cache_dir(self) -> None:
+        with patch("torch.compiler.save_cache_artifacts") as save_mock:
+            self.assertEqual(save_compile_cache(), [])
+            save_mock.assert_not_called()
+
+    def test_warmup_compile(self) -> None:
+        module = torch.nn.Sequential(torch.nn.Linear(4, 4), torch.nn.BatchNorm1d(4))
+        module.compile(backend="aot_eager")
+        grad = torch.ones_like(module[0].weight)
+        module[0].weight.grad = grad
+        running_mean = module[1].running_mean.clone()
+        rng_state = torch.get_rng_state()
+
+        warmup_compile(module, lambda: module(torch.rand(2, 4)))
+
+        self.assertGreater(get_compile_stats().num_frames, 0)
+        self.assertIs(module[0].weight.grad, grad)
+        self.assertIsNone(module[0].bias.grad)
+        torch.testing.assert_close(module[1].running_mean, running_mean)
+        torch.testing.assert_close(torch.get_rng_state(), rng_state)
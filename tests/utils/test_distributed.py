@@ -9,7 +9,7 @@
 
 import os
 import unittest
-from typing import Callable, cast, Literal, Optional, Union
+from typing import Any, Callable, cast, Dict, Literal, Optional, Union
 from unittest.mock import MagicMock, patch
 from urllib.parse import parse_qs, urlparse
 
@@ -22,6 +22,8 @@ from torchtnt.utils.distributed import (
     _validate_global_rank_world_size,
     all_gather_str,
     all_gather_tensors,
+    all_reduce_metric_states,
+    all_reduce_tensor_dict,
     broadcast_str,
     destroy_process_group,
     get_file_init_method,
@@ -153,6 +155,121 @@ class DistributedTest(unittest.TestCase):
             assert val.shape == (idx + 1, 4 - idx)
             assert (val == torch.ones_like(val)).all()
 
+    def test_all_reduce_tensor_dict_single_process(self) -> None:
+        tensors = {"a": torch.tensor(1.0), "b": {"c": torch.tensor([1, 2])}}
+        result = all_reduce_tensor_dict(tensors, reduction="mean")
+        self.assertTrue(torch.equal(result["a"], tensors["a"]))
+        self.assertTrue(torch.equal(result["b"]["c"], tensors["b"]["c"]))
+
+    def test_all_reduce_tensor_dict_invalid_inputs(self) -> None:
+        with self.assertRaisesRegex(ValueError, "No reduction specified for b"):
+            all_reduce_tensor_dict(
+                {"a": torch.tensor(1.0), "b": torch.tensor(1.0)}, reduction={"a": "sum"}
+            )
+        with self.assertRaisesRegex(ValueError, "Invalid reduction 'prod'"):
+            # pyre-ignore: Incompatible parameter type [6]
+            all_reduce_tensor_dict({"a": torch.tensor(1.0)}, reduction="prod")
+        with self.assertRaisesRegex(ValueError, "Invalid reduction {'b': 'sum'} for a"):
+            all_reduce_tensor_dict(
+                {"a": torch.tensor(1.0)}, reduction={"a": {"b": "sum"}}
+            )
+        with self.assertRaisesRegex(TypeError, "Expected a tensor"):
+            all_reduce_tensor_dict({"a": 1.0})
+
+    @skip_if_not_distributed
+    def test_all_reduce_tensor_dict(self) -> None:
+        spawn_multi_process(2, "gloo", self._test_all_reduce_tensor_dict)
+
+    @staticmethod
+    def _test_all_reduce_tensor_dict() -> None:
+        rank = dist.get_rank()
+        tensors = {
+            "loss": torch.tensor(float(rank)),
+            "max_loss": torch.tensor([float(rank), 5.0 - rank]),
+            "counts": {
+                "correct": torch.tensor(rank + 1),
+                "total": torch.tensor([[10, 20]]),
+            },
+            "min_step": torch.tensor(rank + 3),
+        }
+        reduction: Dict[str, Any] = {
+            "loss": "mean",
+            "max_loss": "max",
+            "counts": "sum",
+            "min_step": "min",
+        }
+        with patch(
+            "torchtnt.utils.distributed.dist.all_reduce", wraps=dist.all_reduce
+        ) as mock_all_reduce:
+            result = all_reduce_tensor_dict(tensors, reduction=reduction)
+
+        tc = unittest.TestCase()
+        # buckets: float sum, float max, int sum, int min
+        tc.assertEqual(mock_all_reduce.call_count, 4)
+        tc.assertTrue(torch.equal(result["loss"], torch.tensor(0.5)))
+        tc.assertTrue(torch.equal(result["max_loss"], torch.tensor([1.0, 5.0])))
+        tc.assertTrue(torch.equal(result["counts"]["correct"], torch.tensor(3)))
+        tc.assertTrue(torch.equal(result["counts"]["total"], torch.tensor([[20, 40]])))
+        tc.assertTrue(torch.equal(result["min_step"], torch.tensor(3)))
+        # inputs are not modified in place
+        tc.assertTrue(torch.equal(tensors["loss"], torch.tensor(float(rank))))
+
+    @skip_if_not_distributed
+    def test_all_reduce_metric_states(self) -> None:
+        spawn_multi_process(2, "gloo", self._test_all_reduce_metric_states)
+
+    @staticmethod
+    def _test_all_reduce_metric_states() -> None:
+        class _SumMetric:
+            def __init__(self) -> None:
+                self.total = torch.tensor(0.0)
+                self.name = "sum"
+
+            def update(self, x: torch.Tensor) -> None:
+                self.total += x
+
+            def compute(self) -> torch.Tensor:
+                return self.total
+
+            def state_dict(self) -> Dict[str, Any]:
+                return {"total": self.total, "name": self.name}
+
+            def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+                self.total = state_dict["total"]
+                self.name = state_dict["name"]
+
+        rank = dist.get_rank()
+        metric_a, metric_b, metric_c = _SumMetric(), _SumMetric(), _SumMetric()
+        metric_a.update(torch.tensor(float(rank + 1)))
+        metric_b.update(torch.tensor(float(rank * 10)))
+        metric_c.total = torch.tensor(rank + 1)
+        all_reduce_metric_states(
+            {"a": metric_a, "b": metric_b, "c": metric_c},
+            reduction={"a": "sum", "b": "max", "c": "mean"},
+        )
+
+        tc = unittest.TestCase()
+        tc.assertEqual(metric_a.compute().item(), 3.0)
+        tc.assertEqual(metric_b.compute().item(), 10.0)
+        tc.assertEqual(metric_a.name, "sum")
+        # the mean of integer states is not truncated
+        tc.assertEqual(metric_c.compute().item(), 1.5)
+
+        class _ListMetric(_SumMetric):
+            def state_dict(self) -> Dict[str, Any]:
+                return {"total": self.total, "inputs": [self.total]}
+
+            def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+                self.total = state_dict["total"]
+
+        # list states can not be reduced, which is reported instead of silently skipped
+        with patch("torchtnt.utils.distributed.logger.warning") as warning_mock:
+            all_reduce_metric_states({"list": _ListMetric()})
+        if rank == 0:
+            tc.assertIn("['list.inputs']", warning_mock.call_args.args[0])
+        else:
+            warning_mock.assert_not_called()
+
     def test_rank_zero_fn_rank_zero(self) -> None:
         @rank_zero_fn
         def foo() -> int:
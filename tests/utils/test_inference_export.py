@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import os
+import tempfile
+import unittest
+
+import torch
+from torch import nn
+from torchtnt.framework._test_utils import DummyTrainUnit, generate_random_dataloader
+from torchtnt.framework.callbacks.dcp_saver import DistributedCheckpointSaver
+from torchtnt.framework.train import train
+from torchtnt.utils.inference_export import (
+    export_inference_weights,
+    INFERENCE_WEIGHTS_FNAMES,
+    load_inference_weights,
+    load_inference_weights_into_module,
+    save_inference_weights,
+)
+
+
+def _module() -> nn.Module:
+    return nn.Sequential(nn.Linear(4, 8), nn.BatchNorm1d(8), nn.Linear(8, 2))
+
+
+class InferenceExportTest(unittest.TestCase):
+    def test_save_load(self) -> None:
+        module = _module()
+        module(torch.randn(4, 4))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = save_inference_weights(
+                {"module": module.state_dict()}, temp_dir, dtype=torch.bfloat16
+            )
+            self.assertIn(os.path.basename(path), INFERENCE_WEIGHTS_FNAMES)
+            self.assertEqual(os.listdir(temp_dir), [os.path.basename(path)])
+
+            module_names, weights = load_inference_weights(temp_dir)
+            self.assertEqual(module_names, ["module"])
+            self.assertEqual(
+                set(weights), {f"module.{key}" for key in module.state_dict()}
+            )
+            # only floating point weights are downcast
+            self.assertEqual(weights["module.0.weight"].dtype, torch.bfloat16)
+            self.assertEqual(weights["module.1.num_batches_tracked"].dtype, torch.int64)
+            torch.testing.assert_close(
+                weights["module.0.weight"], module[0].weight.to(torch.bfloat16)
+            )
+
+    def test_load_into_meta_module(self) -> None:
+        module = _module()
+        module(torch.randn(4, 4))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_inference_weights(
+                {"module": module.state_dict(), "other": nn.Linear(2, 2).state_dict()},
+                temp_dir,
+            )
+            with torch.device("meta"):
+                new_module = _module()
+            with self.assertRaisesRegex(ValueError, "module_name must be one of"):
+                load_inference_weights_into_module(new_module, temp_dir)
+
+            load_inference_weights_into_module(
+                new_module, temp_dir, module_name="module"
+            )
+        torch.testing.assert_close(new_module.state_dict(), module.state_dict())
+        # buffers are kept as buffers
+        self.assertEqual(
+            {name for name, _ in new_module.named_buffers()},
+            {name for name, _ in module.named_buffers()},
+        )
+
+    def test_export_from_checkpoint(self) -> None:
+        my_unit = DummyTrainUnit(input_dim=2)
+        dataloader = generate_random_dataloader(10, 2, 2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpoint_dirpath = os.path.join(temp_dir, "checkpoints")
+            dcp_cb = DistributedCheckpointSaver(checkpoint_dirpath)
+            train(my_unit, dataloader, max_steps=2, callbacks=[dcp_cb])
+
+            checkpoint_path = os.path.join(
+                checkpoint_dirpath, os.listdir(checkpoint_dirpath)[0]
+            )
+            export_dirpath = os.path.join(temp_dir, "export")
+            with self.assertRaisesRegex(ValueError, "not found in checkpoint"):
+                export_inference_weights(
+                    checkpoint_path, export_dirpath, module_names=["model"]
+                )
+            export_inference_weights(checkpoint_path, export_dirpath)
+
+            module_names, weights = load_inference_weights(export_dirpath)
+            self.assertEqual(module_names, ["module"])
+            self.assertEqual(set(weights), {"module.weight", "module.bias"})
+
+            new_module = nn.Linear(2, 2)
+            load_inference_weights_into_module(new_module, export_dirpath)
+        torch.testing.assert_close(new_module.state_dict(), my_unit.module.state_dict())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import math
+import unittest
+
+import torch
+from torchtnt.utils.metric_accumulator import (
+    AccumulatedMetric,
+    DeviceMetricAccumulator,
+    to_log_dict,
+)
+
+
+class DeviceMetricAccumulatorTest(unittest.TestCase):
+    def test_update(self) -> None:
+        accumulator = DeviceMetricAccumulator(capacity=3)
+        accumulator.update("loss", torch.tensor([1.0, 3.0]))
+        accumulator.update("loss", 5.0)
+        accumulator.update("grad_norm", torch.tensor(2, dtype=torch.int64))
+        accumulator.update("empty", torch.tensor([]))
+
+        self.assertEqual(
+            accumulator.compute(),
+            {
+                "loss": AccumulatedMetric(sum=9.0, count=3.0, min=1.0, max=5.0),
+                "grad_norm": AccumulatedMetric(sum=2.0, count=1.0, min=2.0, max=2.0),
+            },
+        )
+        self.assertEqual(accumulator.compute()["loss"].mean, 3.0)
+        self.assertTrue(math.isnan(AccumulatedMetric(0.0, 0.0, 0.0, 0.0).mean))
+
+        with self.assertRaisesRegex(ValueError, "Please increase capacity"):
+            accumulator.update("other", 1.0)
+
+    def test_read_async_reset(self) -> None:
+        accumulator = DeviceMetricAccumulator()
+        accumulator.update("loss", 1.0)
+        readout = accumulator.read_async()
+        accumulator.update("loss", 3.0)
+
+        self.assertTrue(readout.ready())
+        self.assertEqual(readout.wait()["loss"].sum, 1.0)
+        self.assertEqual(
+            accumulator.compute(),
+            {"loss": AccumulatedMetric(sum=3.0, count=1.0, min=3.0, max=3.0)},
+        )
+
+        # without reset, statistics keep accumulating
+        accumulator.read_async(reset=False)
+        accumulator.update("loss", 5.0)
+        self.assertEqual(accumulator.compute()["loss"].count, 2.0)
+
+        accumulator.reset()
+        self.assertEqual(accumulator.compute(), {})
+        self.assertEqual(accumulator.names, ["loss"])
+
+    def test_state_dict(self) -> None:
+        accumulator = DeviceMetricAccumulator(capacity=4)
+        accumulator.update_dict({"loss": 1.0, "grad_norm": torch.tensor(4.0)})
+        state_dict = accumulator.state_dict()
+        # the state dict is not affected by later updates
+        accumulator.update("loss", 2.0)
+        # tensors are sized by capacity, not by the number of recorded metrics
+        self.assertEqual(state_dict["sum"].shape, (4,))
+
+        restored = DeviceMetricAccumulator(capacity=4)
+        # loading in place, as torch.distributed.checkpoint does
+        restored_state_dict = restored.state_dict()
+        for key in ("sum", "count", "min", "max"):
+            restored_state_dict[key].copy_(state_dict[key])
+        restored_state_dict["names"] = state_dict["names"]
+        restored.load_state_dict(restored_state_dict)
+        self.assertEqual(restored.names, ["loss", "grad_norm"])
+        self.assertEqual(restored.compute()["loss"].sum, 1.0)
+        restored.update("other", 1.0)
+        self.assertEqual(restored.names, ["loss", "grad_norm", "other"])
+
+    def test_to_log_dict(self) -> None:
+        metrics = {"loss": AccumulatedMetric(sum=6.0, count=3.0, min=1.0, max=3.0)}
+        self.assertEqual(
+            to_log_dict(metrics, prefix="train/"),
+            {"train/loss": 2.0, "train/loss_min": 1.0, "train/loss_max": 3.0},
+        )
+
+    @unittest.skipUnless(torch.cuda.is_available(), "CUDA is not available")
+    def test_cuda(self) -> None:
+        accumulator = DeviceMetricAccumulator(device=torch.device("cuda"))
+        accumulator.update("loss", torch.tensor([1.0, 2.0], device="cuda"))
+        self.assertEqual(accumulator.read_async().wait()["loss"].sum, 3.0)
+
+    def test_load_state_dict_over_capacity(self) -> None:
+        accumulator = DeviceMetricAccumulator(capacity=2)
+        accumulator.update_dict({"a": 1.0, "b": 2.0})
+        with self.assertRaisesRegex(ValueError, "capacity 1"):
+            DeviceMetricAccumulator(capacity=1).load_state_dict(
+                accumulator.state_dict()
+            )
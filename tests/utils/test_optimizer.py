@@ -7,11 +7,27 @@
 
 # pyre-strict
 
+import copy
+import math
 import unittest
 
 import torch
+from torch.distributed.device_mesh import init_device_mesh
+from torch.distributed.tensor import (
+    distribute_tensor,
+    DTensor,
+    Partial,
+    Replicate,
+    Shard,
+)
+from torchtnt.utils.distributed import spawn_multi_process
 from torchtnt.utils.env import init_from_env
-from torchtnt.utils.optimizer import init_optim_state
+from torchtnt.utils.optimizer import (
+    clip_grads_with_norm_,
+    get_grad_norms,
+    init_optim_state,
+)
+from torchtnt.utils.test_utils import skip_if_not_distributed
 
 
 class OptimizerTest(unittest.TestCase):
@@ -41,3 +57,114 @@ class OptimizerTest(unittest.TestCase):
                 module.state_dict()["bias"],
             )
         )
+
+    def test_get_grad_norms(self) -> None:
+        module = torch.nn.Sequential(torch.nn.Linear(4, 4), torch.nn.Linear(4, 2))
+        module(torch.rand(3, 4)).sum().backward()
+        groups = [list(module[0].parameters()), list(module[1].parameters())]
+        # parameters without gradients are skipped
+        groups[1].append(torch.nn.Parameter(torch.ones(2)))
+
+        for norm_type in (2.0, 1.0, math.inf):
+            total_norm, group_norms = get_grad_norms(groups, norm_type)
+            torch.testing.assert_close(
+                total_norm,
+                torch.nn.utils.get_total_norm(
+                    [p.grad for p in module.parameters()], norm_type
+                ),
+            )
+            for group, group_norm in zip(groups, group_norms):
+                torch.testing.assert_close(
+                    group_norm,
+                    torch.nn.utils.get_total_norm(
+                        [p.grad for p in group if p.grad is not None], norm_type
+                    ),
+                )
+
+        total_norm, group_norms = get_grad_norms([[], []])
+        self.assertEqual(total_norm.item(), 0.0)
+        self.assertEqual(len(group_norms), 2)
+
+    def test_clip_grads_with_norm(self) -> None:
+        module = torch.nn.Linear(4, 4)
+        module(torch.rand(3, 4)).sum().backward()
+        expected_module = copy.deepcopy(module)
+        for param, expected_param in zip(
+            module.parameters(), expected_module.parameters()
+        ):
+            expected_param.grad = param.grad.clone()
+        torch.nn.utils.clip_grad_norm_(expected_module.parameters(), max_norm=0.5)
+
+        total_norm, _ = get_grad_norms([list(module.parameters())])
+        clip_grads_with_norm_(module.parameters(), 0.5, total_norm)
+        for param, expected_param in zip(
+            module.parameters(), expected_module.parameters()
+        ):
+            torch.testing.assert_close(param.grad, expected_param.grad)
+
+    @skip_if_not_distributed
+    def test_get_grad_norms_dtensor(self) -> None:
+        spawn_multi_process(2, "gloo", self._test_get_grad_norms_dtensor)
+
+    @staticmethod
+    def _test_get_grad_norms_dtensor() -> None:
+        tc = unittest.TestCase()
+        mesh = init_device_mesh("cpu", (2,))
+        torch.manual_seed(0)
+        full_grads = [torch.rand(4, 3), torch.rand(6), torch.rand(2)]
+        placements = [[Shard(0)], [Shard(0)], [Replicate()]]
+        params = []
+        for grad, placement in zip(full_grads, placements):
+            param = torch.nn.Parameter(
+                distribute_tensor(torch.zeros_like(grad), mesh, placement)
+            )
+            param.grad = distribute_tensor(grad, mesh, placement)
+            params.append(param)
+
+        for norm_type in (2.0, math.inf):
+            total_norm, group_norms = get_grad_norms(
+                [params[:2], params[2:]], norm_type
+            )
+            torch.testing.assert_close(
+                total_norm, torch.nn.utils.get_total_norm(full_grads, norm_type)
+            )
+            torch.testing.assert_close(
+                group_norms[0],
+                torch.nn.utils.get_total_norm(full_grads[:2], norm_type),
+            )
+            tc.assertNotIsInstance(total_norm, DTensor)
+
+    @skip_if_not_distributed
+    def test_get_grad_norms_rank_without_grads(self) -> None:
+        spawn_multi_process(2, "gloo", self._test_get_grad_norms_rank_without_grads)
+
+    @staticmethod
+    def _test_get_grad_norms_rank_without_grads() -> None:
+        tc = unittest.TestCase()
+        mesh = init_device_mesh("cpu", (2,))
+        rank = torch.distributed.get_rank()
+        torch.manual_seed(0)
+        full_grads = [torch.rand(4, 3), torch.rand(6)]
+        params = []
+        for grad in full_grads:
+            param = torch.nn.Parameter(
+                distribute_tensor(torch.zeros_like(grad), mesh, [Shard(0)])
+            )
+            param.grad = distribute_tensor(grad, mesh, [Shard(0)])
+            # only rank 0 has gradients, rank 1 must still join the all-reduce
+            if rank == 1:
+                param.grad = None
+            params.append(param)
+
+        total_norm, _ = get_grad_norms([params])
+        torch.testing.assert_close(
+            total_norm,
+            torch.nn.utils.get_total_norm([full_grads[0][:2], full_grads[1][:3]]),
+        )
+
+        param = torch.nn.Parameter(
+            distribute_tensor(torch.zeros(2), mesh, [Replicate()])
+        )
+        param.grad = DTensor.from_local(torch.ones(2), mesh, [Partial()])
+        with tc.assertRaisesRegex(ValueError, "Partial gradients"):
+            get_grad_norms([[param]])
@@ -418,6 +418,45 @@ class PrepareModelTest(unittest.TestCase):
         )
         mock_parallelize_module.assert_called_once()
 
+    def test_apply_torch_compile_dedup_and_cache(self) -> None:
+        """
+        Test that nested modules are not compiled when dedup_repeated_modules is set, and that the compile cache is loaded.
+        """
+
+        class Block(torch.nn.Module):
+            def __init__(self) -> None:
+                super().__init__()
+                self.linear = torch.nn.Linear(2, 2)
+
+            def forward(self, x: torch.Tensor) -> torch.Tensor:
+                return self.linear(x)
+
+        module = torch.nn.Sequential(Block(), Block())
+        with patch("torch.compile", return_value=None) as mock_compile, patch(
+            "torchtnt.utils.prepare_module.load_compile_cache"
+        ) as load_compile_cache_mock:
+            apply_torch_compile(
+                module,
+                TorchCompileParams(
+                    recursive_module_types=[Block, torch.nn.Linear],
+                    dedup_repeated_modules=True,
+                    cache_dir="foo",
+                ),
+            )
+            self.assertEqual(mock_compile.call_count, 2)
+            for block in module:
+                mock_compile.assert_any_call(
+                    block._call_impl,
+                    fullgraph=False,
+                    dynamic=False,
+                    backend="inductor",
+                    mode=None,
+                    options=None,
+                    disable=False,
+                )
+            load_compile_cache_mock.assert_called_once()
+            self.assertEqual(load_compile_cache_mock.call_args.args[0], "foo")
+
     def test_apply_torch_compile_recursive_module_types(self) -> None:
         """
         Test that recursive_module_types is apply correctly.
@@ -228,3 +228,45 @@ class TestSWA(unittest.TestCase):
 
         for p_avg, p_swa in zip(averaged_params, averaged_model.parameters()):
             torch.testing.assert_close(p_avg, p_swa, check_device=False)
+
+    def test_cpu_offload(self) -> None:
+        for averaging_method, use_lit in (
+            ("ema", False),
+            ("ema", True),
+            ("swa", False),
+        ):
+            dnn = torch.nn.Sequential(
+                torch.nn.Linear(5, 5),
+                torch.nn.BatchNorm1d(5),
+                torch.nn.Linear(5, 10),
+            )
+            averaged_dnn = AveragedModel(
+                dnn,
+                averaging_method=averaging_method,
+                use_buffers=True,
+                use_lit=use_lit,
+            )
+            offloaded_dnn = AveragedModel(
+                dnn,
+                averaging_method=averaging_method,
+                use_buffers=True,
+                use_lit=use_lit,
+                cpu_offload=True,
+            )
+            for _ in range(5):
+                dnn(torch.rand(4, 5))
+                for p in dnn.parameters():
+                    p.detach().add_(torch.randn_like(p))
+                averaged_dnn.update_parameters(dnn)
+                offloaded_dnn.update_parameters(dnn)
+
+            # state_dict waits for the pending update
+            offloaded_state_dict = offloaded_dnn.state_dict()
+            for key, value in averaged_dnn.state_dict().items():
+                torch.testing.assert_close(offloaded_state_dict[key], value)
+                self.assertEqual(offloaded_state_dict[key].device.type, "cpu")
+
+    def test_cpu_offload_input_checks(self) -> None:
+        model = torch.nn.Linear(2, 2)
+        with self.assertRaisesRegex(ValueError, "skip_deepcopy"):
+            AveragedModel(model, skip_deepcopy=True, cpu_offload=True)
@@ -6,14 +6,23 @@
 
 # pyre-strict
 
+import copy
 import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import partial
-from typing import Dict, List, Type, Union
+from typing import Any, Callable, cast, Deque, Dict, List, Optional, Type, Union
 from unittest.mock import Mock
 
 from torchtnt.framework.callback import Callback
 from torchtnt.framework.state import State
-from torchtnt.framework.unit import TEvalUnit, TPredictUnit, TTestUnit, TTrainUnit
+from torchtnt.framework.unit import (
+    AppStateMixin,
+    TEvalUnit,
+    TPredictUnit,
+    TTestUnit,
+    TTrainUnit,
+)
 from torchtnt.utils.event_handlers import log_interval
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -115,6 +124,101 @@ def _get_implemented_callback_mapping(
     return cb_overrides
 
 
+# maximum number of async hook calls queued before the trainer thread waits for the worker
+_MAX_PENDING_ASYNC_HOOKS = 256
+
+
+def _snapshot_state(state: State) -> State:
+    """
+    Returns a shallow copy of ``state`` whose phase states are copied too, so that the entry point, the active phase
+    and each phase's ``step_output`` are those of the time the hook was due. Dataloaders, timers and the step outputs
+    themselves are shared with the trainer thread.
+    """
+    snapshot = copy.copy(state)
+    for attr in ("_train_state", "_eval_state", "_predict_state", "_test_state"):
+        phase_state = getattr(state, attr)
+        if phase_state is not None:
+            setattr(snapshot, attr, copy.copy(phase_state))
+    return snapshot
+
+
+def _snapshot_unit(unit: object) -> object:
+    """
+    Returns a snapshot of ``unit`` where only its tracked progress is copied, see :meth:`AppStateMixin._snapshot`.
+    Units which are not an :class:`AppStateMixin` are not copied.
+    """
+    if isinstance(unit, AppStateMixin):
+        return unit._snapshot()
+    return unit
+
+
+class _AsyncCallbackWorker:
+    """
+    Runs the hooks of async callbacks on a single background thread, in the order they were submitted.
+    """
+
+    def __init__(self, max_pending: int = _MAX_PENDING_ASYNC_HOOKS) -> None:
+        self._max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[Future[None]] = deque()
+
+    def raise_errors(self) -> None:
+        """Raises the first error from hooks which already ran, if any, without waiting for pending hooks."""
+        while self._pending and self._pending[0].done():
+            self._pending.popleft().result()
+
+    def submit(self, fn: Callable[..., None], *args: Any) -> None:
+        self.raise_errors()
+        if len(self._pending) >= self._max_pending:
+            self._pending.popleft().result()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tnt_async_callbacks"
+            )
+        self._pending.append(self._executor.submit(fn, *args))
+
+    def drain(self) -> None:
+        """Waits for all submitted hooks to run, and raises the first error, if any."""
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._pending.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+class _AsyncCallback:
+    """
+    Wraps a callback with ``run_async`` set, submitting its hooks to an :class:`_AsyncCallbackWorker`
+    with snapshots of the state and unit.
+    """
+
+    def __init__(self, callback: Callback, worker: _AsyncCallbackWorker) -> None:
+        self._callback = callback
+        self._worker = worker
+
+    def __getattr__(self, name: str) -> object:
+        attr = getattr(self._callback, name)
+        if not name.startswith("on_") or name == "on_exception":
+            return attr
+
+        def hook(state: State, unit: object) -> None:
+            self._worker.submit(attr, _snapshot_state(state), _snapshot_unit(unit))
+
+        return hook
+
+
+_STEP_HOOK_SUFFIXES = (
+    "get_next_batch_start",
+    "get_next_batch_end",
+    "step_start",
+    "step_end",
+)
+
+
 class CallbackHandler:
     """
     A helper class to run and time callbacks in TorchTNT.
@@ -124,6 +228,66 @@ class CallbackHandler:
         self._callbacks: Dict[str, List[Callback]] = _get_implemented_callback_mapping(
             callbacks
         )
+        self._async_worker: Optional[_AsyncCallbackWorker] = None
+        if any(getattr(cb, "run_async", False) is True for cb in callbacks):
+            worker = _AsyncCallbackWorker()
+            self._async_worker = worker
+            for hook, hook_callbacks in self._callbacks.items():
+                self._callbacks[hook] = [
+                    (
+                        cast(Callback, _AsyncCallback(cb, worker))
+                        if getattr(cb, "run_async", False) is True
+                        else cb
+                    )
+                    for cb in hook_callbacks
+                ]
+        # per phase, the step_hook_interval of each callback implementing a step-level hook
+        self._step_hook_intervals: Dict[str, List[Optional[int]]] = {}
+        for phase in ("train", "eval", "predict", "test"):
+            step_callbacks: List[Callback] = []
+            for suffix in _STEP_HOOK_SUFFIXES:
+                for cb in self._callbacks.get(f"on_{phase}_{suffix}", []):
+                    if not any(cb is c for c in step_callbacks):
+                        step_callbacks.append(cb)
+            self._step_hook_intervals[phase] = [
+                cb.step_hook_interval for cb in step_callbacks
+            ]
+
+    def step_hooks_due(self, phase: str, step: int) -> bool:
+        """
+        Returns whether any callback's step-level hooks for ``phase`` must be called for ``step``,
+        given each callback's ``step_hook_interval``. Used by loops running with ``steps_per_loop`` > 1.
+        """
+        for interval in self._step_hook_intervals[phase]:
+            if interval is None or step % interval == 0:
+                return True
+        return False
+
+    def run_step_hook(
+        self,
+        hook: str,
+        state: State,
+        unit: Union[TTrainUnit, TEvalUnit, TPredictUnit, TTestUnit],
+        step: int,
+    ) -> None:
+        """
+        Calls the step-level ``hook`` on the callbacks whose ``step_hook_interval`` is due for ``step``.
+        Used by loops running with ``steps_per_loop`` > 1.
+        """
+        self._raise_async_callback_errors()
+        callbacks = self._callbacks.get(hook, [])
+        for cb in callbacks:
+            interval = cb.step_hook_interval
+            if interval is None or step % interval == 0:
+                getattr(cb, hook)(state, unit)
+
+    def _raise_async_callback_errors(self) -> None:
+        if self._async_worker is not None:
+            self._async_worker.raise_errors()
+
+    def _drain_async_callbacks(self) -> None:
+        if self._async_worker is not None:
+            self._async_worker.drain()
 
     def on_exception(
         self,
@@ -131,6 +295,10 @@ class CallbackHandler:
         unit: Union[TTrainUnit, TEvalUnit, TPredictUnit, TTestUnit],
         exc: BaseException,
     ) -> None:
+        try:
+            self._drain_async_callbacks()
+        except Exception as e:
+            logger.error(f"Async callback failed while handling an exception: {e}")
         fn_name = "on_exception"
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
@@ -139,12 +307,14 @@ class CallbackHandler:
     @log_interval("on_train_start", {"category": "callback_handler"})
     def on_train_start(self, state: State, unit: TTrainUnit) -> None:
         fn_name = "on_train_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_start(state, unit)
 
     def on_train_epoch_start(self, state: State, unit: TTrainUnit) -> None:
         fn_name = "on_train_epoch_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_epoch_start(state, unit)
@@ -153,6 +323,7 @@ class CallbackHandler:
         self, state: State, unit: TTrainUnit
     ) -> None:
         fn_name = "on_train_dataloader_iter_creation_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_dataloader_iter_creation_start(state, unit)
@@ -161,30 +332,35 @@ class CallbackHandler:
         self, state: State, unit: TTrainUnit
     ) -> None:
         fn_name = "on_train_dataloader_iter_creation_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_dataloader_iter_creation_end(state, unit)
 
     def on_train_get_next_batch_start(self, state: State, unit: TTrainUnit) -> None:
         fn_name = "on_train_get_next_batch_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_get_next_batch_start(state, unit)
 
     def on_train_get_next_batch_end(self, state: State, unit: TTrainUnit) -> None:
         fn_name = "on_train_get_next_batch_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_get_next_batch_end(state, unit)
 
     def on_train_step_start(self, state: State, unit: TTrainUnit) -> None:
         fn_name = "on_train_step_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_step_start(state, unit)
 
     def on_train_step_end(self, state: State, unit: TTrainUnit) -> None:
         fn_name = "on_train_step_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_step_end(state, unit)
@@ -192,6 +368,7 @@ class CallbackHandler:
     @log_interval("on_train_epoch_end", {"category": "callback_handler"})
     def on_train_epoch_end(self, state: State, unit: TTrainUnit) -> None:
         fn_name = "on_train_epoch_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_epoch_end(state, unit)
@@ -199,18 +376,22 @@ class CallbackHandler:
     @log_interval("on_train_end", {"category": "callback_handler"})
     def on_train_end(self, state: State, unit: TTrainUnit) -> None:
         fn_name = "on_train_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_train_end(state, unit)
+        self._drain_async_callbacks()
 
     def on_eval_start(self, state: State, unit: TEvalUnit) -> None:
         fn_name = "on_eval_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_start(state, unit)
 
     def on_eval_epoch_start(self, state: State, unit: TEvalUnit) -> None:
         fn_name = "on_eval_epoch_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_epoch_start(state, unit)
@@ -219,6 +400,7 @@ class CallbackHandler:
         self, state: State, unit: TEvalUnit
     ) -> None:
         fn_name = "on_eval_dataloader_iter_creation_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_dataloader_iter_creation_start(state, unit)
@@ -227,54 +409,64 @@ class CallbackHandler:
         self, state: State, unit: TEvalUnit
     ) -> None:
         fn_name = "on_eval_dataloader_iter_creation_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_dataloader_iter_creation_end(state, unit)
 
     def on_eval_get_next_batch_start(self, state: State, unit: TEvalUnit) -> None:
         fn_name = "on_eval_get_next_batch_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_get_next_batch_start(state, unit)
 
     def on_eval_get_next_batch_end(self, state: State, unit: TEvalUnit) -> None:
         fn_name = "on_eval_get_next_batch_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_get_next_batch_end(state, unit)
 
     def on_eval_step_start(self, state: State, unit: TEvalUnit) -> None:
         fn_name = "on_eval_step_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_step_start(state, unit)
 
     def on_eval_step_end(self, state: State, unit: TEvalUnit) -> None:
         fn_name = "on_eval_step_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_step_end(state, unit)
 
     def on_eval_epoch_end(self, state: State, unit: TEvalUnit) -> None:
         fn_name = "on_eval_epoch_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_epoch_end(state, unit)
 
     def on_eval_end(self, state: State, unit: TEvalUnit) -> None:
         fn_name = "on_eval_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_eval_end(state, unit)
+        self._drain_async_callbacks()
 
     def on_predict_start(self, state: State, unit: TPredictUnit) -> None:
         fn_name = "on_predict_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_start(state, unit)
 
     def on_predict_epoch_start(self, state: State, unit: TPredictUnit) -> None:
         fn_name = "on_predict_epoch_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_epoch_start(state, unit)
@@ -283,6 +475,7 @@ class CallbackHandler:
         self, state: State, unit: TPredictUnit
     ) -> None:
         fn_name = "on_predict_dataloader_iter_creation_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_dataloader_iter_creation_start(state, unit)
@@ -291,54 +484,64 @@ class CallbackHandler:
         self, state: State, unit: TPredictUnit
     ) -> None:
         fn_name = "on_predict_dataloader_iter_creation_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_dataloader_iter_creation_end(state, unit)
 
     def on_predict_get_next_batch_start(self, state: State, unit: TPredictUnit) -> None:
         fn_name = "on_predict_get_next_batch_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_get_next_batch_start(state, unit)
 
     def on_predict_get_next_batch_end(self, state: State, unit: TPredictUnit) -> None:
         fn_name = "on_predict_get_next_batch_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_get_next_batch_end(state, unit)
 
     def on_predict_step_start(self, state: State, unit: TPredictUnit) -> None:
         fn_name = "on_predict_step_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_step_start(state, unit)
 
     def on_predict_step_end(self, state: State, unit: TPredictUnit) -> None:
         fn_name = "on_predict_step_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_step_end(state, unit)
 
     def on_predict_epoch_end(self, state: State, unit: TPredictUnit) -> None:
         fn_name = "on_predict_epoch_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_epoch_end(state, unit)
 
     def on_predict_end(self, state: State, unit: TPredictUnit) -> None:
         fn_name = "on_predict_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_predict_end(state, unit)
+        self._drain_async_callbacks()
 
     def on_test_start(self, state: State, unit: TTestUnit) -> None:
         fn_name = "on_test_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_start(state, unit)
 
     def on_test_epoch_start(self, state: State, unit: TTestUnit) -> None:
         fn_name = "on_test_epoch_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_epoch_start(state, unit)
@@ -347,6 +550,7 @@ class CallbackHandler:
         self, state: State, unit: TTestUnit
     ) -> None:
         fn_name = "on_test_dataloader_iter_creation_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_dataloader_iter_creation_start(state, unit)
@@ -355,42 +559,50 @@ class CallbackHandler:
         self, state: State, unit: TTestUnit
     ) -> None:
         fn_name = "on_test_dataloader_iter_creation_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_dataloader_iter_creation_end(state, unit)
 
     def on_test_get_next_batch_start(self, state: State, unit: TTestUnit) -> None:
         fn_name = "on_test_get_next_batch_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_get_next_batch_start(state, unit)
 
     def on_test_get_next_batch_end(self, state: State, unit: TTestUnit) -> None:
         fn_name = "on_test_get_next_batch_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_get_next_batch_end(state, unit)
 
     def on_test_step_start(self, state: State, unit: TTestUnit) -> None:
         fn_name = "on_test_step_start"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_step_start(state, unit)
 
     def on_test_step_end(self, state: State, unit: TTestUnit) -> None:
         fn_name = "on_test_step_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_step_end(state, unit)
 
     def on_test_epoch_end(self, state: State, unit: TTestUnit) -> None:
         fn_name = "on_test_epoch_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_epoch_end(state, unit)
 
     def on_test_end(self, state: State, unit: TTestUnit) -> None:
         fn_name = "on_test_end"
+        self._raise_async_callback_errors()
         callbacks = self._callbacks.get(fn_name, [])
         for cb in callbacks:
             cb.on_test_end(state, unit)
+        self._drain_async_callbacks()
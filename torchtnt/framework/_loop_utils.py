@@ -7,7 +7,20 @@
 # pyre-strict
 
 import logging
-from typing import Dict, Iterable, Optional, Protocol, runtime_checkable, TypeVar
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+    runtime_checkable,
+    Tuple,
+    TYPE_CHECKING,
+    TypeVar,
+)
 
 import torch
 import torch.nn as nn
@@ -34,6 +47,12 @@ except Exception:
 
 
 from torchtnt.utils.progress import Progress
+from torchtnt.utils.stateful import Stateful
+from torchtnt.utils.timer import TimerProtocol
+
+if TYPE_CHECKING:
+    from torchtnt.framework._callback_handler import CallbackHandler
+    from torchtnt.framework.state import PhaseState, State
 
 _logger: logging.Logger = logging.getLogger(__name__)
 T = TypeVar("T")
@@ -78,6 +97,77 @@ def _reason_epoch_completed(
     return f"Unable to determine reason for stopping train epoch {current_epoch}"
 
 
+def _num_steps_in_next_loop(
+    progress: Progress,
+    steps_per_loop: int,
+    max_steps_per_epoch: Optional[int],
+    max_steps: Optional[int],
+    every_n_steps: Optional[int] = None,
+) -> int:
+    """
+    Returns how many steps to run back to back, such that the loop does not run past the end of the epoch,
+    ``max_steps``, or the next multiple of ``every_n_steps``.
+    """
+    num_steps = steps_per_loop
+    if max_steps_per_epoch is not None:
+        num_steps = min(
+            num_steps, max_steps_per_epoch - progress.num_steps_completed_in_epoch
+        )
+    if max_steps is not None:
+        num_steps = min(num_steps, max_steps - progress.num_steps_completed)
+    if every_n_steps:
+        num_steps = min(
+            num_steps, every_n_steps - progress.num_steps_completed % every_n_steps
+        )
+    return max(num_steps, 1)
+
+
+def _run_steps(
+    state: "State",
+    phase_state: "PhaseState[object, object]",
+    unit: object,
+    callback_handler: "CallbackHandler",
+    phase: str,
+    progress: Progress,
+    get_next_batch: Callable[["State", Iterator[object]], object],
+    step_fn: Callable[["State", object], object],
+    data_iter: Iterator[object],
+    num_steps: int,
+) -> None:
+    """
+    Runs up to ``num_steps`` steps back to back for loops with ``steps_per_loop`` > 1. Step-level hooks are only
+    called on the callbacks whose ``step_hook_interval`` is due for each step. Returns early if ``state.should_stop``
+    is set, and raises StopIteration once ``data_iter`` is exhausted.
+    """
+    for _ in range(num_steps):
+        step = progress.num_steps_completed + 1
+        if callback_handler.step_hooks_due(phase, step):
+            # pyre-ignore[6]: unit is the unit of the given phase
+            callback_handler.run_step_hook(
+                f"on_{phase}_get_next_batch_start", state, unit, step
+            )
+            step_input = get_next_batch(state, data_iter)
+            # pyre-ignore[6]
+            callback_handler.run_step_hook(
+                f"on_{phase}_get_next_batch_end", state, unit, step
+            )
+            # pyre-ignore[6]
+            callback_handler.run_step_hook(f"on_{phase}_step_start", state, unit, step)
+            phase_state._step_output = step_fn(state, step_input)
+            progress.increment_step()
+            # pyre-ignore[6]
+            callback_handler.run_step_hook(f"on_{phase}_step_end", state, unit, step)
+        else:
+            step_input = get_next_batch(state, data_iter)
+            phase_state._step_output = step_fn(state, step_input)
+            progress.increment_step()
+        # clear step_output to avoid retaining extra memory
+        phase_state._step_output = None
+
+        if state.should_stop:
+            return
+
+
 @runtime_checkable
 class _DistributedSampler(Protocol):
     def set_epoch(self, epoch: int) -> None: ...
@@ -98,6 +188,125 @@ def _maybe_set_distributed_sampler_epoch(
             dataloader.batch_sampler.set_epoch(current_epoch)
 
 
+@runtime_checkable
+class _EvalBatchReplayer(Protocol):
+    def _replays_eval_batches(self, state: "State") -> bool: ...
+
+
+def _replays_eval_batches(state: "State", eval_unit: object) -> bool:
+    """Whether the unit serves the next eval epoch from batches it cached, so the eval dataloader need not be iterated."""
+    return isinstance(
+        eval_unit, _EvalBatchReplayer
+    ) and eval_unit._replays_eval_batches(state)
+
+
+def _timed_iter(dataloader: Iterable[object]) -> Tuple[Iterator[object], float]:
+    start_time = perf_counter()
+    data_iter = iter(dataloader)
+    return data_iter, perf_counter() - start_time
+
+
+def _reason_next_iter_prefetch_unsupported(
+    dataloader: Iterable[object],
+) -> Optional[str]:
+    """
+    Returns why the next epoch's iterator cannot be created while the current epoch is still being consumed, if so.
+    """
+    if (
+        isinstance(dataloader, torch.utils.data.DataLoader)
+        and dataloader.persistent_workers
+        and dataloader.num_workers > 0
+    ):
+        # iter() resets and returns the iterator the current epoch is consuming
+        return "it uses persistent workers"
+    if isinstance(dataloader, Stateful):
+        # a checkpoint taken during the current epoch would record the next iterator's state
+        return "it is stateful"
+    return None
+
+
+class _DataIterPrefetcher:
+    """Creates the iterator of a dataloader on a background thread, so that the cost of
+    ``iter(dataloader)`` (e.g. spawning DataLoader workers and filling their prefetch queues)
+    overlaps with other work in the loop instead of blocking it.
+
+    At most one iterator is prefetched at a time. A prefetched iterator is only handed out
+    for the same dataloader object it was created from.
+    """
+
+    def __init__(self, thread_name_prefix: str) -> None:
+        self._thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dataloader: Optional[Iterable[object]] = None
+        self._future: Optional[Future[Tuple[Iterator[object], float]]] = None
+
+    @property
+    def pending(self) -> bool:
+        return self._future is not None
+
+    def prefetch(self, dataloader: Iterable[object]) -> None:
+        if self._future is not None:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=self._thread_name_prefix
+            )
+        self._dataloader = dataloader
+        self._future = self._executor.submit(_timed_iter, dataloader)
+
+    def pop(
+        self, dataloader: Iterable[object]
+    ) -> Optional[Tuple[Iterator[object], float]]:
+        """Returns the prefetched iterator for ``dataloader`` and how long it took to create, if available.
+        Exceptions raised while creating the iterator are re-raised here."""
+        future, prefetched_dataloader = self._future, self._dataloader
+        self._future = None
+        self._dataloader = None
+        if future is None:
+            return None
+        if prefetched_dataloader is not dataloader:
+            _logger.info(
+                "Dataloader changed since its iterator was prefetched, discarding prefetched iterator."
+            )
+            future.cancel()
+            return None
+        return future.result()
+
+    def shutdown(self) -> None:
+        """Discards any pending iterator and joins the background thread. A pending iterator is still
+        created, rather than cancelled, so the number of ``iter`` calls does not depend on thread timing.
+        """
+        self._future = None
+        self._dataloader = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _get_data_iter(
+    dataloader: Iterable[T],
+    prefetcher: Optional[_DataIterPrefetcher],
+    timer: Optional[TimerProtocol],
+    event_name: str,
+) -> Iterator[T]:
+    """Returns ``iter(dataloader)``, using an iterator prefetched in the background if one is available.
+    When a prefetched iterator is used, the time hidden from the loop is recorded to ``timer`` under ``{event_name}_overlapped``.
+    """
+    if prefetcher is not None:
+        start_time = perf_counter()
+        prefetched = prefetcher.pop(dataloader)
+        if prefetched is not None:
+            data_iter, creation_time = prefetched
+            wait_time = perf_counter() - start_time
+            if timer is not None:
+                timer.recorded_durations[f"{event_name}_overlapped"].append(
+                    max(creation_time - wait_time, 0.0)
+                )
+            # pyre-ignore[7]: the prefetched iterator was created from `dataloader`
+            return data_iter
+    return iter(dataloader)
+
+
 def _set_module_training_mode(
     modules: Dict[str, nn.Module], mode: bool
 ) -> Dict[str, bool]:
@@ -9,6 +9,7 @@
 
 import contextlib
 import logging
+import traceback
 from abc import ABCMeta, abstractmethod
 from copy import deepcopy
 from dataclasses import dataclass
@@ -17,22 +18,27 @@ from typing import (
     Callable,
     cast,
     ContextManager,
+    Dict,
     Generic,
+    Iterable,
     Iterator,
     List,
     Optional,
     Tuple,
+    TYPE_CHECKING,
     TypeVar,
     Union,
 )
 
 import torch
+import torch.distributed as dist
 from pyre_extensions import none_throws
 from torch.distributed.fsdp import FSDPModule, FullyShardedDataParallel as FSDP
 from torch.distributed.tensor import DTensor
 from torch.distributed.tensor.parallel.loss import loss_parallel
 from torch.nn.parallel import DistributedDataParallel as DDP
 from torch.optim.swa_utils import SWALR
+from torch.utils._pytree import tree_flatten, tree_map_only, tree_unflatten
 from torchtnt.framework.state import ActivePhase, EntryPoint, State
 from torchtnt.framework.unit import (
     EvalUnit,
@@ -46,6 +52,14 @@ from torchtnt.utils.device import copy_data_to_device
 from torchtnt.utils.device_mesh import GlobalMeshCoordinator
 from torchtnt.utils.env import init_from_env
 from torchtnt.utils.lr_scheduler import TLRScheduler
+from torchtnt.utils.memory import get_tensor_size_bytes_map
+from torchtnt.utils.metric_accumulator import DeviceMetricAccumulator
+from torchtnt.utils.oom import is_out_of_memory_error
+from torchtnt.utils.optimizer import (
+    _get_deduped_name,
+    clip_grads_with_norm_,
+    get_grad_norms,
+)
 from torchtnt.utils.precision import (
     convert_precision_str_to_dtype,
     get_grad_scaler_from_precision,
@@ -65,6 +79,9 @@ from torchtnt.utils.prepare_module import (
 from torchtnt.utils.swa import AveragedModel
 from typing_extensions import Literal
 
+if TYPE_CHECKING:
+    from torchtnt.utils.data.shape_bucketing import ShapeBucketer
+
 _logger: logging.Logger = logging.getLogger(__name__)
 
 
@@ -111,6 +128,8 @@ class SWAParams:
             specified ema_decay as more updates occur. The ``averaging_method`` must be
             set to ema.
         swalr_params: params for SWA learning rate scheduler
+        cpu_offload: if True, the averaged model is kept in pinned CPU memory and updated on a background thread.
+            See :class:`~torchtnt.utils.swa.AveragedModel`. Not supported with FSDP.
 
         Note: Whether steps or epochs is used based on what `step_lr_interval` is set on the AutoUnit.
 
@@ -125,6 +144,320 @@ class SWAParams:
     ema_decay: float = 0.999
     use_lit: bool = False
     swalr_params: Optional[SWALRParams] = None
+    cpu_offload: bool = False
+
+
+@dataclass
+class EvalCacheParams:
+    """
+    Dataclass to store parameters for caching eval batches across evaluation rounds.
+
+    When enabled, the first evaluation pass records every batch after ``move_data_to_device``, and later passes
+    replay the recorded batches instead of reading from the eval dataloader. This is useful when periodically
+    evaluating on a small, fixed eval set during :py:func:`~torchtnt.framework.fit`.
+
+    Args:
+        max_device_bytes: maximum number of bytes of batches to keep on the unit's device. ``None`` means no limit.
+        max_host_bytes: maximum number of bytes of batches to spill to host memory once ``max_device_bytes`` is reached.
+            Spilled batches are copied back to the device when replayed.
+        pin_memory: whether to pin host memory for spilled batches, to speed up copying them back to a CUDA device.
+
+    Note:
+        If the eval set does not fit within ``max_device_bytes + max_host_bytes``, caching is disabled for that dataloader
+        and batches are read from it as usual.
+
+    Note:
+        The cache is invalidated when the eval dataloader object or ``max_steps_per_epoch`` changes. Cached batches are
+        replayed as is, so this should not be used with eval data that is randomly augmented or changes between rounds,
+        and ``compute_loss`` must not modify eval batches in place.
+    """
+
+    max_device_bytes: Optional[int] = None
+    max_host_bytes: int = 0
+    pin_memory: bool = True
+
+
+@dataclass
+class GradNormParams:
+    """
+    Dataclass to store parameters for computing gradient norms in ``_update_weights``.
+
+    When enabled, the norms of the gradients of each optimizer param group are computed together with a single
+    ``torch._foreach_norm`` call, see :func:`~torchtnt.utils.optimizer.get_grad_norms`, and the total norm is reused to
+    clip the gradients if ``clip_grad_norm`` is set. For DTensor gradients, e.g. with FSDP2, the norm is reduced with a
+    single all-reduce of the per-group norms, instead of materializing the total norm with ``full_tensor()``.
+
+    Without ``clip_grad_norm``, the norms are only computed on train steps which update the weights and are a multiple
+    of ``log_every_n_steps``, and reported in :class:`~torchtnt.framework.auto_unit.TrainStepResults`. With
+    ``clip_grad_norm``, they are computed and reported on every step which updates the weights, since clipping needs them.
+
+    Args:
+        log_every_n_steps: interval, in train steps, at which gradient norms are computed when they are not needed for clipping.
+        norm_type: type of the p-norm. Can be ``inf`` for the infinity norm.
+
+    Note:
+        Not supported for modules wrapped with FSDP1, which compute the norm with ``FSDP.clip_grad_norm_``.
+    """
+
+    log_every_n_steps: int = 1
+    norm_type: float = 2.0
+
+
+@dataclass
+class MicroBatchParams:
+    """
+    Dataclass to store parameters for adaptive micro-batching in ``train_step``.
+
+    When enabled, each train batch is split into ``num_micro_batches`` chunks along the batch dimension, and the forward
+    and backward passes run chunk by chunk, accumulating gradients before the optimizer step. Gradient synchronization
+    is skipped for all but the last chunk, as with ``gradient_accumulation_steps``. If a chunk runs out of memory, the
+    number of micro-batches is multiplied by ``growth_factor`` and the step is retried. The number of micro-batches is
+    saved in checkpoints, so restarted jobs do not probe it again.
+
+    Args:
+        initial_num_micro_batches: number of micro-batches to start with.
+        max_num_micro_batches: the out of memory error is raised if more micro-batches would be needed.
+        growth_factor: factor by which the number of micro-batches is increased after running out of memory.
+        split_fn: optional function which splits a batch into the given number of chunks, returning the chunks and the
+            fraction of the batch in each chunk. By default, tensors whose first dimension matches the batch size are
+            split with ``torch.tensor_split`` and other values are passed to every chunk.
+
+    Note:
+        Chunk losses are weighted by the fraction of the batch in each chunk, which matches processing the whole batch
+        when ``compute_loss`` averages over the batch. Tensor outputs are concatenated along the first dimension.
+
+    Note:
+        Gradients accumulated in a step that runs out of memory are discarded before retrying it. With
+        ``gradient_accumulation_steps > 1``, this also discards the gradients of the previous steps in the accumulation window.
+
+    Note:
+        In distributed training, ranks check whether any of them ran out of memory, and that they all run the same
+        number of micro-batches, with a single all-reduce per step, right before the backward pass of the last chunk,
+        so that all ranks retry the step together. A rank which runs out of memory skips its remaining chunks and joins
+        that all-reduce. This requires the error to be raised outside of a collective: running out of memory on only
+        some ranks during the backward pass of the last chunk, which synchronizes gradients, or during the all-gathers
+        of a sharded module, cannot be recovered from.
+    """
+
+    initial_num_micro_batches: int = 1
+    max_num_micro_batches: int = 64
+    growth_factor: int = 2
+    split_fn: Optional[Callable[[Any, int], Tuple[List[Any], List[float]]]] = None
+
+
+def _split_batch(data: Any, num_chunks: int) -> Tuple[List[Any], List[float]]:
+    leaves, spec = tree_flatten(data)
+    batch_size = next(
+        (
+            leaf.size(0)
+            for leaf in leaves
+            if isinstance(leaf, torch.Tensor) and leaf.dim() > 0
+        ),
+        None,
+    )
+    if batch_size is None:
+        raise ValueError(
+            "Unable to split the batch into micro-batches since it has no tensors. Please pass a split_fn in MicroBatchParams."
+        )
+    num_chunks = min(num_chunks, batch_size)
+    split_leaves = [
+        (
+            torch.tensor_split(leaf, num_chunks)
+            if isinstance(leaf, torch.Tensor)
+            and leaf.dim() > 0
+            and leaf.size(0) == batch_size
+            else [leaf] * num_chunks
+        )
+        for leaf in leaves
+    ]
+    chunks = [
+        tree_unflatten([split[i] for split in split_leaves], spec)
+        for i in range(num_chunks)
+    ]
+    sizes = [
+        len(chunk) for chunk in torch.tensor_split(torch.arange(batch_size), num_chunks)
+    ]
+    return chunks, [size / batch_size for size in sizes]
+
+
+def _concat_outputs(outputs: List[Any]) -> Any:
+    if len(outputs) == 1:
+        return outputs[0]
+    flat_outputs = [tree_flatten(output) for output in outputs]
+    spec = flat_outputs[-1][1]
+    leaves = []
+    for chunk_leaves in zip(*(flat for flat, _ in flat_outputs)):
+        last = chunk_leaves[-1]
+        if isinstance(last, torch.Tensor) and last.dim() > 0:
+            leaves.append(torch.cat(chunk_leaves))
+        else:
+            leaves.append(last)
+    return tree_unflatten(leaves, spec)
+
+
+def _agree_micro_batch_outcome(
+    outcome: int, num_micro_batches: int, device: torch.device
+) -> Tuple[int, int, int]:
+    """
+    Returns the worst outcome of a micro-batched attempt across all ranks, and the minimum and maximum number of
+    micro-batches, with a single all-reduce.
+    """
+    if (
+        not dist.is_available()
+        or not dist.is_initialized()
+        or dist.get_world_size() == 1
+    ):
+        return outcome, num_micro_batches, num_micro_batches
+    tensor = torch.tensor(
+        [outcome, -num_micro_batches, num_micro_batches], device=device
+    )
+    dist.all_reduce(tensor, op=dist.ReduceOp.MAX)
+    max_outcome, neg_min_num_micro_batches, max_num_micro_batches = tensor.tolist()
+    return max_outcome, -neg_min_num_micro_batches, max_num_micro_batches
+
+
+# outcomes of a micro-batched attempt, ordered so that all ranks act on the maximum
+_MICRO_BATCH_OK = 0
+_MICRO_BATCH_RETRY = 1
+_MICRO_BATCH_FAILED = 2
+
+
+class _MicroBatchAborted(Exception):
+    """Raised to abandon a micro-batched attempt after another rank ran out of memory."""
+
+
+class _MicroBatchState:
+    """Tracks the number of micro-batches per train step, and saves it in checkpoints."""
+
+    def __init__(self, params: MicroBatchParams) -> None:
+        if params.initial_num_micro_batches < 1:
+            raise ValueError(
+                f"initial_num_micro_batches must be >= 1. Got {params.initial_num_micro_batches}"
+            )
+        if params.growth_factor < 2:
+            raise ValueError(f"growth_factor must be >= 2. Got {params.growth_factor}")
+        self.params = params
+        self.num_micro_batches: int = params.initial_num_micro_batches
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {"num_micro_batches": self.num_micro_batches}
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self.num_micro_batches = state_dict["num_micro_batches"]
+
+
+class _EvalBatchCache:
+    """Records eval batches during one evaluation pass and replays them in later passes."""
+
+    def __init__(self, params: EvalCacheParams, device: torch.device) -> None:
+        self._params = params
+        self._device = device
+        # a reference rather than an id, which a new dataloader may reuse once this one is freed
+        self._dataloader: Optional[Iterable[object]] = None
+        self._max_steps_per_epoch: Optional[int] = None
+        # cached batches, along with whether they were spilled to host memory
+        self._batches: List[Tuple[Any, bool]] = []
+        self._device_bytes = 0
+        self._host_bytes = 0
+        self._end_reached = False
+        # set when the eval set does not fit in the memory budget
+        self._disabled = False
+        self._replaying = False
+        self._replay_idx = 0
+
+    @property
+    def replaying(self) -> bool:
+        return self._replaying
+
+    def _matches(
+        self, dataloader: Iterable[object], max_steps_per_epoch: Optional[int]
+    ) -> bool:
+        return (
+            dataloader is self._dataloader
+            and max_steps_per_epoch == self._max_steps_per_epoch
+        )
+
+    def _complete(self) -> bool:
+        return self._end_reached or (
+            self._max_steps_per_epoch is not None
+            and len(self._batches) == self._max_steps_per_epoch
+        )
+
+    def will_replay(
+        self, dataloader: Iterable[object], max_steps_per_epoch: Optional[int]
+    ) -> bool:
+        """Whether an epoch over ``dataloader`` started now would be replayed from the cache."""
+        return (
+            self._matches(dataloader, max_steps_per_epoch)
+            and self._complete()
+            and not self._disabled
+        )
+
+    def start_epoch(
+        self, dataloader: Iterable[object], max_steps_per_epoch: Optional[int]
+    ) -> None:
+        if self._matches(dataloader, max_steps_per_epoch) and (
+            self._complete() or self._disabled
+        ):
+            self._replaying = not self._disabled
+            self._replay_idx = 0
+            return
+
+        if self._dataloader is not None:
+            _logger.info("Eval dataloader changed, invalidating eval batch cache.")
+        self._reset()
+        self._dataloader = dataloader
+        self._max_steps_per_epoch = max_steps_per_epoch
+
+    def _reset(self) -> None:
+        self._batches = []
+        self._device_bytes = 0
+        self._host_bytes = 0
+        self._end_reached = False
+        self._disabled = False
+        self._replaying = False
+        self._replay_idx = 0
+
+    def record(self, batch: Any) -> None:
+        if self._disabled:
+            return
+        num_bytes = sum(get_tensor_size_bytes_map(batch).values())
+        max_device_bytes = self._params.max_device_bytes
+        if (
+            max_device_bytes is None
+            or self._device_bytes + num_bytes <= max_device_bytes
+        ):
+            self._batches.append((batch, False))
+            self._device_bytes += num_bytes
+        elif self._host_bytes + num_bytes <= self._params.max_host_bytes:
+            host_batch = copy_data_to_device(batch, torch.device("cpu"))
+            if self._params.pin_memory and self._device.type == "cuda":
+                host_batch = tree_map_only(
+                    torch.Tensor, lambda t: t.pin_memory(), host_batch
+                )
+            self._batches.append((host_batch, True))
+            self._host_bytes += num_bytes
+        else:
+            _logger.warning(
+                "Eval set does not fit in the eval batch cache memory budget "
+                f"(max_device_bytes={max_device_bytes}, max_host_bytes={self._params.max_host_bytes}). "
+                "Disabling eval batch caching for this dataloader."
+            )
+            self._batches = []
+            self._device_bytes = 0
+            self._host_bytes = 0
+            self._disabled = True
+
+    def mark_end_reached(self) -> None:
+        if not self._replaying:
+            self._end_reached = True
+
+    def replay(self) -> Tuple[Any, bool]:
+        if self._replay_idx >= len(self._batches):
+            raise StopIteration
+        batch = self._batches[self._replay_idx]
+        self._replay_idx += 1
+        return batch
 
 
 @dataclass
@@ -134,13 +467,16 @@ class TrainStepResults:
 
     Args:
         loss: the loss computed in the ``compute_loss`` function
-        total_grad_norm: total norm of the parameter gradients, if gradient norm clipping is enabled
+        total_grad_norm: total norm of the parameter gradients, if gradient norm clipping is enabled, or if computed according to ``grad_norm_params``
         outputs: the outputs of the model forward pass
+        param_group_grad_norms: norm of the gradients of each optimizer param group, if computed according to ``grad_norm_params``.
+            Keys are the param group names, deduplicated as in :func:`~torchtnt.utils.optimizer.extract_lr_from_optimizer`.
     """
 
     loss: torch.Tensor
     total_grad_norm: Optional[torch.Tensor]
     outputs: Any
+    param_group_grad_norms: Optional[Dict[str, torch.Tensor]] = None
 
 
 class _ConfigureOptimizersCaller(ABCMeta):
@@ -183,6 +519,7 @@ class _AutoUnitMixin(Generic[TData]):
         detect_anomaly: Optional[bool] = None,
         torch_compile_params: Optional[TorchCompileParams] = None,
         enable_prefetch: bool = True,
+        shape_bucketer: Optional["ShapeBucketer"] = None,
     ) -> None:
         super().__init__()
 
@@ -237,6 +574,7 @@ class _AutoUnitMixin(Generic[TData]):
         # whether the current batch is the last train batch
         self._is_last_batch: bool = False
         self._enable_prefetch = enable_prefetch
+        self.shape_bucketer: Optional["ShapeBucketer"] = shape_bucketer
 
     def move_data_to_device(
         self,
@@ -283,6 +621,8 @@ class _AutoUnitMixin(Generic[TData]):
             self._phase_to_next_batch[active_phase] = None
             self._is_last_batch = True
             return
+        if self.shape_bucketer is not None:
+            next_batch = self.shape_bucketer(next_batch)
 
         non_blocking = bool(
             self.device.type == "cuda" and self._phase_to_prefetched[active_phase]
@@ -301,6 +641,8 @@ class _AutoUnitMixin(Generic[TData]):
     def _get_next_batch(self, state: State, data: Iterator[TData]) -> TData:
         if not self._enable_prefetch:
             batch = next(data)
+            if self.shape_bucketer is not None:
+                batch = self.shape_bucketer(batch)
             return self.move_data_to_device(state, batch, non_blocking=True)
 
         active_phase = state.active_phase
@@ -340,6 +682,7 @@ class AutoPredictUnit(_AutoUnitMixin[TPredictData], PredictUnit[TPredictData]):
         detect_anomaly: Optional[bool] = None,
         enable_prefetch: bool = False,
         global_mesh: Optional[GlobalMeshCoordinator] = None,
+        shape_bucketer: Optional["ShapeBucketer"] = None,
     ) -> None:
         """
         AutoPredictUnit is a convenience for users who are running inference and would like to have certain features handled for them, such as:
@@ -363,6 +706,8 @@ class AutoPredictUnit(_AutoUnitMixin[TPredictData], PredictUnit[TPredictData]):
             torch_compile_params: params for Torch compile https://pytorch.org/docs/stable/generated/torch.compile.html
             detect_anomaly: whether to enable anomaly detection for the autograd engine https://pytorch.org/docs/stable/autograd.html#anomaly-detection
             global_mesh: an instance of :class:`~torchtnt.utils.device_mesh.GlobalMeshCoordinator` which defines the global mesh topology. Needed to configure TP or 2D parallelism strategies.
+            shape_bucketer: a :class:`~torchtnt.utils.data.ShapeBucketer` which pads each mapping batch to a fixed set of shapes before it is moved to device,
+                so variable-length inputs do not trigger a recompilation of the compiled module for every new shape.
 
         Note:
             Torch compile support is only available in PyTorch 2.0 or higher.
@@ -374,6 +719,7 @@ class AutoPredictUnit(_AutoUnitMixin[TPredictData], PredictUnit[TPredictData]):
             torch_compile_params=torch_compile_params,
             detect_anomaly=detect_anomaly,
             enable_prefetch=enable_prefetch,
+            shape_bucketer=shape_bucketer,
         )
         self.module: torch.nn.Module = prepare_module(
             module,
@@ -498,6 +844,16 @@ class AutoUnit(
         zero_grad_at_train_step_start: if True, the optimizer's gradients will be zeroed at the start of each train step, rather than at the end. Useful if you want to inspect/log the gradients via custom callback.
         global_mesh: an instance of :class:`~torchtnt.utils.device_mesh.GlobalMeshCoordinator` which defines the global mesh topology. Needed to configure TP or 2D parallelism strategies.
         enable_loss_parallel: if True, the loss will be computed in parallel across all ranks. This is only supported for TP strategy + cross entropy loss.
+        eval_cache_params: params for caching eval batches on device across evaluation rounds, see :class:`~torchtnt.framework.auto_unit.EvalCacheParams`.
+        micro_batch_params: params for splitting train batches into micro-batches, adapting their number when running out of memory,
+            see :class:`~torchtnt.framework.auto_unit.MicroBatchParams`.
+        grad_norm_params: params for computing gradient norms of all optimizer param groups at once, and reusing them for clipping,
+            see :class:`~torchtnt.framework.auto_unit.GradNormParams`.
+        accumulate_step_metrics: if True, the losses and gradient norms of each step are recorded on device in ``self.train_step_metrics``
+            and ``self.eval_step_metrics``, which are :class:`~torchtnt.utils.metric_accumulator.DeviceMetricAccumulator` s. They can be logged
+            without synchronizing with the device every step using :class:`~torchtnt.framework.callbacks.AccumulatedMetricLogger`.
+        shape_bucketer: a :class:`~torchtnt.utils.data.ShapeBucketer` which pads each mapping batch to a fixed set of shapes before it is moved to device,
+            so variable-length inputs do not trigger a recompilation of the compiled module for every new shape.
 
     Note:
         Certain strategies, like :class:`~torchtnt.utils.prepare_module.FSDPStrategy` also support mixed precision as an argument, so can be configured through that class as well.
@@ -537,6 +893,11 @@ class AutoUnit(
         zero_grad_at_train_step_start: bool = False,
         global_mesh: Optional[GlobalMeshCoordinator] = None,
         enable_loss_parallel: bool = False,
+        eval_cache_params: Optional[EvalCacheParams] = None,
+        micro_batch_params: Optional[MicroBatchParams] = None,
+        grad_norm_params: Optional[GradNormParams] = None,
+        accumulate_step_metrics: bool = False,
+        shape_bucketer: Optional["ShapeBucketer"] = None,
     ) -> None:
         super().__init__(
             module=module,
@@ -545,6 +906,7 @@ class AutoUnit(
             detect_anomaly=detect_anomaly,
             torch_compile_params=torch_compile_params,
             enable_prefetch=enable_prefetch,
+            shape_bucketer=shape_bucketer,
         )
 
         if not gradient_accumulation_steps > 0:
@@ -566,12 +928,13 @@ class AutoUnit(
 
             self.swa_model = AveragedModel(
                 module_for_swa,
-                device=self.device,
+                device=None if swa_params.cpu_offload else self.device,
                 use_buffers=swa_params.use_buffers,
                 averaging_method=swa_params.averaging_method,
                 ema_decay=swa_params.ema_decay,
                 skip_deepcopy=skip_deepcopy,
                 use_lit=swa_params.use_lit,
+                cpu_offload=swa_params.cpu_offload,
             )
 
         self.module: torch.nn.Module = prepare_module(
@@ -616,6 +979,28 @@ class AutoUnit(
         self.maybe_loss_parallel: Callable = (
             loss_parallel if enable_loss_parallel else contextlib.nullcontext
         )
+        self._eval_cache: Optional[_EvalBatchCache] = (
+            _EvalBatchCache(eval_cache_params, self.device)
+            if eval_cache_params is not None
+            else None
+        )
+        # tracked as a stateful, so the number of micro-batches is checkpointed
+        self.micro_batch_state: Optional[_MicroBatchState] = (
+            _MicroBatchState(micro_batch_params)
+            if micro_batch_params is not None
+            else None
+        )
+        if grad_norm_params is not None and grad_norm_params.log_every_n_steps < 1:
+            raise ValueError(
+                f"log_every_n_steps must be >= 1. Got {grad_norm_params.log_every_n_steps}"
+            )
+        self.grad_norm_params = grad_norm_params
+        self._param_group_grad_norms: Optional[Dict[str, torch.Tensor]] = None
+        self.train_step_metrics: Optional[DeviceMetricAccumulator] = None
+        self.eval_step_metrics: Optional[DeviceMetricAccumulator] = None
+        if accumulate_step_metrics:
+            self.train_step_metrics = DeviceMetricAccumulator(device=self.device)
+            self.eval_step_metrics = DeviceMetricAccumulator(device=self.device)
 
     def __setattr__(self, name: str, value: object) -> None:
         if isinstance(value, torch.nn.Module):
@@ -697,6 +1082,50 @@ class AutoUnit(
             self.zero_grad(state)
             self._weight_updated_in_prev_step = False
 
+        if self.micro_batch_state is None:
+            loss, outputs = self._forward_backward(state, data, should_update_weights)
+        else:
+            loss, outputs = self._micro_batched_forward_backward(
+                state, data, should_update_weights
+            )
+
+        total_grad_norm = None
+        if should_update_weights:
+            total_grad_norm = self._update_weights(state)
+
+        param_group_grad_norms = None
+        if should_update_weights:
+            # consume the norms computed by _update_weights, if any
+            param_group_grad_norms = self._param_group_grad_norms
+            self._param_group_grad_norms = None
+
+        if self.train_step_metrics is not None:
+            self.train_step_metrics.update("train_loss", loss)
+            if total_grad_norm is not None:
+                self.train_step_metrics.update("train_grad_norm", total_grad_norm)
+            for name, norm in (param_group_grad_norms or {}).items():
+                self.train_step_metrics.update(f"train_grad_norm/{name}", norm)
+
+        step = self.train_progress.num_steps_completed
+        results = TrainStepResults(
+            loss, total_grad_norm, outputs, param_group_grad_norms
+        )
+        self.on_train_step_end(state, data, step, results)
+        return loss, outputs
+
+    def _forward_backward(
+        self,
+        state: State,
+        data: TData,
+        sync_grads: bool,
+        loss_weight: float = 1.0,
+        before_backward: Optional[Callable[[], None]] = None,
+    ) -> Tuple[torch.Tensor, Any]:
+        """
+        Runs the forward pass, loss computation and backward pass on ``data``. Gradient synchronization is skipped if
+        ``sync_grads`` is False, and the normalized loss is scaled by ``loss_weight`` before the backward pass.
+        ``before_backward`` is called between the loss computation and the backward pass, if set.
+        """
         # for pyre, assign to local variable
         module = self.module
 
@@ -706,16 +1135,19 @@ class AutoUnit(
         # https://pytorch.org/docs/stable/fsdp.html#torch.distributed.fsdp.FullyShardedDataParallel.no_sync
         maybe_no_sync = (
             module.no_sync()
-            if not should_update_weights
+            if not sync_grads
             and not self.gradient_accumulation_sync
             and (isinstance(module, DDP) or isinstance(module, FSDP))
             else contextlib.nullcontext()
         )
         # fsdp2 has separate way of disabling gradient sync
         if _is_fsdp2_module(module) and not self.gradient_accumulation_sync:
-            if not should_update_weights:
+            if not sync_grads:
                 cast(FSDPModule, module).set_requires_gradient_sync(False)
-            elif should_update_weights and self.gradient_accumulation_steps > 1:
+            elif (
+                self.gradient_accumulation_steps > 1
+                or self.micro_batch_state is not None
+            ):
                 # if gradient accumulation is used and it's time to update weights,
                 # we need to re-enable gradient sync
                 cast(FSDPModule, module).set_requires_gradient_sync(True)
@@ -739,6 +1171,10 @@ class AutoUnit(
 
             # normalize loss to account for gradient accumulation
             loss = self._normalize_loss_for_gradient_accumulation(loss)
+            if loss_weight != 1.0:
+                loss = loss * loss_weight
+            if before_backward is not None:
+                before_backward()
 
             try:
                 from torch._dynamo.utils import maybe_enable_compiled_autograd
@@ -766,15 +1202,109 @@ class AutoUnit(
                     ):
                         loss.backward(retain_graph=self.loss_backward_retain_graph)
 
-        total_grad_norm = None
-        if should_update_weights:
-            total_grad_norm = self._update_weights(state)
-
-        step = self.train_progress.num_steps_completed
-        results = TrainStepResults(loss, total_grad_norm, outputs)
-        self.on_train_step_end(state, data, step, results)
         return loss, outputs
 
+    def _micro_batched_forward_backward(
+        self, state: State, data: TData, should_update_weights: bool
+    ) -> Tuple[torch.Tensor, Any]:
+        micro_batch_state = none_throws(self.micro_batch_state)
+        params = micro_batch_state.params
+        split_fn = params.split_fn or _split_batch
+        while True:
+            num_micro_batches = micro_batch_state.num_micro_batches
+            chunks, weights = split_fn(data, num_micro_batches)
+            losses = []
+            outputs = []
+            oom_error = None
+            outcome = _MICRO_BATCH_OK
+            # ranks agree on the outcome and on the number of micro-batches once per attempt, right before the
+            # backward pass of the last chunk, which may synchronize gradients, so that they all retry together
+            agreement: Optional[Tuple[int, int, int]] = None
+
+            def agree_before_last_backward() -> None:
+                nonlocal agreement
+                agreement = _agree_micro_batch_outcome(
+                    _MICRO_BATCH_OK, num_micro_batches, self.device
+                )
+                if agreement != (_MICRO_BATCH_OK, num_micro_batches, num_micro_batches):
+                    raise _MicroBatchAborted()
+
+            for i, (chunk, weight) in enumerate(zip(chunks, weights)):
+                is_last = i == len(chunks) - 1
+                try:
+                    chunk_loss, chunk_outputs = self._forward_backward(
+                        state,
+                        chunk,
+                        sync_grads=should_update_weights and is_last,
+                        loss_weight=weight,
+                        before_backward=(
+                            agree_before_last_backward if is_last else None
+                        ),
+                    )
+                except _MicroBatchAborted:
+                    # another rank ran out of memory, or runs another number of micro-batches
+                    break
+                except RuntimeError as e:
+                    if not is_out_of_memory_error(e) or agreement is not None:
+                        # the backward pass of the last chunk synchronizes gradients, so it cannot be retried
+                        raise
+                    # the traceback holds the activations of the failed chunk
+                    traceback.clear_frames(e.__traceback__)
+                    oom_error = e
+                    can_grow = (
+                        num_micro_batches * params.growth_factor
+                        <= params.max_num_micro_batches
+                        and len(chunks) >= num_micro_batches
+                    )
+                    outcome = _MICRO_BATCH_RETRY if can_grow else _MICRO_BATCH_FAILED
+                    break
+                losses.append(chunk_loss.detach())
+                outputs.append(chunk_outputs)
+                del chunk_loss, chunk_outputs
+            if agreement is None:
+                # join the agreement the other ranks hold before the backward pass of their last chunk
+                agreement = _agree_micro_batch_outcome(
+                    outcome, num_micro_batches, self.device
+                )
+
+            outcome, min_num_micro_batches, max_num_micro_batches = agreement
+            if outcome == _MICRO_BATCH_OK and (
+                min_num_micro_batches == max_num_micro_batches == num_micro_batches
+            ):
+                return torch.stack(losses).sum(), _concat_outputs(outputs)
+            if outcome == _MICRO_BATCH_FAILED:
+                # the batch cannot be split any further on some rank
+                if oom_error is not None:
+                    raise oom_error
+                raise RuntimeError(
+                    f"Another rank ran out of memory with {max_num_micro_batches} micro-batches and cannot split its batch any further."
+                )
+
+            if outcome == _MICRO_BATCH_RETRY:
+                next_num_micro_batches = max_num_micro_batches * params.growth_factor
+                cause = "Ran" if oom_error is not None else "Another rank ran"
+                _logger.warning(
+                    f"{cause} out of memory with {num_micro_batches} micro-batches, retrying the train step with {next_num_micro_batches}."
+                )
+            else:
+                # e.g. ranks restored from checkpoints saved with different numbers of micro-batches
+                next_num_micro_batches = max_num_micro_batches
+                _logger.warning(
+                    f"Ranks ran between {min_num_micro_batches} and {max_num_micro_batches} micro-batches, retrying the train step with {next_num_micro_batches}."
+                )
+            micro_batch_state.num_micro_batches = next_num_micro_batches
+
+            # free the memory held by the failed attempt before retrying
+            del losses, outputs, chunks, oom_error
+            module = self.module
+            if isinstance(module, DDP):
+                # DDP expects a backward pass after a forward pass run with gradient synchronization, which the
+                # abandoned attempt may not have run
+                module.reducer._reset_state()
+            self.zero_grad(state)
+            if self.device.type == "cuda":
+                torch.cuda.empty_cache()
+
     def _normalize_loss_for_gradient_accumulation(
         self, loss: torch.Tensor
     ) -> torch.Tensor:
@@ -819,6 +1349,9 @@ class AutoUnit(
             with get_timing_context(state, f"{self.__class__.__name__}.compute_loss"):
                 loss, outputs = self.compute_loss(state, data)
 
+        if self.eval_step_metrics is not None:
+            self.eval_step_metrics.update("eval_loss", loss)
+
         if state.entry_point == EntryPoint.FIT:
             step = self.train_progress.num_steps_completed
         else:
@@ -953,8 +1486,26 @@ class AutoUnit(
                 grad_scaler.unscale_(optimizer)
 
         total_grad_norm = None
+        grad_norm_params = self.grad_norm_params
+        if grad_norm_params is not None and not isinstance(module, FSDP):
+            # compute all norms at once, and reuse them for clipping
+            step = self.train_progress.num_steps_completed + 1
+            if clip_grad_norm or step % grad_norm_params.log_every_n_steps == 0:
+                with get_timing_context(state, f"{self.__class__.__name__}.grad_norm"):
+                    total_grad_norm = self._compute_grad_norms(
+                        optimizer, grad_norm_params.norm_type
+                    )
+            if clip_grad_norm:
+                with get_timing_context(
+                    state, f"{self.__class__.__name__}.clip_grad_norm"
+                ):
+                    clip_grads_with_norm_(
+                        module.parameters(),
+                        max_norm=clip_grad_norm,
+                        total_norm=none_throws(total_grad_norm),
+                    )
         # gradient norm clipping
-        if clip_grad_norm:
+        elif clip_grad_norm:
             if isinstance(module, FSDP):
                 with get_timing_context(
                     state, f"{self.__class__.__name__}.clip_grad_norm"
@@ -1003,6 +1554,19 @@ class AutoUnit(
 
         return total_grad_norm
 
+    def _compute_grad_norms(
+        self, optimizer: torch.optim.Optimizer, norm_type: float
+    ) -> torch.Tensor:
+        total_norm, group_norms = get_grad_norms(
+            [group["params"] for group in optimizer.param_groups], norm_type
+        )
+        seen_names: Dict[str, int] = {}
+        self._param_group_grad_norms = {
+            _get_deduped_name(seen_names, group.get("name", "pg")): norm
+            for group, norm in zip(optimizer.param_groups, group_norms)
+        }
+        return total_norm
+
     # pyrefly: ignore [bad-override]
     def get_next_train_batch(
         self, state: State, data_iter: Iterator[TData]
@@ -1019,7 +1583,49 @@ class AutoUnit(
         # Override the default behavior from PredictUnit in order to enable prefetching if possible.
         if self._eval_step_requires_iterator:
             return data_iter
-        return self._get_next_batch(state, data_iter)
+        eval_cache = self._eval_cache
+        if eval_cache is None:
+            return self._get_next_batch(state, data_iter)
+        return self._get_next_cached_eval_batch(state, data_iter, eval_cache)
+
+    def _replays_eval_batches(self, state: State) -> bool:
+        eval_cache = self._eval_cache
+        if (
+            self._eval_step_requires_iterator
+            or eval_cache is None
+            or self.eval_progress.num_steps_completed_in_epoch != 0
+        ):
+            return False
+        eval_state = none_throws(state.eval_state)
+        return eval_cache.will_replay(
+            eval_state.dataloader, eval_state.max_steps_per_epoch
+        )
+
+    def _get_next_cached_eval_batch(
+        self, state: State, data_iter: Iterator[TData], eval_cache: _EvalBatchCache
+    ) -> TData:
+        eval_state = none_throws(state.eval_state)
+        if self.eval_progress.num_steps_completed_in_epoch == 0:
+            eval_cache.start_epoch(
+                eval_state.dataloader, eval_state.max_steps_per_epoch
+            )
+
+        if eval_cache.replaying:
+            with get_timing_context(
+                state, f"{self.__class__.__name__}.eval_cache_replay"
+            ):
+                batch, spilled = eval_cache.replay()
+                if spilled:
+                    batch = self.move_data_to_device(state, batch, non_blocking=True)
+            return batch
+
+        try:
+            batch = self._get_next_batch(state, data_iter)
+        except StopIteration:
+            eval_cache.mark_end_reached()
+            raise
+        eval_cache.record(batch)
+        return batch
 
     # pyrefly: ignore [bad-override]
     def get_next_predict_batch(
@@ -6,7 +6,7 @@
 
 # pyre-strict
 
-from typing import Union
+from typing import Optional, Union
 
 from torchtnt.framework.state import State
 from torchtnt.framework.unit import TEvalUnit, TPredictUnit, TTestUnit, TTrainUnit
@@ -53,8 +53,27 @@ class Callback:
 
       printing_callback = PrintingCallback()
       train(train_unit, train_dataloader, callbacks=[printing_callback])
+
+    When a loop runs multiple steps per iteration with ``steps_per_loop``, a callback can set ``step_hook_interval``
+    to declare how often it needs its step-level hooks, so the loop can skip calling them in between.
+
+    Callbacks which only have side effects, such as logging, can set ``run_async`` to keep their hooks off the trainer thread.
     """
 
+    #: Number of steps between calls to the step-level hooks (``on_*_get_next_batch_start``, ``on_*_get_next_batch_end``,
+    #: ``on_*_step_start`` and ``on_*_step_end``) when the loop runs with ``steps_per_loop`` greater than 1. The hooks are
+    #: called for steps whose number, as counted by the phase's progress, is a multiple of this value. ``None`` means every step.
+    step_hook_interval: Optional[int] = None
+
+    #: Whether the hooks of this callback run on a background worker instead of the trainer thread. Hooks receive snapshots
+    #: of the state and unit taken when the hook was due, and run in order. The snapshots are shallow: the progress counters,
+    #: the active phase and the step outputs are those of the time the hook was due, but modules, optimizers, metrics and
+    #: other unit attributes are shared with the trainer thread, which keeps updating them. Hooks should therefore only read
+    #: progress and step outputs, must not modify the unit and must not stop the loop. Exceptions are raised on the trainer
+    #: thread at the next callback hook, and the worker is drained at the end of each phase. ``on_exception`` always runs on
+    #: the trainer thread.
+    run_async: bool = False
+
     @property
     def name(self) -> str:
         """A distinct name per instance. This is useful for debugging, profiling, and checkpointing purposes."""
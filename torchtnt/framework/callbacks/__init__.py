@@ -6,11 +6,14 @@
 
 # pyre-strict
 
+from .accumulated_metric_logger import AccumulatedMetricLogger
 from .base_csv_writer import BaseCSVWriter
 from .dcp_saver import DistributedCheckpointSaver
 from .early_stopping import EarlyStopping
 from .empty_cuda_cache import EmptyCudaCache
 from .garbage_collector import GarbageCollector
+from .in_memory_checkpointer import InMemoryCheckpointer
+from .inference_exporter import InferenceExporter
 from .iteration_time_logger import IterationTimeLogger
 from .lambda_callback import Lambda
 from .learning_rate_monitor import LearningRateMonitor
@@ -19,6 +22,7 @@ from .module_summary import ModuleSummary
 from .periodic_distributed_sync import PeriodicDistributedSync
 from .progress_reporter import ProgressReporter
 from .pytorch_profiler import PyTorchProfiler
+from .sharded_prediction_writer import ShardedPredictionWriter
 from .slow_rank_detector import SlowRankDetector
 from .system_resources_monitor import SystemResourcesMonitor
 from .tensorboard_parameter_monitor import TensorBoardParameterMonitor
@@ -32,11 +36,14 @@ from .tqdm_progress_bar import TQDMProgressBar
 from .train_progress_monitor import TrainProgressMonitor
 
 __all__ = [
+    "AccumulatedMetricLogger",
     "BaseCSVWriter",
     "EarlyStopping",
     "EmptyCudaCache",
     "EnableTensorFloat32",
     "GarbageCollector",
+    "InMemoryCheckpointer",
+    "InferenceExporter",
     "IterationTimeLogger",
     "Lambda",
     "LearningRateMonitor",
@@ -45,6 +52,7 @@ __all__ = [
     "PeriodicDistributedSync",
     "ProgressReporter",
     "PyTorchProfiler",
+    "ShardedPredictionWriter",
     "SlowRankDetector",
     "SystemResourcesMonitor",
     "TensorBoardParameterMonitor",
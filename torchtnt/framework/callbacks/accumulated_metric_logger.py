@@ -0,0 +1,100 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+from typing import List, Tuple, Union
+
+from torchtnt.framework.callback import Callback
+from torchtnt.framework.state import EntryPoint, State
+from torchtnt.framework.unit import AppStateMixin, TEvalUnit, TrainUnit, TTrainUnit
+from torchtnt.utils.loggers.logger import MetricLogger
+from torchtnt.utils.metric_accumulator import (
+    DeviceMetricAccumulator,
+    MetricReadout,
+    to_log_dict,
+)
+
+
+class AccumulatedMetricLogger(Callback):
+    """
+    A callback which logs the metrics recorded in the :class:`~torchtnt.utils.metric_accumulator.DeviceMetricAccumulator` s
+    tracked by the unit, such as those of :class:`~torchtnt.framework.auto_unit.AutoUnit` with ``accumulate_step_metrics=True``.
+
+    Every ``log_every_n_steps`` train steps, the callback starts copying the statistics accumulated since the previous
+    interval to host memory, and logs the copy started at the previous interval, which has completed by then. This
+    keeps the training loop free of device synchronizations between intervals, at the cost of logging each interval
+    one interval late. Pending statistics are logged, and the remaining ones read synchronously, at the end of each
+    train epoch and of each evaluation.
+
+    For each metric, the mean is logged under its name, and the min and max under ``{name}_min`` and ``{name}_max``.
+
+    Args:
+        loggers: Either a :class:`torchtnt.loggers.logger.MetricLogger` or
+            list of :class:`torchtnt.loggers.logger.MetricLogger`
+        log_every_n_steps: the interval, in train steps, at which metrics are read back and logged.
+    """
+
+    def __init__(
+        self,
+        loggers: Union[MetricLogger, List[MetricLogger]],
+        log_every_n_steps: int = 100,
+    ) -> None:
+        if not isinstance(loggers, list):
+            loggers = [loggers]
+        if log_every_n_steps < 1:
+            raise ValueError(
+                f"log_every_n_steps must be at least 1. Got {log_every_n_steps}"
+            )
+        self._loggers: List[MetricLogger] = loggers
+        self.log_every_n_steps = log_every_n_steps
+        self._pending: List[Tuple[int, MetricReadout]] = []
+
+    def on_train_step_end(self, state: State, unit: TTrainUnit) -> None:
+        step = unit.train_progress.num_steps_completed
+        if step % self.log_every_n_steps != 0:
+            return
+        self._log_pending()
+        self._pending = [
+            (step, accumulator.read_async()) for accumulator in _get_accumulators(unit)
+        ]
+
+    def on_train_epoch_end(self, state: State, unit: TTrainUnit) -> None:
+        self._flush(unit, unit.train_progress.num_steps_completed)
+
+    def on_eval_end(self, state: State, unit: TEvalUnit) -> None:
+        # when fitting, eval metrics are logged at the current train step
+        step = (
+            unit.train_progress.num_steps_completed
+            if state.entry_point == EntryPoint.FIT and isinstance(unit, TrainUnit)
+            else unit.eval_progress.num_steps_completed
+        )
+        self._flush(unit, step)
+
+    def _flush(self, unit: AppStateMixin, step: int) -> None:
+        self._log_pending()
+        for accumulator in _get_accumulators(unit):
+            self._log(step, accumulator.read_async())
+
+    def _log_pending(self) -> None:
+        for step, readout in self._pending:
+            self._log(step, readout)
+        self._pending = []
+
+    def _log(self, step: int, readout: MetricReadout) -> None:
+        payload = to_log_dict(readout.wait())
+        if not payload:
+            return
+        for logger in self._loggers:
+            logger.log_dict(payload, step)
+
+
+def _get_accumulators(unit: AppStateMixin) -> List[DeviceMetricAccumulator]:
+    return [
+        metric
+        for metric in unit.tracked_metrics().values()
+        if isinstance(metric, DeviceMetricAccumulator)
+    ]
@@ -9,10 +9,18 @@
 import abc
 import logging
 import math
+import os
+import signal
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from dataclasses import dataclass, field, replace
 from datetime import timedelta
-from typing import Any, cast, Dict, Iterable, List, Literal, Optional, Union
+from types import FrameType
+from typing import Any, cast, Dict, Iterable, List, Literal, Optional, Tuple, Union
 
 import fsspec
+import torch
 import torch.distributed as dist
 from pyre_extensions import none_throws
 from torchtnt.framework.callback import Callback
@@ -20,30 +28,63 @@ from torchtnt.framework.callbacks._checkpoint_utils import (
     _get_epoch,
     _get_step_phase_mapping,
 )
-from torchtnt.framework.callbacks.checkpointer_types import RestoreOptions
+from torchtnt.framework.callbacks.checkpointer_types import (
+    AdaptiveCheckpointOptions,
+    PreemptionOptions,
+    RestoreOptions,
+    TieredCheckpointOptions,
+)
 from torchtnt.framework.state import EntryPoint, State
 from torchtnt.framework.unit import (
     AppStateMixin,
     TEvalUnit,
     TPredictUnit,
+    TTestUnit,
     TTrainData,
     TTrainUnit,
 )
+from torchtnt.framework.utils import get_timing_context
 from torchtnt.utils.checkpoint import (
     BestCheckpointConfig,
     CheckpointManager,
+    CheckpointPath,
+    CheckpointPromoter,
+    estimate_mtbf,
     get_best_checkpoint_path,
     get_latest_checkpoint_path,
+    get_latest_tiered_checkpoint_path,
+    get_optimal_checkpoint_interval,
+    is_emergency_checkpoint,
     MetricData,
     Phase,
+    record_train_start,
 )
 from torchtnt.utils.distributed import get_world_size, PGWrapper
 from torchtnt.utils.event_handlers import log_interval
 from torchtnt.utils.rank_zero_log import rank_zero_info, rank_zero_warn
+from torchtnt.utils.timer import FullSyncPeriodicTimer
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _UpkeepDecision:
+    """
+    Everything rank 0 decides before a checkpoint is saved, which is broadcast to the other ranks in a single collective.
+
+    Args:
+        checkpoint_path: path of the checkpoint to save, or None if no checkpoint is saved.
+        promotion_results: whether each of the oldest pending promotions succeeded, for the promotions which completed.
+        train_checkpoint_interval: number of train steps until the next checkpoint, if it is adapted.
+        extras: decisions of subclasses, keyed by name.
+    """
+
+    checkpoint_path: Optional[CheckpointPath] = None
+    promotion_results: Optional[List[bool]] = None
+    train_checkpoint_interval: Optional[int] = None
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+
 class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
     """
     Abstract base class for file-based state_dict checkpointing. This class can be used as the base of a checkpointing callback, and handles
@@ -71,6 +112,13 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
             to clean the difference. If best checkpoint config is enabled, this param will manage the top n checkpoints instead. Only supported for train or fit entrypoints.
         best_checkpoint_config: Configuration for saving the best checkpoint based on a monitored metric. The metric is read off the attribute of the unit prior to checkpoint. This param is ignored if not in train or fit entrypoints.
         process_group: The process group on which the ranks will communicate on. If the process group is not gloo-based, a new gloo-based process group will be created.
+        tiered_checkpoint_options: If set, checkpoints are saved to a fast local tier, and promoted to ``dirpath`` in the background. See :class:`~torchtnt.framework.callbacks.checkpointer_types.TieredCheckpointOptions`.
+        save_every_n_seconds: Frequency, in seconds of wall-clock time, with which to save checkpoints during the train epoch. The time is measured on rank 0
+            and propagated to the other ranks asynchronously, so a checkpoint is saved by all ranks at the train step following the one at which the interval elapsed.
+        adaptive_checkpoint_options: If set, the interval between train step checkpoints is adapted to the measured save cost, step time and the expected mean time
+            between failures, starting from ``save_every_n_train_steps``. See :class:`~torchtnt.framework.callbacks.checkpointer_types.AdaptiveCheckpointOptions`.
+        preemption_options: If set, signal handlers are installed during training, and an emergency checkpoint is saved before training stops when the job is
+            preempted. See :class:`~torchtnt.framework.callbacks.checkpointer_types.PreemptionOptions`.
 
     Note:
         If torch.distributed is available and default process group is initialized, the constructor will call a collective operation for rank 0 to broadcast the dirpath to all other ranks
@@ -100,6 +148,10 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
         keep_last_n_checkpoints: Optional[int] = None,
         best_checkpoint_config: Optional[BestCheckpointConfig] = None,
         process_group: Optional[dist.ProcessGroup] = None,
+        tiered_checkpoint_options: Optional[TieredCheckpointOptions] = None,
+        save_every_n_seconds: Optional[float] = None,
+        adaptive_checkpoint_options: Optional[AdaptiveCheckpointOptions] = None,
+        preemption_options: Optional[PreemptionOptions] = None,
     ) -> None:
         if get_world_size() > 1 and not dist.is_initialized():
             raise RuntimeError(
@@ -133,6 +185,32 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
                 f"Invalid value passed for keep_last_n_checkpoints. Expected to receive either None or positive number, but received {keep_last_n_checkpoints}"
             )
 
+        if save_every_n_seconds is not None and save_every_n_seconds <= 0:
+            raise ValueError(
+                f"Invalid value passed for save_every_n_seconds. Expected to receive either None or positive number, but received {save_every_n_seconds}"
+            )
+        if adaptive_checkpoint_options is not None:
+            if save_every_n_train_steps is None:
+                raise ValueError(
+                    "save_every_n_train_steps must be set to the initial interval when adaptive_checkpoint_options is set"
+                )
+            if adaptive_checkpoint_options.min_interval_steps <= 0 or (
+                adaptive_checkpoint_options.max_interval_steps is not None
+                and adaptive_checkpoint_options.max_interval_steps
+                < adaptive_checkpoint_options.min_interval_steps
+            ):
+                raise ValueError(
+                    f"Invalid interval bounds passed in adaptive_checkpoint_options. Expected 0 < min_interval_steps <= max_interval_steps, but received {adaptive_checkpoint_options}"
+                )
+
+        if preemption_options is not None and (
+            not preemption_options.signals
+            or preemption_options.grace_period_seconds <= 0
+        ):
+            raise ValueError(
+                f"Invalid preemption_options. Expected at least one signal and a positive grace period, but received {preemption_options}"
+            )
+
         if best_checkpoint_config and best_checkpoint_config.mode not in {"min", "max"}:
             raise ValueError(
                 f"Invalid value passed for best_checkpoint_config.mode. Expected to receive 'min' or 'max', but received {best_checkpoint_config.mode}"
@@ -146,6 +224,25 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
         self._keep_last_n_checkpoints = keep_last_n_checkpoints
         self._best_checkpoint_config = best_checkpoint_config
 
+        # step hooks only act on multiples of the step frequencies
+        step_frequencies = [
+            n
+            for n in (
+                save_every_n_train_steps,
+                save_every_n_eval_steps,
+                save_every_n_predict_steps,
+            )
+            if n
+        ]
+        # time-based, adaptive and emergency checkpoints may be due at any step
+        if (
+            step_frequencies
+            and save_every_n_seconds is None
+            and adaptive_checkpoint_options is None
+            and preemption_options is None
+        ):
+            self.step_hook_interval: Optional[int] = math.gcd(*step_frequencies)
+
         self._process_group: Optional[dist.ProcessGroup] = None
         self._setup_gloo_pg(process_group)
         self._pg_wrapper = PGWrapper(process_group)
@@ -158,6 +255,97 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
             process_group=self._process_group,
         )
 
+        self._tiered_checkpoint_options = tiered_checkpoint_options
+        self._local_checkpoint_manager: Optional[CheckpointManager] = None
+        self._promoter: Optional[CheckpointPromoter] = None
+        # (local checkpoint, durable checkpoint, promotion) in the order the promotions were scheduled
+        self._pending_promotions: List[
+            Tuple[CheckpointPath, CheckpointPath, Future[bool]]
+        ] = []
+        self._num_local_checkpoints = 0
+        self._last_local_checkpoint: Optional[CheckpointPath] = None
+        self._last_promoted_checkpoint: Optional[CheckpointPath] = None
+        if tiered_checkpoint_options is not None:
+            self._setup_tiers(tiered_checkpoint_options)
+
+        self._save_every_n_seconds = save_every_n_seconds
+        self._timer_pg: Optional[dist.ProcessGroup] = None
+        self._timer: Optional[FullSyncPeriodicTimer] = None
+        self._last_time_based_save: float = 0.0
+        if save_every_n_seconds is not None and self._process_group is not None:
+            # the timer propagates its result asynchronously, so it must not share the process group of async saves
+            self._timer_pg = dist.new_group(
+                ranks=dist.get_process_group_ranks(self._process_group),
+                backend=dist.Backend.GLOO,
+            )
+
+        self._adaptive_checkpoint_options = adaptive_checkpoint_options
+        self._train_checkpoint_interval: Optional[int] = save_every_n_train_steps
+        self._next_train_checkpoint_step: Optional[int] = None
+        self._train_start_times: List[float] = []
+        # moving averages of the train step time and of the time spent in step checkpoints, in seconds
+        self._avg_step_time_s: Optional[float] = None
+        self._avg_save_cost_s: Optional[float] = None
+        self._last_step_end_time: Optional[float] = None
+
+        self._preemption_options = preemption_options
+        self._preemption_pg: Optional[dist.ProcessGroup] = None
+        self._previous_signal_handlers: Dict[int, Any] = {}
+        # time at which a preemption signal was first received by this rank
+        self._preemption_signal_time: Optional[float] = None
+        self._preemption_flag: Optional[torch.Tensor] = None
+        self._preemption_work: Optional[dist.Work] = None
+        self._is_preempted = False
+        self._is_emergency_save = False
+        self._last_checkpoint: Optional[CheckpointPath] = None
+        if preemption_options is not None and self._process_group is not None:
+            # the preemption is agreed on asynchronously, so it must not share the process group of async saves
+            self._preemption_pg = dist.new_group(
+                ranks=dist.get_process_group_ranks(self._process_group),
+                backend=dist.Backend.GLOO,
+            )
+
+    def _setup_tiers(self, options: TieredCheckpointOptions) -> None:
+        """
+        Sets up the checkpoint manager of the local tier, and the promoter copying checkpoints to the durable tier.
+        """
+        if options.promote_every_n_checkpoints <= 0:
+            raise ValueError(
+                f"Invalid value passed for promote_every_n_checkpoints. Expected to receive a positive number, but received {options.promote_every_n_checkpoints}"
+            )
+        if (
+            options.local_keep_last_n_checkpoints is not None
+            and options.local_keep_last_n_checkpoints <= 0
+        ):
+            raise ValueError(
+                f"Invalid value passed for local_keep_last_n_checkpoints. Expected to receive either None or positive number, but received {options.local_keep_last_n_checkpoints}"
+            )
+
+        self._local_checkpoint_manager = CheckpointManager(
+            options.local_dirpath,
+            self._best_checkpoint_config,
+            options.local_keep_last_n_checkpoints,
+            metadata_fnames=self.metadata_fnames,
+            process_group=self._process_group,
+            node_local=True,
+        )
+
+        promotion_pg = None
+        if dist.is_initialized():
+            # promotions synchronize from a background thread, so they need their own process group
+            promotion_pg = dist.new_group(
+                ranks=dist.get_process_group_ranks(
+                    self._process_group or dist.group.WORLD
+                ),
+                timeout=timedelta(seconds=3600),
+                backend=dist.Backend.GLOO,
+            )
+        self._promoter = CheckpointPromoter(
+            self.metadata_fnames,
+            process_group=promotion_pg,
+            max_bytes_per_sec=options.max_promotion_bytes_per_sec,
+        )
+
     def _setup_gloo_pg(self, process_group: Optional[dist.ProcessGroup]) -> None:
         """
         Setups gloo process group to be used for any collectives called during
@@ -189,6 +377,11 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
         """Returns parent directory to save to."""
         return self._checkpoint_manager.dirpath
 
+    @property
+    def _save_checkpoint_manager(self) -> CheckpointManager:
+        """Returns the manager of the tier which checkpoints are saved to."""
+        return self._local_checkpoint_manager or self._checkpoint_manager
+
     def _generate_checkpoint_and_upkeep(
         self, state: State, unit: Union[TTrainUnit, TEvalUnit, TPredictUnit], hook: str
     ) -> bool:
@@ -219,74 +412,251 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
         with log_interval(
             "_generate_checkpoint_and_upkeep", metadata=log_interval_metadata
         ):
-            # 1) generate checkpoint name
-            epoch = _get_epoch(state, unit)
-            step_mapping = _get_step_phase_mapping(state, unit)
-
-            # 1.1) append metric data only if best_checkpoint_config is defined
-            metric_data: Optional[MetricData] = None
-            if self._best_checkpoint_config and (
-                metric_value := self._get_tracked_metric_value(cast(TTrainUnit, unit))
-            ):
-                metric_data = MetricData(
-                    name=none_throws(self._best_checkpoint_config).monitored_metric,
-                    value=metric_value,
-                )
-
-            checkpoint_path = self._checkpoint_manager.generate_checkpoint_path(
-                epoch,
-                step_mapping,
-                metric_data,
-                process_group=self._process_group,
-            )
-
-            # 2) Determine if we should save checkpoint. This is a no-op for eval and predict entrypoints
-            # since neither best_checkpoint_config nor keep_last_n_checkpoints are supported.
-            if not self._checkpoint_manager.should_save_checkpoint(checkpoint_path):
+            # 1) agree on whether and where to save the checkpoint, in a single collective
+            with get_timing_context(state, f"{self.__class__.__name__}.upkeep"):
+                decision = self._agree_on_upkeep(state, unit, hook)
+            if decision.checkpoint_path is None:
                 return False
+            checkpoint_path = decision.checkpoint_path
 
-            if hook == "on_train_end":
-                # 2.1) Make sure that last checkpoint does not already exist
-                if self._checkpoint_manager.does_checkpoint_exist(
-                    checkpoint_path, self._process_group
-                ):
-                    rank_zero_warn(
-                        "Final checkpoint already exists, skipping.", logger=logger
-                    )
-                    return False
-
-                # 2.2) If doing fit or train without eval checkpointing, only consider
-                # training progress when checking if last checkpoint exists.
-                # TRAIN is included because increment_epoch() inflates the
-                # epoch counter after the last step, producing a different
-                # checkpoint path but identical training state.
-                if (
-                    state.entry_point in (EntryPoint.FIT, EntryPoint.TRAIN)
-                    and self._save_every_n_eval_epochs is None
-                    and self._checkpoint_manager._ckpt_paths
-                    and self._checkpoint_manager._ckpt_paths[-1].step[Phase.TRAIN]
-                    == cast(TTrainUnit, unit).train_progress.num_steps_completed
-                ):
-                    rank_zero_info(
-                        "Omitting final checkpoint since train progress is unchanged, and eval checkpointing is not configured.",
-                        logger=logger,
-                    )
-                    return False
-
-            # 3) try to save checkpoint
+            # 2) try to save checkpoint
             if not self._checkpoint_impl(
                 state, unit, checkpoint_id=checkpoint_path.path, hook=hook
             ):
                 return False
 
-            # 4) track checkpoint and clean up surplus if needed
-            self._checkpoint_manager.append_checkpoint(checkpoint_path)
+            # 3) track checkpoint and clean up surplus if needed
+            self._last_checkpoint = checkpoint_path
+            if self._promoter is not None:
+                self._track_local_checkpoint(checkpoint_path)
+            else:
+                self._checkpoint_manager.append_checkpoint(checkpoint_path)
 
-            # 5) invoke on_checkpoint_save callback on the unit since checkpoint was saved successfully
+            # 4) invoke on_checkpoint_save callback on the unit since checkpoint was saved successfully
             unit.on_checkpoint_save(state, checkpoint_id=checkpoint_path.path)
 
             return True
 
+    def _agree_on_upkeep(
+        self, state: State, unit: Union[TTrainUnit, TEvalUnit, TPredictUnit], hook: str
+    ) -> _UpkeepDecision:
+        """
+        Decides on rank 0 whether and where to save a checkpoint, broadcasts the decision to the other ranks, and applies it
+        on every rank. Must be called while no asynchronous save is using the process group.
+        """
+        pg_wrapper = PGWrapper(self._process_group)
+        decision: List[Optional[_UpkeepDecision]] = [None]
+        if pg_wrapper.get_rank() == 0:
+            decision[0] = self._decide_upkeep(state, unit, hook)
+        pg_wrapper.broadcast_object_list(decision)
+        self._apply_upkeep_decision(state, unit, hook, none_throws(decision[0]))
+        return none_throws(decision[0])
+
+    def _decide_upkeep(
+        self, state: State, unit: Union[TTrainUnit, TEvalUnit, TPredictUnit], hook: str
+    ) -> _UpkeepDecision:
+        """
+        Decides whether and where to save a checkpoint, on rank 0 only. Subclasses may override this to decide on
+        additional state before the save, in ``extras``, and apply it in :meth:`_apply_upkeep_decision`.
+        """
+        # 1) generate checkpoint name
+        epoch = _get_epoch(state, unit)
+        step_mapping = _get_step_phase_mapping(state, unit)
+
+        # 1.1) append metric data only if best_checkpoint_config is defined
+        metric_data: Optional[MetricData] = None
+        if self._best_checkpoint_config and (
+            metric_value := self._get_tracked_metric_value(cast(TTrainUnit, unit))
+        ):
+            metric_data = MetricData(
+                name=none_throws(self._best_checkpoint_config).monitored_metric,
+                value=metric_value,
+            )
+
+        checkpoint_manager = self._save_checkpoint_manager
+        checkpoint_path = checkpoint_manager._generate_checkpoint_path(
+            epoch, step_mapping, metric_data
+        )
+
+        # 2) Determine if we should save checkpoint. This is a no-op for eval and predict entrypoints
+        # since neither best_checkpoint_config nor keep_last_n_checkpoints are supported.
+        if (
+            not self._is_emergency_save
+            and not checkpoint_manager.should_save_checkpoint(checkpoint_path)
+        ):
+            return _UpkeepDecision()
+
+        if hook == "on_train_end":
+            # 2.1) Make sure that last checkpoint does not already exist
+            if any(
+                checkpoint_manager.does_checkpoint_metadata_exist(
+                    checkpoint_path.path, fname
+                )
+                for fname in checkpoint_manager._metadata_fnames
+            ):
+                rank_zero_warn(
+                    "Final checkpoint already exists, skipping.", logger=logger
+                )
+                return _UpkeepDecision()
+
+            # 2.2) If doing fit or train without eval checkpointing, only consider
+            # training progress when checking if last checkpoint exists.
+            # TRAIN is included because increment_epoch() inflates the
+            # epoch counter after the last step, producing a different
+            # checkpoint path but identical training state.
+            if (
+                state.entry_point in (EntryPoint.FIT, EntryPoint.TRAIN)
+                and self._save_every_n_eval_epochs is None
+                and checkpoint_manager._ckpt_paths
+                and checkpoint_manager._ckpt_paths[-1].step[Phase.TRAIN]
+                == cast(TTrainUnit, unit).train_progress.num_steps_completed
+            ):
+                rank_zero_info(
+                    "Omitting final checkpoint since train progress is unchanged, and eval checkpointing is not configured.",
+                    logger=logger,
+                )
+                return _UpkeepDecision()
+
+        decision = _UpkeepDecision(checkpoint_path=checkpoint_path)
+
+        # 2.3) track completed promotions before an asynchronous save starts using the process group
+        if self._promoter is not None:
+            decision.promotion_results = self._get_completed_promotions(
+                self._num_promotions_to_wait()
+            )
+
+        # 2.4) likewise, pick the next adaptive checkpoint step before the save starts
+        if (
+            hook == "on_train_step_end"
+            and self._adaptive_checkpoint_options is not None
+        ):
+            decision.train_checkpoint_interval = (
+                self._get_adaptive_train_checkpoint_interval()
+            )
+        return decision
+
+    def _apply_upkeep_decision(
+        self,
+        state: State,
+        unit: Union[TTrainUnit, TEvalUnit, TPredictUnit],
+        hook: str,
+        decision: _UpkeepDecision,
+    ) -> None:
+        """Applies the decision of rank 0 on every rank."""
+        if decision.promotion_results is not None:
+            self._track_completed_promotions(decision.promotion_results)
+        if decision.train_checkpoint_interval is not None:
+            self._set_train_checkpoint_interval(
+                decision.train_checkpoint_interval,
+                cast(TTrainUnit, unit).train_progress.num_steps_completed,
+            )
+
+    def _track_local_checkpoint(self, checkpoint_path: CheckpointPath) -> None:
+        """
+        Tracks a checkpoint saved to the local tier, and schedules its promotion to the durable tier if it is due.
+        """
+        none_throws(self._local_checkpoint_manager).append_checkpoint(checkpoint_path)
+        self._last_local_checkpoint = checkpoint_path
+        self._num_local_checkpoints += 1
+        if (
+            self._num_local_checkpoints
+            % none_throws(self._tiered_checkpoint_options).promote_every_n_checkpoints
+            == 0
+        ):
+            self._promote(checkpoint_path)
+
+    def _num_promotions_to_wait(self) -> int:
+        """
+        Returns the number of pending promotions to wait for before the next local checkpoint is tracked, since
+        a local checkpoint must be promoted before it is removed to honor ``local_keep_last_n_checkpoints``.
+        """
+        local_manager = none_throws(self._local_checkpoint_manager)
+        max_ckpts = local_manager._keep_last_n_checkpoints
+        if not max_ckpts or len(local_manager._ckpt_paths) < max_ckpts:
+            return 0
+
+        removed = local_manager._ckpt_paths[0]
+        num_to_wait = 0
+        for i, (local_path, _, _) in enumerate(self._pending_promotions):
+            if local_path == removed:
+                num_to_wait = i + 1
+        return num_to_wait
+
+    def _promote(self, checkpoint_path: CheckpointPath) -> None:
+        """Schedules the promotion of a local checkpoint, if the durable tier would keep it."""
+        durable_path = CheckpointPath(
+            self._checkpoint_manager.dirpath,
+            checkpoint_path.epoch,
+            checkpoint_path.step,
+            metric_data=checkpoint_path.metric_data,
+        )
+        self._last_promoted_checkpoint = checkpoint_path
+        if (
+            not self._is_emergency_save
+            and not self._checkpoint_manager.should_save_checkpoint(durable_path)
+        ):
+            return
+
+        future = none_throws(self._promoter).promote(
+            checkpoint_path.path,
+            durable_path.path,
+            wait_for=self._async_save_future(),
+        )
+        self._pending_promotions.append((checkpoint_path, durable_path, future))
+
+    def _complete_promotions(self, num_to_wait: int = 0) -> None:
+        """
+        Tracks the completed promotions in the checkpoint manager of the durable tier, which removes surplus durable checkpoints.
+
+        Args:
+            num_to_wait: number of the oldest pending promotions to wait for.
+        """
+        if not self._pending_promotions:
+            return
+
+        # rank 0 decides which promotions are tracked, so the durable tier is tracked consistently on every rank
+        pg_wrapper = PGWrapper(self._process_group)
+        rank_zero_results: List[Optional[List[bool]]] = [None]
+        if pg_wrapper.get_rank() == 0:
+            rank_zero_results[0] = self._get_completed_promotions(num_to_wait)
+        pg_wrapper.broadcast_object_list(rank_zero_results)
+        self._track_completed_promotions(none_throws(rank_zero_results[0]))
+
+    def _get_completed_promotions(self, num_to_wait: int) -> List[bool]:
+        """
+        Returns whether each of the oldest pending promotions succeeded, up to the first one which is still running
+        once ``num_to_wait`` promotions completed.
+        """
+        results = []
+        for i, (_, _, future) in enumerate(self._pending_promotions):
+            if i >= num_to_wait and not future.done():
+                break
+            results.append(future.result())
+        return results
+
+    def _track_completed_promotions(self, results: List[bool]) -> None:
+        """Tracks the promotions which completed on rank 0 in the checkpoint manager of the durable tier."""
+        for (local_path, durable_path, future), promoted in zip(
+            self._pending_promotions, results
+        ):
+            # this does not block, as every rank finished copying when the promotion completed on rank 0
+            future.result()
+            if promoted:
+                self._checkpoint_manager.append_checkpoint(durable_path)
+            else:
+                rank_zero_warn(
+                    f"Failed to promote checkpoint {local_path} to {durable_path}",
+                    logger=logger,
+                )
+        del self._pending_promotions[: len(results)]
+
+    def _async_save_future(self) -> Optional[Future[Any]]:
+        """
+        Returns a future which completes when the last checkpoint is written, if it is saved asynchronously.
+        Subclasses saving asynchronously override this, so checkpoints are only promoted once written.
+        """
+        return None
+
     def _get_tracked_metric_value(self, unit: TTrainUnit) -> Optional[float]:
         """
         If the checkpointer has a tracked metric, look the value in the unit using reflection, and cast to float.
@@ -341,18 +711,236 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
     def on_train_start(self, state: State, unit: TTrainUnit) -> None:
         # clean up the difference if surplus of checkpoints exist
         self._checkpoint_manager.prune_surplus_checkpoints()
+        if self._local_checkpoint_manager is not None:
+            self._local_checkpoint_manager.prune_surplus_checkpoints()
+
+        if self._save_every_n_seconds is not None:
+            self._last_time_based_save = time.perf_counter()
+            if self._timer_pg is not None:
+                self._timer = FullSyncPeriodicTimer(
+                    timedelta(seconds=self._save_every_n_seconds), self._timer_pg
+                )
+
+        options = self._adaptive_checkpoint_options
+        if options is not None:
+            self._next_train_checkpoint_step = (
+                unit.train_progress.num_steps_completed
+                + none_throws(self._train_checkpoint_interval)
+            )
+            self._last_step_end_time = time.perf_counter()
+            # only rank 0 picks the checkpoint interval
+            if (
+                options.mtbf_seconds is None
+                and PGWrapper(self._process_group).get_rank() == 0
+            ):
+                self._train_start_times = record_train_start(self.dirpath)
+
+        if self._preemption_options is not None:
+            self._install_preemption_handlers(self._preemption_options)
 
     def on_train_step_end(self, state: State, unit: TTrainUnit) -> None:
+        if self._preemption_options is not None and self._is_preemption_agreed():
+            self._save_emergency_checkpoint(state, unit)
+            return
+
         num_steps_completed = unit.train_progress.num_steps_completed
+        step_end_time = time.perf_counter()
+        if self._last_step_end_time is not None:
+            self._avg_step_time_s = _moving_average(
+                self._avg_step_time_s, step_end_time - self._last_step_end_time
+            )
+
+        if self._adaptive_checkpoint_options is not None:
+            is_due = num_steps_completed >= none_throws(
+                self._next_train_checkpoint_step
+            )
+        else:
+            is_due = (
+                bool(self._save_every_n_train_steps)
+                and num_steps_completed % none_throws(self._save_every_n_train_steps)
+                == 0
+            )
+        # the timer is checked at every step, as each check propagates the result of the previous one
+        is_due = self._is_time_based_checkpoint_due() or is_due
+
+        if is_due and self._generate_checkpoint_and_upkeep(
+            state, unit, hook="on_train_step_end"
+        ):
+            self._avg_save_cost_s = _moving_average(
+                self._avg_save_cost_s, time.perf_counter() - step_end_time
+            )
         if (
-            not self._save_every_n_train_steps
-            or num_steps_completed % self._save_every_n_train_steps != 0
+            self._adaptive_checkpoint_options is not None
+            and num_steps_completed >= none_throws(self._next_train_checkpoint_step)
         ):
+            # no checkpoint was saved, so none was scheduled either
+            self._next_train_checkpoint_step = num_steps_completed + none_throws(
+                self._train_checkpoint_interval
+            )
+        self._last_step_end_time = time.perf_counter()
+
+    def _is_time_based_checkpoint_due(self) -> bool:
+        if self._save_every_n_seconds is None:
+            return False
+        if self._timer is not None:
+            return self._timer.check()
+        # without a process group, the local clock is used
+        now = time.perf_counter()
+        if now - self._last_time_based_save < self._save_every_n_seconds:
+            return False
+        self._last_time_based_save = now
+        return True
+
+    def _set_train_checkpoint_interval(
+        self, interval: int, num_steps_completed: int
+    ) -> None:
+        """Schedules the next checkpoint ``interval`` train steps after the current one, as picked by rank 0."""
+        if interval != self._train_checkpoint_interval:
+            rank_zero_info(
+                f"Saving checkpoints every {interval} train steps, for a save cost of {self._avg_save_cost_s:.2f}s "
+                f"and a step time of {self._avg_step_time_s:.3f}s",
+                logger=logger,
+            )
+        self._train_checkpoint_interval = interval
+        self._next_train_checkpoint_step = num_steps_completed + interval
+
+    def _get_adaptive_train_checkpoint_interval(self) -> Optional[int]:
+        """
+        Returns the number of train steps between checkpoints minimizing the expected time lost to saving and to
+        failures, or the current interval if the save cost, step time or mean time between failures is not known yet.
+        """
+        options = none_throws(self._adaptive_checkpoint_options)
+        mtbf_s = options.mtbf_seconds or estimate_mtbf(self._train_start_times)
+        if mtbf_s is None or not self._avg_step_time_s or self._avg_save_cost_s is None:
+            return self._train_checkpoint_interval
+
+        interval_s = get_optimal_checkpoint_interval(self._avg_save_cost_s, mtbf_s)
+        interval = max(
+            options.min_interval_steps, round(interval_s / self._avg_step_time_s)
+        )
+        if options.max_interval_steps is not None:
+            interval = min(interval, options.max_interval_steps)
+        return interval
+
+    def _install_preemption_handlers(self, options: PreemptionOptions) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            rank_zero_warn(
+                "Signal handlers can only be installed from the main thread, emergency checkpoints are disabled.",
+                logger=logger,
+            )
+            return
+        for signum in options.signals:
+            self._previous_signal_handlers[signum] = signal.signal(
+                signum, self._handle_preemption_signal
+            )
+
+    def _restore_signal_handlers(self) -> None:
+        for signum, handler in self._previous_signal_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_signal_handlers = {}
+
+    def _handle_preemption_signal(
+        self, signum: int, frame: Optional[FrameType]
+    ) -> None:
+        if self._preemption_signal_time is None:
+            self._preemption_signal_time = time.monotonic()
+            logger.warning(
+                f"Received {signal.Signals(signum).name}, saving an emergency checkpoint after the current train step."
+            )
             return
 
-        self._generate_checkpoint_and_upkeep(state, unit, hook="on_train_step_end")
+        # a repeated signal is handled as it was before training started
+        handler = self._previous_signal_handlers.get(signum, signal.SIG_DFL)
+        if callable(handler):
+            handler(signum, frame)
+        elif handler != signal.SIG_IGN:
+            signal.signal(signum, signal.SIG_DFL)
+            signal.raise_signal(signum)
+
+    def _is_preemption_agreed(self) -> bool:
+        """
+        Returns whether any rank received a preemption signal. Ranks agree on the signals received up to the previous
+        train step, with a reduction which is started at every step and waited for at the next one.
+        """
+        signaled = self._preemption_signal_time is not None
+        if self._preemption_pg is None:
+            return signaled
+
+        agreed = False
+        if self._preemption_work is not None:
+            self._preemption_work.wait()
+            agreed = bool(none_throws(self._preemption_flag).item())
+            self._preemption_work = None
+        if not agreed:
+            self._preemption_flag = torch.tensor([int(signaled)])
+            self._preemption_work = dist.all_reduce(
+                self._preemption_flag,
+                op=dist.ReduceOp.MAX,
+                group=self._preemption_pg,
+                async_op=True,
+            )
+        return agreed
+
+    def _save_emergency_checkpoint(self, state: State, unit: TTrainUnit) -> None:
+        """
+        Saves a checkpoint of the current train step, unless one was already saved, and stops training. The checkpoint
+        is marked as an emergency checkpoint if it is written, and promoted if checkpoints are tiered, within the grace period.
+        """
+        options = none_throws(self._preemption_options)
+        # ranks which were not signaled measure the grace period from the time they learned about the preemption
+        deadline = (
+            self._preemption_signal_time or time.monotonic()
+        ) + options.grace_period_seconds
+        num_steps_completed = unit.train_progress.num_steps_completed
+        rank_zero_warn(
+            f"Preemption signaled, saving an emergency checkpoint at train step {num_steps_completed} and stopping training.",
+            logger=logger,
+        )
+        state.stop()
+
+        self._is_preempted = True
+        self._is_emergency_save = True
+        try:
+            last_checkpoint = self._last_checkpoint
+            if (
+                last_checkpoint is None
+                or last_checkpoint.step.get(Phase.TRAIN) != num_steps_completed
+            ) and not self._generate_checkpoint_and_upkeep(
+                state, unit, hook="on_train_step_end"
+            ):
+                rank_zero_warn("Failed to save emergency checkpoint.", logger=logger)
+                return
+
+            checkpoint_path = none_throws(self._last_checkpoint)
+            if not _wait_until(self._async_save_future(), deadline):
+                rank_zero_warn(
+                    f"Emergency checkpoint {checkpoint_path} was not written within the grace period.",
+                    logger=logger,
+                )
+                return
+            self._save_checkpoint_manager.mark_emergency_checkpoint(checkpoint_path)
+
+            if self._promoter is None:
+                return
+            if checkpoint_path is not self._last_promoted_checkpoint:
+                self._promote(checkpoint_path)
+            for local_path, durable_path, future in self._pending_promotions:
+                if local_path == checkpoint_path:
+                    if _wait_until(future, deadline) and future.result():
+                        self._checkpoint_manager.mark_emergency_checkpoint(durable_path)
+                    else:
+                        rank_zero_warn(
+                            f"Emergency checkpoint {checkpoint_path} was not promoted within the grace period.",
+                            logger=logger,
+                        )
+        finally:
+            self._is_emergency_save = False
 
     def on_train_epoch_end(self, state: State, unit: TTrainUnit) -> None:
+        if self._is_preempted:
+            # the emergency checkpoint of the interrupted epoch was saved
+            return
+
         epoch = unit.train_progress.num_epochs_completed
         if not self._save_every_n_epochs or epoch % self._save_every_n_epochs != 0:
             return
@@ -360,7 +948,32 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
         self._generate_checkpoint_and_upkeep(state, unit, hook="on_train_epoch_end")
 
     def on_train_end(self, state: State, unit: TTrainUnit) -> None:
-        self._generate_checkpoint_and_upkeep(state, unit, hook="on_train_end")
+        if self._timer is not None:
+            self._timer.wait_remaining_work()
+            self._timer = None
+        if self._preemption_work is not None:
+            self._preemption_work.wait()
+            self._preemption_work = None
+        self._restore_signal_handlers()
+        if not self._is_preempted:
+            self._generate_checkpoint_and_upkeep(state, unit, hook="on_train_end")
+        if self._promoter is not None:
+            # the latest checkpoint is always promoted, and training only ends once it is durable
+            last_checkpoint = self._last_local_checkpoint
+            if (
+                last_checkpoint is not None
+                and last_checkpoint is not self._last_promoted_checkpoint
+            ):
+                self._promote(last_checkpoint)
+            self._complete_promotions(num_to_wait=len(self._pending_promotions))
+
+    def on_exception(
+        self,
+        state: State,
+        unit: Union[TTrainUnit, TEvalUnit, TPredictUnit, TTestUnit],
+        exc: BaseException,
+    ) -> None:
+        self._restore_signal_handlers()
 
     def on_eval_start(self, state: State, unit: TEvalUnit) -> None:
         if state.entry_point == EntryPoint.EVALUATE:
@@ -414,6 +1027,8 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
             )
             self._best_checkpoint_config = None
             self._checkpoint_manager._best_checkpoint_config = None
+            if self._local_checkpoint_manager is not None:
+                self._local_checkpoint_manager._best_checkpoint_config = None
 
         if self._keep_last_n_checkpoints:
             logger.warning(
@@ -421,6 +1036,8 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
             )
             self._keep_last_n_checkpoints = None
             self._checkpoint_manager._keep_last_n_checkpoints = None
+            if self._local_checkpoint_manager is not None:
+                self._local_checkpoint_manager._keep_last_n_checkpoints = None
 
     @abc.abstractmethod
     def _checkpoint_impl(
@@ -480,6 +1097,7 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
         process_group: Optional[dist.ProcessGroup] = None,
         restore_options: Optional[RestoreOptions] = None,
         file_system: Optional[fsspec.AbstractFileSystem] = None,
+        local_dirpath: Optional[str] = None,
         **kwargs: Any,
     ) -> bool:
         """
@@ -496,22 +1114,45 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
             restore_options: Controls what to  filter when restoring the state.
             file_system: If a custom file system should be used to fetch the checkpoint directories. Otherwise, fsspec will be
                 used to match the file system of the dirpath.
+            local_dirpath: Parent directory of the local tier, if checkpoints were saved with ``tiered_checkpoint_options``. The latest
+                local checkpoint is restored if it is complete on every rank and at least as recent as the latest one in ``dirpath``.
 
         Returns:
             True if the latest checkpoint directory was found and successfully restored, otherwise False.
         """
-        path = get_latest_checkpoint_path(
-            dirpath,
-            metadata_fname=cls.metadata_fnames,
-            process_group=process_group,
-            file_system=file_system,
-        )
+        if local_dirpath is None:
+            path = get_latest_checkpoint_path(
+                dirpath,
+                metadata_fname=cls.metadata_fnames,
+                process_group=process_group,
+                file_system=file_system,
+            )
+        else:
+            path = get_latest_tiered_checkpoint_path(
+                dirpath,
+                local_dirpath,
+                metadata_fname=cls.metadata_fnames,
+                file_system=file_system,
+                process_group=process_group,
+            )
         if path is None:
             logger.info(
                 f"Attempted to restore from the following path but no checkpoint was found: {dirpath=}, {cls.metadata_fnames}"
             )
             return False
-        logger.info(f"Restoring from path: {path}")
+        if is_emergency_checkpoint(path, file_system=file_system):
+            logger.info(
+                f"Restoring from emergency checkpoint saved upon preemption: {path}"
+            )
+        else:
+            logger.info(f"Restoring from path: {path}")
+        if (
+            local_dirpath is not None
+            and restore_options is not None
+            and not restore_options.verify_local_checksums
+            and path.startswith(os.path.join(local_dirpath, ""))
+        ):
+            restore_options = replace(restore_options, verify_checksums=False)
         cls.restore(
             path,
             unit,
@@ -619,3 +1260,23 @@ class BaseCheckpointer(Callback, metaclass=abc.ABCMeta):
             restore_options=restore_options,
             **kwargs,
         )
+
+
+def _moving_average(
+    average: Optional[float], value: float, weight: float = 0.9
+) -> float:
+    return value if average is None else weight * average + (1 - weight) * value
+
+
+def _wait_until(future: Optional[Future[Any]], deadline: float) -> bool:
+    """Waits for a future until the ``time.monotonic`` deadline, and returns whether it completed successfully."""
+    if future is None:
+        return True
+    try:
+        future.result(timeout=max(deadline - time.monotonic(), 0))
+    except TimeoutError:
+        return False
+    except Exception as exc:
+        logger.error(f"Failed to complete checkpoint: {exc}")
+        return False
+    return True
@@ -6,8 +6,9 @@
 
 # pyre-strict
 
+import signal
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 
 # TODO: eventually support overriding all knobs
@@ -56,6 +57,13 @@ class RestoreOptions:
         init_optim_states: Whether to initialize the optimizer state. Defaults to True. Toggle off
             if running into issues with loading optimizer state. This will reset optimizer state,
             which may affect training in some cases.
+        defer_optimizer_restore: Whether to load the optimizer states in a background thread, after the rest of the
+            state is restored, so that training starts before they are read. The first step of each optimizer waits
+            for them to be loaded. Only supported by :class:`~torchtnt.framework.callbacks.DistributedCheckpointSaver`.
+        verify_checksums: Whether to verify the checksums of the checkpoint while reading it, if it was saved with
+            ``checksum_options``. A checkpoint failing verification is marked as corrupt, and is skipped by ``restore_from_latest``.
+        verify_local_checksums: Whether to verify the checksums of a checkpoint of the local tier, when ``restore_from_latest``
+            restores from it. Set to False to skip the verification of checkpoints which were never copied.
     """
 
     restore_modules: bool = True
@@ -67,3 +75,118 @@ class RestoreOptions:
     restore_metrics: bool = True
     strict: bool = True
     init_optim_states: bool = True
+    defer_optimizer_restore: bool = False
+    verify_checksums: bool = True
+    verify_local_checksums: bool = True
+
+
+@dataclass
+class TieredCheckpointOptions:
+    """
+    Options for tiered checkpointing. Checkpoints are saved to a fast local tier, and every n-th checkpoint is
+    copied to ``dirpath``, the durable tier, in a background thread. The final checkpoint of training is always copied.
+
+    Args:
+        local_dirpath: Parent directory of the local tier, e.g. on a node-local disk or tmpfs.
+        promote_every_n_checkpoints: Frequency, in saved checkpoints, with which checkpoints are copied to the durable tier.
+        local_keep_last_n_checkpoints: Number of most recent checkpoints to keep in the local tier. If None, all checkpoints
+            are kept. ``keep_last_n_checkpoints`` of the checkpointer applies to the durable tier.
+        max_promotion_bytes_per_sec: Maximum rate at which each rank copies checkpoints to the durable tier. If None, the rate
+            is not limited.
+    """
+
+    local_dirpath: str
+    promote_every_n_checkpoints: int = 1
+    local_keep_last_n_checkpoints: Optional[int] = 2
+    max_promotion_bytes_per_sec: Optional[float] = None
+
+
+@dataclass
+class CompressionOptions:
+    """
+    Options for compressing checkpoints with :class:`~torchtnt.utils.checkpoint_storage.CompressedStorageWriter`.
+
+    Args:
+        codec: The compression codec, one of ``zstd``, ``lz4``, ``zlib``, or ``auto`` for the fastest one installed.
+        downcast_optimizer_moments: Whether to store float32 optimizer moments in bfloat16. This is lossy, and may affect
+            training after a restore.
+    """
+
+    codec: str = "auto"
+    downcast_optimizer_moments: bool = False
+
+
+@dataclass
+class AdaptiveCheckpointOptions:
+    """
+    Options for picking the interval between train step checkpoints from the measured cost of saving, the measured
+    step time and the expected mean time between failures (MTBF), so that the expected time lost to saving and to
+    failures is minimal. ``save_every_n_train_steps`` of the checkpointer is used as the initial interval.
+
+    Args:
+        mtbf_seconds: Expected mean time between failures of the job. If None, it is estimated from the start times of
+            the previous runs of training, which are recorded in ``dirpath``, and the initial interval is kept until
+            two runs have started.
+        min_interval_steps: Minimum number of train steps between checkpoints.
+        max_interval_steps: Maximum number of train steps between checkpoints. If None, the interval is not bounded.
+    """
+
+    mtbf_seconds: Optional[float] = None
+    min_interval_steps: int = 1
+    max_interval_steps: Optional[int] = None
+
+
+@dataclass
+class PreemptionOptions:
+    """
+    Options for saving an emergency checkpoint when the job is about to be preempted. Once one of ``signals`` is received
+    by any rank, every rank finishes its current train step, a checkpoint is saved regardless of the checkpoint frequency,
+    and training stops. The checkpoint is marked as an emergency checkpoint once it is complete, and is restored by
+    ``restore_from_latest`` like any other checkpoint.
+
+    Args:
+        signals: Signals announcing the preemption. A second signal while the emergency checkpoint is saved is handled by
+            the handler that was installed before training started.
+        grace_period_seconds: Time between the signal and the job being killed. The emergency checkpoint is only marked
+            once it is written, and promoted to ``dirpath`` if checkpoints are tiered, within this time.
+    """
+
+    signals: Tuple[int, ...] = (signal.SIGTERM,)
+    grace_period_seconds: float = 30.0
+
+
+@dataclass
+class IOTuningOptions:
+    """
+    Options for tuning the concurrency of checkpoint writes from the write throughput measured at each save, see
+    :class:`~torchtnt.utils.checkpoint_storage.IOConcurrencyTuner`. Tuning starts from ``max_per_rank_io_concurrency``
+    of the knob options, and the best settings found are persisted in ``dirpath``, so that the next run starts from them.
+
+    Args:
+        min_thread_count: Minimum number of threads writing files per rank.
+        max_thread_count: Maximum number of threads writing files per rank.
+        min_per_thread_copy_ahead: Minimum number of bytes of tensors each thread copies to CPU ahead of writing them.
+        max_per_thread_copy_ahead: Maximum number of bytes of tensors each thread copies to CPU ahead of writing them.
+        tune_single_file_per_rank: Whether to try writing a single file per thread, rather than one file per item.
+        min_improvement: Relative improvement of the write throughput for a change of the settings to be kept.
+    """
+
+    min_thread_count: int = 1
+    max_thread_count: int = 64
+    min_per_thread_copy_ahead: int = 1_000_000
+    max_per_thread_copy_ahead: int = 256_000_000
+    tune_single_file_per_rank: bool = True
+    min_improvement: float = 0.05
+
+
+@dataclass
+class ChecksumOptions:
+    """
+    Options for checksumming checkpoints as they are written, see :class:`~torchtnt.utils.checkpoint_storage.MeasuredStorageWriter`.
+    The checksums are verified when the checkpoint is restored, unless disabled by the ``RestoreOptions``.
+
+    Args:
+        algorithm: The checksum algorithm, one of ``crc32c``, ``xxh3_64``, ``crc32``, or ``auto`` for the first one installed.
+    """
+
+    algorithm: str = "auto"
@@ -7,13 +7,19 @@
 # pyre-strict
 
 import inspect
+import json
 import logging
+import os
 import time
-from concurrent.futures import Future
-from typing import Any, cast, Dict, Iterable, List, Optional, Union
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Any, cast, Dict, Iterable, List, Optional, Tuple, Union
 
 import torch
 import torch.distributed as dist
+from fsspec.core import url_to_fs
 from pyre_extensions import none_throws
 from torch.distributed import checkpoint as dcp
 from torch.distributed.checkpoint._fsspec_filesystem import (
@@ -43,8 +49,20 @@ from torchtnt.framework.callbacks._checkpoint_utils import (
     _prepare_app_state_for_checkpoint,
     _prepare_app_state_for_restore,
 )
-from torchtnt.framework.callbacks.base_checkpointer import BaseCheckpointer
-from torchtnt.framework.callbacks.checkpointer_types import KnobOptions, RestoreOptions
+from torchtnt.framework.callbacks.base_checkpointer import (
+    _UpkeepDecision,
+    BaseCheckpointer,
+)
+from torchtnt.framework.callbacks.checkpointer_types import (
+    AdaptiveCheckpointOptions,
+    ChecksumOptions,
+    CompressionOptions,
+    IOTuningOptions,
+    KnobOptions,
+    PreemptionOptions,
+    RestoreOptions,
+    TieredCheckpointOptions,
+)
 from torchtnt.framework.state import State
 from torchtnt.framework.unit import (
     AppStateMixin,
@@ -57,10 +75,25 @@ from torchtnt.framework.unit import (
     TTrainUnit,
 )
 from torchtnt.framework.utils import get_timing_context
-from torchtnt.utils.checkpoint import BestCheckpointConfig, CheckpointPath, Phase
-from torchtnt.utils.distributed import get_global_rank, get_or_create_gloo_pg
+from torchtnt.utils.checkpoint import (
+    BestCheckpointConfig,
+    CheckpointPath,
+    mark_corrupt_checkpoint,
+    Phase,
+)
+from torchtnt.utils.checkpoint_storage import (
+    CompressedStorageReader,
+    CompressedStorageWriter,
+    get_checksum_algorithm,
+    IOConcurrencyTuner,
+    IOSettings,
+    MeasuredStorageWriter,
+    needs_compressed_storage_reader,
+)
+from torchtnt.utils.distributed import get_global_rank, get_or_create_gloo_pg, PGWrapper
 from torchtnt.utils.rank_zero_log import rank_zero_info, rank_zero_warn
 from torchtnt.utils.stateful import MultiStateful, Stateful
+from torchtnt.utils.timer import TimerProtocol
 from typing_extensions import TypeAlias
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -70,6 +103,9 @@ TDataloader: TypeAlias = Union[
     Iterable[TTrainData], Iterable[TEvalData], Iterable[TPredictData]
 ]
 
+# file of dirpath in which the state of the tuning of checkpoint writes is persisted
+IO_TUNING_FNAME = ".io_tuning"
+
 
 class DistributedCheckpointSaver(BaseCheckpointer):
     """
@@ -105,6 +141,18 @@ class DistributedCheckpointSaver(BaseCheckpointer):
         process_group: The process group on which the ranks will communicate on. default: ``None`` (the entire world)
         async_checkpoint: Whether to perform asynchronous checkpointing. Default: ``True``.
         knob_options: Additional keyword options for StorageWriter. <https://pytorch.org/docs/stable/distributed.checkpoint.html#torch.distributed.checkpoint.StorageWriter/>
+        tiered_checkpoint_options: If set, checkpoints are saved to a fast local tier, and every n-th checkpoint is promoted to ``dirpath`` in the background.
+            Pass the ``local_dirpath`` of the options to :meth:`restore_from_latest` to restore from the local tier when possible.
+        compression_options: If set, checkpoint items are compressed by the writer threads, and optimizer moments optionally downcast.
+        save_every_n_seconds: Frequency, in seconds of wall-clock time, with which to save checkpoints during the train epoch. The time is measured on rank 0
+            and propagated to the other ranks without blocking, so checkpoints are saved at the train step following the one at which the interval elapsed.
+        adaptive_checkpoint_options: If set, the interval between train step checkpoints is adapted to the measured save cost, step time and expected mean time
+            between failures, starting from ``save_every_n_train_steps``.
+        preemption_options: If set, an emergency checkpoint is saved, and training stopped, when the job receives a preemption signal such as SIGTERM.
+        io_tuning_options: If set, the thread count, copy-ahead size and ``single_file_per_rank`` of the storage writer are tuned from the write
+            throughput measured at each save, and the best settings are persisted in ``dirpath``. Ignored for saves with a custom ``storage_writer``.
+        checksum_options: If set, the writer threads checksum every item of the checkpoint as they write it, and the checksums are written to a
+            manifest in the checkpoint. They are verified in parallel when the checkpoint is restored, see :class:`~torchtnt.framework.callbacks.checkpointer_types.RestoreOptions`.
 
     Note:
         If torch.distributed is available, there should be a process group is initialized. In this case DCP assumes the intention is to save/load checkpoints in distributed fashion.
@@ -134,6 +182,13 @@ class DistributedCheckpointSaver(BaseCheckpointer):
         process_group: Optional[dist.ProcessGroup] = None,
         async_checkpoint: bool = False,
         knob_options: Optional[KnobOptions] = None,
+        tiered_checkpoint_options: Optional[TieredCheckpointOptions] = None,
+        compression_options: Optional[CompressionOptions] = None,
+        save_every_n_seconds: Optional[float] = None,
+        adaptive_checkpoint_options: Optional[AdaptiveCheckpointOptions] = None,
+        preemption_options: Optional[PreemptionOptions] = None,
+        io_tuning_options: Optional[IOTuningOptions] = None,
+        checksum_options: Optional[ChecksumOptions] = None,
     ) -> None:
         super().__init__(
             dirpath=dirpath,
@@ -145,12 +200,59 @@ class DistributedCheckpointSaver(BaseCheckpointer):
             keep_last_n_checkpoints=keep_last_n_checkpoints,
             best_checkpoint_config=best_checkpoint_config,
             process_group=process_group,
+            tiered_checkpoint_options=tiered_checkpoint_options,
+            save_every_n_seconds=save_every_n_seconds,
+            adaptive_checkpoint_options=adaptive_checkpoint_options,
+            preemption_options=preemption_options,
         )
         self._async_checkpoint = async_checkpoint
 
         self._knob_options: KnobOptions = knob_options or KnobOptions()
+        self._compression_options = compression_options
+        self._checksum_algorithm: Optional[str] = (
+            get_checksum_algorithm(checksum_options.algorithm)
+            if checksum_options is not None
+            else None
+        )
         self._prev_snapshot: Optional[Future] = None
 
+        self._io_tuner: Optional[IOConcurrencyTuner] = None
+        self._io_settings: Optional[IOSettings] = None
+        # writer of the last checkpoint and its settings, until its throughput is recorded
+        self._measured_save: Optional[Tuple[MeasuredStorageWriter, IOSettings]] = None
+        if io_tuning_options is not None:
+            self._setup_io_tuner(io_tuning_options)
+
+    def _setup_io_tuner(self, options: IOTuningOptions) -> None:
+        thread_count = self._knob_options.max_per_rank_io_concurrency or 16
+        tuner = IOConcurrencyTuner(
+            IOSettings(
+                thread_count=thread_count, single_file_per_rank=thread_count == 1
+            ),
+            thread_count_bounds=(options.min_thread_count, options.max_thread_count),
+            per_thread_copy_ahead_bounds=(
+                options.min_per_thread_copy_ahead,
+                options.max_per_thread_copy_ahead,
+            ),
+            tune_single_file_per_rank=options.tune_single_file_per_rank,
+            min_improvement=options.min_improvement,
+        )
+        # rank 0 tunes the settings, which are broadcast before each save
+        if PGWrapper(self._process_group).get_rank() == 0:
+            fs, _ = url_to_fs(self.dirpath)
+            path = os.path.join(self.dirpath, IO_TUNING_FNAME)
+            if fs.exists(path):
+                try:
+                    with fs.open(path, "r") as f:
+                        tuner.load_state_dict(json.load(f))
+                    logger.info(
+                        f"Resuming the tuning of checkpoint writes from {tuner.best_settings}"
+                    )
+                except (KeyError, TypeError, ValueError):
+                    logger.warning(f"Ignoring unreadable I/O tuning state {path}")
+        self._io_tuner = tuner
+        self._io_settings = tuner.settings
+
     def _checkpoint_impl(
         self,
         state: State,
@@ -184,8 +286,37 @@ class DistributedCheckpointSaver(BaseCheckpointer):
         if planner is None:
             planner = DefaultSavePlanner()
 
-        if storage_writer is None:
+        if self._io_tuner is not None:
+            # no-op if the throughput was already recorded when the settings of this save were picked
+            self._record_write_throughput()
+
+        if storage_writer is None and self._compression_options is not None:
+            storage_writer = CompressedStorageWriter(
+                checkpoint_id,
+                codec=self._compression_options.codec,
+                downcast_optimizer_moments=self._compression_options.downcast_optimizer_moments,
+                checksum_algorithm=self._checksum_algorithm,
+                **self.default_writer_options,
+            )
+        elif storage_writer is None and (
+            self._io_tuner is not None or self._checksum_algorithm is not None
+        ):
+            storage_writer = MeasuredStorageWriter(
+                checkpoint_id,
+                checksum_algorithm=self._checksum_algorithm,
+                **self.default_writer_options,
+            )
+        elif storage_writer is None:
             storage_writer = Writer(checkpoint_id, **self.default_writer_options)
+        if self._io_tuner is not None and isinstance(
+            storage_writer, MeasuredStorageWriter
+        ):
+            self._measured_save = (storage_writer, none_throws(self._io_settings))
+
+        # the optimizer states of a deferred restore must be loaded before they are saved
+        deferred_restore = _deferred_optimizer_restores.get(unit)
+        if deferred_restore is not None:
+            deferred_restore.wait()
 
         app_state = _prepare_app_state_for_checkpoint(state, unit, intra_epoch)
         # TODO: evaluate whether we need to implement the equivalent of torchsnapshot.RNGState()
@@ -216,8 +347,61 @@ class DistributedCheckpointSaver(BaseCheckpointer):
                     use_collectives=self._knob_options.use_collectives,
                 )
 
+        if self._io_tuner is not None and (
+            not self._async_checkpoint or curr_snapshot_wait
+        ):
+            self._record_write_throughput()
         return True
 
+    def _decide_upkeep(
+        self, state: State, unit: Union[TTrainUnit, TEvalUnit, TPredictUnit], hook: str
+    ) -> _UpkeepDecision:
+        decision = super()._decide_upkeep(state, unit, hook)
+        if self._io_tuner is not None and decision.checkpoint_path is not None:
+            # the previous checkpoint was waited for, so its write throughput is known
+            self._record_write_throughput()
+            decision.extras["io_settings"] = self._io_tuner.settings
+        return decision
+
+    def _apply_upkeep_decision(
+        self,
+        state: State,
+        unit: Union[TTrainUnit, TEvalUnit, TPredictUnit],
+        hook: str,
+        decision: _UpkeepDecision,
+    ) -> None:
+        super()._apply_upkeep_decision(state, unit, hook, decision)
+        if "io_settings" in decision.extras:
+            self._io_settings = decision.extras["io_settings"]
+
+    def _record_write_throughput(self) -> None:
+        """
+        Records the write throughput of the last checkpoint, which is measured by the coordinator rank, and persists the
+        state of the tuning in ``dirpath`` on rank 0.
+        """
+        if self._measured_save is None:
+            return
+        writer, settings = self._measured_save
+        self._measured_save = None
+        stats = writer.write_stats
+        tuner = none_throws(self._io_tuner)
+        if stats is None or PGWrapper(self._process_group).get_rank() != 0:
+            return
+
+        tuner.record(settings, stats)
+        logger.info(
+            f"Wrote {stats.bytes_written} bytes in {stats.write_seconds:.3f}s with {settings}, "
+            f"next checkpoint uses {tuner.settings}"
+        )
+        fs, _ = url_to_fs(self.dirpath)
+        path = os.path.join(self.dirpath, IO_TUNING_FNAME)
+        try:
+            fs.makedirs(self.dirpath, exist_ok=True)
+            with fs.open(path, "w") as f:
+                json.dump(tuner.state_dict(), f)
+        except OSError as exc:
+            logger.warning(f"Failed to persist I/O tuning state to {path}: {exc}")
+
     def _wait(self, log_warning: bool = True) -> None:
         """
         If the previous async checkpoint is still running, wait for it to finish before continuing. Otherwise,
@@ -255,6 +439,16 @@ class DistributedCheckpointSaver(BaseCheckpointer):
             logger=logger,
         )
 
+    def _async_save_future(self) -> Optional[Future[Any]]:
+        return self._prev_snapshot if self._async_checkpoint else None
+
+    def on_train_start(self, state: State, unit: TTrainUnit) -> None:
+        deferred_restore = _deferred_optimizer_restores.get(unit)
+        if deferred_restore is not None:
+            # the time spent restoring the optimizer states is reported along with the other timings of training
+            deferred_restore.timer = state.timer
+        super().on_train_start(state, unit)
+
     def on_exception(
         self,
         state: State,
@@ -263,6 +457,7 @@ class DistributedCheckpointSaver(BaseCheckpointer):
     ) -> None:
         rank_zero_info("Ensuring previous async checkpoint finished before exiting.")
         self._wait(log_warning=False)
+        super().on_exception(state, unit, exc)
 
     @staticmethod
     def restore(
@@ -325,8 +520,12 @@ class DistributedCheckpointSaver(BaseCheckpointer):
             process_group: The process group on which the ranks will communicate on. default: ``None`` (the entire world)
                             If not Gloo, a Gloo process group is created.
                             Note: If torch.distributed is available and a process group is initialized, dcp assumes the intention is to save/load checkpoints in distributed fashion.
-            restore_options: Controls what to  filter when restoring the state.
-            knob_options: Additional keyword options for StorageWriter and StorageReader
+            restore_options: Controls what to  filter when restoring the state. If ``defer_optimizer_restore`` is set, the optimizer
+                             states are loaded in a background thread after this returns, over a dedicated gloo process group,
+                             and the first ``step`` of each optimizer waits until they are loaded. If the checksums of the checkpoint
+                             are verified and do not match, the checkpoint is marked as corrupt before the error is raised.
+            knob_options: Additional keyword options for StorageWriter and StorageReader. If ``max_per_rank_io_concurrency`` is set,
+                          the files of a compressed or checksummed checkpoint are read, decompressed and verified by as many threads.
             planner: Instance of LoadPlanner. If this is not specificed, the default planner will be used. (Default: ``None``)
             storage_reader: Instance of StorageReader used to perform reads. If this is not specified, it will automatically infer
                             the reader based on the checkpoint_id. If checkpoint_id is also None, an exception will be raised. (Default: ``None``)
@@ -355,9 +554,29 @@ class DistributedCheckpointSaver(BaseCheckpointer):
 
         app_state = _prepare_app_state_for_restore(unit, restore_options)
 
-        # If no storage_reader is provided, default to path based reader
+        # If no storage_reader is provided, default to path based reader. Checkpoints which are compressed, or whose
+        # checksums are to be verified, are read by CompressedStorageReader instead
+        deferred_storage_reader = storage_reader
         if storage_reader is None:
-            storage_reader = Reader(checkpoint_id)
+            if needs_compressed_storage_reader(
+                checkpoint_id,
+                rank=get_global_rank(),
+                verify_checksums=restore_options.verify_checksums,
+            ):
+                thread_count = (
+                    knob_options.max_per_rank_io_concurrency or 1 if knob_options else 1
+                )
+                storage_reader, deferred_storage_reader = (
+                    CompressedStorageReader(
+                        checkpoint_id,
+                        thread_count=thread_count,
+                        verify_checksums=restore_options.verify_checksums,
+                    )
+                    for _ in range(2)
+                )
+            else:
+                storage_reader = Reader(checkpoint_id)
+                deferred_storage_reader = Reader(checkpoint_id)
 
         # If no planner is provided, use the default planner
         if planner is None:
@@ -384,13 +603,40 @@ class DistributedCheckpointSaver(BaseCheckpointer):
                 if isinstance(optimizer, torch.optim.Optimizer):
                     _init_optim_state(optimizer)
 
+        optimizer_app_state: Dict[str, Any] = {}
+        if restore_options.defer_optimizer_restore:
+            optimizer_app_state = {
+                key: app_state.pop(key)
+                for key in unit.tracked_optimizers().keys()
+                if key in app_state
+            }
+
         with get_or_create_gloo_pg(candidate_pg=process_group) as pg:
-            dcp.load(
-                {"app_state": MultiStateful(app_state, strict=restore_options.strict)},
-                checkpoint_id=checkpoint_id,
-                storage_reader=storage_reader,
+            try:
+                dcp.load(
+                    {
+                        "app_state": MultiStateful(
+                            app_state, strict=restore_options.strict
+                        )
+                    },
+                    checkpoint_id=checkpoint_id,
+                    storage_reader=storage_reader,
+                    planner=planner,
+                    process_group=pg,
+                )
+            except BaseException:
+                # DCP raises a CheckpointException, which is not an Exception
+                _mark_if_corrupt(checkpoint_id, storage_reader)
+                raise
+
+        if optimizer_app_state:
+            _deferred_optimizer_restores[unit] = _DeferredOptimizerRestore(
+                checkpoint_id,
+                optimizer_app_state,
+                storage_reader=none_throws(deferred_storage_reader),
                 planner=planner,
-                process_group=pg,
+                strict=restore_options.strict,
+                process_group=process_group,
             )
 
         rank_zero_info(
@@ -503,5 +749,138 @@ class DistributedCheckpointSaver(BaseCheckpointer):
         }
         if dcp_options["thread_count"] > 1:
             dcp_options["single_file_per_rank"] = False
+        if self._io_settings is not None:
+            dcp_options.update(asdict(self._io_settings))
 
         return dcp_options
+
+
+class _DeferredOptimizerRestore:
+    """
+    Loads the optimizer states of a checkpoint in a background thread, and makes the first ``step`` of each optimizer
+    wait until they are loaded.
+
+    Optimizer wrappers, such as the FSDP one, run collectives on the default process group in ``state_dict`` and
+    ``load_state_dict``, which would deadlock if they were called in the background thread while training issues its
+    own collectives. So only the tensors are read in the background, into state dicts which are taken on the main
+    thread here, and they are loaded into the optimizers on the main thread, in :meth:`wait`.
+    """
+
+    def __init__(
+        self,
+        checkpoint_id: str,
+        optimizer_app_state: Dict[str, Any],
+        *,
+        storage_reader: StorageReader,
+        planner: LoadPlanner,
+        strict: bool,
+        process_group: Optional[dist.ProcessGroup],
+    ) -> None:
+        self.timer: Optional[TimerProtocol] = None
+        self._checkpoint_id = checkpoint_id
+        self._done = False
+        self._load_time_s = 0.0
+
+        # the load runs concurrently with the collectives of training, so it needs its own process group
+        self._pg: Optional[dist.ProcessGroup] = None
+        if dist.is_initialized():
+            self._pg = dist.new_group(
+                ranks=dist.get_process_group_ranks(process_group or dist.group.WORLD),
+                timeout=timedelta(seconds=3600),
+                backend=dist.Backend.GLOO,
+            )
+
+        # the hooks are never removed, since removing a hook while the hooks of a step are called is an error
+        for obj in optimizer_app_state.values():
+            optimizer = getattr(obj, "optimizer", obj)
+            if isinstance(optimizer, torch.optim.Optimizer):
+                optimizer.register_step_pre_hook(self._step_pre_hook)
+
+        self._optimizers = MultiStateful(optimizer_app_state, strict=strict)
+        # DCP loads tensors in place, so the state dicts are templates which are filled in the background
+        self._state_dict: Dict[str, Any] = {"app_state": self._optimizers.state_dict()}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tnt-deferred-optimizer-restore"
+        )
+        self._future: Future[None] = self._executor.submit(
+            self._load,
+            self._state_dict,
+            storage_reader,
+            planner,
+        )
+        self._executor.shutdown(wait=False)
+
+    def _load(
+        self,
+        state_dict: Dict[str, Any],
+        storage_reader: StorageReader,
+        planner: LoadPlanner,
+    ) -> None:
+        t0 = time.perf_counter()
+        try:
+            dcp.load(
+                state_dict,
+                checkpoint_id=self._checkpoint_id,
+                storage_reader=storage_reader,
+                planner=planner,
+                process_group=self._pg,
+            )
+        except BaseException:
+            _mark_if_corrupt(self._checkpoint_id, storage_reader)
+            raise
+        self._load_time_s = time.perf_counter() - t0
+
+    def _step_pre_hook(
+        self, optimizer: torch.optim.Optimizer, args: Any, kwargs: Any
+    ) -> None:
+        self.wait()
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def wait(self) -> None:
+        """Waits until the optimizer states are loaded, and reports the time spent loading them, and waiting for them."""
+        if self._done:
+            return
+
+        t0 = time.perf_counter()
+        self._future.result()
+        wait_time_s = time.perf_counter() - t0
+        self._done = True
+        if self._pg is not None:
+            dist.destroy_process_group(self._pg)
+            self._pg = None
+        # on the main thread, since optimizer wrappers may run collectives
+        self._optimizers.load_state_dict(self._state_dict["app_state"])
+        self._state_dict = {}
+
+        if self.timer is not None:
+            self.timer.recorded_durations[
+                "DistributedCheckpointSaver.deferred_optimizer_restore"
+            ].append(self._load_time_s)
+            self.timer.recorded_durations[
+                "DistributedCheckpointSaver.wait_for_optimizer_restore"
+            ].append(wait_time_s)
+        rank_zero_info(
+            f"Restored the optimizer states of {self._checkpoint_id} in {self._load_time_s:.3f}s, "
+            f"of which {max(self._load_time_s - wait_time_s, 0):.3f}s overlapped with training",
+            logger=logger,
+        )
+
+
+# optimizer states being restored in the background, by unit
+_deferred_optimizer_restores: (
+    "weakref.WeakKeyDictionary[AppStateMixin, _DeferredOptimizerRestore]"
+) = weakref.WeakKeyDictionary()
+
+
+def _mark_if_corrupt(checkpoint_id: str, storage_reader: StorageReader) -> None:
+    """Marks a checkpoint as corrupt if the reader found a checksum mismatch."""
+    if (
+        isinstance(storage_reader, CompressedStorageReader)
+        and storage_reader.corrupt_files
+    ):
+        logger.error(
+            f"Checksums of {storage_reader.corrupt_files} do not match, marking checkpoint {checkpoint_id} as corrupt"
+        )
+        mark_corrupt_checkpoint(checkpoint_id)
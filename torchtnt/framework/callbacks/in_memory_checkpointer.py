@@ -0,0 +1,606 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+import fsspec
+import torch
+import torch.distributed as dist
+from pyre_extensions import none_throws
+from torch import nn
+from torch.distributed.tensor import DTensor
+from torch.utils._pytree import tree_map_only
+from torchtnt.framework.callbacks._checkpoint_utils import (
+    _PHASE_DL_STATE_KEY_MAPPING,
+    _prepare_app_state_for_checkpoint,
+    _prepare_app_state_for_restore,
+)
+from torchtnt.framework.callbacks.base_checkpointer import BaseCheckpointer
+from torchtnt.framework.callbacks.checkpointer_types import RestoreOptions
+from torchtnt.framework.callbacks.dcp_saver import DistributedCheckpointSaver
+from torchtnt.framework.state import EntryPoint, State
+from torchtnt.framework.unit import AppStateMixin, TTrainData
+from torchtnt.framework.utils import get_timing_context
+from torchtnt.utils.checkpoint import CheckpointPath, get_latest_checkpoint_path, Phase
+from torchtnt.utils.distributed import get_local_world_size, PGWrapper
+from torchtnt.utils.optimizer import init_optim_state
+from torchtnt.utils.rank_zero_log import rank_zero_info, rank_zero_warn
+from torchtnt.utils.stateful import Stateful
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+_ROOT_DIRNAME = "torchtnt_in_memory_checkpoints"
+_TMP_SUFFIX = ".tmp"
+
+
+@dataclass
+class _MemoryCheckpoint:
+    """A serialized checkpoint of one rank, held in a node-local file."""
+
+    path: str
+    file_path: str
+    size: int
+
+    def read(self) -> torch.Tensor:
+        with open(self.file_path, "rb") as f:
+            return torch.frombuffer(bytearray(f.read()), dtype=torch.uint8)
+
+
+@dataclass
+class _HeldCheckpoints:
+    """The checkpoints held on its node for a rank: its own, and the replica of its peer's."""
+
+    own: Optional[_MemoryCheckpoint] = None
+    replica: Optional[_MemoryCheckpoint] = None
+    replica_rank: Optional[int] = None
+
+
+@dataclass
+class _HeldCheckpointsInfo:
+    """Description of the checkpoints held by a rank, gathered to plan a recovery."""
+
+    own_path: Optional[str]
+    own_size: int
+    replica_path: Optional[str]
+    replica_size: int
+    replica_rank: Optional[int]
+
+
+class _NodeLocalStore:
+    """
+    Holds the checkpoints of a rank in files of a node-local directory, ideally a memory-backed file system such as
+    ``/dev/shm``, so they outlive the process which wrote them, and are found again by the process which takes over
+    the rank on the same node when the workers are restarted.
+
+    Files are named ``rank{rank}-own-{name}.bin`` and ``rank{rank}-replica{source_rank}-{name}.bin``, where ``name``
+    is the base name of the checkpoint path. Each file is written to a temporary path first, and the files of older
+    checkpoints are only deleted once the files of the new checkpoint are complete.
+    """
+
+    def __init__(self, dirpath: str, local_dir: Optional[str], rank: int) -> None:
+        self.dirpath = dirpath
+        # checkpoint names may hold characters which are not valid in file names
+        self.root: str = os.path.join(
+            local_dir or _default_local_dir(),
+            _ROOT_DIRNAME,
+            hashlib.sha256(dirpath.encode()).hexdigest()[:16],
+        )
+        self.rank = rank
+
+    def write(
+        self,
+        path: str,
+        payload: torch.Tensor,
+        replica: Optional[Tuple[int, torch.Tensor]],
+    ) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        name = os.path.basename(path)
+        written = [self._write_file(f"rank{self.rank:05d}-own-{name}.bin", payload)]
+        if replica is not None:
+            source_rank, replica_payload = replica
+            written.append(
+                self._write_file(
+                    f"rank{self.rank:05d}-replica{source_rank:05d}-{name}.bin",
+                    replica_payload,
+                )
+            )
+        for file_name in self._file_names():
+            if file_name not in written:
+                os.remove(os.path.join(self.root, file_name))
+
+    def held(self) -> _HeldCheckpoints:
+        """Returns the latest checkpoint of the rank, and the latest replica, held on this node."""
+        held = _HeldCheckpoints()
+        for file_name in self._file_names():
+            _, kind, name = file_name[: -len(".bin")].split("-", 2)
+            checkpoint = _MemoryCheckpoint(
+                path=os.path.join(self.dirpath, name),
+                file_path=os.path.join(self.root, file_name),
+                size=os.path.getsize(os.path.join(self.root, file_name)),
+            )
+            if kind == "own":
+                if held.own is None or _is_newer(checkpoint, held.own):
+                    held.own = checkpoint
+            elif held.replica is None or _is_newer(checkpoint, held.replica):
+                held.replica = checkpoint
+                held.replica_rank = int(kind[len("replica") :])
+        return held
+
+    def clear(self) -> None:
+        for file_name in self._file_names():
+            os.remove(os.path.join(self.root, file_name))
+
+    def _file_names(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            file_name
+            for file_name in os.listdir(self.root)
+            if file_name.startswith(f"rank{self.rank:05d}-")
+            and file_name.endswith(".bin")
+        )
+
+    def _write_file(self, file_name: str, payload: torch.Tensor) -> str:
+        file_path = os.path.join(self.root, file_name)
+        with open(file_path + _TMP_SUFFIX, "wb") as f:
+            payload.numpy().tofile(f)
+        os.replace(file_path + _TMP_SUFFIX, file_path)
+        return file_name
+
+
+def _default_local_dir() -> str:
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def _is_newer(checkpoint: _MemoryCheckpoint, other: _MemoryCheckpoint) -> bool:
+    return CheckpointPath.from_str(checkpoint.path).newer_than(
+        CheckpointPath.from_str(other.path)
+    )
+
+
+class InMemoryCheckpointer(BaseCheckpointer):
+    """
+    A callback which periodically keeps a copy of the application state in node-local memory, and replicates it to the
+    memory of a peer rank on another node, so that training can recover from the failure of a node without reading a
+    checkpoint back from storage.
+
+    Every rank keeps the latest serialized state of its own, and the latest state of the rank ``buddy_offset`` ranks
+    before it, which it receives over the checkpointing gloo process group. With the default offset, which is the
+    number of ranks per node, each rank's replica lives on the next node. Both are written to files under
+    ``local_dir``, by default the memory-backed ``/dev/shm``, so they outlive the worker processes. When the workers
+    are restarted, e.g. by ``torchrun`` after a failure, :meth:`restore_from_latest` restores each rank from the files
+    left on its node, and each rank of a replaced node from the replica held by its peer, which sends it over the
+    process group. If the state of some rank is held by no node, or if the storage checkpoint is more recent, the latest
+    checkpoint in ``storage_dirpath`` is restored instead, so this callback is meant to be used along with a
+    :class:`DistributedCheckpointSaver` which saves less frequently.
+
+    .. note::
+        A restarted worker finds the files of its rank on its node, so ranks must be assigned to the same nodes when
+        the workers are restarted, as with a static ``--node-rank``. The files are kept when training ends, so that
+        a later restart can still use them, and can be removed with :meth:`delete_local_checkpoints`. If ``local_dir``
+        is memory-backed, they are lost when the node reboots.
+
+    Only the latest checkpoint is kept, so each rank holds two copies of its shard of the state in node-local memory:
+    its own, and its peer's. Tensors are stored as they are sharded, and DTensors as their local shards, so the state
+    must be restored with the same world size and sharding as it was saved with.
+
+    Args:
+        dirpath: Name of the in-memory checkpoints, e.g. ``memory://my_job``, which must be unique among the jobs
+            sharing a node. Checkpoints are identified by the path ``dirpath/epoch_{epoch}_<phase>_step_{step}``, but
+            nothing is written to ``dirpath`` itself.
+        save_every_n_train_steps: Frequency of steps with which to save checkpoints during the train epoch. If None, no intra-epoch checkpoints are generated.
+        save_every_n_epochs: Frequency of epochs with which to save checkpoints during training. If None, no end-of-epoch checkpoints are generated.
+        process_group: The process group on which the ranks will communicate on. If the process group is not gloo-based, a new gloo-based process group will be created.
+        buddy_offset: Distance, in ranks of the process group, between a rank and the peer holding its replica. Defaults to the
+            number of ranks per node, or to 1 if there is a single node.
+        local_dir: Node-local directory in which checkpoints are held. Defaults to ``/dev/shm``, or to the temporary
+            directory if there is no ``/dev/shm``.
+
+    Example::
+
+        in_memory = InMemoryCheckpointer("memory://my_job", save_every_n_train_steps=50)
+        storage = DistributedCheckpointSaver(storage_dirpath, save_every_n_train_steps=1000)
+        InMemoryCheckpointer.restore_from_latest("memory://my_job", unit, storage_dirpath=storage_dirpath)
+        train(unit, dataloader, callbacks=[in_memory, storage])
+    """
+
+    def __init__(
+        self,
+        dirpath: str,
+        *,
+        save_every_n_train_steps: Optional[int] = None,
+        save_every_n_epochs: Optional[int] = None,
+        process_group: Optional[dist.ProcessGroup] = None,
+        buddy_offset: Optional[int] = None,
+        local_dir: Optional[str] = None,
+    ) -> None:
+        super().__init__(
+            dirpath=dirpath,
+            save_every_n_train_steps=save_every_n_train_steps,
+            save_every_n_epochs=save_every_n_epochs,
+            process_group=process_group,
+        )
+        pg_wrapper = PGWrapper(self._process_group)
+        world_size = pg_wrapper.get_world_size()
+        if buddy_offset is None:
+            local_world_size = get_local_world_size()
+            buddy_offset = local_world_size if world_size > local_world_size else 1
+        if world_size > 1 and buddy_offset % world_size == 0:
+            raise ValueError(
+                f"Invalid value passed for buddy_offset. Expected an offset which is not a multiple of the world size {world_size}, but received {buddy_offset}"
+            )
+        self._buddy_offset: int = buddy_offset
+        self._store = _NodeLocalStore(
+            self.dirpath, local_dir, rank=pg_wrapper.get_rank()
+        )
+
+    def _checkpoint_impl(
+        self,
+        state: State,
+        unit: AppStateMixin,
+        *,
+        checkpoint_id: str,
+        hook: str,
+    ) -> bool:
+        intra_epoch = "step_end" in hook or (
+            "on_eval_epoch_end" == hook and state.entry_point == EntryPoint.FIT
+        )
+        app_state = _prepare_app_state_for_checkpoint(state, unit, intra_epoch)
+
+        with get_timing_context(state, f"{self.__class__.__name__}.save"):
+            payload = _serialize(
+                {key: stateful.state_dict() for key, stateful in app_state.items()}
+            )
+            replica = self._replicate(payload)
+
+        # the previous checkpoint is only dropped once the new one is replicated
+        with get_timing_context(state, f"{self.__class__.__name__}.write_local"):
+            self._store.write(checkpoint_id, payload, replica)
+        return True
+
+    @staticmethod
+    def delete_local_checkpoints(
+        dirpath: str,
+        *,
+        process_group: Optional[dist.ProcessGroup] = None,
+        local_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Deletes the checkpoint and replica held on its node for the calling rank, e.g. once the job completed.
+
+        Args:
+            dirpath: Name of the in-memory checkpoints.
+            process_group: The process group whose rank the checkpoints were held for. default: ``None`` (the entire world)
+            local_dir: Node-local directory in which checkpoints are held.
+        """
+        rank = PGWrapper(process_group).get_rank()
+        _NodeLocalStore(dirpath, local_dir, rank).clear()
+
+    def _replicate(self, payload: torch.Tensor) -> Optional[Tuple[int, torch.Tensor]]:
+        """
+        Sends this rank's payload to its buddy, and receives the payload of the rank whose buddy this rank is.
+
+        Returns:
+            The rank of the received payload, and the payload. None if there is a single rank.
+        """
+        pg_wrapper = PGWrapper(self._process_group)
+        world_size = pg_wrapper.get_world_size()
+        if world_size == 1:
+            return None
+
+        rank = pg_wrapper.get_rank()
+        buddy_rank = (rank + self._buddy_offset) % world_size
+        source_rank = (rank - self._buddy_offset) % world_size
+        sizes: List[int] = [0] * world_size
+        pg_wrapper.all_gather_object(sizes, payload.numel())
+
+        replica = torch.empty(sizes[source_rank], dtype=torch.uint8)
+        _send_recv(
+            self._process_group,
+            sends=[(buddy_rank, payload)],
+            recvs=[(source_rank, replica)],
+        )
+        return source_rank, replica
+
+    @staticmethod
+    def restore(
+        path: str,
+        unit: AppStateMixin,
+        *,
+        train_dataloader: Optional[Iterable[TTrainData]] = None,
+        process_group: Optional[dist.ProcessGroup] = None,
+        restore_options: Optional[RestoreOptions] = None,
+        local_dir: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Restores the checkpoint at ``path`` from the node-local memory of the ranks. Each rank is restored from the
+        files on its node if they hold its checkpoint, and otherwise from the replica held by its peer.
+
+        Args:
+            path: Path of the in-memory checkpoint to restore.
+            unit: An instance of :class:`~torchtnt.framework.unit.TrainUnit`, :class:`~torchtnt.framework.unit.EvalUnit`, or :class:`~torchtnt.framework.unit.PredictUnit` containing states to restore.
+            train_dataloader: An optional train dataloader to restore.
+            process_group: The process group on which the ranks will communicate on. Must be gloo-based. default: ``None`` (the entire world)
+            restore_options: Controls what to filter when restoring the state.
+            local_dir: Node-local directory in which checkpoints are held.
+
+        Raises:
+            RuntimeError: If the checkpoint of some rank is not held in memory by any rank.
+        """
+        pg_wrapper = PGWrapper(process_group)
+        store = _NodeLocalStore(
+            os.path.dirname(path), local_dir, rank=pg_wrapper.get_rank()
+        )
+        held = store.held()
+        infos = _gather_held_checkpoints(held, pg_wrapper)
+        sources = _find_sources(infos, path)
+        if sources is None:
+            raise RuntimeError(
+                f"Unable to restore {path} from memory, since the checkpoint of some rank is not held by any rank."
+            )
+
+        rank = pg_wrapper.get_rank()
+        sends = []
+        recvs = []
+        payload = None
+        for dst_rank, src_rank in enumerate(sources):
+            if dst_rank == src_rank:
+                if dst_rank == rank:
+                    payload = none_throws(held.own).read()
+                continue
+            if src_rank == rank:
+                sends.append((dst_rank, none_throws(held.replica).read()))
+            elif dst_rank == rank:
+                payload = torch.empty(infos[src_rank].replica_size, dtype=torch.uint8)
+                recvs.append((src_rank, payload))
+        _send_recv(process_group, sends=sends, recvs=recvs)
+
+        num_recovered = sum(
+            dst_rank != src_rank for dst_rank, src_rank in enumerate(sources)
+        )
+        rank_zero_info(
+            f"Restoring {path} from memory, {num_recovered} rank(s) from the replica of a peer",
+            logger=logger,
+        )
+        _load(
+            _deserialize(payload),
+            unit,
+            restore_options or RestoreOptions(),
+            train_dataloader,
+        )
+
+    @classmethod
+    def restore_from_latest(
+        cls,
+        dirpath: str,
+        unit: AppStateMixin,
+        *,
+        train_dataloader: Optional[Iterable[TTrainData]] = None,
+        process_group: Optional[dist.ProcessGroup] = None,
+        restore_options: Optional[RestoreOptions] = None,
+        file_system: Optional[fsspec.AbstractFileSystem] = None,
+        storage_dirpath: Optional[str] = None,
+        storage_checkpointer: Type[BaseCheckpointer] = DistributedCheckpointSaver,
+        local_dir: Optional[str] = None,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        Restores the latest checkpoint held in memory which can be restored on every rank. If there is none, or if the
+        latest checkpoint in ``storage_dirpath`` is more recent, the latter is restored instead.
+
+        Args:
+            dirpath: Name of the in-memory checkpoints.
+            unit: An instance of :class:`~torchtnt.framework.unit.TrainUnit`, :class:`~torchtnt.framework.unit.EvalUnit`, or :class:`~torchtnt.framework.unit.PredictUnit` containing states to restore.
+            train_dataloader: An optional train dataloader to restore.
+            process_group: The process group on which the ranks will communicate on. Must be gloo-based. default: ``None`` (the entire world)
+            restore_options: Controls what to filter when restoring the state.
+            file_system: If a custom file system should be used to fetch the storage checkpoint directories.
+            storage_dirpath: Parent directory of the storage checkpoints to fall back to.
+            storage_checkpointer: The checkpointer which saved the storage checkpoints.
+            local_dir: Node-local directory in which checkpoints are held.
+
+        Returns:
+            True if a checkpoint was restored, otherwise False.
+        """
+        pg_wrapper = PGWrapper(process_group)
+        store = _NodeLocalStore(dirpath, local_dir, rank=pg_wrapper.get_rank())
+        infos = _gather_held_checkpoints(store.held(), pg_wrapper)
+        candidates = {
+            path
+            for info in infos
+            for path in (info.own_path, info.replica_path)
+            if path is not None
+        }
+        memory_path = None
+        for path in sorted(
+            candidates, key=lambda p: CheckpointPath.from_str(p), reverse=True
+        ):
+            if _find_sources(infos, path) is not None:
+                memory_path = path
+                break
+
+        storage_path = None
+        if storage_dirpath is not None:
+            storage_path = get_latest_checkpoint_path(
+                storage_dirpath,
+                metadata_fname=storage_checkpointer.metadata_fnames,
+                file_system=file_system,
+                process_group=process_group,
+            )
+
+        if memory_path is None:
+            reason = (
+                "the state of some rank is not held in memory by any node"
+                if candidates
+                else "no node holds an in-memory checkpoint"
+            )
+        elif storage_path is not None and CheckpointPath.from_str(
+            storage_path
+        ).newer_than(CheckpointPath.from_str(memory_path)):
+            reason = f"the storage checkpoint is newer than the in-memory checkpoint {memory_path}"
+        else:
+            cls.restore(
+                memory_path,
+                unit,
+                train_dataloader=train_dataloader,
+                process_group=process_group,
+                restore_options=restore_options,
+                local_dir=local_dir,
+            )
+            return True
+
+        if storage_path is None:
+            rank_zero_warn(
+                f"No checkpoint can be restored from memory ({dirpath=}), as {reason}, or storage ({storage_dirpath=})",
+                logger=logger,
+            )
+            return False
+
+        rank_zero_info(
+            f"Restoring from storage checkpoint {storage_path}, as {reason}",
+            logger=logger,
+        )
+        storage_checkpointer.restore(
+            storage_path,
+            unit,
+            train_dataloader=train_dataloader,
+            process_group=process_group,
+            restore_options=restore_options,
+            **kwargs,
+        )
+        return True
+
+
+def _serialize(state_dict: Dict[str, Any]) -> torch.Tensor:
+    # DTensors are stored as their local shards, as their device mesh can not be serialized
+    state_dict = tree_map_only(DTensor, lambda t: t.to_local(), state_dict)
+    buffer = io.BytesIO()
+    torch.save(state_dict, buffer)
+    return torch.frombuffer(buffer.getbuffer(), dtype=torch.uint8).clone()
+
+
+def _deserialize(payload: Optional[torch.Tensor]) -> Dict[str, Any]:
+    if payload is None:
+        raise RuntimeError("No in-memory checkpoint was received by this rank")
+    return torch.load(
+        io.BytesIO(payload.numpy().tobytes()), map_location="cpu", weights_only=False
+    )
+
+
+def _to_dtensors(saved: Any, template: Any) -> Any:
+    """Wraps the local shards of ``saved`` as DTensors wherever ``template`` holds a DTensor."""
+    if isinstance(template, DTensor) and isinstance(saved, torch.Tensor):
+        return DTensor.from_local(
+            saved.to(template.device),
+            template.device_mesh,
+            template.placements,
+            shape=template.shape,
+            stride=template.stride(),
+        )
+    if isinstance(template, dict) and isinstance(saved, dict):
+        return {k: _to_dtensors(v, template.get(k)) for k, v in saved.items()}
+    if isinstance(template, (list, tuple)) and isinstance(saved, (list, tuple)):
+        return type(saved)(_to_dtensors(v, t) for v, t in zip(saved, template))
+    return saved
+
+
+def _load(
+    state_dict: Dict[str, Any],
+    unit: AppStateMixin,
+    restore_options: RestoreOptions,
+    train_dataloader: Optional[Iterable[TTrainData]],
+) -> None:
+    app_state: Dict[str, Any] = _prepare_app_state_for_restore(unit, restore_options)
+    dl_key = _PHASE_DL_STATE_KEY_MAPPING[Phase.TRAIN]
+    if dl_key in state_dict and isinstance(train_dataloader, Stateful):
+        app_state[dl_key] = train_dataloader
+
+    if restore_options.init_optim_states:
+        for obj in app_state.values():
+            optimizer = getattr(obj, "optimizer", obj)
+            if isinstance(optimizer, torch.optim.Optimizer):
+                init_optim_state(optimizer)
+
+    for key, stateful in app_state.items():
+        if key not in state_dict:
+            if restore_options.strict:
+                raise RuntimeError(
+                    f"Missing key in in-memory checkpoint state_dict: {key}."
+                )
+            logger.warning(f"{key} was not found in the in-memory checkpoint")
+            continue
+        saved = _to_dtensors(state_dict[key], stateful.state_dict())
+        if isinstance(stateful, nn.Module):
+            stateful.load_state_dict(saved, strict=restore_options.strict)
+        else:
+            stateful.load_state_dict(saved)
+
+
+def _send_recv(
+    process_group: Optional[dist.ProcessGroup],
+    sends: List[Tuple[int, torch.Tensor]],
+    recvs: List[Tuple[int, torch.Tensor]],
+) -> None:
+    """Sends and receives tensors to and from ranks of the process group, without ordering constraints."""
+    group = process_group or dist.group.WORLD
+    works = [
+        dist.isend(tensor, dist.get_global_rank(group, dst), group=group)
+        for dst, tensor in sends
+    ] + [
+        dist.irecv(tensor, dist.get_global_rank(group, src), group=group)
+        for src, tensor in recvs
+    ]
+    for work in works:
+        work.wait()
+
+
+def _gather_held_checkpoints(
+    held: _HeldCheckpoints, pg_wrapper: PGWrapper
+) -> List[_HeldCheckpointsInfo]:
+    info = _HeldCheckpointsInfo(
+        own_path=held.own.path if held.own else None,
+        own_size=held.own.size if held.own else 0,
+        replica_path=held.replica.path if held.replica else None,
+        replica_size=held.replica.size if held.replica else 0,
+        replica_rank=held.replica_rank,
+    )
+    infos: List[Optional[_HeldCheckpointsInfo]] = [None] * pg_wrapper.get_world_size()
+    pg_wrapper.all_gather_object(infos, info)
+    return [i for i in infos if i is not None]
+
+
+def _find_sources(infos: List[_HeldCheckpointsInfo], path: str) -> Optional[List[int]]:
+    """
+    Returns, for every rank, the rank holding its checkpoint at ``path``: itself if it holds it, otherwise a peer
+    holding its replica. Returns None if the checkpoint of some rank is not held by any rank.
+    """
+    sources = []
+    for rank, info in enumerate(infos):
+        if info.own_path == path:
+            sources.append(rank)
+            continue
+        source = next(
+            (
+                peer
+                for peer, peer_info in enumerate(infos)
+                if peer_info.replica_rank == rank and peer_info.replica_path == path
+            ),
+            None,
+        )
+        if source is None:
+            return None
+        sources.append(source)
+    return sources
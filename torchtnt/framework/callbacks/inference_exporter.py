@@ -0,0 +1,207 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import torch
+import torch.distributed as dist
+from torch.distributed.checkpoint.state_dict import (
+    get_model_state_dict,
+    StateDictOptions,
+)
+from torchtnt.framework.callbacks.base_checkpointer import BaseCheckpointer
+from torchtnt.framework.callbacks.checkpointer_types import RestoreOptions
+from torchtnt.framework.state import State
+from torchtnt.framework.unit import (
+    AppStateMixin,
+    TEvalUnit,
+    TPredictUnit,
+    TTestUnit,
+    TTrainData,
+    TTrainUnit,
+)
+from torchtnt.framework.utils import get_timing_context
+from torchtnt.utils.inference_export import (
+    INFERENCE_WEIGHTS_FNAMES,
+    load_inference_weights,
+    load_inference_weights_into_module,
+    save_inference_weights,
+)
+from torchtnt.utils.rank_zero_log import rank_zero_info
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class InferenceExporter(BaseCheckpointer):
+    """
+    A callback which periodically exports the weights of the tracked modules of the unit to a single, memory-mappable
+    weights file, so that inference jobs can load them without going through the distributed restore of a training
+    checkpoint. See :func:`~torchtnt.utils.inference_export.save_inference_weights` for the file format.
+
+    The full state dicts of the modules are gathered to CPU on rank 0, which is a collective for sharded modules, and
+    copied; the weights file is then written by rank 0 in a background thread while training continues. Exports are
+    named like checkpoints, ``dirpath/epoch_{epoch}_<phase>_step_{step}/``, so the latest one is found with
+    :meth:`restore_from_latest`. To export every n-th checkpoint of a checkpointer, use a multiple of its frequency.
+
+    Args:
+        dirpath: Parent directory to export weights to.
+        save_every_n_train_steps: Frequency of steps with which to export weights during the train epoch. If None, no intra-epoch exports are generated.
+        save_every_n_epochs: Frequency of epochs with which to export weights during training. If None, no end-of-epoch exports are generated.
+        keep_last_n_checkpoints: Number of most recent exports to keep. If None, all exports are kept.
+        process_group: The process group on which the ranks will communicate on. If the process group is not gloo-based, a new gloo-based process group will be created.
+        dtype: If set, floating point weights are exported in this dtype, e.g. ``torch.bfloat16``.
+
+    Example::
+
+        exporter = InferenceExporter(export_dirpath, save_every_n_train_steps=5000, keep_last_n_checkpoints=2, dtype=torch.bfloat16)
+        train(unit, dataloader, callbacks=[checkpointer, exporter])
+
+        # in the inference job, the module may be created on the meta device
+        InferenceExporter.restore_from_latest(export_dirpath, predict_unit)
+    """
+
+    metadata_fnames: List[str] = INFERENCE_WEIGHTS_FNAMES
+
+    def __init__(
+        self,
+        dirpath: str,
+        *,
+        save_every_n_train_steps: Optional[int] = None,
+        save_every_n_epochs: Optional[int] = None,
+        keep_last_n_checkpoints: Optional[int] = None,
+        process_group: Optional[dist.ProcessGroup] = None,
+        dtype: Optional[torch.dtype] = None,
+    ) -> None:
+        super().__init__(
+            dirpath=dirpath,
+            save_every_n_train_steps=save_every_n_train_steps,
+            save_every_n_epochs=save_every_n_epochs,
+            keep_last_n_checkpoints=keep_last_n_checkpoints,
+            process_group=process_group,
+        )
+        self._dtype = dtype
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tnt-inference-export"
+        )
+        self._prev_export: Optional[Future[str]] = None
+
+    def _checkpoint_impl(
+        self,
+        state: State,
+        unit: AppStateMixin,
+        *,
+        checkpoint_id: str,
+        hook: str,
+    ) -> bool:
+        # the previous export must be written before it may be removed to honor keep_last_n_checkpoints
+        self._wait()
+
+        with get_timing_context(state, f"{self.__class__.__name__}.export"):
+            options = StateDictOptions(full_state_dict=True, cpu_offload=True)
+            module_state_dicts: Dict[str, Dict[str, torch.Tensor]] = {}
+            for name, module in unit.tracked_modules().items():
+                state_dict = get_model_state_dict(module, options=options)
+                if not state_dict:
+                    # e.g. a loss module, or a rank other than 0
+                    continue
+                # the weights keep being updated by training while they are written
+                module_state_dicts[name] = {
+                    key: tensor.detach().to(
+                        device="cpu",
+                        dtype=(
+                            self._dtype
+                            if self._dtype is not None and tensor.is_floating_point()
+                            else tensor.dtype
+                        ),
+                        copy=True,
+                    )
+                    for key, tensor in state_dict.items()
+                }
+
+        # the full state dicts are only gathered on rank 0
+        if not dist.is_initialized() or dist.get_rank() == 0:
+            self._prev_export = self._executor.submit(
+                save_inference_weights, module_state_dicts, checkpoint_id
+            )
+        return True
+
+    def _async_save_future(self) -> Optional[Future[Any]]:
+        return self._prev_export
+
+    def on_train_end(self, state: State, unit: TTrainUnit) -> None:
+        # the last export must be written before checking whether the final one already exists
+        self._wait()
+        super().on_train_end(state, unit)
+        self._wait()
+
+    def on_exception(
+        self,
+        state: State,
+        unit: Union[TTrainUnit, TEvalUnit, TPredictUnit, TTestUnit],
+        exc: BaseException,
+    ) -> None:
+        self._wait()
+        super().on_exception(state, unit, exc)
+
+    def _wait(self) -> None:
+        if self._prev_export is None:
+            return
+        try:
+            path = self._prev_export.result()
+        except Exception as exc:
+            logger.error(f"Failed to export inference weights: {exc}")
+        else:
+            rank_zero_info(f"Exported inference weights to {path}", logger=logger)
+        self._prev_export = None
+
+    @staticmethod
+    def restore(
+        path: str,
+        unit: AppStateMixin,
+        *,
+        train_dataloader: Optional[Iterable[TTrainData]] = None,
+        process_group: Optional[dist.ProcessGroup] = None,
+        restore_options: Optional[RestoreOptions] = None,
+        device: Optional[torch.device] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Loads the exported weights at ``path`` into the tracked modules of the unit with the same names, by memory-mapping
+        the weights file on every rank. Only module weights are restored.
+
+        Args:
+            path: Path of the export to restore.
+            unit: An instance of :class:`~torchtnt.framework.unit.TrainUnit`, :class:`~torchtnt.framework.unit.EvalUnit`, or :class:`~torchtnt.framework.unit.PredictUnit` containing modules to restore.
+            train_dataloader: Unused, since exports do not contain dataloader state.
+            process_group: Unused, since every rank reads the weights file.
+            restore_options: Controls what to filter when restoring the state. Only ``restore_modules`` and ``strict`` apply.
+            device: Device to load the weights to. Defaults to the device of each module's parameters, or to CPU if they are on the meta device.
+        """
+        restore_options = restore_options or RestoreOptions()
+        if not restore_options.restore_modules:
+            return
+
+        exported_module_names, _ = load_inference_weights(path)
+        for name, module in unit.tracked_modules().items():
+            if name not in exported_module_names:
+                # modules without state, e.g. loss modules, are not exported
+                if restore_options.strict and module.state_dict():
+                    raise RuntimeError(
+                        f"Module {name} was not exported to {path}, exported modules are {exported_module_names}"
+                    )
+                continue
+            load_inference_weights_into_module(
+                module,
+                path,
+                module_name=name,
+                device=device,
+                strict=restore_options.strict,
+            )
+        rank_zero_info(f"Restored exported weights from {path}", logger=logger)
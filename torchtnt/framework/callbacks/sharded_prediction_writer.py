@@ -0,0 +1,404 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import csv
+import io
+import json
+import logging
+import os
+import shutil
+from abc import ABC, abstractmethod
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, IO, List, Optional, Tuple, Union
+
+import fsspec
+import numpy as np
+import torch
+from pyre_extensions import none_throws
+from torchtnt.framework.callback import Callback
+from torchtnt.framework.state import EntryPoint, State
+from torchtnt.framework.unit import TEvalUnit, TPredictUnit, TTestUnit, TTrainUnit
+from torchtnt.utils.distributed import get_global_rank, PGWrapper
+from torchtnt.utils.fsspec import get_filesystem
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    _PYARROW_AVAILABLE = True
+except Exception:
+    _PYARROW_AVAILABLE = False
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_TMP_SUFFIX = ".tmp"
+_NPY_MERGE_CHUNK_BYTES: int = 16 * 1024 * 1024
+
+
+class PredictionOutputFormat(ABC):
+    """
+    Defines how a batch of prediction rows is serialized into a shard file, and how shards are merged.
+    """
+
+    suffix: str
+
+    @abstractmethod
+    def serialize(self, rows: List[Any]) -> bytes:
+        """Serializes a batch of rows into the contents of a single shard file."""
+        ...
+
+    def merge(
+        self, fs: fsspec.AbstractFileSystem, shard_paths: List[str], output_path: str
+    ) -> None:
+        """Merges shard files, in order, into a single file. By default shards are concatenated byte-wise."""
+        with fs.open(output_path, "wb") as out:
+            for path in shard_paths:
+                with fs.open(path, "rb") as f:
+                    out.write(f.read())
+
+
+class CSVFormat(PredictionOutputFormat):
+    """
+    Writes rows as delimited text. Each row is a list of strings matching ``header_row``.
+    Every shard contains the header row, which is written once in the merged file.
+
+    Args:
+        header_row: columns of the CSV file
+        delimiter: separate columns in one row. Default is tab
+    """
+
+    suffix = "csv"
+
+    def __init__(self, header_row: List[str], delimiter: str = "\t") -> None:
+        self.header_row = header_row
+        self.delimiter = delimiter
+
+    def serialize(self, rows: List[Any]) -> bytes:
+        buf = io.StringIO()
+        writer = csv.writer(buf, delimiter=self.delimiter)
+        writer.writerow(self.header_row)
+        writer.writerows(rows)
+        return buf.getvalue().encode("utf-8")
+
+    def merge(
+        self, fs: fsspec.AbstractFileSystem, shard_paths: List[str], output_path: str
+    ) -> None:
+        with fs.open(output_path, "wb") as out:
+            for i, path in enumerate(shard_paths):
+                with fs.open(path, "rb") as f:
+                    header = f.readline()
+                    if i == 0:
+                        out.write(header)
+                    out.write(f.read())
+
+
+class JSONLFormat(PredictionOutputFormat):
+    """
+    Writes each row as one line of JSON. Rows must be JSON serializable.
+    """
+
+    suffix = "jsonl"
+
+    def serialize(self, rows: List[Any]) -> bytes:
+        return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+
+class ParquetFormat(PredictionOutputFormat):
+    """
+    Writes rows to Parquet files. Each row is a dict mapping column name to value.
+    Requires ``pyarrow`` to be installed.
+    """
+
+    suffix = "parquet"
+
+    def __init__(self) -> None:
+        if not _PYARROW_AVAILABLE:
+            raise RuntimeError(
+                "ParquetFormat requires pyarrow. Please make sure ``pyarrow`` is installed."
+            )
+
+    def serialize(self, rows: List[Any]) -> bytes:
+        buf = io.BytesIO()
+        pq.write_table(pa.Table.from_pylist(rows), buf)
+        return buf.getvalue()
+
+    def merge(
+        self, fs: fsspec.AbstractFileSystem, shard_paths: List[str], output_path: str
+    ) -> None:
+        # copy one row group at a time, so only a single row group is held in memory
+        with fs.open(output_path, "wb") as out:
+            writer = None
+            try:
+                for path in shard_paths:
+                    with fs.open(path, "rb") as f:
+                        shard = pq.ParquetFile(f)
+                        if writer is None:
+                            writer = pq.ParquetWriter(out, shard.schema_arrow)
+                        for i in range(shard.num_row_groups):
+                            writer.write_table(shard.read_row_group(i))
+            finally:
+                if writer is not None:
+                    writer.close()
+
+
+class NpyFormat(PredictionOutputFormat):
+    """
+    Writes rows as a single stacked array in ``.npy`` format. Each row is a tensor or
+    numpy array, and all rows must have the same shape and dtype.
+    """
+
+    suffix = "npy"
+
+    def serialize(self, rows: List[Any]) -> bytes:
+        arrays = [
+            row.detach().cpu().numpy() if isinstance(row, torch.Tensor) else row
+            for row in rows
+        ]
+        buf = io.BytesIO()
+        np.save(buf, np.stack(arrays))
+        return buf.getvalue()
+
+    def merge(
+        self, fs: fsspec.AbstractFileSystem, shard_paths: List[str], output_path: str
+    ) -> None:
+        # the headers are read first to size the merged array, and the data is then copied in chunks
+        num_rows = 0
+        row_shape: Optional[Tuple[int, ...]] = None
+        dtype: Optional[np.dtype] = None
+        for path in shard_paths:
+            with fs.open(path, "rb") as f:
+                shape, shard_dtype = _read_npy_header(f, path)
+            if row_shape is None:
+                row_shape, dtype = shape[1:], shard_dtype
+            elif shape[1:] != row_shape or shard_dtype != dtype:
+                raise ValueError(
+                    f"Cannot merge shard {path} with rows of shape {shape[1:]} and dtype {shard_dtype} "
+                    f"into rows of shape {row_shape} and dtype {dtype}."
+                )
+            num_rows += shape[0]
+
+        header = {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": (num_rows,) + none_throws(row_shape),
+        }
+        with fs.open(output_path, "wb") as out:
+            try:
+                np.lib.format.write_array_header_1_0(out, header)
+            except ValueError:
+                # the header does not fit the length field of format version 1.0
+                np.lib.format.write_array_header_2_0(out, header)
+            for path in shard_paths:
+                with fs.open(path, "rb") as f:
+                    _read_npy_header(f, path)
+                    shutil.copyfileobj(f, out, _NPY_MERGE_CHUNK_BYTES)
+
+
+def _read_npy_header(f: IO[bytes], path: str) -> Tuple[Tuple[int, ...], np.dtype]:
+    """Reads the header of a ``.npy`` file, leaving ``f`` positioned at the start of the data."""
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    if fortran_order or dtype.hasobject or len(shape) == 0:
+        raise ValueError(
+            f"Cannot merge shard {path}: only C-ordered arrays of at least one dimension without Python objects are supported."
+        )
+    return shape, dtype
+
+
+class ShardedPredictionWriter(Callback, ABC):
+    """
+    A callback to write prediction outputs to per-rank sharded files.
+
+    Unlike :class:`~torchtnt.framework.callbacks.BaseCSVWriter`, which synchronously appends every row to a single
+    file shared by all ranks, this callback buffers rows in memory and hands every ``rows_per_shard`` rows to a
+    background thread, which serializes them with the given :class:`PredictionOutputFormat` and writes them to a new
+    shard file owned by the current rank. Each shard is first written to a temporary path and then moved to its
+    final name, so only complete shards are ever visible under the final name.
+
+    Shards are named ``{filename_prefix}-rank{rank:05d}-{shard_idx:05d}.{suffix}``. If ``merge_shards`` is set, all
+    ranks synchronize at the end of prediction and rank 0 merges the shards written in this run, in rank and shard
+    order, into ``{filename_prefix}.{suffix}``. The other ranks do not wait for the merge, so only rank 0 may expect
+    the merged file to exist once prediction returns. Like shards, the merged file is written to a temporary path and
+    moved to its final name once complete. Parquet shards are merged one row group at a time and ``.npy`` shards in
+    fixed size chunks, so merging does not hold the whole output in memory.
+
+    This callback must be extended with an implementation for ``get_step_output_rows`` to produce the rows to
+    write for each step, in the representation expected by the format.
+
+    Args:
+        dir_path: directory path of where to save the shards
+        output_format: the format in which shards are written, e.g. :class:`CSVFormat`, :class:`JSONLFormat`,
+            :class:`ParquetFormat`, or :class:`NpyFormat`
+        filename_prefix: prefix of the shard file names. Default is "predictions"
+        rows_per_shard: number of rows to buffer before writing a shard
+        max_pending_shards: maximum number of shards queued for the background writer before the training thread blocks
+        merge_shards: whether rank 0 should merge all shards into a single file at the end of prediction
+        delete_shards_after_merge: whether to delete the shards once they were merged
+
+    Note:
+        Errors raised by the background writer are only re-raised once a step has to wait for a pending shard because
+        ``max_pending_shards`` shards are queued, or at the end of prediction.
+    """
+
+    def __init__(
+        self,
+        dir_path: str,
+        output_format: PredictionOutputFormat,
+        filename_prefix: str = "predictions",
+        rows_per_shard: int = 10_000,
+        max_pending_shards: int = 2,
+        merge_shards: bool = False,
+        delete_shards_after_merge: bool = False,
+    ) -> None:
+        super().__init__()
+        if rows_per_shard <= 0:
+            raise ValueError(f"rows_per_shard must be > 0. Got {rows_per_shard}")
+        if max_pending_shards <= 0:
+            raise ValueError(
+                f"max_pending_shards must be > 0. Got {max_pending_shards}"
+            )
+
+        self.dir_path = dir_path
+        self.output_format = output_format
+        self.filename_prefix = filename_prefix
+        self.rows_per_shard = rows_per_shard
+        self.max_pending_shards = max_pending_shards
+        self.merge_shards = merge_shards
+        self.delete_shards_after_merge = delete_shards_after_merge
+
+        self._fs: fsspec.AbstractFileSystem = get_filesystem(dir_path)
+        self._rows: List[Any] = []
+        self._num_shards = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[Future[None]] = deque()
+
+    @abstractmethod
+    def get_step_output_rows(
+        self,
+        state: State,
+        unit: TPredictUnit,
+        step_output: Any,
+    ) -> List[Any]:
+        """Returns the rows to write for the current step."""
+        ...
+
+    def shard_path(self, rank: int, shard_idx: int) -> str:
+        return os.path.join(
+            self.dir_path,
+            f"{self.filename_prefix}-rank{rank:05d}-{shard_idx:05d}.{self.output_format.suffix}",
+        )
+
+    @property
+    def merged_path(self) -> str:
+        return os.path.join(
+            self.dir_path, f"{self.filename_prefix}.{self.output_format.suffix}"
+        )
+
+    def on_predict_start(self, state: State, unit: TPredictUnit) -> None:
+        self._fs.makedirs(self.dir_path, exist_ok=True)
+        self._rows = []
+        self._num_shards = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tnt_prediction_writer"
+        )
+
+    def on_predict_step_end(self, state: State, unit: TPredictUnit) -> None:
+        predict_state = none_throws(state.predict_state)
+        self._rows.extend(
+            self.get_step_output_rows(state, unit, predict_state.step_output)
+        )
+        while len(self._rows) >= self.rows_per_shard:
+            rows = self._rows[: self.rows_per_shard]
+            self._rows = self._rows[self.rows_per_shard :]
+            self._submit_shard(rows)
+
+    def on_predict_end(self, state: State, unit: TPredictUnit) -> None:
+        if self._rows:
+            self._submit_shard(self._rows)
+            self._rows = []
+        self._close()
+
+        if self.merge_shards:
+            # wait for all ranks to commit their shards, and learn how many each wrote
+            pg = PGWrapper(None)
+            num_shards_by_rank: List[int] = [0] * pg.get_world_size()
+            pg.all_gather_object(num_shards_by_rank, self._num_shards)
+            # the other ranks do not wait for the merge, which can outlast the timeout of collectives
+            if get_global_rank() == 0:
+                self._merge(num_shards_by_rank)
+
+    def on_exception(
+        self,
+        state: State,
+        unit: Union[TTrainUnit, TEvalUnit, TPredictUnit, TTestUnit],
+        exc: BaseException,
+    ) -> None:
+        if state.entry_point == EntryPoint.PREDICT and self._executor is not None:
+            # shards that were already handed off are still committed
+            try:
+                self._close()
+            except Exception as e:
+                logger.error(f"Failed to write prediction shards: {e}")
+
+    def _submit_shard(self, rows: List[Any]) -> None:
+        # apply backpressure and surface errors from the background writer
+        while len(self._pending) >= self.max_pending_shards:
+            self._pending.popleft().result()
+
+        path = self.shard_path(get_global_rank(), self._num_shards)
+        self._num_shards += 1
+        self._pending.append(
+            none_throws(self._executor).submit(self._write_shard, rows, path)
+        )
+
+    def _write_shard(self, rows: List[Any], path: str) -> None:
+        data = self.output_format.serialize(rows)
+        tmp_path = path + _TMP_SUFFIX
+        with self._fs.open(tmp_path, "wb") as f:
+            f.write(data)
+        self._fs.mv(tmp_path, path)
+
+    def _close(self) -> None:
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._pending.clear()
+            none_throws(self._executor).shutdown(wait=True)
+            self._executor = None
+
+    def _merge(self, num_shards_by_rank: List[int]) -> None:
+        # shards left over from earlier runs in the same directory are not merged
+        shard_paths = [
+            self.shard_path(rank, shard_idx)
+            for rank, num_shards in enumerate(num_shards_by_rank)
+            for shard_idx in range(num_shards)
+        ]
+        if not shard_paths:
+            logger.warning("No prediction shards found to merge.")
+            return
+        # merge into a temporary path first, so an interrupted merge never leaves a truncated file under the final name
+        tmp_path = self.merged_path + _TMP_SUFFIX
+        try:
+            self.output_format.merge(self._fs, shard_paths, tmp_path)
+        except BaseException:
+            if self._fs.exists(tmp_path):
+                self._fs.rm(tmp_path)
+            raise
+        self._fs.mv(tmp_path, self.merged_path)
+        logger.info(
+            f"Merged {len(shard_paths)} prediction shards into {self.merged_path}"
+        )
+        if self.delete_shards_after_merge:
+            for path in shard_paths:
+                self._fs.rm(path)
@@ -7,6 +7,7 @@
 # pyre-strict
 
 import logging
+from typing import Any, List, Optional, Union
 
 try:
     from torch._inductor.async_compile import shutdown_compile_workers
@@ -19,9 +20,18 @@ except ImportError:
         )
 
 
+from torchtnt.framework.auto_unit import AutoUnit
 from torchtnt.framework.callback import Callback
 from torchtnt.framework.state import State
 from torchtnt.framework.unit import TTrainUnit
+from torchtnt.framework.utils import get_timing_context
+from torchtnt.utils.compile import (
+    CompileStats,
+    get_compile_stats,
+    save_compile_cache,
+    warmup_compile,
+)
+from torchtnt.utils.loggers.logger import MetricLogger
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -30,18 +40,117 @@ class TorchCompile(Callback):
     """
     A callback for using torch.compile.
 
+    Compilation time is recorded in the state's timer under ``TorchCompile.compile``, and, if loggers are given,
+    logged along with the number of compiled frames and graphs whenever something was compiled during a train step.
+    Frames compiled during a train step after the first one, or after the warmup, are counted as recompilations, and
+    warned about. Frames compiled outside of train steps, e.g. the eval mode graphs compiled during the evaluation
+    epochs of ``fit``, are expected and not counted.
+
+    If a ``cache_dir`` is set in :class:`~torchtnt.utils.prepare_module.TorchCompileParams`, the compile artifacts are
+    saved to the persistent cache after the warmup, or after the first train step, and at the end of training.
+
     Args:
         step_shutdown_compile_workers: step after which compiler workers
-        will be shut down.
+            will be shut down. If None, compiler workers are shut down after
+            the warmup if there is one, and are kept otherwise.
+        warmup_batch: a batch, e.g. a synthetic one, on which the module of an
+            :class:`~torchtnt.framework.auto_unit.AutoUnit` runs a forward and backward pass at the start of training,
+            so the module is compiled before the first real step. The gradients, buffers and RNG state of the module are
+            restored afterwards.
+        loggers: Either a :class:`torchtnt.loggers.logger.MetricLogger` or
+            list of :class:`torchtnt.loggers.logger.MetricLogger` to log compile statistics to.
     """
 
-    def __init__(self, step_shutdown_compile_workers: int) -> None:
+    def __init__(
+        self,
+        step_shutdown_compile_workers: Optional[int] = None,
+        *,
+        warmup_batch: Optional[Any] = None,
+        loggers: Optional[Union[MetricLogger, List[MetricLogger]]] = None,
+    ) -> None:
         self._step_shutdown_compile_workers = step_shutdown_compile_workers
+        self._warmup_batch = warmup_batch
+        if loggers is None:
+            loggers = []
+        elif not isinstance(loggers, list):
+            loggers = [loggers]
+        self._loggers: List[MetricLogger] = loggers
+        self._stats: CompileStats = get_compile_stats()
+        # whether the module is expected to be compiled for training, after the warmup or the first train step
+        self._compiled = False
+        self._num_frames_at_step_start = 0
+        self._num_recompiles = 0
+
+    def on_train_start(self, state: State, unit: TTrainUnit) -> None:
+        self._stats = get_compile_stats()
+        if self._warmup_batch is None:
+            return
+        if not isinstance(unit, AutoUnit):
+            raise RuntimeError(
+                "TorchCompile's warmup_batch is only supported with AutoUnit"
+            )
+
+        batch = unit.move_data_to_device(state, self._warmup_batch, non_blocking=False)
+
+        def forward() -> Any:
+            with unit.maybe_autocast_precision:
+                loss, _ = unit.compute_loss(state, batch)
+            return loss
+
+        with get_timing_context(state, "TorchCompile.warmup"):
+            warmup_compile(unit.module, forward)
+        self._on_compiled(state, unit.train_progress.num_steps_completed)
+        logger.info("Finished torch.compile warmup")
+        if self._step_shutdown_compile_workers is None:
+            logger.info("Shutdown compile workers after warmup")
+            shutdown_compile_workers()
+
+    def on_train_step_start(self, state: State, unit: TTrainUnit) -> None:
+        self._num_frames_at_step_start = get_compile_stats().num_frames
 
     def on_train_step_end(self, state: State, unit: TTrainUnit) -> None:
         total_num_steps_completed = unit.train_progress.num_steps_completed
+        if not self._compiled:
+            self._on_compiled(state, total_num_steps_completed)
+        else:
+            self._record_stats(state, total_num_steps_completed)
         if total_num_steps_completed == self._step_shutdown_compile_workers:
             logger.info(
                 f"Shutdown compile workers after step {total_num_steps_completed}"
             )
             shutdown_compile_workers()
+
+    def on_train_end(self, state: State, unit: TTrainUnit) -> None:
+        save_compile_cache()
+
+    def _on_compiled(self, state: State, step: int) -> None:
+        self._record_stats(state, step)
+        self._compiled = True
+        save_compile_cache()
+
+    def _record_stats(self, state: State, step: int) -> None:
+        stats = get_compile_stats()
+        if stats.num_frames == self._stats.num_frames:
+            return
+        compile_time_s = stats.compile_time_s - self._stats.compile_time_s
+        self._stats = stats
+        if state.timer is not None:
+            state.timer.recorded_durations.setdefault(
+                "TorchCompile.compile", []
+            ).append(compile_time_s)
+
+        # only frames compiled during this train step are recompilations of the train graphs
+        num_step_frames = stats.num_frames - self._num_frames_at_step_start
+        if self._compiled and num_step_frames > 0:
+            self._num_recompiles += num_step_frames
+            logger.warning(
+                f"torch.compile recompiled at step {step}, {self._num_recompiles} recompilations so far"
+            )
+        payload = {
+            "compile/time_s": stats.compile_time_s,
+            "compile/num_frames": stats.num_frames,
+            "compile/num_graphs": stats.num_graphs,
+            "compile/num_recompiles": self._num_recompiles,
+        }
+        for metric_logger in self._loggers:
+            metric_logger.log_dict(payload, step)
@@ -20,7 +20,11 @@ from torchtnt.framework.callbacks._checkpoint_utils import (
     _TRAIN_DL_STATE_KEY,
 )
 from torchtnt.framework.callbacks.base_checkpointer import BaseCheckpointer
-from torchtnt.framework.callbacks.checkpointer_types import KnobOptions, RestoreOptions
+from torchtnt.framework.callbacks.checkpointer_types import (
+    AdaptiveCheckpointOptions,
+    KnobOptions,
+    RestoreOptions,
+)
 from torchtnt.framework.state import State
 from torchtnt.framework.unit import (
     AppStateMixin,
@@ -83,6 +87,10 @@ class TorchSnapshotSaver(BaseCheckpointer):
         storage_options: Additional keyword options for the storage plugin to use, to be passed to `torchsnapshot.Snapshot <https://pytorch.org/torchsnapshot/stable/api_reference.html#torchsnapshot.Snapshot>`_.
             See each storage plugin's documentation for customizations.
         knob_options: Additional keyword options for the snapshot knobs
+        save_every_n_seconds: Frequency, in seconds of wall-clock time, with which to save checkpoints during the train epoch. The time is measured on rank 0
+            and propagated to the other ranks without blocking, so checkpoints are saved at the train step following the one at which the interval elapsed.
+        adaptive_checkpoint_options: If set, the interval between train step checkpoints is adapted to the measured save cost, step time and expected mean time
+            between failures, starting from ``save_every_n_train_steps``.
 
     Note:
         If torch.distributed is available and default process group is initialized, the constructor will call a collective operation for rank 0 to broadcast the dirpath to all other ranks
@@ -111,6 +119,8 @@ class TorchSnapshotSaver(BaseCheckpointer):
         replicated: Optional[List[str]] = None,
         storage_options: Optional[Dict[str, Any]] = None,
         knob_options: Optional[KnobOptions] = None,
+        save_every_n_seconds: Optional[float] = None,
+        adaptive_checkpoint_options: Optional[AdaptiveCheckpointOptions] = None,
     ) -> None:
         _validate_snapshot_available()
         super().__init__(
@@ -121,6 +131,8 @@ class TorchSnapshotSaver(BaseCheckpointer):
             keep_last_n_checkpoints=keep_last_n_checkpoints,
             best_checkpoint_config=best_checkpoint_config,
             process_group=process_group,
+            save_every_n_seconds=save_every_n_seconds,
+            adaptive_checkpoint_options=adaptive_checkpoint_options,
         )
         self._async_checkpoint = async_checkpoint
 
@@ -13,9 +13,13 @@ import torch
 from pyre_extensions import none_throws
 from torchtnt.framework._callback_handler import CallbackHandler
 from torchtnt.framework._loop_utils import (
+    _get_data_iter,
     _is_epoch_done,
     _log_api_usage,
+    _num_steps_in_next_loop,
+    _replays_eval_batches,
     _reset_module_training_mode,
+    _run_steps,
     _set_module_training_mode,
 )
 from torchtnt.framework.callback import Callback
@@ -35,6 +39,7 @@ def evaluate(
     max_steps_per_epoch: Optional[int] = None,
     callbacks: Optional[List[Callback]] = None,
     timer: Optional[TimerProtocol] = None,
+    steps_per_loop: int = 1,
 ) -> None:
     """
     The ``evaluate`` entry point takes in a :class:`~torchtnt.framework.unit.EvalUnit` object, a train dataloader (any Iterable), optional arguments to modify loop execution,
@@ -46,6 +51,9 @@ def evaluate(
         max_steps_per_epoch: the max number of steps to run per epoch. None means evaluate until the dataloader is exhausted.
         callbacks: an optional list of :class:`~torchtnt.framework.callback.Callback` s.
         timer: an optional Timer which will be used to time key events (using a Timer with CUDA synchronization may degrade performance).
+        steps_per_loop: number of ``eval_step`` s to run back to back per loop iteration. When greater than 1, step-level callback hooks are
+         only called at the cadence each callback declares with :attr:`~torchtnt.framework.callback.Callback.step_hook_interval`.
+         See :py:func:`~torchtnt.framework.train` for details.
 
 
     Below is an example of calling :py:func:`~torchtnt.framework.evaluate`.
@@ -85,6 +93,7 @@ def evaluate(
         eval_state=PhaseState(
             dataloader=eval_dataloader,
             max_steps_per_epoch=max_steps_per_epoch,
+            steps_per_loop=steps_per_loop,
         ),
         timer=timer,
     )
@@ -132,8 +141,17 @@ def _evaluate_impl(
         callback_handler.on_eval_epoch_start(state, eval_unit)
 
     callback_handler.on_eval_dataloader_iter_creation_start(state, eval_unit)
-    with get_timing_context(state, "evaluate.iter(dataloader)"):
-        data_iter = iter(eval_state.dataloader)
+    if _replays_eval_batches(state, eval_unit):
+        # the unit replays the batches it cached, so the dataloader is not touched
+        data_iter = iter(())
+    else:
+        with get_timing_context(state, "evaluate.iter(dataloader)"):
+            data_iter = _get_data_iter(
+                eval_state.dataloader,
+                eval_state._data_iter_prefetcher,
+                state.timer,
+                "evaluate.iter(dataloader)",
+            )
     callback_handler.on_eval_dataloader_iter_creation_end(state, eval_unit)
 
     prev_steps_in_epoch = eval_unit.eval_progress.num_steps_completed_in_epoch
@@ -147,29 +165,53 @@ def _evaluate_impl(
             eval_state.max_steps,
         )
     ):
+        steps_before = eval_unit.eval_progress.num_steps_completed_in_epoch
         try:
-            with eval_state.iteration_timer.time("eval_and_data_iteration_time"):
-                with get_timing_context(
-                    state, "evaluate.next(data_iter)"
-                ), eval_state.iteration_timer.time("data_wait_time"):
-                    callback_handler.on_eval_get_next_batch_start(state, eval_unit)
-                    step_input = eval_unit.get_next_eval_batch(state, data_iter)
-                    callback_handler.on_eval_get_next_batch_end(state, eval_unit)
-
-                with eval_state.iteration_timer.time("eval_iteration_time"):
-                    callback_handler.on_eval_step_start(state, eval_unit)
-                    eval_state._step_output = eval_unit.eval_step(state, step_input)
-
-                    eval_unit.eval_progress.increment_step()
-                    callback_handler.on_eval_step_end(state, eval_unit)
-
-                    # clear step_output to avoid retaining extra memory
-                    eval_state._step_output = None
+            if eval_state.steps_per_loop > 1:
+                with eval_state.iteration_timer.time(
+                    "eval_and_data_iteration_time"
+                ), get_timing_context(state, "evaluate.run_steps"):
+                    _run_steps(
+                        state,
+                        eval_state,
+                        eval_unit,
+                        callback_handler,
+                        "eval",
+                        eval_unit.eval_progress,
+                        eval_unit.get_next_eval_batch,
+                        eval_unit.eval_step,
+                        data_iter,
+                        _num_steps_in_next_loop(
+                            eval_unit.eval_progress,
+                            eval_state.steps_per_loop,
+                            eval_state.max_steps_per_epoch,
+                            eval_state.max_steps,
+                        ),
+                    )
+            else:
+                with eval_state.iteration_timer.time("eval_and_data_iteration_time"):
+                    with get_timing_context(
+                        state, "evaluate.next(data_iter)"
+                    ), eval_state.iteration_timer.time("data_wait_time"):
+                        callback_handler.on_eval_get_next_batch_start(state, eval_unit)
+                        step_input = eval_unit.get_next_eval_batch(state, data_iter)
+                        callback_handler.on_eval_get_next_batch_end(state, eval_unit)
+
+                    with eval_state.iteration_timer.time("eval_iteration_time"):
+                        callback_handler.on_eval_step_start(state, eval_unit)
+                        eval_state._step_output = eval_unit.eval_step(state, step_input)
+
+                        eval_unit.eval_progress.increment_step()
+                        callback_handler.on_eval_step_end(state, eval_unit)
+
+                        # clear step_output to avoid retaining extra memory
+                        eval_state._step_output = None
 
             if (
-                eval_unit.eval_progress.num_steps_completed_in_epoch
+                steps_before - prev_steps_in_epoch
+                < 5
+                <= eval_unit.eval_progress.num_steps_completed_in_epoch
                 - prev_steps_in_epoch
-                == 5
             ):
                 # Set the trainer thread name to improve debuggability. We do it after
                 # 5 iterations to make sure that all the processes or thread pools
@@ -10,6 +10,7 @@ import logging
 from typing import Iterable, List, Optional
 
 import torch
+from pyre_extensions import none_throws
 from torchtnt.framework._callback_handler import CallbackHandler
 from torchtnt.framework._loop_utils import _log_api_usage
 from torchtnt.framework.callback import Callback
@@ -45,6 +46,9 @@ def fit(
     timer: Optional[TimerProtocol] = None,
     test_dataloader: Optional[Iterable[TTestData]] = None,
     max_test_steps: Optional[int] = None,
+    prefetch_eval_dataloader_iter: bool = False,
+    prefetch_train_dataloader_iter_steps: Optional[int] = None,
+    steps_per_loop: int = 1,
 ) -> None:
     """
     The ``fit`` entry point interleaves training and evaluation loops. The ``fit`` entry point takes in an object which subclasses both :class:`~torchtnt.framework.unit.TrainUnit` and :class:`~torchtnt.framework.unit.EvalUnit`, train and eval dataloaders (any Iterables), optional arguments to modify loop execution,
@@ -65,6 +69,20 @@ def fit(
         timer: an optional Timer which will be used to time key events (using a Timer with CUDA synchronization may degrade performance).
         test_dataloader: an optional dataloader to be used during testing after training completes.
         max_test_steps: the max number of steps to run for testing. None means test until ``test_dataloader`` is exhausted.
+        prefetch_eval_dataloader_iter: whether to create the next ``iter(eval_dataloader)`` on a background thread while training runs,
+         so that evaluations start with warm dataloader workers instead of paying worker startup each time. The time hidden
+         from the loop is recorded in ``timer`` under ``evaluate.iter(dataloader)_overlapped``. Note that the prefetched
+         iterator's workers stay alive and prefetch eval batches while training runs.
+        prefetch_train_dataloader_iter_steps: if set, the next epoch's ``iter(train_dataloader)`` is created on a background thread once this many
+         steps or fewer remain in the current train epoch, hiding dataloader worker startup at epoch boundaries. The epoch length is taken from
+         ``max_train_steps_per_epoch`` or ``len(train_dataloader)``; if neither is known, no prefetching happens. The ``DistributedSampler``
+         epoch is set before the next iterator is created, so samplers must compute their indices when their iterator is created.
+         The time hidden from the loop is recorded in ``timer`` under ``train.iter(dataloader)_overlapped``. Prefetching is skipped, with a
+         warning, for dataloaders with persistent workers, which reuse the current epoch's iterator, and for stateful dataloaders, whose
+         checkpoints would record the next epoch's iterator state.
+        steps_per_loop: number of ``train_step`` s and ``eval_step`` s to run back to back per loop iteration. When greater than 1, step-level
+         callback hooks are only called at the cadence each callback declares with :attr:`~torchtnt.framework.callback.Callback.step_hook_interval`.
+         See :py:func:`~torchtnt.framework.train` for details.
 
     Below is an example of calling :py:func:`~torchtnt.framework.fit`.
 
@@ -122,12 +140,16 @@ def fit(
             max_epochs=max_epochs,
             max_steps=max_steps,
             max_steps_per_epoch=max_train_steps_per_epoch,
+            prefetch_dataloader_iter_steps=prefetch_train_dataloader_iter_steps,
+            steps_per_loop=steps_per_loop,
         ),
         eval_state=PhaseState(
             dataloader=eval_dataloader,
             max_steps_per_epoch=max_eval_steps_per_epoch,
             evaluate_every_n_steps=evaluate_every_n_steps,
             evaluate_every_n_epochs=evaluate_every_n_epochs,
+            prefetch_dataloader_iter=prefetch_eval_dataloader_iter,
+            steps_per_loop=steps_per_loop,
         ),
         test_state=(
             PhaseState(
@@ -169,3 +191,8 @@ def fit(
         unit.on_exception(state, e)
         callback_handler.on_exception(state, unit, e)
         raise e
+    finally:
+        for phase_state in (state.train_state, state.eval_state):
+            prefetcher = none_throws(phase_state)._data_iter_prefetcher
+            if prefetcher is not None:
+                prefetcher.shutdown()
@@ -15,7 +15,9 @@ from torchtnt.framework._callback_handler import CallbackHandler
 from torchtnt.framework._loop_utils import (
     _is_epoch_done,
     _log_api_usage,
+    _num_steps_in_next_loop,
     _reset_module_training_mode,
+    _run_steps,
     _set_module_training_mode,
 )
 from torchtnt.framework.callback import Callback
@@ -36,6 +38,7 @@ def predict(
     max_steps_per_epoch: Optional[int] = None,
     callbacks: Optional[List[Callback]] = None,
     timer: Optional[TimerProtocol] = None,
+    steps_per_loop: int = 1,
 ) -> None:
     """
     The ``predict`` entry point takes in a :class:`~torchtnt.framework.unit.PredictUnit` object, a train dataloader (any Iterable), optional arguments to modify loop execution,
@@ -47,6 +50,9 @@ def predict(
         max_steps_per_epoch: the max number of steps to run per epoch. None means predict until the dataloader is exhausted.
         callbacks: an optional list of :class:`~torchtnt.framework.callback.Callback` s.
         timer: an optional Timer which will be used to time key events (using a Timer with CUDA synchronization may degrade performance).
+        steps_per_loop: number of ``predict_step`` s to run back to back per loop iteration. When greater than 1, step-level callback hooks are
+         only called at the cadence each callback declares with :attr:`~torchtnt.framework.callback.Callback.step_hook_interval`.
+         See :py:func:`~torchtnt.framework.train` for details.
 
 
     Below is an example of calling :py:func:`~torchtnt.framework.predict`.
@@ -89,6 +95,7 @@ def predict(
         predict_state=PhaseState(
             dataloader=predict_dataloader,
             max_steps_per_epoch=max_steps_per_epoch,
+            steps_per_loop=steps_per_loop,
         ),
         timer=timer,
     )
@@ -168,33 +175,63 @@ def _predict_impl(
             predict_state.max_steps,
         )
     ):
+        steps_before = predict_unit.predict_progress.num_steps_completed_in_epoch
         try:
-            with predict_state.iteration_timer.time("predict_and_data_iteration_time"):
-                with get_timing_context(
-                    state, "predict.next(data_iter)"
-                ), predict_state.iteration_timer.time("data_wait_time"):
-                    callback_handler.on_predict_get_next_batch_start(
-                        state, predict_unit
+            if predict_state.steps_per_loop > 1:
+                with predict_state.iteration_timer.time(
+                    "predict_and_data_iteration_time"
+                ), get_timing_context(state, "predict.run_steps"):
+                    _run_steps(
+                        state,
+                        predict_state,
+                        predict_unit,
+                        callback_handler,
+                        "predict",
+                        predict_unit.predict_progress,
+                        predict_unit.get_next_predict_batch,
+                        predict_unit.predict_step,
+                        data_iter,
+                        _num_steps_in_next_loop(
+                            predict_unit.predict_progress,
+                            predict_state.steps_per_loop,
+                            predict_state.max_steps_per_epoch,
+                            predict_state.max_steps,
+                        ),
                     )
-                    step_input = predict_unit.get_next_predict_batch(state, data_iter)
-                    callback_handler.on_predict_get_next_batch_end(state, predict_unit)
-
-                with predict_state.iteration_timer.time("predict_iteration_time"):
-                    callback_handler.on_predict_step_start(state, predict_unit)
-                    predict_state._step_output = predict_unit.predict_step(
-                        state, step_input
-                    )
-
-                    predict_unit.predict_progress.increment_step()
-                    callback_handler.on_predict_step_end(state, predict_unit)
-
-                    # clear step_output to avoid retaining extra memory
-                    predict_state._step_output = None
+            else:
+                with predict_state.iteration_timer.time(
+                    "predict_and_data_iteration_time"
+                ):
+                    with get_timing_context(
+                        state, "predict.next(data_iter)"
+                    ), predict_state.iteration_timer.time("data_wait_time"):
+                        callback_handler.on_predict_get_next_batch_start(
+                            state, predict_unit
+                        )
+                        step_input = predict_unit.get_next_predict_batch(
+                            state, data_iter
+                        )
+                        callback_handler.on_predict_get_next_batch_end(
+                            state, predict_unit
+                        )
+
+                    with predict_state.iteration_timer.time("predict_iteration_time"):
+                        callback_handler.on_predict_step_start(state, predict_unit)
+                        predict_state._step_output = predict_unit.predict_step(
+                            state, step_input
+                        )
+
+                        predict_unit.predict_progress.increment_step()
+                        callback_handler.on_predict_step_end(state, predict_unit)
+
+                        # clear step_output to avoid retaining extra memory
+                        predict_state._step_output = None
 
             if (
-                predict_unit.predict_progress.num_steps_completed_in_epoch
+                steps_before - prev_steps_in_epoch
+                < 5
+                <= predict_unit.predict_progress.num_steps_completed_in_epoch
                 - prev_steps_in_epoch
-                == 5
             ):
                 # Set the trainer thread name to improve debuggability. We do it after
                 # 5 iterations to make sure that all the processes or thread pools
@@ -13,6 +13,10 @@ from enum import auto, Enum
 from typing import Generic, Iterable, Optional, TypeVar
 
 from pyre_extensions import none_throws
+from torchtnt.framework._loop_utils import (
+    _DataIterPrefetcher,
+    _reason_next_iter_prefetch_unsupported,
+)
 from torchtnt.utils.checkpoint import Phase
 from torchtnt.utils.timer import BoundedTimer, TimerProtocol
 
@@ -106,12 +110,22 @@ class PhaseState(Generic[TData, TStepOutput]):
         max_steps_per_epoch: Optional[int] = None,
         evaluate_every_n_steps: Optional[int] = None,  # used only for evaluate
         evaluate_every_n_epochs: Optional[int] = None,  # used only for evaluate
+        prefetch_dataloader_iter: bool = False,  # used only for evaluate
+        prefetch_dataloader_iter_steps: Optional[int] = None,  # used only for train
+        steps_per_loop: int = 1,
     ) -> None:
         _check_loop_condition("max_epochs", max_epochs)
         _check_loop_condition("max_steps", max_steps)
         _check_loop_condition("max_steps_per_epoch", max_steps_per_epoch)
         _check_loop_condition("evaluate_every_n_steps", evaluate_every_n_steps)
         _check_loop_condition("evaluate_every_n_epochs", evaluate_every_n_epochs)
+        _check_loop_condition(
+            "prefetch_dataloader_iter_steps", prefetch_dataloader_iter_steps
+        )
+        if steps_per_loop < 1:
+            raise ValueError(
+                f"Invalid value provided for steps_per_loop. Expected a positive integer, but received {steps_per_loop}."
+            )
 
         self._dataloader: Iterable[TData] = dataloader
         self._max_epochs = max_epochs
@@ -119,6 +133,22 @@ class PhaseState(Generic[TData, TStepOutput]):
         self._max_steps_per_epoch = max_steps_per_epoch
         self._evaluate_every_n_steps = evaluate_every_n_steps
         self._evaluate_every_n_epochs = evaluate_every_n_epochs
+        self._steps_per_loop = steps_per_loop
+
+        if prefetch_dataloader_iter_steps is not None:
+            reason = _reason_next_iter_prefetch_unsupported(dataloader)
+            if reason is not None:
+                _logger.warning(
+                    f"Not prefetching the next epoch's dataloader iterator since {reason}."
+                )
+                prefetch_dataloader_iter_steps = None
+
+        self._data_iter_prefetcher: Optional[_DataIterPrefetcher] = (
+            _DataIterPrefetcher(thread_name_prefix="tnt_data_iter_prefetch")
+            if prefetch_dataloader_iter or prefetch_dataloader_iter_steps is not None
+            else None
+        )
+        self._prefetch_dataloader_iter_steps = prefetch_dataloader_iter_steps
 
         self._step_output: Optional[TStepOutput] = None
         self._iteration_timer = BoundedTimer(
@@ -145,6 +175,11 @@ class PhaseState(Generic[TData, TStepOutput]):
         """Maximum number of steps to run per epoch, defined by the user."""
         return self._max_steps_per_epoch
 
+    @property
+    def steps_per_loop(self) -> int:
+        """Number of steps run back to back per loop iteration, defined by the user."""
+        return self._steps_per_loop
+
     @property
     def evaluate_every_n_steps(self) -> Optional[int]:
         """Frequency with which to evaluate in terms of training steps, when running :func:`~torchtnt.framework.fit`. Defined by the user."""
@@ -13,12 +13,16 @@ import torch
 from pyre_extensions import none_throws
 from torchtnt.framework._callback_handler import CallbackHandler
 from torchtnt.framework._loop_utils import (
+    _get_data_iter,
     _is_done,
     _is_epoch_done,
     _log_api_usage,
     _maybe_set_distributed_sampler_epoch,
+    _num_steps_in_next_loop,
     _reason_epoch_completed,
+    _replays_eval_batches,
     _reset_module_training_mode,
+    _run_steps,
     _set_module_training_mode,
 )
 from torchtnt.framework.callback import Callback
@@ -26,6 +30,7 @@ from torchtnt.framework.evaluate import _evaluate_impl
 from torchtnt.framework.state import ActivePhase, EntryPoint, PhaseState, State
 from torchtnt.framework.unit import EvalUnit, TTrainData, TTrainUnit
 from torchtnt.framework.utils import get_timing_context
+from torchtnt.utils.progress import estimated_steps_in_epoch
 from torchtnt.utils.timer import get_timer_summary, TimerProtocol
 from torchtnt.utils.version import is_torch_version_geq
 
@@ -42,6 +47,8 @@ def train(
     max_steps_per_epoch: Optional[int] = None,
     callbacks: Optional[List[Callback]] = None,
     timer: Optional[TimerProtocol] = None,
+    prefetch_train_dataloader_iter_steps: Optional[int] = None,
+    steps_per_loop: int = 1,
 ) -> None:
     """
     The ``train`` entry point takes in a :class:`~torchtnt.framework.unit.TrainUnit` object, a train dataloader (any Iterable), optional arguments to modify loop execution,
@@ -55,7 +62,13 @@ def train(
         max_steps_per_epoch: the max number of steps to run per epoch. None means train until the dataloader is exhausted.
         callbacks: an optional list of :class:`~torchtnt.framework.callback.Callback` s.
         timer: an optional Timer which will be used to time key events (using a Timer with CUDA synchronization may degrade performance).
-
+        prefetch_train_dataloader_iter_steps: if set, the next epoch's ``iter(train_dataloader)`` is created on a background thread once this many
+         steps or fewer remain in the current epoch, hiding dataloader worker startup at epoch boundaries. Requires the epoch length to be known from
+         ``max_steps_per_epoch`` or ``len(train_dataloader)``. See :py:func:`~torchtnt.framework.fit` for details.
+        steps_per_loop: number of ``train_step`` s to run back to back per loop iteration. When greater than 1, step-level callback hooks
+         are only called at the cadence each callback declares with :attr:`~torchtnt.framework.callback.Callback.step_hook_interval`, and the
+         per-step timers are replaced by a single timer around each loop iteration. Progress counters, ``max_steps``, ``max_steps_per_epoch``
+         and ``evaluate_every_n_steps`` are honored exactly.
 
     Below is an example of calling :py:func:`~torchtnt.framework.train`.
 
@@ -97,6 +110,8 @@ def train(
             max_epochs=max_epochs,
             max_steps=max_steps,
             max_steps_per_epoch=max_steps_per_epoch,
+            prefetch_dataloader_iter_steps=prefetch_train_dataloader_iter_steps,
+            steps_per_loop=steps_per_loop,
         ),
         timer=timer,
     )
@@ -113,6 +128,10 @@ def train(
         train_unit.on_exception(state, e)
         callback_handler.on_exception(state, train_unit, e)
         raise e
+    finally:
+        train_prefetcher = none_throws(state.train_state)._data_iter_prefetcher
+        if train_prefetcher is not None:
+            train_prefetcher.shutdown()
 
 
 # Enabling grad in case this function is called directly from elsewhere in the framework.
@@ -142,6 +161,8 @@ def _train_impl(
     callback_handler.on_train_start(state, train_unit)
 
     _maybe_run_pending_fit_eval(state, train_unit, callback_handler)
+    if state.entry_point == EntryPoint.FIT:
+        _maybe_prefetch_eval_data_iter(state, train_unit)
 
     while not (
         state.should_stop
@@ -197,6 +218,64 @@ def _run_fit_eval(
     )
     eval_unit.eval_progress.mark_eval_completed()
     state._active_phase = ActivePhase.TRAIN
+    _maybe_prefetch_eval_data_iter(state, train_unit)
+
+
+def _maybe_prefetch_eval_data_iter(state: State, train_unit: TTrainUnit) -> None:
+    """Starts creating the next eval iterator in the background while training runs, if enabled."""
+    eval_state = state.eval_state
+    if eval_state is None or eval_state._data_iter_prefetcher is None:
+        return
+    train_state = none_throws(state.train_state)
+    if state.should_stop or _is_done(
+        train_unit.train_progress, train_state.max_epochs, train_state.max_steps
+    ):
+        # no further evaluation will run during this fit
+        return
+    if _replays_eval_batches(state, train_unit):
+        return
+    eval_state._data_iter_prefetcher.prefetch(eval_state.dataloader)
+
+
+def _maybe_prefetch_next_train_data_iter(state: State, train_unit: TTrainUnit) -> None:
+    """Starts creating the next epoch's train iterator in the background once the current epoch is near its end, if enabled."""
+    train_state = none_throws(state.train_state)
+    prefetcher = train_state._data_iter_prefetcher
+    if prefetcher is None or prefetcher.pending or state.should_stop:
+        return
+
+    progress = train_unit.train_progress
+    steps_in_epoch = estimated_steps_in_epoch(
+        train_state.dataloader,
+        num_steps_completed=0,
+        max_steps=None,
+        max_steps_per_epoch=train_state.max_steps_per_epoch,
+    )
+    if steps_in_epoch == float("inf"):
+        # the end of the epoch cannot be anticipated
+        return
+    remaining_steps_in_epoch = (
+        int(steps_in_epoch) - progress.num_steps_completed_in_epoch
+    )
+    if remaining_steps_in_epoch > none_throws(
+        train_state._prefetch_dataloader_iter_steps
+    ):
+        return
+
+    # no next epoch if training ends with the current one
+    max_epochs = train_state.max_epochs
+    max_steps = train_state.max_steps
+    if (max_epochs is not None and progress.num_epochs_completed + 1 >= max_epochs) or (
+        max_steps is not None
+        and progress.num_steps_completed + remaining_steps_in_epoch >= max_steps
+    ):
+        return
+
+    # the sampler epoch must be set before the next iterator is created
+    _maybe_set_distributed_sampler_epoch(
+        train_state.dataloader, progress.num_epochs_completed + 1
+    )
+    prefetcher.prefetch(train_state.dataloader)
 
 
 def _train_epoch_impl(
@@ -230,8 +309,14 @@ def _train_epoch_impl(
 
     callback_handler.on_train_dataloader_iter_creation_start(state, train_unit)
     with get_timing_context(state, "train.iter(dataloader)"):
-        data_iter = iter(train_state.dataloader)
+        data_iter = _get_data_iter(
+            train_state.dataloader,
+            train_state._data_iter_prefetcher,
+            state.timer,
+            "train.iter(dataloader)",
+        )
     callback_handler.on_train_dataloader_iter_creation_end(state, train_unit)
+    _maybe_prefetch_next_train_data_iter(state, train_unit)
 
     prev_steps_in_epoch = train_unit.train_progress.num_steps_completed_in_epoch
 
@@ -244,28 +329,60 @@ def _train_epoch_impl(
             train_state.max_steps,
         )
     ):
+        steps_before = train_unit.train_progress.num_steps_completed_in_epoch
         try:
-            with train_state.iteration_timer.time("train_and_data_iteration_time"):
-                with get_timing_context(
-                    state, "train.next(data_iter)"
-                ), train_state.iteration_timer.time("data_wait_time"):
-                    callback_handler.on_train_get_next_batch_start(state, train_unit)
-                    step_input = train_unit.get_next_train_batch(state, data_iter)
-                    callback_handler.on_train_get_next_batch_end(state, train_unit)
-
-                with train_state.iteration_timer.time("train_iteration_time"):
-                    callback_handler.on_train_step_start(state, train_unit)
-                    train_state._step_output = train_unit.train_step(state, step_input)
-                    train_unit.train_progress.increment_step()
-                    callback_handler.on_train_step_end(state, train_unit)
-
-                    # clear step_output to avoid retaining extra memory
-                    train_state._step_output = None
+            if train_state.steps_per_loop > 1:
+                with train_state.iteration_timer.time(
+                    "train_and_data_iteration_time"
+                ), get_timing_context(state, "train.run_steps"):
+                    _run_steps(
+                        state,
+                        train_state,
+                        train_unit,
+                        callback_handler,
+                        "train",
+                        train_unit.train_progress,
+                        train_unit.get_next_train_batch,
+                        train_unit.train_step,
+                        data_iter,
+                        _num_steps_in_next_loop(
+                            train_unit.train_progress,
+                            train_state.steps_per_loop,
+                            train_state.max_steps_per_epoch,
+                            train_state.max_steps,
+                            evaluate_every_n_steps,
+                        ),
+                    )
+            else:
+                with train_state.iteration_timer.time("train_and_data_iteration_time"):
+                    with get_timing_context(
+                        state, "train.next(data_iter)"
+                    ), train_state.iteration_timer.time("data_wait_time"):
+                        callback_handler.on_train_get_next_batch_start(
+                            state, train_unit
+                        )
+                        step_input = train_unit.get_next_train_batch(state, data_iter)
+                        callback_handler.on_train_get_next_batch_end(state, train_unit)
+
+                    with train_state.iteration_timer.time("train_iteration_time"):
+                        callback_handler.on_train_step_start(state, train_unit)
+                        train_state._step_output = train_unit.train_step(
+                            state, step_input
+                        )
+                        train_unit.train_progress.increment_step()
+                        callback_handler.on_train_step_end(state, train_unit)
+
+                        # clear step_output to avoid retaining extra memory
+                        train_state._step_output = None
+
+            if train_state._data_iter_prefetcher is not None:
+                _maybe_prefetch_next_train_data_iter(state, train_unit)
 
             if (
-                train_unit.train_progress.num_steps_completed_in_epoch
+                steps_before - prev_steps_in_epoch
+                < 5
+                <= train_unit.train_progress.num_steps_completed_in_epoch
                 - prev_steps_in_epoch
-                == 5
             ):
                 # Set the trainer thread name to improve debuggability. We do it after
                 # 5 iterations to make sure that all the processes or thread pools
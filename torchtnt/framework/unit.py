@@ -7,10 +7,22 @@
 # pyre-strict
 
 
+import copy
 import inspect
 import logging
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, cast, Dict, Generic, Iterator, TypeVar, Union
+from typing import (
+    Any,
+    cast,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterator,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 import torch
 from torchtnt.framework._unit_utils import (
@@ -43,6 +55,76 @@ def _remove_from_dicts(name_to_remove: str, *dicts: Dict[str, Any]) -> None:
             del d[name_to_remove]
 
 
+# values of these types are never tracked, so assigning them skips classification
+_UNTRACKED_TYPES: FrozenSet[type] = frozenset({bool, int, float, complex, str, bytes})
+
+# marks types whose instances must be classified individually, see ``_tracked_dict_name``
+_CLASSIFY_PER_VALUE = "<per-value>"
+
+# maps the type of an assigned value to the name of the AppStateMixin dict tracking it,
+# or None if values of that type are not tracked. Weak keys let classes defined at runtime be freed.
+_TRACKED_DICT_NAME_BY_TYPE: "weakref.WeakKeyDictionary[type, Optional[str]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _classify_value(value: object) -> Optional[str]:
+    # Check first for metrics since some libraries subclass nn.Module as well
+    if isinstance(value, MetricStateful):
+        return "_metrics"
+    elif isinstance(value, torch.nn.Module):
+        return "_modules"
+    elif isinstance(value, torch.optim.Optimizer):
+        return "_optimizers"
+    elif isinstance(value, TLRScheduler):
+        return "_lr_schedulers"
+    elif isinstance(value, Progress):
+        return "_progress"
+    elif isinstance(value, Stateful) and not inspect.isclass(value):
+        return "_misc_statefuls"
+    return None
+
+
+def _classify_type(cls: type) -> Optional[str]:
+    if issubclass(cls, MetricStateful):
+        return "_metrics"
+    elif issubclass(cls, torch.nn.Module):
+        return "_modules"
+    elif issubclass(cls, torch.optim.Optimizer):
+        return "_optimizers"
+    elif issubclass(cls, TLRScheduler):
+        return "_lr_schedulers"
+    elif issubclass(cls, Progress):
+        return "_progress"
+    elif issubclass(cls, Stateful):
+        return "_misc_statefuls"
+    elif hasattr(cls, "__getattr__"):
+        # instances may satisfy the Stateful protocols through dynamic attributes
+        return _CLASSIFY_PER_VALUE
+    return None
+
+
+def _tracked_dict_name(value: object) -> Optional[str]:
+    """
+    Returns the name of the AppStateMixin dict which should track ``value``, or None if it should not be tracked.
+
+    Runtime-checkable protocol checks are slow, so the classification is cached per type. Classes and objects which
+    only satisfy the Stateful protocols through instance attributes are classified individually.
+    """
+    if isinstance(value, type):
+        return _classify_value(value)
+    cls = type(value)
+    name = _TRACKED_DICT_NAME_BY_TYPE.get(cls, _CLASSIFY_PER_VALUE)
+    if name is _CLASSIFY_PER_VALUE:
+        if cls not in _TRACKED_DICT_NAME_BY_TYPE:
+            name = _TRACKED_DICT_NAME_BY_TYPE[cls] = _classify_type(cls)
+        if name is _CLASSIFY_PER_VALUE:
+            return _classify_value(value)
+    if name is None and "state_dict" in getattr(value, "__dict__", ()):
+        return _classify_value(value)
+    return name
+
+
 class AppStateMixin:
     """
     A mixin to track modules, optimizers, and LR schedulers to simplify checkpointing object states.
@@ -51,6 +133,8 @@ class AppStateMixin:
     """
 
     def __init__(self) -> None:
+        # maps the name of each tracked attribute to the dict tracking it
+        self._tracked_dicts_by_name: Dict[str, Dict[str, Any]] = {}
         self._modules: Dict[str, torch.nn.Module] = {}
         self._optimizers: Dict[str, torch.optim.Optimizer] = {}
         self._lr_schedulers: Dict[str, TLRScheduler] = {}
@@ -97,6 +181,12 @@ class AppStateMixin:
         return self._misc_statefuls
 
     def __getattr__(self, name: str) -> object:
+        tracked_dicts_by_name = self.__dict__.get("_tracked_dicts_by_name")
+        if tracked_dicts_by_name is not None and name in tracked_dicts_by_name:
+            tracked_objects = tracked_dicts_by_name[name]
+            if name in tracked_objects:
+                return tracked_objects[name]
+        # objects may also be added to the tracked dicts directly
         if "_modules" in self.__dict__:
             _modules = self.__dict__["_modules"]
             if name in _modules:
@@ -124,6 +214,13 @@ class AppStateMixin:
 
         return self.__getattribute__(name)
 
+    def _untrack(self, name: str, *dicts: Dict[str, Any]) -> None:
+        _remove_from_dicts(name, self.__dict__, *dicts)
+        tracked_dicts_by_name = self.__dict__.get("_tracked_dicts_by_name")
+        if tracked_dicts_by_name is not None and name in tracked_dicts_by_name:
+            if name not in tracked_dicts_by_name[name]:
+                del tracked_dicts_by_name[name]
+
     def _update_attr(
         self,
         name: str,
@@ -134,9 +231,8 @@ class AppStateMixin:
             raise AttributeError(
                 "Please call super().__init__() before setting attributes."
             )
-        _remove_from_dicts(
+        self._untrack(
             name,
-            self.__dict__,
             self._modules,
             self._optimizers,
             self._lr_schedulers,
@@ -145,44 +241,25 @@ class AppStateMixin:
             self._misc_statefuls,
         )
         tracked_objects[name] = value
+        self._tracked_dicts_by_name[name] = tracked_objects
 
     def __setattr__(self, name: str, value: object) -> None:
-        # Check first for metrics since some libraries subclass nn.Module as well
-        if isinstance(value, MetricStateful):
-            # pyrefly: ignore [bad-argument-type]
-            self._update_attr(name, value, self.__dict__.get("_metrics"))
-        elif isinstance(value, torch.nn.Module):
-            # pyrefly: ignore [bad-argument-type]
-            self._update_attr(name, value, self.__dict__.get("_modules"))
-        elif isinstance(value, torch.optim.Optimizer):
-            # pyrefly: ignore [bad-argument-type]
-            self._update_attr(name, value, self.__dict__.get("_optimizers"))
-        elif isinstance(value, TLRScheduler):
-            self._update_attr(
-                name,
-                value,
-                # pyrefly: ignore [bad-argument-type]
-                self.__dict__.get("_lr_schedulers"),
-            )
-        elif isinstance(value, Progress):
-            self._update_attr(
-                name,
-                value,
-                # pyrefly: ignore [bad-argument-type]
-                self.__dict__.get("_progress"),
-            )
-        elif isinstance(value, Stateful) and not inspect.isclass(value):
+        if type(value) in _UNTRACKED_TYPES:
+            super().__setattr__(name, value)
+            return
+
+        tracked_dict_name = _tracked_dict_name(value)
+        if tracked_dict_name is not None:
             self._update_attr(
                 name,
                 value,
                 # pyrefly: ignore [bad-argument-type]
-                self.__dict__.get("_misc_statefuls"),
+                self.__dict__.get(tracked_dict_name),
             )
         else:
             if value is None:
-                _remove_from_dicts(
+                self._untrack(
                     name,
-                    self.__dict__,
                     self._modules,
                     self._optimizers,
                     self._lr_schedulers,
@@ -206,6 +283,24 @@ class AppStateMixin:
             del self._misc_statefuls[name]
         else:
             super().__delattr__(name)
+            return
+        self._tracked_dicts_by_name.pop(name, None)
+
+    def _snapshot(self) -> "AppStateMixin":
+        """
+        Returns a shallow copy of the unit whose tracked progress is copied, so that it does not change as the loop advances.
+
+        Only the progress objects are copied, which keeps the snapshot cheap enough to take for every hook. Modules,
+        optimizers, metrics and other attributes are the unit's own objects, which the trainer thread keeps updating.
+        """
+        snapshot = copy.copy(self)
+        progress = {name: copy.copy(p) for name, p in self._progress.items()}
+        snapshot.__dict__["_progress"] = progress
+        snapshot.__dict__["_tracked_dicts_by_name"] = {
+            name: progress if tracked is self._progress else tracked
+            for name, tracked in self._tracked_dicts_by_name.items()
+        }
+        return snapshot
 
     def _construct_tracked_optimizers_and_schedulers(
         self,
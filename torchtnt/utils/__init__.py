@@ -7,6 +7,7 @@
 # pyre-strict
 
 from .anomaly_evaluation import IsNaNEvaluator, ThresholdEvaluator
+from .batch_size_finder import BatchSizeFinderResult, BatchSizeProbe, find_batch_size
 from .checkpoint import (
     BestCheckpointConfig,
     CheckpointManager,
@@ -16,6 +17,28 @@ from .checkpoint import (
     get_latest_checkpoint_path,
     MetricData,
 )
+from .checkpoint_storage import (
+    ChecksumMismatchError,
+    CompressedStorageReader,
+    CompressedStorageWriter,
+    CompressionStats,
+    get_checksum_algorithm,
+    get_compression_extension,
+    IOConcurrencyTuner,
+    IOSettings,
+    MeasuredStorageWriter,
+    needs_compressed_storage_reader,
+    WriteStats,
+)
+from .compile import (
+    CompileStats,
+    dedup_compile_targets,
+    get_compile_cache_key,
+    get_compile_stats,
+    load_compile_cache,
+    save_compile_cache,
+    warmup_compile,
+)
 from .device import (
     copy_data_to_device,
     CPUStats,
@@ -28,6 +51,8 @@ from .device import (
 )
 from .distributed import (
     all_gather_tensors,
+    all_reduce_metric_states,
+    all_reduce_tensor_dict,
     barrier,
     get_global_rank,
     get_local_rank,
@@ -41,9 +66,20 @@ from .early_stop_checker import EarlyStopChecker
 from .env import init_from_env, seed
 from .flops import FlopTensorDispatchMode
 from .fsspec import get_filesystem
+from .inference_export import (
+    export_inference_weights,
+    load_inference_weights,
+    load_inference_weights_into_module,
+    save_inference_weights,
+)
 from .lr_scheduler import TLRScheduler
 from .memory import get_tensor_size_bytes_map, measure_rss_deltas, RSSProfiler
 from .memory_snapshot_profiler import MemorySnapshotParams, MemorySnapshotProfiler
+from .metric_accumulator import (
+    AccumulatedMetric,
+    DeviceMetricAccumulator,
+    MetricReadout,
+)
 from .misc import days_to_secs, transfer_batch_norm_stats, transfer_weights
 from .module_summary import (
     get_module_summary,
@@ -59,7 +95,12 @@ from .oom import (
     is_out_of_memory_error,
     log_memory_snapshot,
 )
-from .optimizer import extract_lr_from_optimizer, init_optim_state
+from .optimizer import (
+    clip_grads_with_norm_,
+    extract_lr_from_optimizer,
+    get_grad_norms,
+    init_optim_state,
+)
 from .precision import convert_precision_str_to_dtype
 from .prepare_module import (
     DDPStrategy,
@@ -94,6 +135,16 @@ __all__ = [
     "register_nan_hooks_on_whole_graph",
     "IsNaNEvaluator",
     "ThresholdEvaluator",
+    "BatchSizeFinderResult",
+    "BatchSizeProbe",
+    "find_batch_size",
+    "CompileStats",
+    "dedup_compile_targets",
+    "get_compile_cache_key",
+    "get_compile_stats",
+    "load_compile_cache",
+    "save_compile_cache",
+    "warmup_compile",
     "CheckpointPath",
     "MetricData",
     "get_best_checkpoint_path",
@@ -101,6 +152,17 @@ __all__ = [
     "get_latest_checkpoint_path",
     "BestCheckpointConfig",
     "CheckpointManager",
+    "ChecksumMismatchError",
+    "CompressedStorageReader",
+    "CompressedStorageWriter",
+    "CompressionStats",
+    "get_checksum_algorithm",
+    "get_compression_extension",
+    "IOConcurrencyTuner",
+    "IOSettings",
+    "MeasuredStorageWriter",
+    "needs_compressed_storage_reader",
+    "WriteStats",
     "copy_data_to_device",
     "CPUStats",
     "get_device_from_env",
@@ -110,6 +172,8 @@ __all__ = [
     "set_float32_precision",
     "record_data_in_stream",
     "all_gather_tensors",
+    "all_reduce_metric_states",
+    "all_reduce_tensor_dict",
     "barrier",
     "get_global_rank",
     "get_local_rank",
@@ -122,9 +186,16 @@ __all__ = [
     "seed",
     "FlopTensorDispatchMode",
     "get_filesystem",
+    "export_inference_weights",
+    "load_inference_weights",
+    "load_inference_weights_into_module",
+    "save_inference_weights",
     "get_tensor_size_bytes_map",
     "measure_rss_deltas",
     "RSSProfiler",
+    "AccumulatedMetric",
+    "DeviceMetricAccumulator",
+    "MetricReadout",
     "MemorySnapshotParams",
     "MemorySnapshotProfiler",
     "days_to_secs",
@@ -135,6 +206,8 @@ __all__ = [
     "log_memory_snapshot",
     "extract_lr_from_optimizer",
     "init_optim_state",
+    "get_grad_norms",
+    "clip_grads_with_norm_",
     "convert_precision_str_to_dtype",
     "DDPStrategy",
     "FSDPStrategy",
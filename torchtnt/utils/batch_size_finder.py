@@ -0,0 +1,400 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import platform
+import statistics
+import weakref
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+
+import torch
+from pyre_extensions import none_throws
+from torch.utils._python_dispatch import TorchDispatchMode
+from torch.utils._pytree import tree_flatten, tree_map_only
+from torch.utils.data import Dataset
+from torch.utils.data._utils.collate import default_collate
+from torchtnt.utils.device import copy_data_to_device
+from torchtnt.utils.fsspec import get_filesystem
+from torchtnt.utils.oom import is_out_of_memory_error
+from torchtnt.utils.precision import convert_precision_str_to_dtype
+from torchtnt.utils.timer import Timer
+from typing_extensions import Literal
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_CACHE_VERSION = 1
+
+
+@dataclass
+class BatchSizeProbe:
+    """
+    Result of probing a single batch size.
+
+    Args:
+        batch_size: the probed batch size.
+        fits: whether the steps ran without running out of memory.
+        step_time_s: median duration of a timed step in seconds, if the batch size fits.
+        samples_per_sec: throughput of the timed steps, if the batch size fits.
+    """
+
+    batch_size: int
+    fits: bool
+    step_time_s: Optional[float] = None
+    samples_per_sec: Optional[float] = None
+
+
+@dataclass
+class BatchSizeFinderResult:
+    """
+    Result of :func:`find_batch_size`.
+
+    Args:
+        max_batch_size: the largest probed batch size which fits in memory.
+        best_throughput_batch_size: the probed batch size with the highest samples per second.
+        probes: all probes, in the order they were run.
+    """
+
+    max_batch_size: int
+    best_throughput_batch_size: int
+    probes: List[BatchSizeProbe] = field(default_factory=list)
+
+
+class _MemoryCeilingMode(TorchDispatchMode):
+    """
+    Tracks the bytes held by storages created while the mode is active, and raises an out of memory error, as the CPU
+    allocator would, once they exceed ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.live_bytes = 0
+        self._storage_bytes: Dict[int, int] = {}
+
+    def _release(self, key: int) -> None:
+        self.live_bytes -= self._storage_bytes.pop(key, 0)
+
+    # pyre-ignore[2, 3]
+    def __torch_dispatch__(self, func, types, args=(), kwargs=None):
+        out = func(*args, **(kwargs or {}))
+        for leaf in tree_flatten(out)[0]:
+            if not isinstance(leaf, torch.Tensor):
+                continue
+            storage = leaf.untyped_storage()
+            key = storage.data_ptr()
+            if storage.nbytes() == 0 or key in self._storage_bytes:
+                continue
+            self._storage_bytes[key] = storage.nbytes()
+            self.live_bytes += storage.nbytes()
+            weakref.finalize(storage, self._release, key)
+        if self.live_bytes > self.max_bytes:
+            raise RuntimeError(
+                f"DefaultCPUAllocator: can't allocate memory: {self.live_bytes} bytes are in use, exceeding the ceiling of {self.max_bytes} bytes."
+            )
+        return out
+
+
+def _sample_batch_size(batch: Any) -> int:
+    for leaf in tree_flatten(batch)[0]:
+        if isinstance(leaf, torch.Tensor) and leaf.dim() > 0:
+            return leaf.size(0)
+    raise ValueError(
+        "Unable to infer the batch size of the sample batch since it has no tensors."
+    )
+
+
+def _make_batch(data: Any, batch_size: int) -> Any:
+    """Builds a batch of ``batch_size`` items from a dataset, or by repeating the rows of a sample batch."""
+    if isinstance(data, Dataset):
+        # pyre-ignore[6]: datasets used here define __len__
+        num_items = len(data)
+        return default_collate([data[i % num_items] for i in range(batch_size)])
+
+    sample_batch_size = _sample_batch_size(data)
+    indices = torch.arange(batch_size) % sample_batch_size
+    return tree_map_only(
+        torch.Tensor,
+        lambda t: (
+            t[indices.to(t.device)]
+            if t.dim() > 0 and t.size(0) == sample_batch_size
+            else t
+        ),
+        data,
+    )
+
+
+def _get_hardware_name(device: torch.device) -> str:
+    if device.type == "cuda":
+        return torch.cuda.get_device_name(device)
+    return f"{device.type}-{platform.machine()}-{platform.processor()}-{os.cpu_count()}"
+
+
+def _get_module_fingerprint(module: torch.nn.Module) -> str:
+    parameters = [
+        f"{name}:{tuple(param.shape)}:{param.dtype}"
+        for name, param in module.named_parameters()
+    ]
+    return f"{type(module).__qualname__}[{','.join(parameters)}]"
+
+
+def _make_step_fn(
+    module: torch.nn.Module,
+    compute_loss: Callable[[torch.nn.Module, Any], torch.Tensor],
+    device: torch.device,
+    precision: Optional[str],
+) -> Callable[[Any], object]:
+    dtype = convert_precision_str_to_dtype(precision) if precision else None
+
+    def step(batch: Any) -> None:
+        maybe_autocast: ContextManager[object] = (
+            torch.autocast(device_type=device.type, dtype=dtype)
+            if dtype is not None
+            else contextlib.nullcontext()
+        )
+        with maybe_autocast:
+            loss = compute_loss(module, batch)
+        loss.backward()
+        module.zero_grad(set_to_none=True)
+
+    return step
+
+
+def _probe_batch_size(
+    step_fn: Callable[[Any], object],
+    data: Any,
+    batch_size: int,
+    device: torch.device,
+    num_warmup_steps: int,
+    num_timed_steps: int,
+    max_memory_bytes: Optional[int],
+) -> BatchSizeProbe:
+    timer = Timer(cuda_sync=device.type == "cuda")
+    batch = None
+    try:
+        batch = copy_data_to_device(_make_batch(data, batch_size), device)
+        for i in range(num_warmup_steps):
+            maybe_memory_ceiling: ContextManager[object] = (
+                _MemoryCeilingMode(max_memory_bytes)
+                if max_memory_bytes is not None and i == 0
+                else contextlib.nullcontext()
+            )
+            with maybe_memory_ceiling:
+                step_fn(batch)
+        for _ in range(num_timed_steps):
+            with timer.time("step"):
+                step_fn(batch)
+    except RuntimeError as e:
+        if not is_out_of_memory_error(e):
+            raise
+        return BatchSizeProbe(batch_size=batch_size, fits=False)
+    finally:
+        del batch
+        if device.type == "cuda":
+            torch.cuda.empty_cache()
+
+    step_time_s = statistics.median(timer.recorded_durations["step"])
+    return BatchSizeProbe(
+        batch_size=batch_size,
+        fits=True,
+        step_time_s=step_time_s,
+        samples_per_sec=batch_size / step_time_s if step_time_s > 0 else None,
+    )
+
+
+def _load_cached_result(path: str) -> Optional[BatchSizeFinderResult]:
+    fs = get_filesystem(path)
+    if not fs.exists(path):
+        return None
+    try:
+        with fs.open(path, "r") as f:
+            cached = json.load(f)
+        return BatchSizeFinderResult(
+            max_batch_size=cached["max_batch_size"],
+            best_throughput_batch_size=cached["best_throughput_batch_size"],
+            probes=[BatchSizeProbe(**probe) for probe in cached["probes"]],
+        )
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable batch size finder cache {path}: {e}")
+        return None
+
+
+def _save_cached_result(path: str, result: BatchSizeFinderResult) -> None:
+    fs = get_filesystem(path)
+    fs.makedirs(os.path.dirname(path), exist_ok=True)
+    with fs.open(path, "w") as f:
+        json.dump(asdict(result), f)
+
+
+def find_batch_size(
+    data: Any,
+    *,
+    step_fn: Optional[Callable[[Any], object]] = None,
+    module: Optional[torch.nn.Module] = None,
+    compute_loss: Optional[Callable[[torch.nn.Module, Any], torch.Tensor]] = None,
+    device: Optional[torch.device] = None,
+    precision: Optional[str] = None,
+    init_batch_size: int = 1,
+    max_batch_size: int = 65536,
+    search_mode: Literal["power", "binsearch"] = "binsearch",
+    num_warmup_steps: int = 1,
+    num_timed_steps: int = 3,
+    max_memory_bytes: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cache_key: Optional[str] = None,
+) -> BatchSizeFinderResult:
+    """
+    Finds the largest batch size which fits in memory, and the batch size with the best throughput, by running a few
+    steps for each probed batch size.
+
+    Batch sizes are probed by doubling ``init_batch_size`` until a step runs out of memory or ``max_batch_size`` is
+    reached. With ``search_mode="binsearch"``, the range between the last batch size which fit and the first one which
+    did not is then binary searched. Out of memory errors are detected with
+    :func:`~torchtnt.utils.oom.is_out_of_memory_error`, and steps are timed with :class:`~torchtnt.utils.timer.Timer`.
+
+    The step is either given directly as ``step_fn``, e.g. the train step of a unit, or built from ``module`` and
+    ``compute_loss``, in which case it runs the forward pass under autocast with ``precision``, and the backward pass.
+    For example, to probe an :class:`~torchtnt.framework.auto_unit.AutoUnit`::
+
+        state = State(entry_point=EntryPoint.TRAIN)
+        result = find_batch_size(
+            dataset,
+            step_fn=lambda batch: unit.train_step(state, batch),
+            module=unit.module,
+            device=unit.device,
+        )
+
+    Args:
+        data: a sample batch, whose rows are repeated to build batches of the probed sizes, or a dataset,
+            e.g. an :class:`~torchtnt.utils.data.AbstractRandomDataset`, whose items are collated into batches.
+        step_fn: function which runs one step on a batch already moved to ``device``.
+        module: the module to probe. Required if ``step_fn`` is not given, and used in the cache key otherwise.
+        compute_loss: function which computes the loss of ``module`` on a batch. Required if ``step_fn`` is not given.
+        device: device on which batches are placed. Defaults to the device of ``module``'s parameters, or CPU.
+        precision: autocast precision used with ``compute_loss``, e.g. "bf16". Also part of the cache key.
+        init_batch_size: the first probed batch size.
+        max_batch_size: the largest batch size to probe.
+        search_mode: "power" to only probe powers of two times ``init_batch_size``, or "binsearch" to also binary
+            search between the largest one which fits and the smallest one which does not.
+        num_warmup_steps: number of untimed steps run for each batch size, before the timed steps.
+        num_timed_steps: number of timed steps run for each batch size.
+        max_memory_bytes: if set, a step is treated as out of memory once tensors allocated during it hold more than
+            this many bytes. This emulates a smaller device, e.g. to run on CPU in CI. The limit is enforced during the
+            warmup steps, which are required in this case.
+        cache_dir: if set, results are cached in this directory, keyed by model, hardware, precision and search
+            arguments, and returned without probing on later calls.
+        cache_key: identifies the model in the cache. Defaults to a fingerprint of ``module``'s class and parameters.
+
+    Returns:
+        a :class:`BatchSizeFinderResult` with the largest fitting and the highest throughput batch sizes.
+
+    Raises:
+        RuntimeError: if ``init_batch_size`` does not fit in memory.
+
+    Note:
+        Probing runs real steps, so it may update the weights and optimizer state of the unit or module.
+    """
+    if step_fn is None and (module is None or compute_loss is None):
+        raise ValueError("Either step_fn, or module and compute_loss must be set.")
+    if init_batch_size < 1 or max_batch_size < init_batch_size:
+        raise ValueError(
+            f"Expected 1 <= init_batch_size <= max_batch_size. Got init_batch_size={init_batch_size}, max_batch_size={max_batch_size}"
+        )
+    if num_timed_steps < 1:
+        raise ValueError(f"num_timed_steps must be >= 1. Got {num_timed_steps}")
+    if max_memory_bytes is not None and num_warmup_steps < 1:
+        raise ValueError("num_warmup_steps must be >= 1 when max_memory_bytes is set.")
+
+    if device is None:
+        param = next(module.parameters(), None) if module is not None else None
+        device = param.device if param is not None else torch.device("cpu")
+
+    cache_path = None
+    if cache_dir is not None:
+        if cache_key is None:
+            if module is None:
+                raise ValueError("cache_key or module must be set to cache results.")
+            cache_key = _get_module_fingerprint(module)
+        key = json.dumps(
+            [
+                _CACHE_VERSION,
+                cache_key,
+                _get_hardware_name(device),
+                precision,
+                init_batch_size,
+                max_batch_size,
+                search_mode,
+                max_memory_bytes,
+            ]
+        )
+        cache_path = os.path.join(
+            cache_dir, f"batch_size_{hashlib.sha256(key.encode()).hexdigest()}.json"
+        )
+        cached = _load_cached_result(cache_path)
+        if cached is not None:
+            logger.info(f"Loaded batch size finder result from {cache_path}")
+            return cached
+
+    if step_fn is None:
+        step_fn = _make_step_fn(
+            none_throws(module), none_throws(compute_loss), device, precision
+        )
+
+    probes: List[BatchSizeProbe] = []
+
+    def probe(batch_size: int) -> bool:
+        result = _probe_batch_size(
+            step_fn,
+            data,
+            batch_size,
+            device,
+            num_warmup_steps,
+            num_timed_steps,
+            max_memory_bytes,
+        )
+        probes.append(result)
+        logger.info(f"Probed batch size {batch_size}: {result}")
+        return result.fits
+
+    if not probe(init_batch_size):
+        raise RuntimeError(
+            f"Ran out of memory with the initial batch size {init_batch_size}."
+        )
+
+    # grow the batch size exponentially until running out of memory
+    low, high = init_batch_size, None
+    while low < max_batch_size:
+        batch_size = min(low * 2, max_batch_size)
+        if probe(batch_size):
+            low = batch_size
+        else:
+            high = batch_size
+            break
+
+    if search_mode == "binsearch" and high is not None:
+        while high - low > 1:
+            mid = (low + high) // 2
+            if probe(mid):
+                low = mid
+            else:
+                high = mid
+
+    fitting = [p for p in probes if p.fits]
+    best = max(fitting, key=lambda p: p.samples_per_sec or 0.0)
+    result = BatchSizeFinderResult(
+        max_batch_size=low,
+        best_throughput_batch_size=best.batch_size,
+        probes=probes,
+    )
+    if cache_path is not None:
+        _save_cached_result(cache_path, result)
+    return result
@@ -6,11 +6,13 @@
 
 # pyre-strict
 import bisect
+import json
 import logging
 import math
 import os
 import re
-from concurrent.futures import Future
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from functools import total_ordering
@@ -25,6 +27,7 @@ from typing import (
     Literal,
     Optional,
     Pattern,
+    Sequence,
     Tuple,
     Union,
 )
@@ -37,10 +40,20 @@ from pyre_extensions import none_throws
 from torch import nn
 from torch.distributed.tensor import distribute_tensor
 from torch.nn.modules.module import _IncompatibleKeys
-from torchtnt.utils.distributed import PGWrapper, rank_zero_read_and_broadcast
+from torchtnt.utils.distributed import (
+    get_local_rank,
+    get_local_world_size,
+    PGWrapper,
+    rank_zero_read_and_broadcast,
+)
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+# file marking a checkpoint saved upon preemption
+EMERGENCY_CHECKPOINT_MARKER = ".emergency"
+# file marking a checkpoint which failed the verification of its checksums
+CORRUPT_CHECKPOINT_MARKER = ".corrupt"
+
 
 @dataclass
 class MetricData:
@@ -388,6 +401,7 @@ class CheckpointManager:
         metadata_fnames: Optional[List[str]] = None,
         process_group: Optional[dist.ProcessGroup] = None,
         file_system: Optional[fsspec.AbstractFileSystem] = None,
+        node_local: bool = False,
     ) -> None:
         """
         Initialize a checkpoint manager. If a `keep_last_n_checkpoints` value is provided, this will read the
@@ -402,6 +416,8 @@ class CheckpointManager:
                 checkpoint is considered if at least one of them exists.
             process_group: Optional process group to use for distributed training. gloo process groups are known
                 to perform better.
+            node_local: Whether dirpath is on storage local to each node, such as a node-local disk or tmpfs. If True,
+                checkpoints are deleted by the local rank 0 of every node, instead of by rank 0 only.
         """
         self.dirpath: str = self._sync_dirpath_to_all_ranks(
             dirpath=dirpath, process_group=process_group
@@ -410,6 +426,7 @@ class CheckpointManager:
         self._best_checkpoint_config = best_checkpoint_config
         self._keep_last_n_checkpoints = keep_last_n_checkpoints
         self._pg_wrapper = PGWrapper(process_group)
+        self._node_local = node_local
 
         if file_system is None:
             file_system, _ = url_to_fs(self.dirpath)
@@ -495,7 +512,15 @@ class CheckpointManager:
             - `best_checkpoint_config` is not set but `metric_data` was provided
             - `best_checkpoint_config` is set and `metric_data` is passed. But they are not tracking the same metric
         """
+        return self._generate_checkpoint_path(epoch, step, metric_data)
 
+    def _generate_checkpoint_path(
+        self,
+        epoch: int,
+        step: Union[int, Dict[Phase, int]],
+        metric_data: Optional[MetricData] = None,
+    ) -> CheckpointPath:
+        """Same as :meth:`generate_checkpoint_path`, but on the calling rank only."""
         if metric_data:
             assert (
                 self._best_checkpoint_config
@@ -607,6 +632,24 @@ class CheckpointManager:
         """
         return _metadata_exists(self._file_system, checkpoint_path, metadata_fname)
 
+    def mark_emergency_checkpoint(self, ckpt: CheckpointPath) -> None:
+        """
+        Marks a checkpoint, which was completely saved upon preemption, as an emergency checkpoint. The marker is written
+        on rank 0, and is copied along with the checkpoint if it is promoted to another tier.
+
+        Args:
+            ckpt: The checkpoint to mark.
+        """
+        if self._pg_wrapper.get_rank() != 0:
+            return
+        try:
+            with self._file_system.open(
+                os.path.join(ckpt.path, EMERGENCY_CHECKPOINT_MARKER), "w"
+            ) as f:
+                f.write(str(time.time()))
+        except Exception as exc:
+            logger.error(f"Failed to mark emergency checkpoint '{ckpt}': {exc}")
+
     @staticmethod
     @rank_zero_read_and_broadcast
     def _sync_dirpath_to_all_ranks(
@@ -617,12 +660,18 @@ class CheckpointManager:
 
     def remove_checkpoint(self) -> None:
         """
-        Delete the weakest checkpoint both from the internal state and from the file system (rank 0). This means:
+        Delete the weakest checkpoint both from the internal state and from the file system (rank 0, or the local rank 0
+        of every node if ``node_local`` is set). This means:
         - If there is a `best_checkpoint_config`, then the checkpoint with the least optimal metric value
         - If there is no `best_checkpoint_config`, then the oldest checkpoint
         """
         worst_ckpt_path = self._ckpt_paths.pop(0)
-        if self._pg_wrapper.get_rank() == 0:
+        is_remover = (
+            get_local_rank() == 0
+            if self._node_local
+            else self._pg_wrapper.get_rank() == 0
+        )
+        if is_remover:
             failed_checkpoint_path = self._take_failed_checkpoint_removal()
             if failed_checkpoint_path is not None:
                 self._remove_checkpoint_from_filesystem(failed_checkpoint_path)
@@ -725,7 +774,8 @@ def get_latest_checkpoint_path(
     process_group: Optional[dist.ProcessGroup] = None,
 ) -> Optional[str]:
     """
-    Given a parent directory where checkpoints are saved, return the latest checkpoint subdirectory.
+    Given a parent directory where checkpoints are saved, return the latest checkpoint subdirectory. Checkpoints marked
+    as corrupt by :func:`mark_corrupt_checkpoint` are skipped.
 
     Args:
         dirpath: parent directory where checkpoints are saved.
@@ -757,12 +807,218 @@ def _get_latest_checkpoint_path(
     if not candidate_dirpaths:
         return None
 
-    latest_checkpoint = candidate_dirpaths[0]
-    for candidate in candidate_dirpaths[1:]:
-        if candidate.newer_than(latest_checkpoint):
-            latest_checkpoint = candidate
+    fs = file_system
+    if fs is None:
+        fs, _ = url_to_fs(dirpath)
+    while candidate_dirpaths:
+        latest_checkpoint = candidate_dirpaths[0]
+        for candidate in candidate_dirpaths[1:]:
+            if candidate.newer_than(latest_checkpoint):
+                latest_checkpoint = candidate
+        if not _metadata_exists(fs, latest_checkpoint.path, CORRUPT_CHECKPOINT_MARKER):
+            return latest_checkpoint.path
+
+        logger.warning(f"Skipping corrupt checkpoint {latest_checkpoint}")
+        candidate_dirpaths.remove(latest_checkpoint)
+
+    return None
+
+
+def get_latest_tiered_checkpoint_path(
+    dirpath: str,
+    local_dirpath: str,
+    metadata_fname: Optional[Union[str, List[str]]] = None,
+    file_system: Optional[fsspec.AbstractFileSystem] = None,
+    process_group: Optional[dist.ProcessGroup] = None,
+) -> Optional[str]:
+    """
+    Given the parent directories of the durable and local tiers of tiered checkpoints, return the latest checkpoint
+    subdirectory. The latest checkpoint of the local tier is preferred if it is at least as recent as the latest one of
+    the durable tier, and if every rank sees it complete. Otherwise, e.g. when the local tier is on node-local disks of
+    different nodes, the latest checkpoint of the durable tier is returned.
+
+    Args:
+        dirpath: parent directory of the durable tier.
+        local_dirpath: parent directory of the local tier.
+        metadata_fname: Checks if metadata file is present in checkpoint, disregards if it does not exist.
+                    If a list is provided, it will check that at least one of the files is present.
+        file_system: If a custom file system should be used to fetch the durable checkpoint directories. Otherwise, fsspec will be
+            used to match the file system of the dirpath.
+        process_group: the process group on which the ranks will communicate on. default: ``None`` (the entire world)
+
+    Note:
+        Every rank reads the local tier, while only rank 0 reads the durable tier.
+    """
+    pg_wrapper = PGWrapper(process_group)
+    local_latest = _get_latest_checkpoint_path(local_dirpath, metadata_fname)
+    local_latest_per_rank: List[Optional[str]] = [None] * pg_wrapper.get_world_size()
+    pg_wrapper.all_gather_object(local_latest_per_rank, local_latest)
+
+    durable_latest = get_latest_checkpoint_path(
+        dirpath,
+        metadata_fname=metadata_fname,
+        file_system=file_system,
+        process_group=process_group,
+    )
+
+    if local_latest is None:
+        return durable_latest
+    if any(path != local_latest for path in local_latest_per_rank):
+        logger.info(
+            f"Latest local checkpoint {local_latest} is not visible to every rank, falling back to {dirpath}"
+        )
+        return durable_latest
+    if durable_latest is not None and CheckpointPath.from_str(
+        durable_latest
+    ).newer_than(CheckpointPath.from_str(local_latest)):
+        return durable_latest
+    return local_latest
 
-    return latest_checkpoint.path
+
+class CheckpointPromoter:
+    """
+    Copies checkpoints from a fast local tier, such as a node-local disk or tmpfs, to durable storage in a background
+    thread, so checkpoints can be saved often without blocking training on a slow remote store.
+
+    The files of a checkpoint are split between the local ranks of each node, so each file of a node-local tier is
+    copied once. The metadata files are copied last by rank 0, once every rank has copied its files, so an interrupted
+    promotion never leaves a durable checkpoint which looks complete. Promotions run one at a time, in the order in
+    which they were scheduled.
+
+    Args:
+        metadata_fnames: names of the metadata files which mark a checkpoint as complete.
+        process_group: process group on which the ranks agree that every file was copied. The collective runs in the
+            background thread, so the process group should not be used by any other thread.
+        max_bytes_per_sec: maximum rate at which each rank copies, to leave bandwidth to the training job. If None,
+            the rate is not limited.
+        chunk_size: size of the reads and writes of the copy, in bytes.
+    """
+
+    def __init__(
+        self,
+        metadata_fnames: Optional[List[str]] = None,
+        process_group: Optional[dist.ProcessGroup] = None,
+        max_bytes_per_sec: Optional[float] = None,
+        chunk_size: int = 8 * 1024 * 1024,
+    ) -> None:
+        if max_bytes_per_sec is not None and max_bytes_per_sec <= 0:
+            raise ValueError(
+                f"Invalid value passed for max_bytes_per_sec. Expected to receive either None or positive number, but received {max_bytes_per_sec}"
+            )
+        self._metadata_fnames: List[str] = metadata_fnames or []
+        self._pg_wrapper = PGWrapper(process_group)
+        self._max_bytes_per_sec = max_bytes_per_sec
+        self._chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tnt_checkpoint_promotion"
+        )
+
+    def promote(
+        self, src: str, dst: str, wait_for: Optional[Future[Any]] = None
+    ) -> Future[bool]:
+        """
+        Schedules the copy of the checkpoint directory ``src`` to ``dst``. Every rank must schedule the same promotions.
+
+        Args:
+            src: path of the checkpoint in the local tier.
+            dst: path of the checkpoint in the durable tier.
+            wait_for: future of an asynchronous save of ``src``, to wait on before copying.
+
+        Returns:
+            A future which is True if every rank copied its files, and rank 0 copied the metadata files.
+            On other ranks than rank 0, a failure to copy the metadata files is not reported.
+        """
+        return self._executor.submit(self._promote, src, dst, wait_for)
+
+    def shutdown(self) -> None:
+        """Waits for the scheduled promotions to complete, and stops the background thread."""
+        self._executor.shutdown(wait=True)
+
+    def _promote(self, src: str, dst: str, wait_for: Optional[Future[Any]]) -> bool:
+        start = time.monotonic()
+        num_bytes = 0
+        copied = True
+        metadata_files: List[str] = []
+        try:
+            if wait_for is not None:
+                wait_for.result()
+            src_fs, src_root = url_to_fs(src)
+            dst_fs, dst_root = url_to_fs(dst)
+            files = sorted(src_fs.find(src_root))
+            metadata_files = [
+                f
+                for f in files
+                if os.path.relpath(f, src_root) in self._metadata_fnames
+            ]
+            files = [f for f in files if f not in metadata_files]
+            dst_fs.makedirs(dst_root, exist_ok=True)
+            for file in files[get_local_rank() :: get_local_world_size()]:
+                num_bytes += self._copy_file(
+                    src_fs,
+                    file,
+                    dst_fs,
+                    os.path.join(dst_root, os.path.relpath(file, src_root)),
+                    start,
+                    num_bytes,
+                )
+        except Exception as exc:
+            logger.error(f"Failed to promote checkpoint {src} to {dst}: {exc}")
+            copied = False
+
+        # every rank must have copied its files before the metadata marks the durable copy as complete
+        copied_per_rank: List[bool] = [False] * self._pg_wrapper.get_world_size()
+        self._pg_wrapper.all_gather_object(copied_per_rank, copied)
+        if not all(copied_per_rank):
+            return False
+
+        if self._pg_wrapper.get_rank() == 0:
+            try:
+                for file in metadata_files:
+                    num_bytes += self._copy_file(
+                        src_fs,
+                        file,
+                        dst_fs,
+                        os.path.join(dst_root, os.path.relpath(file, src_root)),
+                        start,
+                        num_bytes,
+                    )
+            except Exception as exc:
+                logger.error(
+                    f"Failed to promote checkpoint metadata of {src} to {dst}: {exc}"
+                )
+                return False
+
+        logger.info(
+            f"Promoted checkpoint {src} to {dst}: copied {num_bytes} bytes in {time.monotonic() - start:.2f} seconds"
+        )
+        return True
+
+    def _copy_file(
+        self,
+        src_fs: fsspec.AbstractFileSystem,
+        src_path: str,
+        dst_fs: fsspec.AbstractFileSystem,
+        dst_path: str,
+        start: float,
+        num_bytes_copied: int,
+    ) -> int:
+        """Copies a file, throttled so the promotion started at ``start`` stays under the bandwidth limit."""
+        dst_fs.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        num_bytes = 0
+        with src_fs.open(src_path, "rb") as src_file, dst_fs.open(
+            dst_path, "wb"
+        ) as dst_file:
+            while chunk := src_file.read(self._chunk_size):
+                dst_file.write(chunk)
+                num_bytes += len(chunk)
+                if self._max_bytes_per_sec is not None:
+                    min_elapsed = (
+                        num_bytes_copied + num_bytes
+                    ) / self._max_bytes_per_sec
+                    elapsed = time.monotonic() - start
+                    if min_elapsed > elapsed:
+                        time.sleep(min_elapsed - elapsed)
+        return num_bytes
 
 
 @rank_zero_read_and_broadcast
@@ -921,6 +1177,136 @@ def _metadata_exists(
     return fs.exists(os.path.join(dirpath, metadata_fname))
 
 
+def is_emergency_checkpoint(
+    ckpt_path: str, file_system: Optional[fsspec.AbstractFileSystem] = None
+) -> bool:
+    """
+    Returns whether a checkpoint was saved upon preemption, see :meth:`CheckpointManager.mark_emergency_checkpoint`.
+
+    Args:
+        ckpt_path: path of the checkpoint.
+        file_system: If a custom file system should be used. Otherwise, fsspec will be used to match the file system of the path.
+    """
+    fs = file_system
+    if fs is None:
+        fs, _ = url_to_fs(ckpt_path)
+    return _metadata_exists(fs, ckpt_path, EMERGENCY_CHECKPOINT_MARKER)
+
+
+def mark_corrupt_checkpoint(
+    ckpt_path: str, file_system: Optional[fsspec.AbstractFileSystem] = None
+) -> None:
+    """
+    Marks a checkpoint as corrupt, e.g. after the verification of its checksums failed, so that it is skipped by
+    :func:`get_latest_checkpoint_path`. May be called by any rank.
+
+    Args:
+        ckpt_path: path of the checkpoint.
+        file_system: If a custom file system should be used. Otherwise, fsspec will be used to match the file system of the path.
+    """
+    fs = file_system
+    if fs is None:
+        fs, _ = url_to_fs(ckpt_path)
+    try:
+        with fs.open(os.path.join(ckpt_path, CORRUPT_CHECKPOINT_MARKER), "w") as f:
+            f.write(str(time.time()))
+    except Exception as exc:
+        logger.error(f"Failed to mark corrupt checkpoint '{ckpt_path}': {exc}")
+
+
+def is_corrupt_checkpoint(
+    ckpt_path: str, file_system: Optional[fsspec.AbstractFileSystem] = None
+) -> bool:
+    """
+    Returns whether a checkpoint was marked as corrupt by :func:`mark_corrupt_checkpoint`.
+
+    Args:
+        ckpt_path: path of the checkpoint.
+        file_system: If a custom file system should be used. Otherwise, fsspec will be used to match the file system of the path.
+    """
+    fs = file_system
+    if fs is None:
+        fs, _ = url_to_fs(ckpt_path)
+    return _metadata_exists(fs, ckpt_path, CORRUPT_CHECKPOINT_MARKER)
+
+
+def get_optimal_checkpoint_interval(save_cost_s: float, mtbf_s: float) -> float:
+    """
+    Returns the interval between checkpoints, in seconds, which minimizes the expected time lost to saving checkpoints
+    and to recomputing the work lost on failures, using Daly's higher order estimate of the optimum.
+
+    For a save cost ``C`` much smaller than the mean time between failures ``M``, this is about Young's ``sqrt(2 * C * M)``.
+    If the save cost is as large as twice the mean time between failures, checkpointing once per ``M`` is optimal.
+
+    Args:
+        save_cost_s: time spent saving a checkpoint, in seconds.
+        mtbf_s: mean time between failures of the job, in seconds.
+    """
+    if mtbf_s <= 0:
+        raise ValueError(
+            f"Expected a positive mean time between failures, got {mtbf_s}"
+        )
+    if save_cost_s >= 2 * mtbf_s:
+        return mtbf_s
+    ratio = save_cost_s / (2 * mtbf_s)
+    return (
+        math.sqrt(2 * save_cost_s * mtbf_s) * (1 + math.sqrt(ratio) / 3 + ratio / 9)
+        - save_cost_s
+    )
+
+
+def estimate_mtbf(start_times: Sequence[float]) -> Optional[float]:
+    """
+    Estimates the mean time between failures of a job from the times at which its runs started, assuming each run
+    but the last one ended with a failure, and was restarted right away.
+
+    Args:
+        start_times: start times of the runs of the job, in seconds since the epoch.
+
+    Returns:
+        The mean duration of the runs, or None if fewer than two runs started.
+    """
+    if len(start_times) < 2:
+        return None
+    start_times = sorted(start_times)
+    return (start_times[-1] - start_times[0]) / (len(start_times) - 1)
+
+
+def record_train_start(
+    dirpath: str,
+    fname: str = ".train_starts",
+    file_system: Optional[fsspec.AbstractFileSystem] = None,
+) -> List[float]:
+    """
+    Appends the current time to the history of the start times of training kept in ``dirpath``. Should only be called
+    by a single rank.
+
+    Args:
+        dirpath: parent directory where checkpoints are saved.
+        fname: name of the history file in ``dirpath``.
+        file_system: If a custom file system should be used. Otherwise, fsspec will be used to match the file system of the dirpath.
+
+    Returns:
+        The start times of training, including the current one, in seconds since the epoch.
+    """
+    fs = file_system
+    if fs is None:
+        fs, _ = url_to_fs(dirpath)
+    path = os.path.join(dirpath, fname)
+    start_times: List[float] = []
+    if fs.exists(path):
+        try:
+            with fs.open(path, "r") as f:
+                start_times = json.load(f)
+        except ValueError:
+            logger.warning(f"Ignoring unreadable train start history {path}")
+    start_times.append(time.time())
+    fs.makedirs(dirpath, exist_ok=True)
+    with fs.open(path, "w") as f:
+        json.dump(start_times, f)
+    return start_times
+
+
 def load_from_full_model_state_dict(
     model: torch.nn.Module,
     full_sd: Dict[str, Any],
@@ -945,6 +1331,7 @@ def load_from_full_model_state_dict(
             * **unexpected_keys** is a list of str containing the unexpected keys
     """
     meta_sharded_sd = model.state_dict()
+    buffer_names = {name for name, _ in model.named_buffers()}
     sharded_sd = {}
     for param_name, full_tensor in sorted(full_sd.items()):
         sharded_meta_param = meta_sharded_sd.get(param_name)
@@ -961,7 +1348,12 @@ def load_from_full_model_state_dict(
             )
         if cpu_offload:
             sharded_tensor = sharded_tensor.cpu()
-        sharded_sd[param_name] = nn.Parameter(sharded_tensor)
+        # buffers must not be registered as parameters when assigned
+        sharded_sd[param_name] = (
+            sharded_tensor
+            if param_name in buffer_names
+            else nn.Parameter(sharded_tensor)
+        )
         if release_sd:
             full_sd[param_name] = None
     # choose `assign=True` since we cannot call `copy_` on meta tensor
@@ -0,0 +1,958 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import bisect
+import io
+import json
+import logging
+import math
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, Generator, IO, List, Optional, Tuple
+
+import torch
+from pyre_extensions import none_throws
+from torch.distributed.checkpoint._extension import (
+    ExtensionRegistry,
+    StreamTransformExtension,
+    ZStandard,
+)
+from torch.distributed.checkpoint._fsspec_filesystem import FsspecReader, FsspecWriter
+from torch.distributed.checkpoint.filesystem import _StorageInfo, DEFAULT_SUFFIX
+from torch.distributed.checkpoint.metadata import Metadata, TensorStorageMetadata
+from torch.distributed.checkpoint.planner import (
+    LoadPlan,
+    LoadPlanner,
+    ReadItem,
+    SavePlan,
+    SavePlanner,
+    WriteItem,
+)
+from torch.distributed.checkpoint.storage import WriteResult
+from torch.futures import Future
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+try:
+    import crc32c
+except ImportError:
+    crc32c = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# optimizer state entries which hold running moments, and may be stored in bfloat16
+OPTIMIZER_MOMENT_KEYS = ("exp_avg", "exp_avg_sq", "max_exp_avg_sq", "momentum_buffer")
+
+# manifest of the checksums of the items of a checkpoint, written before its metadata file
+CHECKSUMS_FNAME = ".checksums"
+# checksum algorithms, in order of preference
+CHECKSUM_ALGORITHMS = ("crc32c", "xxh3_64", "crc32")
+
+
+class Zlib(StreamTransformExtension):
+    """
+    A DCP stream transform which compresses checkpoint items with zlib, which is always available.
+
+    Args:
+        level: the zlib compression level. Low levels trade compression ratio for speed.
+    """
+
+    def __init__(self, level: int = 1) -> None:
+        super().__init__()
+        self.level = level
+
+    @staticmethod
+    def registry_name() -> str:
+        return "stream.zlib"
+
+    @staticmethod
+    def from_descriptor(version: str) -> "Zlib":
+        if version.partition(".")[0] != "1":
+            raise ValueError(f"Unknown extension {version=}")
+        return Zlib()
+
+    def get_descriptor(self) -> str:
+        return f"{self.registry_name()}/1"
+
+    def transform_to(self, output: IO[bytes]) -> IO[bytes]:
+        compressor = zlib.compressobj(self.level)
+        return _CompressingWriter(output, compressor.compress, compressor.flush)
+
+    def transform_from(self, input: IO[bytes]) -> IO[bytes]:
+        return io.BytesIO(zlib.decompress(input.read()))
+
+
+class Lz4(StreamTransformExtension):
+    """A DCP stream transform which compresses checkpoint items with LZ4 frames. Requires the ``lz4`` package."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        if not Lz4.is_available():
+            raise ValueError(
+                "Lz4 extension is unavailable because no module named 'lz4'"
+            )
+
+    @staticmethod
+    def is_available() -> bool:
+        return lz4_frame is not None
+
+    @staticmethod
+    def registry_name() -> str:
+        return "stream.lz4"
+
+    @staticmethod
+    def from_descriptor(version: str) -> "Lz4":
+        if version.partition(".")[0] != "1":
+            raise ValueError(f"Unknown extension {version=}")
+        return Lz4()
+
+    def get_descriptor(self) -> str:
+        return f"{self.registry_name()}/1"
+
+    def transform_to(self, output: IO[bytes]) -> IO[bytes]:
+        # pyre-ignore[16]: lz4 is checked to be available in __init__
+        compressor = lz4_frame.LZ4FrameCompressor()
+        output.write(compressor.begin())
+        return _CompressingWriter(output, compressor.compress, compressor.flush)
+
+    def transform_from(self, input: IO[bytes]) -> IO[bytes]:
+        # pyre-ignore[16]: lz4 is checked to be available in __init__
+        return io.BytesIO(lz4_frame.decompress(input.read()))
+
+
+class _CompressingWriter(io.RawIOBase):
+    def __init__(self, output: IO[bytes], compress: Any, flush: Any) -> None:
+        super().__init__()
+        self._output = output
+        self._compress = compress
+        self._flush = flush
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        data = self._compress(b)
+        if data:
+            self._output.write(data)
+        return len(memoryview(b))
+
+    def close(self) -> None:
+        # the output stream is owned by the caller, only the compressed stream is ended
+        if not self.closed:
+            self._output.write(self._flush())
+        super().close()
+
+
+def get_compression_extension(codec: str = "auto") -> StreamTransformExtension:
+    """
+    Returns the DCP stream transform compressing with ``codec``.
+
+    Args:
+        codec: one of ``zstd``, ``lz4`` or ``zlib``, or ``auto`` for the first of them which is installed. zstd
+            requires the ``zstandard`` or ``pyzstd`` package, and lz4 the ``lz4`` package.
+    """
+    if codec == "auto":
+        codec = (
+            "zstd"
+            if ZStandard.is_available()
+            else "lz4" if Lz4.is_available() else "zlib"
+        )
+    if codec == "zstd":
+        return ZStandard()
+    if codec == "lz4":
+        return Lz4()
+    if codec == "zlib":
+        return Zlib()
+    raise ValueError(
+        f"Unknown compression codec {codec}. Expected one of 'auto', 'zstd', 'lz4' or 'zlib'"
+    )
+
+
+@dataclass
+class CompressionStats:
+    """
+    Storage statistics of a checkpoint.
+
+    Args:
+        bytes_written: bytes written to storage, excluding the metadata file.
+        uncompressed_bytes: size of the checkpointed tensors in their original dtype, plus the size of other items.
+        compression_ratio: ratio of ``uncompressed_bytes`` to ``bytes_written``, including the gain of downcasting.
+    """
+
+    bytes_written: int
+    uncompressed_bytes: int
+    compression_ratio: float
+
+
+def get_checksum_algorithm(algorithm: str = "auto") -> str:
+    """
+    Returns the name of a checksum algorithm of :data:`CHECKSUM_ALGORITHMS`. ``crc32c`` and ``xxh3_64`` require the
+    ``crc32c`` and ``xxhash`` packages respectively, while ``crc32`` is computed with zlib.
+
+    Args:
+        algorithm: one of :data:`CHECKSUM_ALGORITHMS`, or ``auto`` for the first one installed.
+    """
+    if algorithm == "auto":
+        for name in CHECKSUM_ALGORITHMS:
+            if _is_checksum_available(name):
+                return name
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise ValueError(
+            f"Unknown checksum algorithm {algorithm}. Expected one of 'auto', {', '.join(repr(a) for a in CHECKSUM_ALGORITHMS)}"
+        )
+    if not _is_checksum_available(algorithm):
+        raise ValueError(
+            f"Checksum algorithm {algorithm} requires the {'crc32c' if algorithm == 'crc32c' else 'xxhash'} package, which is not installed"
+        )
+    return algorithm
+
+
+class ChecksumMismatchError(RuntimeError):
+    """Raised when the bytes read from a checkpoint file do not match the checksums recorded when it was written."""
+
+
+@dataclass
+class WriteStats:
+    """
+    Write throughput of a checkpoint.
+
+    Args:
+        bytes_written: bytes written to storage by every rank, excluding the metadata file.
+        write_seconds: time from the start of the writes of the coordinator rank to the completion of the checkpoint.
+    """
+
+    bytes_written: int
+    write_seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Bytes written per second."""
+        return self.bytes_written / max(self.write_seconds, 1e-9)
+
+
+class MeasuredStorageWriter(FsspecWriter):
+    """
+    A DCP storage writer which measures the write throughput of the checkpoint, and optionally checksums what it writes.
+    Once the checkpoint is written, its :class:`WriteStats` are kept in :attr:`write_stats` by the coordinator rank.
+
+    If ``checksum_algorithm`` is set, the writer threads compute checksums of the bytes of every item as they write them,
+    and the coordinator rank writes them to a manifest in the checkpoint, before the metadata file. The checksums are
+    verified by :class:`CompressedStorageReader` when the checkpoint is read.
+
+    Args:
+        path: directory of the checkpoint.
+        checksum_algorithm: if set, the checksum algorithm, see :func:`get_checksum_algorithm`.
+        kwargs: additional arguments of :class:`~torch.distributed.checkpoint.FileSystemWriter`, e.g. ``thread_count``.
+    """
+
+    def __init__(
+        self, path: str, *, checksum_algorithm: Optional[str] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(path, **kwargs)
+        self.write_stats: Optional[WriteStats] = None
+        self._write_start_time: Optional[float] = None
+        self.checksum_algorithm: Optional[str] = None
+        if checksum_algorithm is not None:
+            self.checksum_algorithm = get_checksum_algorithm(checksum_algorithm)
+            self._checksummed_fs = _ChecksummingFileSystem(
+                self.fs, self.checksum_algorithm
+            )
+            self.fs = self._checksummed_fs
+
+    def write_data(
+        self, plan: SavePlan, planner: SavePlanner
+    ) -> Future[List[WriteResult]]:
+        self._write_start_time = time.perf_counter()
+        fut = super().write_data(plan, planner)
+        if self.checksum_algorithm is None:
+            return fut
+
+        # the checksums of each rank reach the coordinator along with its write results
+        results = []
+        for result in fut.wait():
+            storage_info = result.storage_data
+            checksums = self._checksummed_fs.pop_checksums(
+                storage_info.relative_path, storage_info.offset, storage_info.length
+            )
+            if checksums is not None:
+                result = replace(
+                    result,
+                    storage_data=_ChecksummedStorageInfo(
+                        **vars(storage_info), checksums=checksums
+                    ),
+                )
+            results.append(result)
+        checksummed_fut: Future[List[WriteResult]] = Future()
+        checksummed_fut.set_result(results)
+        return checksummed_fut
+
+    def finish(self, metadata: Metadata, results: List[List[WriteResult]]) -> None:
+        if self.checksum_algorithm is not None:
+            results = self._write_checksums(results)
+        super().finish(metadata, results)
+        if self._write_start_time is None:
+            return
+        self.write_stats = WriteStats(
+            bytes_written=sum(
+                result.size_in_bytes
+                for rank_results in results
+                for result in rank_results
+            ),
+            write_seconds=time.perf_counter() - self._write_start_time,
+        )
+
+    def _write_checksums(
+        self, results: List[List[WriteResult]]
+    ) -> List[List[WriteResult]]:
+        """
+        Writes the checksums of the write results of every rank to the manifest, and returns the write results with the
+        storage info DCP expects, so that the metadata of the checkpoint can be read without torchtnt.
+        """
+        files: Dict[str, List[List[int]]] = {}
+        plain_results = []
+        for rank_results in results:
+            plain_rank_results = []
+            for result in rank_results:
+                storage_info = result.storage_data
+                if isinstance(storage_info, _ChecksummedStorageInfo):
+                    files.setdefault(storage_info.relative_path, []).extend(
+                        storage_info.checksums
+                    )
+                    result = replace(
+                        result,
+                        storage_data=_StorageInfo(
+                            relative_path=storage_info.relative_path,
+                            offset=storage_info.offset,
+                            length=storage_info.length,
+                            transform_descriptors=storage_info.transform_descriptors,
+                        ),
+                    )
+                plain_rank_results.append(result)
+            plain_results.append(plain_rank_results)
+
+        for segments in files.values():
+            segments.sort()
+        manifest_fname = (
+            f"__{self.rank}{CHECKSUMS_FNAME}"
+            if not self.use_collectives and self.rank is not None
+            else CHECKSUMS_FNAME
+        )
+        with self.fs.create_stream(
+            self.fs.concat_path(self.path, manifest_fname), "wb"
+        ) as f:
+            f.write(
+                json.dumps(
+                    {"algorithm": self.checksum_algorithm, "files": files}
+                ).encode()
+            )
+        return plain_results
+
+
+class CompressedStorageWriter(MeasuredStorageWriter):
+    """
+    A DCP storage writer which compresses every tensor chunk and serialized object of the checkpoint.
+
+    Items are compressed by the writer threads as they are written, so ``thread_count`` sets the number of items
+    compressed in parallel. Each item is written at an offset of the rank's files recorded in the checkpoint metadata,
+    along with its codec, so checkpoints are read back with :class:`CompressedStorageReader`.
+
+    Once the checkpoint is written, its :class:`CompressionStats` are logged, and kept in :attr:`stats` by the coordinator rank.
+
+    Args:
+        path: directory of the checkpoint.
+        codec: the compression codec, see :func:`get_compression_extension`.
+        downcast_optimizer_moments: whether to store the float32 optimizer moments (see ``OPTIMIZER_MOMENT_KEYS``) in
+            bfloat16. This is lossy: restored moments lose precision, which may affect training.
+        kwargs: additional arguments of :class:`~torch.distributed.checkpoint.FileSystemWriter`, e.g. ``thread_count``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        codec: str = "auto",
+        downcast_optimizer_moments: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(path, _extensions=[get_compression_extension(codec)], **kwargs)
+        self.downcast_optimizer_moments = downcast_optimizer_moments
+        self.stats: Optional[CompressionStats] = None
+
+    def write_data(
+        self, plan: SavePlan, planner: SavePlanner
+    ) -> Future[List[WriteResult]]:
+        if self.downcast_optimizer_moments:
+            planner = _DowncastingSavePlanner(planner)
+        return super().write_data(plan, planner)
+
+    def finish(self, metadata: Metadata, results: List[List[WriteResult]]) -> None:
+        super().finish(metadata, results)
+        bytes_written = 0
+        uncompressed_bytes = 0
+        for result in (r for rank_results in results for r in rank_results):
+            bytes_written += result.size_in_bytes
+            uncompressed_bytes += _uncompressed_size(metadata, result)
+        self.stats = CompressionStats(
+            bytes_written=bytes_written,
+            uncompressed_bytes=uncompressed_bytes,
+            compression_ratio=uncompressed_bytes / max(bytes_written, 1),
+        )
+        logger.info(
+            f"Wrote {bytes_written} bytes to {self.path}, with a compression ratio of {self.stats.compression_ratio:.2f}"
+        )
+
+
+class CompressedStorageReader(FsspecReader):
+    """
+    A DCP storage reader for checkpoints written by :class:`CompressedStorageWriter`, and uncompressed checkpoints.
+
+    The files of the checkpoint are read, and their items decompressed, by ``thread_count`` threads in parallel. If the
+    checkpoint was written with checksums, see :class:`MeasuredStorageWriter`, the bytes of every item are verified by
+    the thread reading them, and :class:`ChecksumMismatchError` is raised if they were corrupted. The corrupted files are
+    kept in :attr:`corrupt_files`.
+
+    Args:
+        path: directory of the checkpoint.
+        thread_count: number of files read in parallel.
+        verify_checksums: whether to verify the checksums of the checkpoint, if it has any.
+        kwargs: additional arguments of :class:`~torch.distributed.checkpoint.FileSystemReader`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        thread_count: int = 1,
+        verify_checksums: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(path, **kwargs)
+        registry = ExtensionRegistry()
+        for extension in (Zlib, Lz4):
+            registry.register(extension)
+        self.transforms.extension_registry = registry
+        self.thread_count = thread_count
+        self.verify_checksums = verify_checksums
+        self.corrupt_files: List[str] = []
+        self._checksums: Optional[_ChecksumManifest] = None
+        self._checksums_lock = threading.Lock()
+
+    def read_data(self, plan: LoadPlan, planner: LoadPlanner) -> Future[None]:
+        per_file: Dict[str, List[ReadItem]] = {}
+        for read_item in plan.items:
+            path = self.storage_data[read_item.storage_index].relative_path
+            per_file.setdefault(path, []).append(read_item)
+        if self.thread_count <= 1 or len(per_file) <= 1:
+            return super().read_data(plan, planner)
+
+        locked_planner = _LockedLoadPlanner(planner)
+        with ThreadPoolExecutor(
+            max_workers=min(self.thread_count, len(per_file)),
+            thread_name_prefix="tnt-dcp-read",
+        ) as executor:
+            futures = [
+                executor.submit(
+                    FsspecReader.read_data, self, LoadPlan(items), locked_planner
+                )
+                for items in per_file.values()
+            ]
+            for future in futures:
+                future.result().wait()
+
+        fut: Future[None] = Future()
+        fut.set_result(None)
+        return fut
+
+    def _slice_file(self, file: Any, sinfo: _StorageInfo) -> IO[bytes]:
+        manifest = self._get_checksums() if self.verify_checksums else None
+        segments = manifest.segments(sinfo) if manifest is not None else None
+        if segments is None:
+            return super()._slice_file(file, sinfo)
+
+        file.seek(sinfo.offset)
+        data = memoryview(file.read(sinfo.length))
+        for offset, length, expected in segments:
+            start = offset - sinfo.offset
+            checksum = _new_hasher(manifest.algorithm)
+            checksum.update(data[start : start + length])
+            if len(data) < start + length or checksum.intdigest() != expected:
+                with self._checksums_lock:
+                    self.corrupt_files.append(sinfo.relative_path)
+                raise ChecksumMismatchError(
+                    f"Checksum mismatch of {length} bytes at offset {offset} of {sinfo.relative_path} in checkpoint {self.path}"
+                )
+        return io.BytesIO(data)
+
+    def _get_checksums(self) -> Optional["_ChecksumManifest"]:
+        with self._checksums_lock:
+            if self._checksums is None:
+                self._checksums = _ChecksumManifest.read(self.fs, self.path)
+            return self._checksums if self._checksums.files else None
+
+
+def needs_compressed_storage_reader(
+    path: str, *, rank: Optional[int] = None, verify_checksums: bool = True
+) -> bool:
+    """
+    Returns whether the checkpoint at ``path`` must be read with :class:`CompressedStorageReader`, i.e. whether its items
+    were written with stream transforms, e.g. by :class:`CompressedStorageWriter`, or, if ``verify_checksums`` is set,
+    whether it has a manifest of checksums. Other checkpoints, and checkpoints whose metadata cannot be read, are left to
+    :class:`~torch.distributed.checkpoint.FileSystemReader`.
+
+    Args:
+        path: directory of the checkpoint.
+        rank: rank whose local metadata is read if the checkpoint has no global metadata.
+        verify_checksums: whether the checksums of the checkpoint are to be verified.
+    """
+    try:
+        reader = FsspecReader(path)
+        if verify_checksums and (
+            reader.fs.exists(reader.fs.concat_path(reader.path, CHECKSUMS_FNAME))
+            or reader.fs.fs.glob(
+                str(reader.fs.concat_path(reader.path, f"__*{CHECKSUMS_FNAME}"))
+            )
+        ):
+            return True
+        try:
+            metadata = reader.read_metadata()
+        except FileNotFoundError:
+            if rank is None:
+                raise
+            # checkpoints saved per rank have no global metadata
+            metadata = reader.read_metadata(rank=rank)
+    except Exception:
+        logger.debug(f"Could not read the metadata of checkpoint {path}", exc_info=True)
+        return False
+    return any(
+        storage_info.transform_descriptors
+        for storage_info in (metadata.storage_data or {}).values()
+    )
+
+
+@dataclass(frozen=True)
+class IOSettings:
+    """
+    Settings of the concurrency of the writes of a checkpoint by each rank, see :class:`~torch.distributed.checkpoint.FileSystemWriter`.
+
+    Args:
+        thread_count: number of threads writing files.
+        per_thread_copy_ahead: bytes of tensors each thread copies to CPU ahead of writing them.
+        single_file_per_rank: whether each thread writes a single file, rather than one file per item.
+    """
+
+    thread_count: int = 16
+    per_thread_copy_ahead: int = 10_000_000
+    single_file_per_rank: bool = False
+
+
+class IOConcurrencyTuner:
+    """
+    Tunes the :class:`IOSettings` of checkpoint writes from the throughput measured at successive saves, by hill climbing:
+    one setting is changed at a time, doubling or halving the thread count or the copy-ahead size within bounds, or
+    toggling ``single_file_per_rank``, and the change is kept if it improves the throughput by at least ``min_improvement``.
+    Once no change improves the throughput, the best settings are kept.
+
+    The tuner is :class:`~torchtnt.utils.stateful.Stateful`, so that the best settings found can be persisted across runs.
+
+    Args:
+        initial_settings: settings to start from.
+        thread_count_bounds: minimum and maximum number of threads.
+        per_thread_copy_ahead_bounds: minimum and maximum copy-ahead size, in bytes.
+        tune_single_file_per_rank: whether to try toggling ``single_file_per_rank``.
+        min_improvement: relative improvement of the throughput for a change to be kept.
+        max_history: number of measurements kept in :attr:`history`.
+    """
+
+    def __init__(
+        self,
+        initial_settings: IOSettings,
+        *,
+        thread_count_bounds: Tuple[int, int] = (1, 64),
+        per_thread_copy_ahead_bounds: Tuple[int, int] = (1_000_000, 256_000_000),
+        tune_single_file_per_rank: bool = True,
+        min_improvement: float = 0.05,
+        max_history: int = 100,
+    ) -> None:
+        for name, (low, high) in (
+            ("thread_count_bounds", thread_count_bounds),
+            ("per_thread_copy_ahead_bounds", per_thread_copy_ahead_bounds),
+        ):
+            if not 0 < low <= high:
+                raise ValueError(
+                    f"Invalid {name} ({low}, {high}), expected 0 < minimum <= maximum"
+                )
+        self._thread_count_bounds = thread_count_bounds
+        self._per_thread_copy_ahead_bounds = per_thread_copy_ahead_bounds
+        self._min_improvement = min_improvement
+        self._max_history = max_history
+        self._moves: List[Tuple[str, float]] = [
+            ("thread_count", 2),
+            ("thread_count", 0.5),
+            ("per_thread_copy_ahead", 2),
+            ("per_thread_copy_ahead", 0.5),
+        ]
+        if tune_single_file_per_rank:
+            self._moves.append(("single_file_per_rank", 0))
+
+        self._best: IOSettings = self._clamp(initial_settings)
+        self._best_throughput: Optional[float] = None
+        self._trial: Optional[IOSettings] = None
+        self._move_idx = 0
+        self._num_rejected_moves = 0
+        self.converged = False
+        # measured settings and throughput, in bytes per second, oldest first
+        self.history: List[Dict[str, Any]] = []
+
+    @property
+    def settings(self) -> IOSettings:
+        """The settings to use for the next save."""
+        return self._trial or self._best
+
+    @property
+    def best_settings(self) -> IOSettings:
+        """The settings with the best throughput measured so far."""
+        return self._best
+
+    def record(self, settings: IOSettings, stats: WriteStats) -> None:
+        """
+        Records the throughput of a save which used ``settings``, and picks the settings of the next save.
+        Measurements of other settings than :attr:`settings` are ignored.
+        """
+        if settings != self.settings:
+            return
+        throughput = stats.throughput
+        self.history.append({**asdict(settings), "throughput": throughput})
+        del self.history[: -self._max_history]
+
+        trial = self._trial
+        self._trial = None
+        if trial is None:
+            # the best settings were measured, either initially or since tuning converged
+            self._best_throughput = throughput
+        elif throughput >= none_throws(self._best_throughput) * (
+            1 + self._min_improvement
+        ):
+            logger.info(
+                f"Checkpoint write throughput improved from {_format_throughput(self._best_throughput)} "
+                f"to {_format_throughput(throughput)} with {trial}"
+            )
+            self._best, self._best_throughput = trial, throughput
+            # the same change is tried again
+            self._num_rejected_moves = 0
+        else:
+            logger.info(
+                f"Keeping {self._best} with a checkpoint write throughput of {_format_throughput(self._best_throughput)}, "
+                f"rather than {_format_throughput(throughput)} with {trial}"
+            )
+            self._reject_move()
+
+        if not self.converged:
+            self._trial = self._next_trial()
+            if self._trial is None:
+                self.converged = True
+                logger.info(
+                    f"Tuned checkpoint writes to {self._best}, with a throughput of {_format_throughput(self._best_throughput)}"
+                )
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "best_settings": asdict(self._best),
+            "best_throughput": self._best_throughput,
+            "move_idx": self._move_idx,
+            "num_rejected_moves": self._num_rejected_moves,
+            "converged": self.converged,
+            "history": self.history,
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self._best = self._clamp(IOSettings(**state_dict["best_settings"]))
+        self._best_throughput = state_dict["best_throughput"]
+        self._move_idx = state_dict["move_idx"] % len(self._moves)
+        self._num_rejected_moves = state_dict["num_rejected_moves"]
+        self.converged = state_dict["converged"]
+        self.history = state_dict["history"][-self._max_history :]
+        # the best settings are measured again before other ones are tried
+        self._trial = None
+
+    def _next_trial(self) -> Optional[IOSettings]:
+        while self._num_rejected_moves < len(self._moves):
+            name, factor = self._moves[self._move_idx]
+            if name == "single_file_per_rank":
+                trial = replace(
+                    self._best, single_file_per_rank=not self._best.single_file_per_rank
+                )
+            else:
+                trial = self._clamp(
+                    replace(
+                        self._best, **{name: round(getattr(self._best, name) * factor)}
+                    )
+                )
+            if trial != self._best:
+                return trial
+            # the setting is at its bound
+            self._reject_move()
+        return None
+
+    def _reject_move(self) -> None:
+        self._num_rejected_moves += 1
+        self._move_idx = (self._move_idx + 1) % len(self._moves)
+
+    def _clamp(self, settings: IOSettings) -> IOSettings:
+        min_threads, max_threads = self._thread_count_bounds
+        min_copy_ahead, max_copy_ahead = self._per_thread_copy_ahead_bounds
+        return replace(
+            settings,
+            thread_count=min(max(settings.thread_count, min_threads), max_threads),
+            per_thread_copy_ahead=min(
+                max(settings.per_thread_copy_ahead, min_copy_ahead), max_copy_ahead
+            ),
+        )
+
+
+def _format_throughput(throughput: Optional[float]) -> str:
+    if throughput is None:
+        return "unknown"
+    return f"{throughput / 1e6:.1f} MB/s"
+
+
+class _Crc32:
+    def __init__(self) -> None:
+        self._value = 0
+
+    def update(self, data: Any) -> None:
+        self._value = zlib.crc32(data, self._value)
+
+    def intdigest(self) -> int:
+        return self._value
+
+
+class _Crc32c(_Crc32):
+    def update(self, data: Any) -> None:
+        self._value = crc32c.crc32c(data, self._value)
+
+
+def _is_checksum_available(algorithm: str) -> bool:
+    if algorithm == "crc32c":
+        return crc32c is not None
+    if algorithm == "xxh3_64":
+        return xxhash is not None
+    return algorithm == "crc32"
+
+
+def _new_hasher(algorithm: str) -> Any:
+    if algorithm == "crc32c":
+        return _Crc32c()
+    if algorithm == "xxh3_64":
+        return xxhash.xxh3_64()
+    return _Crc32()
+
+
+@dataclass
+class _ChecksummedStorageInfo(_StorageInfo):
+    """Storage info of an item along with the (offset, length, checksum) of its segments, see :class:`_ChecksummingStream`."""
+
+    checksums: Optional[List[List[int]]] = None
+
+
+class _ChecksummingStream(io.RawIOBase):
+    """
+    Checksums the bytes written to a file. DCP writers call ``tell`` before and after writing each item, so the
+    checksum restarts at every call to ``tell``, and the bytes written in between make a segment of the file.
+    The stream is not seekable, so that items are written sequentially.
+    """
+
+    def __init__(self, output: IO[bytes], algorithm: str) -> None:
+        super().__init__()
+        self._output = output
+        self._algorithm = algorithm
+        self._hasher: Any = _new_hasher(algorithm)
+        self._position = 0
+        self._segment_start = 0
+        # (offset, length, checksum) of each segment
+        self.segments: List[List[int]] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        data = memoryview(b).cast("B")
+        self._output.write(data)
+        self._hasher.update(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        self._end_segment()
+        return self._position
+
+    def close(self) -> None:
+        # the output stream is owned by the caller
+        if not self.closed:
+            self._end_segment()
+        super().close()
+
+    def _end_segment(self) -> None:
+        if self._position > self._segment_start:
+            self.segments.append(
+                [
+                    self._segment_start,
+                    self._position - self._segment_start,
+                    self._hasher.intdigest(),
+                ]
+            )
+            self._hasher = _new_hasher(self._algorithm)
+        self._segment_start = self._position
+
+
+class _ChecksummingFileSystem:
+    """Wraps the file system of a DCP writer to checksum the data files it writes."""
+
+    def __init__(self, fs: Any, algorithm: str) -> None:
+        self._fs = fs
+        self._algorithm = algorithm
+        self._lock = threading.Lock()
+        # segments of each data file, by relative path
+        self._segments: Dict[str, List[List[int]]] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fs, name)
+
+    @contextmanager
+    def create_stream(self, path: Any, mode: str) -> Generator[IO[bytes], None, None]:
+        with self._fs.create_stream(path, mode) as stream:
+            if "w" not in mode or not str(path).endswith(DEFAULT_SUFFIX):
+                yield stream
+                return
+            checksumming_stream = _ChecksummingStream(stream, self._algorithm)
+            yield checksumming_stream
+            checksumming_stream.close()
+        with self._lock:
+            self._segments[os.path.basename(str(path))] = checksumming_stream.segments
+
+    def pop_checksums(
+        self, relative_path: str, offset: int, length: int
+    ) -> Optional[List[List[int]]]:
+        """Returns the segments of the item at ``offset`` of a file, if they cover it exactly."""
+        with self._lock:
+            segments = self._segments.get(relative_path, [])
+        item_segments = [
+            segment for segment in segments if offset <= segment[0] < offset + length
+        ]
+        if sum(segment[1] for segment in item_segments) != length:
+            return None
+        return item_segments
+
+
+@dataclass
+class _ChecksumManifest:
+    algorithm: str
+    # sorted (offset, length, checksum) of the segments of each file
+    files: Dict[str, List[List[int]]]
+
+    @staticmethod
+    def read(fs: Any, path: Any) -> "_ChecksumManifest":
+        """Reads the manifest of a checkpoint, or the manifests of every rank if they were written separately."""
+        manifest = _ChecksumManifest(algorithm="", files={})
+        fnames = [CHECKSUMS_FNAME]
+        if not fs.exists(fs.concat_path(path, CHECKSUMS_FNAME)):
+            fnames = [
+                os.path.basename(name)
+                for name in fs.fs.glob(
+                    str(fs.concat_path(path, f"__*{CHECKSUMS_FNAME}"))
+                )
+            ]
+        for fname in fnames:
+            manifest_path = fs.concat_path(path, fname)
+            if not fs.exists(manifest_path):
+                continue
+            with fs.create_stream(manifest_path, "rb") as f:
+                rank_manifest = json.loads(f.read())
+            manifest.algorithm = rank_manifest["algorithm"]
+            manifest.files.update(rank_manifest["files"])
+        return manifest
+
+    def segments(self, sinfo: _StorageInfo) -> Optional[List[List[int]]]:
+        segments = self.files.get(sinfo.relative_path)
+        if segments is None:
+            return None
+        start = bisect.bisect_left(segments, [sinfo.offset])
+        end = bisect.bisect_left(segments, [sinfo.offset + sinfo.length])
+        return segments[start:end]
+
+
+class _DowncastingSavePlanner:
+    """Wraps a save planner to cast the float32 optimizer moments it resolves to bfloat16."""
+
+    def __init__(self, planner: SavePlanner) -> None:
+        self._planner = planner
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._planner, name)
+
+    def resolve_data(self, write_item: WriteItem) -> Any:
+        data = self._planner.resolve_data(write_item)
+        if (
+            isinstance(data, torch.Tensor)
+            and data.dtype == torch.float32
+            and _is_optimizer_moment(write_item.index.fqn)
+        ):
+            return data.to(torch.bfloat16)
+        return data
+
+
+class _LockedLoadPlanner:
+    """Wraps a load planner so that its methods are called by a single reader thread at a time."""
+
+    def __init__(self, planner: LoadPlanner) -> None:
+        self._planner = planner
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._planner, name)
+
+    def load_bytes(self, read_item: ReadItem, value: io.BytesIO) -> None:
+        with self._lock:
+            self._planner.load_bytes(read_item, value)
+
+    def resolve_tensor(self, read_item: ReadItem) -> torch.Tensor:
+        with self._lock:
+            return self._planner.resolve_tensor(read_item)
+
+    def commit_tensor(self, read_item: ReadItem, tensor: torch.Tensor) -> None:
+        with self._lock:
+            self._planner.commit_tensor(read_item, tensor)
+
+
+def _is_optimizer_moment(fqn: str) -> bool:
+    parts = fqn.split(".")
+    return "state" in parts[:-1] and parts[-1] in OPTIMIZER_MOMENT_KEYS
+
+
+def _uncompressed_size(metadata: Metadata, result: WriteResult) -> int:
+    md = metadata.state_dict_metadata.get(result.index.fqn)
+    if not isinstance(md, TensorStorageMetadata):
+        return result.size_in_bytes
+    for chunk in md.chunks:
+        if result.index.offset is None or tuple(chunk.offsets) == tuple(
+            result.index.offset
+        ):
+            return math.prod(chunk.sizes) * md.properties.dtype.itemsize
+    return result.size_in_bytes
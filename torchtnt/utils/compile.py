@@ -0,0 +1,238 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import hashlib
+import itertools
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Sequence
+
+import torch
+from torchtnt.utils.distributed import get_global_rank
+from torchtnt.utils.fsspec import get_filesystem
+from torchtnt.utils.version import is_torch_version_geq
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# files of the persistent compile cache which were loaded, or missed, in this process
+_compile_cache_paths: List[str] = []
+
+
+@dataclass
+class CompileStats:
+    """
+    Cumulative torch.compile statistics of the current process.
+
+    Args:
+        num_frames: number of frames compiled by dynamo, including recompilations.
+        num_graphs: number of unique graphs captured by dynamo.
+        compile_time_s: time spent compiling, in seconds, including the lazy compilation of backward graphs.
+    """
+
+    num_frames: int
+    num_graphs: int
+    compile_time_s: float
+
+
+def get_compile_stats() -> CompileStats:
+    """Returns the torch.compile statistics of the current process."""
+    from torch._dynamo.utils import compilation_time_metrics, counters
+
+    return CompileStats(
+        num_frames=counters["frames"]["ok"],
+        num_graphs=counters["stats"]["unique_graphs"],
+        compile_time_s=sum(compilation_time_metrics.get("_compile.compile_inner", []))
+        + sum(compilation_time_metrics.get("backward._backward_impl", [])),
+    )
+
+
+def module_signature(module: torch.nn.Module) -> Hashable:
+    """
+    Returns a hashable description of the structure of a module: the types of its submodules, and the names, shapes
+    and dtypes of its parameters and buffers. Modules with the same signature are traced to the same graph.
+    """
+    tensors = itertools.chain(module.named_parameters(), module.named_buffers())
+    return (
+        tuple(type(m).__qualname__ for m in module.modules()),
+        tuple(
+            (name, tuple(t.shape), str(t.dtype), t.device.type, t.requires_grad)
+            for name, t in tensors
+        ),
+    )
+
+
+def dedup_compile_targets(
+    modules: Sequence[torch.nn.Module],
+) -> List[torch.nn.Module]:
+    """
+    Prepares a list of modules for regional compilation, so that each unique block is compiled once.
+
+    Modules nested in another module of the list are dropped, as they are traced as part of it. Dynamo caches
+    compiled graphs per code object and, since it inlines ``nn.Module`` s, does not guard on module identity, so
+    modules with the same :func:`module_signature` reuse the graph compiled for the first of them. The recompile
+    limit is raised if needed so that a training and an eval graph of each unique block fit in the cache, instead of
+    falling back to eager once blocks of too many different structures were compiled.
+
+    Args:
+        modules: the modules which would be compiled.
+
+    Returns:
+        The modules to compile, in the order of ``modules``.
+    """
+    nested = {
+        id(submodule)
+        for m in modules
+        for submodule in m.modules()
+        if submodule is not m
+    }
+    targets = [m for m in modules if id(m) not in nested]
+    num_unique = len({module_signature(m) for m in targets})
+
+    config = torch._dynamo.config
+    limit_name = (
+        "recompile_limit" if hasattr(config, "recompile_limit") else "cache_size_limit"
+    )
+    if getattr(config, limit_name) < 2 * num_unique:
+        logger.info(f"Raising torch._dynamo.config.{limit_name} to {2 * num_unique}")
+        setattr(config, limit_name, 2 * num_unique)
+    logger.info(f"Compiling {len(targets)} modules with {num_unique} unique structures")
+    return targets
+
+
+def get_compile_cache_key(
+    module: torch.nn.Module, compile_kwargs: Mapping[str, Any]
+) -> str:
+    """
+    Returns the key of the persistent compile cache entry of a module, a hash of the PyTorch version, of the
+    :func:`module_signature` of the module, and of the arguments passed to torch.compile.
+    """
+    kwargs = {
+        # pyre-ignore[16]: callable backends are keyed by their name
+        k: getattr(v, "__name__", v) if k == "backend" else v
+        for k, v in compile_kwargs.items()
+    }
+    if isinstance(kwargs.get("options"), dict):
+        kwargs["options"] = sorted(kwargs["options"].items())
+    payload = repr(
+        (torch.__version__, module_signature(module), sorted(kwargs.items()))
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def load_compile_cache(cache_dir: str, key: str) -> bool:
+    """
+    Loads the compile artifacts cached under ``cache_dir`` for ``key``, so compiling the same module again skips
+    the expensive backend compilation. The cache file is registered, whether it exists or not, so that
+    :func:`save_compile_cache` later writes the artifacts compiled in this process to it.
+
+    Returns:
+        Whether cached artifacts were loaded.
+    """
+    if not _is_compile_cache_supported():
+        logger.warning(
+            "Persistent compile caching requires PyTorch >= 2.7.0, skipping the compile cache"
+        )
+        return False
+    path = os.path.join(cache_dir, f"{key}.bin")
+    if path not in _compile_cache_paths:
+        _compile_cache_paths.append(path)
+
+    fs = get_filesystem(path)
+    if not fs.exists(path):
+        logger.info(f"No compile cache found at {path}")
+        return False
+    try:
+        with fs.open(path, "rb") as f:
+            artifacts = f.read()
+        torch.compiler.load_cache_artifacts(artifacts)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable compile cache {path}: {e}")
+        return False
+    logger.info(f"Loaded compile cache from {path}")
+    return True
+
+
+def save_compile_cache() -> List[str]:
+    """
+    Writes the compile artifacts of the current process to the cache files registered by :func:`load_compile_cache`.
+    Only global rank 0 writes, as all ranks compile the same graphs and share the cache files.
+
+    Returns:
+        The paths written to.
+    """
+    if (
+        not _compile_cache_paths
+        or not _is_compile_cache_supported()
+        or get_global_rank() != 0
+    ):
+        return []
+    saved = torch.compiler.save_cache_artifacts()
+    if saved is None:
+        return []
+    artifacts, _ = saved
+    for path in _compile_cache_paths:
+        fs = get_filesystem(path)
+        fs.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first, as other ranks or jobs may be reading the cache
+        tmp_path = f"{path}.{get_global_rank()}.{os.getpid()}.tmp"
+        with fs.open(tmp_path, "wb") as f:
+            f.write(artifacts)
+        fs.mv(tmp_path, path)
+        logger.info(f"Saved compile cache to {path}")
+    return list(_compile_cache_paths)
+
+
+def _is_compile_cache_supported() -> bool:
+    return is_torch_version_geq("2.7.0") and hasattr(
+        torch.compiler, "save_cache_artifacts"
+    )
+
+
+def warmup_compile(
+    module: torch.nn.Module,
+    forward_fn: Callable[[], Any],
+    backward: bool = True,
+) -> None:
+    """
+    Triggers the compilation of a module's forward, and backward, graphs ahead of the first real step, by running
+    ``forward_fn`` on a synthetic batch.
+
+    The module is left as it was: the gradients, the buffers (e.g. batch norm running statistics) and the RNG state
+    are restored after the warmup.
+
+    Args:
+        module: the compiled module.
+        forward_fn: a function running the forward pass of ``module`` and returning a loss, or outputs which are
+            summed into a loss when ``backward`` is True.
+        backward: whether to also run the backward pass, to compile the backward graphs.
+    """
+    grads: Dict[torch.nn.Parameter, Optional[torch.Tensor]] = {
+        p: p.grad for p in module.parameters()
+    }
+    buffers = [(b, b.detach().clone()) for b in module.buffers()]
+    devices = [torch.cuda.current_device()] if torch.cuda.is_available() else []
+    with torch.random.fork_rng(devices=devices):
+        for p in grads:
+            p.grad = None
+        outputs = forward_fn()
+        if backward:
+            loss = outputs
+            if not isinstance(loss, torch.Tensor):
+                loss = sum(
+                    t.sum()
+                    for t in torch.utils._pytree.tree_leaves(outputs)
+                    if isinstance(t, torch.Tensor) and t.requires_grad
+                )
+            # pyre-ignore[16]
+            loss.sum().backward()
+    with torch.no_grad():
+        for p, grad in grads.items():
+            p.grad = grad
+        for b, value in buffers:
+            b.copy_(value)
@@ -18,6 +18,7 @@ from .iterators import (
 )
 from .multi_dataloader import MultiDataLoader
 from .profile_dataloader import profile_dataloader
+from .shape_bucketing import power_of_two_buckets, quantile_buckets, ShapeBucketer
 from .synthetic_data import AbstractRandomDataset
 
 __all__ = [
@@ -31,5 +32,8 @@ __all__ = [
     "MultiIterator",
     "RandomizedBatchSamplerIterator",
     "RoundRobinIterator",
+    "ShapeBucketer",
+    "power_of_two_buckets",
     "profile_dataloader",
+    "quantile_buckets",
 ]
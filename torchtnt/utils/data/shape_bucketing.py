@@ -0,0 +1,327 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import bisect
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import torch
+from torch.utils._pytree import tree_leaves, tree_map_only
+from torchtnt.utils.compile import get_compile_stats
+
+
+def power_of_two_buckets(max_size: int, min_size: int = 1) -> List[int]:
+    """
+    Returns the powers of two between ``min_size`` and ``max_size``, with ``max_size`` as the last bucket.
+
+    Args:
+        max_size: the largest size to bucket.
+        min_size: the smallest bucket.
+    """
+    if min_size < 1 or max_size < min_size:
+        raise ValueError(
+            f"Expected 1 <= min_size <= max_size. Got min_size={min_size}, max_size={max_size}"
+        )
+    buckets = []
+    size = 1 << (min_size - 1).bit_length()
+    while size < max_size:
+        buckets.append(size)
+        size *= 2
+    buckets.append(max_size)
+    return buckets
+
+
+def quantile_buckets(
+    sizes: Union[Sequence[int], Mapping[int, int]], num_buckets: int
+) -> List[int]:
+    """
+    Returns up to ``num_buckets`` buckets at evenly spaced quantiles of observed sizes, so that each bucket receives
+    about the same number of batches. The largest observed size is always the last bucket.
+
+    Args:
+        sizes: observed sizes, or a mapping from observed size to its number of occurrences.
+        num_buckets: the maximum number of buckets.
+    """
+    if num_buckets < 1:
+        raise ValueError(f"num_buckets must be at least 1. Got {num_buckets}")
+    counts = Counter(sizes)
+    if not counts:
+        raise ValueError("Cannot compute quantile buckets without observed sizes")
+
+    total = sum(counts.values())
+    buckets: List[int] = []
+    cumulative = 0
+    next_bucket = 1
+    for size in sorted(counts):
+        cumulative += counts[size]
+        if cumulative * num_buckets >= next_bucket * total:
+            buckets.append(size)
+            # skip the quantiles covered by this size
+            next_bucket = cumulative * num_buckets // total + 1
+    return buckets
+
+
+class ShapeBucketer:
+    """
+    A data pipeline stage which pads mapping batches to a fixed set of shapes, so variable-length data does not
+    trigger a torch.compile recompilation for every new sequence length or batch size.
+
+    Only the sequence dimension of the tensors under ``length_keys`` is padded, to the smallest length bucket which
+    fits it, so tensors which merely happen to have the same size in another dimension are never touched. The length
+    of a batch is the size along ``length_dim`` of the first of ``length_keys``, and all of them must have that size.
+    If ``batch_size_buckets`` is set, every tensor of the batch is padded along its first dimension, which must be
+    the batch size, to the smallest batch size bucket. Batches longer than the largest bucket are left as they are,
+    and counted as bucket misses.
+
+    The bucketer records the lengths it sees, so buckets can be learned from the data with
+    :meth:`fit_quantile_buckets`, and the share of batches in each bucket, which can be logged with :meth:`stats`
+    along with the number of compiled frames to tune the buckets. Its state dict holds the buckets and the observed
+    lengths, so learned buckets are restored from checkpoints when the bucketer is an attribute of a unit.
+
+    Args:
+        length_buckets: the lengths to pad to, e.g. ``power_of_two_buckets(max_length)``. If None, the length is not padded.
+        length_keys: keys of the batch whose tensors have a sequence dimension to pad. Required to pad or record lengths.
+        length_dim: the sequence dimension of the tensors under ``length_keys``.
+        batch_size_buckets: the batch sizes to pad to. If None, the batch size is not padded.
+        pad_value: the value to pad tensors with.
+        pad_values: pad values for specific keys of the batch, e.g. ``{"labels": -100}``.
+        mask_key: key under which the padding mask is added to the batch. If None, no mask is added.
+
+    Example::
+
+        bucketer = ShapeBucketer(
+            power_of_two_buckets(2048, min_size=64),
+            length_keys=["input_ids", "labels"],
+            pad_values={"labels": -100},
+        )
+        auto_unit = MyAutoUnit(module=module, shape_bucketer=bucketer, torch_compile_params=TorchCompileParams())
+        ...
+        # in compute_loss, data["padding_mask"] is True for positions which are not padding
+    """
+
+    def __init__(
+        self,
+        length_buckets: Optional[Sequence[int]] = None,
+        *,
+        length_keys: Optional[Sequence[str]] = None,
+        length_dim: int = 1,
+        batch_size_buckets: Optional[Sequence[int]] = None,
+        pad_value: float = 0,
+        pad_values: Optional[Mapping[str, float]] = None,
+        mask_key: Optional[str] = "padding_mask",
+    ) -> None:
+        if length_dim < 1:
+            raise ValueError(f"length_dim must be at least 1. Got {length_dim}")
+        if length_keys is not None and not length_keys:
+            raise ValueError("length_keys must be None or a non-empty sequence")
+        if length_buckets is not None and length_keys is None:
+            raise ValueError(
+                "length_keys must be set to the keys of the tensors to pad to length_buckets"
+            )
+        self.length_buckets: Optional[List[int]] = _validate_buckets(
+            length_buckets, "length_buckets"
+        )
+        self.batch_size_buckets: Optional[List[int]] = _validate_buckets(
+            batch_size_buckets, "batch_size_buckets"
+        )
+        self.length_keys: Optional[List[str]] = (
+            list(length_keys) if length_keys is not None else None
+        )
+        self.length_dim = length_dim
+        self.pad_value = pad_value
+        self.pad_values: Dict[str, float] = dict(pad_values or {})
+        self.mask_key = mask_key
+
+        # lengths of the batches seen, before padding
+        self.length_counts: Counter[int] = Counter()
+        self._bucket_counts: Counter[int] = Counter()
+        self._shapes: Counter[Tuple[int, Optional[int]]] = Counter()
+        self._num_misses = 0
+        self._num_elements = 0
+        self._num_padded_elements = 0
+
+    def __call__(self, batch: Mapping[str, Any]) -> Dict[str, Any]:
+        """Pads a batch and adds the padding mask under ``mask_key``."""
+        padded, mask = self.pad(batch)
+        if self.mask_key is not None:
+            padded[self.mask_key] = mask
+        return padded
+
+    def pad(self, batch: Mapping[str, Any]) -> Tuple[Dict[str, Any], torch.Tensor]:
+        """
+        Pads a batch to its buckets.
+
+        Returns:
+            The padded batch, and a boolean mask of shape ``(batch_size, length)``, or ``(batch_size,)`` if
+            ``length_keys`` is not set, which is True for positions which are not padding.
+        """
+        if not isinstance(batch, Mapping):
+            raise ValueError(
+                f"ShapeBucketer expects mapping batches, so the tensors to pad can be declared by key. Got {type(batch)}"
+            )
+        length_tensors = [
+            t
+            for key in self.length_keys or []
+            for t in tree_leaves(batch[key])
+            if isinstance(t, torch.Tensor)
+        ]
+        tensors = length_tensors or [
+            t for t in tree_leaves(dict(batch)) if isinstance(t, torch.Tensor)
+        ]
+        if not tensors or tensors[0].ndim == 0:
+            raise ValueError(
+                "Expected a batch with at least one tensor with a batch dimension"
+            )
+        batch_size = tensors[0].size(0)
+        length = None
+        if self.length_keys is not None:
+            if not length_tensors:
+                raise ValueError(
+                    f"Expected tensors under length_keys {self.length_keys} in the batch"
+                )
+            length = _size(length_tensors[0], self.length_dim)
+            for t in length_tensors:
+                if _size(t, self.length_dim) != length:
+                    raise ValueError(
+                        f"Expected all tensors under length_keys {self.length_keys} to have length {length} "
+                        f"along dimension {self.length_dim}. Got shape {tuple(t.shape)}"
+                    )
+
+        padded_batch_size = _bucket(batch_size, self.batch_size_buckets)
+        padded_length = length
+        if length is not None:
+            self.length_counts[length] += 1
+            padded_length = _bucket(length, self.length_buckets)
+            if self.length_buckets is not None:
+                if length > self.length_buckets[-1]:
+                    self._num_misses += 1
+                else:
+                    self._bucket_counts[padded_length] += 1
+        self._shapes[(padded_batch_size, padded_length)] += 1
+        num_elements = padded_batch_size * (padded_length or 1)
+        self._num_elements += num_elements
+        self._num_padded_elements += num_elements - batch_size * (length or 1)
+
+        def pad_tensor(t: torch.Tensor, key: str) -> torch.Tensor:
+            value = self.pad_values.get(key, self.pad_value)
+            if padded_length != length and key in (self.length_keys or []):
+                t = _pad_dim(t, self.length_dim, padded_length, value)
+            if padded_batch_size != batch_size:
+                if t.ndim == 0 or len(t) != batch_size:
+                    raise ValueError(
+                        f"Expected every tensor of the batch to have batch size {batch_size} in its first "
+                        f"dimension to pad it to {padded_batch_size}. Got shape {tuple(t.shape)} under {key}"
+                    )
+                t = _pad_dim(t, 0, padded_batch_size, value)
+            return t
+
+        padded = {
+            key: tree_map_only(
+                torch.Tensor, lambda t, key=key: pad_tensor(t, key), value
+            )
+            for key, value in batch.items()
+        }
+
+        mask_shape = (
+            (padded_batch_size,)
+            if padded_length is None
+            else (padded_batch_size, padded_length)
+        )
+        mask = torch.zeros(mask_shape, dtype=torch.bool, device=tensors[0].device)
+        if padded_length is None:
+            mask[:batch_size] = True
+        else:
+            mask[:batch_size, :length] = True
+        return padded, mask
+
+    def fit_quantile_buckets(self, num_buckets: int) -> List[int]:
+        """
+        Replaces the length buckets with :func:`quantile_buckets` of the lengths seen so far, and resets the stats.
+        Every new bucket triggers a compilation, so buckets are best learned early, e.g. after a warmup epoch.
+        """
+        if self.length_keys is None:
+            raise ValueError("length_keys must be set to fit length buckets")
+        self.length_buckets = quantile_buckets(self.length_counts, num_buckets)
+        self.reset_stats()
+        return self.length_buckets
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns bucketing statistics since the last reset, to be logged to tune the buckets:
+
+            - ``bucket_hit_rate``: share of batches whose length fell in a bucket.
+            - ``bucket_{length}_rate``: share of batches padded to each length bucket.
+            - ``padding_fraction``: share of the padded batch elements which are padding.
+            - ``num_shapes``: number of distinct padded shapes, an upper bound on the compilations bucketing causes.
+            - ``num_compiled_frames``: number of frames compiled by torch.compile in this process.
+        """
+        num_batches = sum(self._shapes.values())
+        stats: Dict[str, float] = {
+            "num_shapes": len(self._shapes),
+            "num_compiled_frames": get_compile_stats().num_frames,
+        }
+        if num_batches == 0:
+            return stats
+        num_bucketed = sum(self._bucket_counts.values())
+        if self.length_buckets is not None and num_bucketed + self._num_misses > 0:
+            stats["bucket_hit_rate"] = num_bucketed / (num_bucketed + self._num_misses)
+            for bucket in self.length_buckets:
+                stats[f"bucket_{bucket}_rate"] = self._bucket_counts[bucket] / (
+                    num_bucketed + self._num_misses
+                )
+        stats["padding_fraction"] = self._num_padded_elements / self._num_elements
+        return stats
+
+    def reset_stats(self) -> None:
+        """Resets the statistics returned by :meth:`stats`. The observed lengths are kept."""
+        self._bucket_counts = Counter()
+        self._shapes = Counter()
+        self._num_misses = 0
+        self._num_elements = 0
+        self._num_padded_elements = 0
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "length_buckets": self.length_buckets,
+            "length_counts": dict(self.length_counts),
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        self.length_buckets = state_dict["length_buckets"]
+        self.length_counts = Counter(state_dict["length_counts"])
+
+
+def _validate_buckets(
+    buckets: Optional[Sequence[int]], name: str
+) -> Optional[List[int]]:
+    if buckets is None:
+        return None
+    if not buckets or any(b < 1 for b in buckets):
+        raise ValueError(f"{name} must be a non-empty sequence of positive sizes")
+    return sorted(set(buckets))
+
+
+def _bucket(size: int, buckets: Optional[List[int]]) -> int:
+    if buckets is None:
+        return size
+    index = bisect.bisect_left(buckets, size)
+    return buckets[index] if index < len(buckets) else size
+
+
+def _size(t: torch.Tensor, dim: int) -> int:
+    if t.ndim <= dim:
+        raise ValueError(
+            f"Expected tensors under length_keys to have dimension {dim}. Got shape {tuple(t.shape)}"
+        )
+    return t.size(dim)
+
+
+def _pad_dim(t: torch.Tensor, dim: int, size: int, value: float) -> torch.Tensor:
+    pad_shape = list(t.shape)
+    pad_shape[dim] = size - t.size(dim)
+    return torch.cat([t, t.new_full(pad_shape, value)], dim=dim)
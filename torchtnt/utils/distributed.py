@@ -16,20 +16,41 @@ from dataclasses import dataclass
 from datetime import timedelta
 from functools import wraps
 from multiprocessing.managers import SyncManager
-from typing import Any, Callable, cast, Dict, Generator, List, Optional, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    Generator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    TypeVar,
+    Union,
+)
 
 import torch
 import torch.nn.functional as F
+from pyre_extensions import none_throws
 from torch import distributed as dist, multiprocessing, Tensor
 from torch.distributed.elastic.utils.distributed import get_free_port
+from torch.utils._pytree import tree_leaves
 from typing_extensions import Literal, ParamSpec
 
+if TYPE_CHECKING:
+    from torchtnt.utils.stateful import MetricStateful
 
 T = TypeVar("T")
 DistObjList = Union[List[T], List[None]]
 TParams = ParamSpec("TParams")
 TReturn = TypeVar("TReturn")
 
+ReductionStr = Literal["sum", "mean", "max", "min"]
+# a single reduction applied to a whole (sub)tree, or a nested mapping mirroring the tensor tree
+ReductionSpec = Union[ReductionStr, Mapping[str, Any]]
+
 logger: logging.Logger = logging.getLogger(__name__)
 
 
@@ -341,6 +362,178 @@ def all_gather_tensors(
     return gathered_result
 
 
+_REDUCE_OPS: Dict[str, dist.ReduceOp.RedOpType] = {
+    "sum": dist.ReduceOp.SUM,
+    # mean is reduced with SUM and divided by the world size afterwards,
+    # so it can share a bucket with sum
+    "mean": dist.ReduceOp.SUM,
+    "max": dist.ReduceOp.MAX,
+    "min": dist.ReduceOp.MIN,
+}
+
+
+def _flatten_tensor_dict(
+    tensors: Mapping[str, Any],
+    reduction: ReductionSpec,
+    prefix: Tuple[str, ...],
+    out: List[Tuple[Tuple[str, ...], Tensor, str]],
+) -> None:
+    for key, value in tensors.items():
+        path = prefix + (key,)
+        if isinstance(reduction, str):
+            leaf_reduction = reduction
+        elif key in reduction:
+            leaf_reduction = reduction[key]
+        else:
+            raise ValueError(
+                f"No reduction specified for {'.'.join(path)}. Provide a reduction for every key or a single reduction string."
+            )
+
+        if isinstance(value, Mapping):
+            _flatten_tensor_dict(value, leaf_reduction, path, out)
+        elif isinstance(value, Tensor):
+            if not isinstance(leaf_reduction, str) or leaf_reduction not in _REDUCE_OPS:
+                raise ValueError(
+                    f"Invalid reduction {leaf_reduction!r} for {'.'.join(path)}. Expected one of {list(_REDUCE_OPS.keys())}."
+                )
+            out.append((path, value, leaf_reduction))
+        else:
+            raise TypeError(
+                f"Expected a tensor or a dict of tensors at {'.'.join(path)}, but received {type(value)}."
+            )
+
+
+def _unflatten_tensor_dict(
+    results: List[Tuple[Tuple[str, ...], Tensor]],
+) -> Dict[str, Any]:
+    unflattened: Dict[str, Any] = {}
+    for path, tensor in results:
+        d = unflattened
+        for key in path[:-1]:
+            d = d.setdefault(key, {})
+        d[path[-1]] = tensor
+    return unflattened
+
+
+def all_reduce_tensor_dict(
+    tensors: Mapping[str, Any],
+    reduction: ReductionSpec = "sum",
+    group: Optional[dist.ProcessGroup] = None,
+) -> Dict[str, Any]:
+    """Reduces a (possibly nested) dict of tensors across ranks with as few collectives as possible.
+
+    Tensors are grouped into buckets by dtype, device and reduce op, each bucket is flattened into a
+    single contiguous buffer, and one ``all_reduce`` is issued per bucket. Typically this means a
+    handful of collectives regardless of how many metrics are being synced.
+
+    In the case ``torch.distributed`` is not available or initialized, the input tensors are returned as is.
+
+    Args:
+        tensors: dict of tensors to reduce. Values may themselves be dicts of tensors.
+        reduction: the reduction to apply. Either one of ``"sum"``, ``"mean"``, ``"max"``, ``"min"`` which is
+            applied to every tensor, or a dict mirroring the structure of ``tensors``. A string at any level of the
+            dict applies to the whole subtree under it.
+        group: the process group to reduce over. Defaults to all processes (world)
+
+    Returns:
+        A new dict with the same structure as ``tensors`` containing the reduced tensors.
+        Inputs are not modified in place.
+
+    Note:
+        ``"mean"`` is computed as a sum divided by the world size, so integer tensors are returned as floating point.
+
+    Example::
+
+        >>> metrics = {"loss": torch.tensor(0.5), "counts": {"correct": torch.tensor(7), "total": torch.tensor(10)}}
+        >>> reduced = all_reduce_tensor_dict(metrics, reduction={"loss": "mean", "counts": "sum"})
+    """
+    flat: List[Tuple[Tuple[str, ...], Tensor, str]] = []
+    _flatten_tensor_dict(tensors, reduction, (), flat)
+
+    if not dist.is_available() or not dist.is_initialized():
+        return _unflatten_tensor_dict([(path, tensor) for path, tensor, _ in flat])
+
+    world_size = dist.get_world_size(group)
+
+    # preserve insertion order so results are deterministic across ranks
+    buckets: Dict[Tuple[torch.dtype, torch.device, str], List[int]] = {}
+    for idx, (_, tensor, leaf_reduction) in enumerate(flat):
+        op_key = "sum" if leaf_reduction == "mean" else leaf_reduction
+        buckets.setdefault((tensor.dtype, tensor.device, op_key), []).append(idx)
+
+    reduced: List[Optional[Tensor]] = [None] * len(flat)
+    for (_, _, op_key), indices in buckets.items():
+        bucket_tensors = [flat[i][1] for i in indices]
+        buffer = torch.cat([t.detach().reshape(-1) for t in bucket_tensors])
+        dist.all_reduce(buffer, op=_REDUCE_OPS[op_key], group=group)
+        chunks = torch.split(buffer, [t.numel() for t in bucket_tensors])
+        for i, chunk, tensor in zip(indices, chunks, bucket_tensors):
+            result = chunk.view(tensor.shape)
+            if flat[i][2] == "mean":
+                # integers are summed exactly, and divided in floating point
+                result = torch.div(
+                    result if result.is_floating_point() else result.double(),
+                    world_size,
+                )
+            reduced[i] = result
+
+    return _unflatten_tensor_dict(
+        [(path, none_throws(t)) for (path, _, _), t in zip(flat, reduced)]
+    )
+
+
+def all_reduce_metric_states(
+    metrics: Mapping[str, "MetricStateful"],
+    reduction: ReductionSpec = "sum",
+    group: Optional[dist.ProcessGroup] = None,
+) -> None:
+    """Syncs the tensor states of several metrics across ranks in one shot, using :func:`all_reduce_tensor_dict`.
+
+    Every tensor entry of each metric's ``state_dict()`` is reduced, and the result is loaded back through
+    ``load_state_dict()``, so after this call each rank holds the globally reduced metric states. Reduced states
+    keep their dtype, except integer states reduced with ``"mean"``, which are loaded as floating point. Non-tensor
+    entries of the state dicts are left untouched. Collections of tensors, such as the list states which torcheval
+    metrics like ``BinaryAUROC`` keep, can not be reduced and are left rank-local, with a warning: such metrics must be
+    synced with their own library, e.g. ``torcheval.metrics.toolkit.sync_and_compute``. This pairs naturally with
+    :meth:`~torchtnt.framework.unit.AppStateMixin.tracked_metrics`::
+
+        >>> all_reduce_metric_states(unit.tracked_metrics(), reduction="sum")
+
+    Args:
+        metrics: dict of metric name to metric object conforming to the ``MetricStateful`` protocol.
+        reduction: the reduction to apply, keyed by metric name and then by state name. See :func:`all_reduce_tensor_dict`.
+        group: the process group to reduce over. Defaults to all processes (world)
+    """
+    state_dicts = {name: metric.state_dict() for name, metric in metrics.items()}
+    tensor_states = {
+        name: {k: v for k, v in state_dict.items() if isinstance(v, Tensor)}
+        for name, state_dict in state_dicts.items()
+    }
+    unsynced_states = [
+        f"{name}.{k}"
+        for name, state_dict in state_dicts.items()
+        for k, v in state_dict.items()
+        if not isinstance(v, Tensor)
+        and any(isinstance(leaf, Tensor) for leaf in tree_leaves(v))
+    ]
+    if unsynced_states and get_global_rank() == 0:
+        logger.warning(
+            f"Metric states {unsynced_states} hold collections of tensors, which can not be reduced, "
+            "so they are not synced and keep the values of each rank."
+        )
+    reduced = all_reduce_tensor_dict(tensor_states, reduction=reduction, group=group)
+    for name, metric in metrics.items():
+        state_dict = state_dicts[name]
+        reduced_states = reduced.get(name, {})
+        for k, v in reduced_states.items():
+            # keep the original dtype, except for the floating point mean of integer states
+            if v.is_floating_point() and not state_dict[k].is_floating_point():
+                state_dict[k] = v
+            else:
+                state_dict[k] = v.to(state_dict[k].dtype)
+        metric.load_state_dict(state_dict)
+
+
 TReturn = TypeVar("TReturn")
 
 
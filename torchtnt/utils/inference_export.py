@@ -0,0 +1,219 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import fsspec
+import torch
+from fsspec.core import url_to_fs
+from torch import nn
+from torch.distributed.checkpoint.state_dict_loader import _load_state_dict_from_keys
+from torch.nn.modules.module import _IncompatibleKeys
+from torchtnt.utils.checkpoint import load_from_full_model_state_dict
+from torchtnt.utils.checkpoint_storage import CompressedStorageReader
+
+try:
+    import safetensors
+    import safetensors.torch
+except ImportError:
+    safetensors = None
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+SAFETENSORS_WEIGHTS_FNAME = "model.safetensors"
+TORCH_WEIGHTS_FNAME = "model.pt"
+# weights files of an export directory, in order of preference
+INFERENCE_WEIGHTS_FNAMES: List[str] = [SAFETENSORS_WEIGHTS_FNAME, TORCH_WEIGHTS_FNAME]
+
+# key of the exported modules in the metadata of the weights file
+_MODULE_NAMES_KEY = "module_names"
+
+
+def save_inference_weights(
+    module_state_dicts: Dict[str, Dict[str, torch.Tensor]],
+    dirpath: str,
+    *,
+    dtype: Optional[torch.dtype] = None,
+    file_system: Optional[fsspec.AbstractFileSystem] = None,
+) -> str:
+    """
+    Writes the full state dicts of modules to a single weights file in ``dirpath``, which can be memory-mapped by
+    :func:`load_inference_weights`. The file is in the safetensors format if the ``safetensors`` package is installed,
+    and is otherwise written with ``torch.save``. It is written to a temporary file first, so that the weights file
+    only exists once complete.
+
+    Args:
+        module_state_dicts: full state dicts of the modules to export, by module name.
+        dirpath: directory to write the weights file to.
+        dtype: if set, floating point tensors are cast to this dtype, e.g. ``torch.bfloat16`` to halve the size of float32 weights.
+        file_system: If a custom file system should be used. Otherwise, fsspec will be used to match the file system of the dirpath.
+
+    Returns:
+        The path of the weights file.
+    """
+    weights: Dict[str, torch.Tensor] = {}
+    for module_name, state_dict in module_state_dicts.items():
+        for key, tensor in state_dict.items():
+            if dtype is not None and tensor.is_floating_point():
+                tensor = tensor.to(dtype)
+            weights[f"{module_name}.{key}"] = tensor.detach().cpu().contiguous()
+    module_names = list(module_state_dicts.keys())
+
+    fs = file_system
+    if fs is None:
+        fs, _ = url_to_fs(dirpath)
+    fs.makedirs(dirpath, exist_ok=True)
+    if safetensors is not None:
+        path = os.path.join(dirpath, SAFETENSORS_WEIGHTS_FNAME)
+        payload = safetensors.torch.save(
+            weights, metadata={_MODULE_NAMES_KEY: json.dumps(module_names)}
+        )
+        with fs.open(f"{path}.tmp", "wb") as f:
+            f.write(payload)
+    else:
+        path = os.path.join(dirpath, TORCH_WEIGHTS_FNAME)
+        with fs.open(f"{path}.tmp", "wb") as f:
+            torch.save({_MODULE_NAMES_KEY: module_names, "weights": weights}, f)
+    fs.mv(f"{path}.tmp", path)
+    return path
+
+
+def load_inference_weights(path: str) -> Tuple[List[str], Dict[str, torch.Tensor]]:
+    """
+    Memory-maps a weights file written by :func:`save_inference_weights`, so that weights are only read from storage once used.
+
+    Args:
+        path: local path of the weights file, or of the directory containing it.
+
+    Returns:
+        The names of the exported modules, and the weights keyed by ``<module name>.<state dict key>``.
+    """
+    if os.path.isdir(path):
+        path = _find_weights_file(path)
+
+    if path.endswith(SAFETENSORS_WEIGHTS_FNAME):
+        if safetensors is None:
+            raise RuntimeError(
+                f"Loading {path} requires the safetensors package, which is not installed"
+            )
+        weights = {}
+        with safetensors.safe_open(path, framework="pt") as f:
+            metadata = f.metadata() or {}
+            module_names = json.loads(metadata.get(_MODULE_NAMES_KEY, "[]"))
+            for key in f.keys():
+                weights[key] = f.get_tensor(key)
+        return module_names, weights
+
+    payload = torch.load(path, mmap=True, weights_only=True)
+    return payload[_MODULE_NAMES_KEY], payload["weights"]
+
+
+def load_inference_weights_into_module(
+    module: nn.Module,
+    path: str,
+    *,
+    module_name: Optional[str] = None,
+    device: Optional[torch.device] = None,
+    strict: bool = True,
+) -> _IncompatibleKeys:
+    """
+    Loads the exported weights of a module into ``module``, moving each memory-mapped weight to ``device`` in turn, and
+    sharding it if the parameters of ``module`` are DTensors. ``module`` may be created on the meta device to skip its
+    initialization, since its parameters are replaced by the loaded ones.
+
+    Args:
+        module: the module to load the weights into.
+        path: local path of the weights file, or of the directory containing it.
+        module_name: name of the exported module to load. May be omitted if a single module was exported.
+        device: device to load the weights to. Defaults to the device of the parameters of ``module``, or to CPU if they are on the meta device.
+        strict: whether the exported weights must match the keys of the state dict of ``module``.
+    """
+    module_names, weights = load_inference_weights(path)
+    if module_name is None:
+        if len(module_names) != 1:
+            raise ValueError(
+                f"module_name must be one of the exported modules {module_names} when more than one module was exported"
+            )
+        module_name = module_names[0]
+    elif module_name not in module_names:
+        raise ValueError(
+            f"Module {module_name} was not exported to {path}, exported modules are {module_names}"
+        )
+
+    if device is None:
+        param = next(module.parameters(), None)
+        device = (
+            param.device
+            if param is not None and param.device.type != "meta"
+            else torch.device("cpu")
+        )
+
+    prefix = f"{module_name}."
+    full_sd = {
+        key[len(prefix) :]: tensor
+        for key, tensor in weights.items()
+        if key.startswith(prefix)
+    }
+    return load_from_full_model_state_dict(module, full_sd, device, strict=strict)
+
+
+def export_inference_weights(
+    checkpoint_path: str,
+    dirpath: str,
+    *,
+    module_names: Sequence[str] = ("module",),
+    dtype: Optional[torch.dtype] = None,
+) -> str:
+    """
+    Exports the weights of the modules of a checkpoint saved by :class:`~torchtnt.framework.callbacks.DistributedCheckpointSaver`
+    to a single weights file, see :func:`save_inference_weights`. Only the weights are read from the checkpoint, in a single process.
+
+    Args:
+        checkpoint_path: path of the checkpoint.
+        dirpath: directory to write the weights file to.
+        module_names: names of the modules in the app state of the unit which saved the checkpoint.
+        dtype: if set, floating point tensors are cast to this dtype.
+
+    Returns:
+        The path of the weights file.
+    """
+    reader = CompressedStorageReader(checkpoint_path)
+    metadata = reader.read_metadata()
+    prefixes = tuple(f"app_state.{name}." for name in module_names)
+    keys = {key for key in metadata.state_dict_metadata if key.startswith(prefixes)}
+    missing_modules = [
+        name
+        for name, prefix in zip(module_names, prefixes)
+        if not any(key.startswith(prefix) for key in keys)
+    ]
+    if missing_modules:
+        raise ValueError(
+            f"Modules {missing_modules} were not found in checkpoint {checkpoint_path}"
+        )
+
+    app_state = _load_state_dict_from_keys(
+        keys=keys, checkpoint_id=checkpoint_path, storage_reader=reader
+    )["app_state"]
+    path = save_inference_weights(
+        {name: app_state[name] for name in module_names}, dirpath, dtype=dtype
+    )
+    logger.info(f"Exported weights of {checkpoint_path} to {path}")
+    return path
+
+
+def _find_weights_file(dirpath: str) -> str:
+    for fname in INFERENCE_WEIGHTS_FNAMES:
+        path = os.path.join(dirpath, fname)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(
+        f"No weights file {INFERENCE_WEIGHTS_FNAMES} found in {dirpath}"
+    )
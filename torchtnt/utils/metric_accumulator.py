@@ -0,0 +1,248 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import torch
+
+_SUM, _COUNT, _MIN, _MAX = range(4)
+_NUM_STATS = 4
+
+
+@dataclass
+class AccumulatedMetric:
+    """
+    Statistics of the values recorded for one metric since the accumulator was last reset.
+
+    Args:
+        sum: sum of the recorded values.
+        count: number of recorded values. Tensors count as one value per element.
+        min: smallest recorded value.
+        max: largest recorded value.
+    """
+
+    sum: float
+    count: float
+    min: float
+    max: float
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count > 0 else math.nan
+
+
+class MetricReadout:
+    """
+    A pending copy of the statistics of a :class:`DeviceMetricAccumulator` to host memory,
+    returned by :meth:`DeviceMetricAccumulator.read_async`.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        host_stats: torch.Tensor,
+        event: Optional[torch.cuda.Event],
+    ) -> None:
+        self._names = names
+        self._host_stats = host_stats
+        self._event = event
+
+    def ready(self) -> bool:
+        """Returns True if the copy to host memory completed, so :meth:`wait` will not block."""
+        return self._event is None or self._event.query()
+
+    def wait(self) -> Dict[str, AccumulatedMetric]:
+        """
+        Waits for the copy to host memory to complete, and returns the statistics of every metric
+        which was recorded at least once.
+        """
+        if self._event is not None:
+            self._event.synchronize()
+            self._event = None
+        return {
+            name: AccumulatedMetric(*row)
+            for name, row in zip(self._names, self._host_stats.tolist())
+            if row[_COUNT] > 0
+        }
+
+
+class DeviceMetricAccumulator:
+    """
+    Accumulates the running sum, count, min and max of scalar metrics, such as losses or gradient norms, in a
+    preallocated buffer on device.
+
+    Calling ``.item()`` on a loss every step, or logging it, blocks the host until the device has caught up with the
+    step, which stalls the training loop. :meth:`update` instead only enqueues a few small in-place kernels, and
+    :meth:`read_async` copies the statistics to host memory without blocking, so the device can be read back every
+    few steps, or at the end of an epoch.
+
+    The accumulator conforms to the ``MetricStateful`` protocol, so when it is an attribute of a unit it is tracked as
+    a metric and saved in checkpoints. Its state dict holds one tensor per statistic, so it can be synced across ranks
+    with :func:`~torchtnt.utils.distributed.all_reduce_metric_states`, using the reductions
+    ``{"sum": "sum", "count": "sum", "min": "min", "max": "max"}``. The tensors always have ``capacity`` rows, however
+    many metrics were recorded, so a checkpoint can be loaded in place into a fresh accumulator of the same capacity,
+    as ``torch.distributed.checkpoint`` requires.
+
+    Args:
+        device: the device on which statistics are accumulated. Defaults to CPU.
+        dtype: the dtype of the statistics.
+        capacity: maximum number of metrics which can be recorded. The buffer is allocated once for this many metrics.
+
+    Example::
+
+        accumulator = DeviceMetricAccumulator(device=torch.device("cuda"))
+        for step, batch in enumerate(dataloader):
+            loss = ...
+            accumulator.update("loss", loss)
+            if step % 100 == 0:
+                if readout is not None:
+                    # copied while the last 100 steps ran, so this does not block
+                    logger.log_dict(to_log_dict(readout.wait()), step)
+                readout = accumulator.read_async()
+    """
+
+    def __init__(
+        self,
+        device: Optional[torch.device] = None,
+        dtype: torch.dtype = torch.float64,
+        capacity: int = 256,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1. Got {capacity}")
+        self.device: torch.device = device or torch.device("cpu")
+        self.dtype = dtype
+        self.capacity = capacity
+        self._index: Dict[str, int] = {}
+        self._stats: torch.Tensor = torch.empty(
+            (capacity, _NUM_STATS), device=self.device, dtype=dtype
+        )
+        self._reset_rows(self._stats)
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the metrics recorded so far."""
+        return list(self._index)
+
+    def update(self, name: str, value: Union[torch.Tensor, float, int]) -> None:
+        """
+        Records a value for the metric ``name``, without synchronizing with the device.
+        Every element of a tensor is recorded as a separate value.
+        """
+        index = self._row_index(name)
+        row = self._stats[index]
+        if isinstance(value, torch.Tensor):
+            value = value.detach()
+            if value.numel() == 0:
+                return
+            value = value.to(device=self.device, dtype=self.dtype)
+            row[_SUM].add_(value.sum())
+            row[_COUNT].add_(value.numel())
+            value_min, value_max = torch.aminmax(value)
+            torch.minimum(row[_MIN], value_min, out=row[_MIN])
+            torch.maximum(row[_MAX], value_max, out=row[_MAX])
+        else:
+            row[_SUM].add_(value)
+            row[_COUNT].add_(1)
+            row[_MIN].clamp_(max=value)
+            row[_MAX].clamp_(min=value)
+
+    def update_dict(
+        self, values: Mapping[str, Union[torch.Tensor, float, int]]
+    ) -> None:
+        """Records a value for each metric in ``values``."""
+        for name, value in values.items():
+            self.update(name, value)
+
+    def read_async(self, reset: bool = True) -> MetricReadout:
+        """
+        Starts copying the statistics to host memory, without blocking on CUDA devices.
+
+        Args:
+            reset: whether to reset the statistics once they are copied, so the next readout only includes values
+                recorded after this call.
+        """
+        names = self.names
+        stats = self._stats[: len(names)]
+        event = None
+        if self.device.type == "cuda":
+            host_stats = torch.empty(
+                stats.shape, dtype=self.dtype, device="cpu", pin_memory=True
+            )
+            host_stats.copy_(stats, non_blocking=True)
+            event = torch.cuda.Event()
+            event.record()
+        else:
+            host_stats = stats.to("cpu", copy=True)
+        if reset:
+            self.reset()
+        return MetricReadout(names, host_stats, event)
+
+    def compute(self, reset: bool = False) -> Dict[str, AccumulatedMetric]:
+        """Returns the statistics of every metric recorded at least once. This synchronizes with the device."""
+        return self.read_async(reset=reset).wait()
+
+    def reset(self) -> None:
+        """Resets the statistics of all metrics."""
+        self._reset_rows(self._stats)
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "names": self.names,
+            "sum": self._stats[:, _SUM].to("cpu", copy=True),
+            "count": self._stats[:, _COUNT].to("cpu", copy=True),
+            "min": self._stats[:, _MIN].to("cpu", copy=True),
+            "max": self._stats[:, _MAX].to("cpu", copy=True),
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        names = state_dict["names"]
+        stats = torch.stack(
+            [state_dict[key] for key in ("sum", "count", "min", "max")], dim=1
+        )
+        if len(names) > self.capacity:
+            raise ValueError(
+                f"Cannot load {len(names)} metrics into an accumulator with capacity {self.capacity}."
+            )
+        self._index = {name: i for i, name in enumerate(names)}
+        self._reset_rows(self._stats)
+        self._stats[: len(names)].copy_(stats[: len(names)])
+
+    def _row_index(self, name: str) -> int:
+        index = self._index.get(name)
+        if index is None:
+            index = len(self._index)
+            if index == self.capacity:
+                raise ValueError(
+                    f"Cannot record metric {name}: all {self.capacity} metrics the accumulator has capacity for are "
+                    "already recorded. Please increase capacity."
+                )
+            self._index[name] = index
+        return index
+
+    @staticmethod
+    def _reset_rows(stats: torch.Tensor) -> None:
+        stats[:, _SUM : _COUNT + 1].zero_()
+        stats[:, _MIN].fill_(math.inf)
+        stats[:, _MAX].fill_(-math.inf)
+
+
+def to_log_dict(
+    metrics: Mapping[str, AccumulatedMetric], prefix: str = ""
+) -> Dict[str, float]:
+    """
+    Flattens accumulated metrics into a payload for :meth:`~torchtnt.utils.loggers.MetricLogger.log_dict`,
+    with the mean of each metric under its name, and its min and max under ``{name}_min`` and ``{name}_max``.
+    """
+    payload = {}
+    for name, metric in metrics.items():
+        payload[f"{prefix}{name}"] = metric.mean
+        payload[f"{prefix}{name}_min"] = metric.min
+        payload[f"{prefix}{name}_max"] = metric.max
+    return payload
@@ -7,9 +7,13 @@
 
 # pyre-strict
 
-from typing import Dict
+import functools
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import torch
+import torch.distributed as dist
+from torch.distributed.tensor import DTensor, Placement
 
 
 def init_optim_state(optimizer: torch.optim.Optimizer) -> None:
@@ -62,3 +66,146 @@ def _get_deduped_name(seen_keys: Dict[str, int], name: str) -> str:
 
     seen_keys[name] += 1
     return name + f":{seen_keys[name]-1}"
+
+
+def get_grad_norms(
+    param_groups: Sequence[Iterable[torch.Tensor]], norm_type: float = 2.0
+) -> Tuple[torch.Tensor, List[torch.Tensor]]:
+    """
+    Computes the total norm of the gradients of all parameters, and the norm of the gradients of each group of parameters,
+    e.g. of each optimizer param group. Parameters without gradients do not contribute to the norms.
+
+    The norms of all gradients are computed with a single ``torch._foreach_norm`` call. For parameters which are DTensors,
+    e.g. with FSDP2, the norms of the local shards are combined and reduced with one all-reduce of a small tensor per
+    device mesh and sharded mesh dimension, instead of materializing the full gradients or norms. The all-reduces are
+    derived from the placements of the parameters rather than of their gradients, so every rank issues the same ones,
+    including ranks which have no gradients at all.
+
+    Args:
+        param_groups: groups of parameters.
+        norm_type: type of the p-norm to compute. Can be ``inf`` for the infinity norm.
+
+    Returns:
+        the total norm, and the norm of each group, as float32 tensors on the device of the parameters. This does not
+        synchronize with the device.
+
+    Raises:
+        ValueError: if a gradient or parameter has a ``Partial`` placement, since the norm of a partial sum is not the
+            norm of its part of the gradient. Such gradients must be reduced first.
+    """
+    grads: List[torch.Tensor] = []
+    group_indices: List[int] = []
+    key_ids: List[int] = []
+    # every way the gradients must be reduced across ranks, in the order of the parameters
+    reduce_keys: Dict[Tuple[object, Tuple[int, ...]], int] = {}
+    device: Optional[torch.device] = None
+    for group_index, params in enumerate(param_groups):
+        for param in params:
+            if isinstance(param, DTensor):
+                _check_not_partial(param.placements)
+                sharded_dims = tuple(
+                    dim
+                    for dim, placement in enumerate(param.placements)
+                    if placement.is_shard()
+                )
+                key = (param.device_mesh, sharded_dims)
+            else:
+                key = (None, ())
+            key_id = reduce_keys.setdefault(key, len(reduce_keys))
+            if device is None:
+                device = param.device
+            grad = param.grad
+            if grad is None:
+                continue
+            if isinstance(grad, DTensor):
+                _check_not_partial(grad.placements)
+                grad = grad.to_local()
+            grads.append(grad)
+            group_indices.append(group_index)
+            key_ids.append(key_id)
+
+    num_groups = len(param_groups)
+    if device is None:
+        return torch.tensor(0.0), [torch.tensor(0.0) for _ in range(num_groups)]
+
+    is_inf = math.isinf(norm_type)
+    if grads:
+        device = grads[0].device
+        norms = torch.stack(
+            [
+                norm.to(device=device, dtype=torch.float32)
+                for norm in torch._foreach_norm(grads, norm_type)
+            ]
+        )
+    else:
+        # this rank still joins the all-reduces of the other ranks
+        norms = torch.zeros(0, device=device, dtype=torch.float32)
+    # combine the norms of each group into a sum of powers, or a max for the infinity norm,
+    # separately for each way the gradients must be reduced across ranks
+    values = norms if is_inf else norms.pow(norm_type)
+    index = _index_tensor(tuple(group_indices), device)
+    group_values = torch.zeros(num_groups, device=device, dtype=torch.float32)
+    for key_id, (mesh, sharded_dims) in enumerate(reduce_keys):
+        key_values = values
+        if len(reduce_keys) > 1:
+            # norms are non-negative, so masked values do not contribute to sums nor maxima
+            mask = _index_tensor(tuple(key_ids), device) == key_id
+            key_values = torch.where(mask, values, 0.0)
+        partial_values = torch.zeros_like(group_values).scatter_reduce(
+            0, index, key_values, reduce="amax" if is_inf else "sum"
+        )
+        for dim in sharded_dims:
+            # pyre-ignore[16]: mesh is a DeviceMesh if there are sharded dims
+            dist.all_reduce(
+                partial_values,
+                op=dist.ReduceOp.MAX if is_inf else dist.ReduceOp.SUM,
+                group=mesh.get_group(dim),
+            )
+        group_values = (
+            torch.maximum(group_values, partial_values)
+            if is_inf
+            else group_values + partial_values
+        )
+
+    if is_inf:
+        total_norm = group_values.max()
+        group_norms = group_values
+    else:
+        total_norm = group_values.sum().pow(1.0 / norm_type)
+        group_norms = group_values.pow(1.0 / norm_type)
+    return total_norm, list(group_norms.unbind())
+
+
+def _check_not_partial(placements: Sequence[Placement]) -> None:
+    if any(placement.is_partial() for placement in placements):
+        raise ValueError(
+            f"Cannot compute the norm of a gradient with placements {tuple(placements)}. Partial gradients must be reduced first."
+        )
+
+
+@functools.lru_cache(maxsize=16)
+def _index_tensor(indices: Tuple[int, ...], device: torch.device) -> torch.Tensor:
+    # the layout of the gradients rarely changes, so avoid copying indices to the device every step
+    return torch.tensor(indices, device=device, dtype=torch.long)
+
+
+def clip_grads_with_norm_(
+    parameters: Iterable[torch.Tensor], max_norm: float, total_norm: torch.Tensor
+) -> None:
+    """
+    Scales the gradients of ``parameters`` in place so that their total norm, precomputed with :func:`get_grad_norms`,
+    is at most ``max_norm``. This does not synchronize with the device, nor communicate across ranks.
+    """
+    grads = [
+        param.grad.to_local() if isinstance(param.grad, DTensor) else param.grad
+        for param in parameters
+        if param.grad is not None
+    ]
+    if not grads:
+        return
+    clip_coef = (max_norm / (total_norm + 1e-6)).clamp(max=1.0)
+    grads_by_device: Dict[torch.device, List[torch.Tensor]] = {}
+    for grad in grads:
+        grads_by_device.setdefault(grad.device, []).append(grad)
+    for device, device_grads in grads_by_device.items():
+        torch._foreach_mul_(device_grads, clip_coef.to(device))
@@ -45,6 +45,11 @@ from torch.distributed.fsdp.fully_sharded_data_parallel import FullStateDictConf
 from torch.distributed.tensor import Shard
 from torch.distributed.tensor.parallel import parallelize_module
 from torch.distributed.tensor.parallel.style import ParallelStyle
+from torchtnt.utils.compile import (
+    dedup_compile_targets,
+    get_compile_cache_key,
+    load_compile_cache,
+)
 from torchtnt.utils.device_mesh import GlobalMeshCoordinator
 from torchtnt.utils.precision import convert_precision_str_to_dtype
 
@@ -267,6 +272,12 @@ class TorchCompileParams:
     TNT specific args:
         recursive_module_types: list of module types to recursively compile. If not specified, applies compile to top-level module only.
             ex. ["TransformerCrossAttentionLayer", torch.nn.Linear] both work
+        dedup_repeated_modules: if True, when compiling recursively, matching modules nested in another matching module are
+            not compiled separately, and the recompile limit is raised so identical repeated blocks share a single
+            compiled graph. See :py:func:`~torchtnt.utils.compile.dedup_compile_targets`.
+        cache_dir: directory of a persistent compile cache. Artifacts cached for the same model structure, compile
+            config and PyTorch version are loaded before compiling, and the
+            :class:`~torchtnt.framework.callbacks.TorchCompile` callback saves them once the model is compiled.
     """
 
     fullgraph: bool = False
@@ -281,6 +292,8 @@ class TorchCompileParams:
     recursive_module_types: Collection[Union[str, Type[torch.nn.Module]]] = field(
         default_factory=list
     )
+    dedup_repeated_modules: bool = False
+    cache_dir: Optional[str] = None
 
 
 @dataclass
@@ -567,8 +580,23 @@ def apply_torch_compile(
     """
     recursive_module_types = torch_compile_params.recursive_module_types
     params_dict = asdict(torch_compile_params)
-    # remove recursive_module_types from params dict as we pass this directly to torch.compile
+    # remove TNT specific params from params dict as we pass this directly to torch.compile
     params_dict.pop("recursive_module_types")
+    params_dict.pop("dedup_repeated_modules")
+    params_dict.pop("cache_dir")
+    if torch_compile_params.cache_dir is not None and not torch_compile_params.disable:
+        load_compile_cache(
+            torch_compile_params.cache_dir,
+            get_compile_cache_key(
+                module,
+                {
+                    **params_dict,
+                    "recursive_module_types": [
+                        getattr(t, "__qualname__", t) for t in recursive_module_types
+                    ],
+                },
+            ),
+        )
     try:
         # use in-place compile to avoid altering the state_dict keys
 
@@ -588,9 +616,15 @@ def apply_torch_compile(
                     module_types = module_types + (v,)
 
             # 2) apply torch.compile recursively
-            for m in reversed(list(module.modules())):
-                if isinstance(m, module_types) or type(m).__name__ in module_names:
-                    m.compile(**params_dict)
+            targets = [
+                m
+                for m in module.modules()
+                if isinstance(m, module_types) or type(m).__name__ in module_names
+            ]
+            if torch_compile_params.dedup_repeated_modules:
+                targets = dedup_compile_targets(targets)
+            for m in reversed(targets):
+                m.compile(**params_dict)
     except AttributeError:
         rank_zero_warn(
             "Please install PyTorch nightlies to use in-place compile to avoid altering the state_dict keys when checkpointing. Skipping torch compile."
@@ -6,10 +6,13 @@
 
 # pyre-strict
 
-from typing import Any, Callable, List, Literal, Optional
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Literal, Mapping, Optional, Tuple
 
 import torch
 from torch.distributed.fsdp import FullyShardedDataParallel, ShardingStrategy
+from torch.utils._foreach_utils import _group_tensors_by_device_and_dtype
 
 _AVERAGED_MODEL_AVAIL: bool = True
 
@@ -37,6 +40,7 @@ class AveragedModel(PyTorchAveragedModel):
         ema_decay: float = 0.999,
         skip_deepcopy: bool = False,
         use_lit: bool = False,
+        cpu_offload: bool = False,
     ) -> None:
         """
         This class is a custom version of AveragedModel that allows us to skip the
@@ -58,6 +62,14 @@ class AveragedModel(PyTorchAveragedModel):
             use_lit: If True, will use Lit EMA style by adjusting weight decay based on the
                 number of updates. The EMA decay will start small and will approach the
                 specified ema_decay as more updates occur.
+            cpu_offload: If True, the averaged model is kept in pinned CPU memory instead of
+                on the device of the model. Each update copies the model weights to host memory
+                without blocking, and averages them on a background thread, overlapping with
+                training. The update is waited for before the averaged model is used, saved or loaded.
+
+        Note:
+            Parameters are averaged with fused ``torch._foreach_lerp_`` calls, grouped by device and
+            dtype, without synchronizing the host with the device.
         """
         if not _AVERAGED_MODEL_AVAIL:
             raise ImportError(
@@ -81,9 +93,19 @@ class AveragedModel(PyTorchAveragedModel):
                 f"Unknown averaging method: {averaging_method}. Only ema and swa are supported."
             )
 
+        if cpu_offload:
+            if skip_deepcopy:
+                raise ValueError("cpu_offload is not supported with skip_deepcopy.")
+            if device is not None and device.type != "cpu":
+                raise ValueError(
+                    f"cpu_offload requires the averaged model to be on CPU, got device {device}."
+                )
+            device = torch.device("cpu")
+
         self._ema_decay = ema_decay
         self._use_lit = use_lit
         self._num_updates = 0
+        self._averaging_method = averaging_method
 
         if skip_deepcopy:
             # calls parent init manually, but skips deepcopy step
@@ -108,7 +130,19 @@ class AveragedModel(PyTorchAveragedModel):
                 use_buffers=use_buffers,
             )
 
+        self._cpu_offload = cpu_offload
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending_update: Optional[Future[None]] = None
+        self._staging_buffers: Optional[List[torch.Tensor]] = None
+        if cpu_offload and torch.cuda.is_available():
+            # pinned memory allows copying the model weights to host without blocking
+            for tensor in itertools.chain(
+                self.module.parameters(), self.module.buffers()
+            ):
+                tensor.data = tensor.data.pin_memory()
+
     def forward(self, *args: Any, **kwargs: Any) -> Any:
+        self.wait()
         output = self.module(*args, **kwargs)
 
         # for fsdp modules, we need to manually reshard the swa_model in case the
@@ -121,12 +155,141 @@ class AveragedModel(PyTorchAveragedModel):
 
         return output
 
+    @torch.no_grad()
     def update_parameters(self, model: torch.nn.Module) -> None:
         self._num_updates += 1
-        if self._use_lit:
-            decay = min(
-                self._ema_decay, (1 + self._num_updates) / (10 + self._num_updates)
+        if self._averaging_method == "ema":
+            decay = self._ema_decay
+            if self._use_lit:
+                decay = min(decay, (1 + self._num_updates) / (10 + self._num_updates))
+            # the first update copies the model weights
+            weight = torch.where(self.n_averaged == 0, 1.0, 1.0 - decay)
+        else:
+            weight = 1.0 / (self.n_averaged + 1.0)
+
+        averaged, current = self._averaged_and_current_tensors(model)
+        if not self._cpu_offload:
+            _average_(averaged, current, weight)
+        else:
+            # staging buffers are reused, so the previous update must complete first
+            self.wait()
+            staged, event = self._stage(current)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="tnt_averaged_model"
+                )
+            self._pending_update = self._executor.submit(
+                _average_, averaged, staged, weight.cpu(), event
+            )
+        self.n_averaged += 1
+
+    def wait(self) -> None:
+        """Waits for the pending update of the averaged model, if any, when ``cpu_offload`` is set."""
+        pending_update = self._pending_update
+        if pending_update is not None:
+            self._pending_update = None
+            pending_update.result()
+
+    # pyre-ignore[14]: state_dict has overloads in torch.nn.Module
+    def state_dict(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        self.wait()
+        return super().state_dict(*args, **kwargs)
+
+    def load_state_dict(
+        self, state_dict: Mapping[str, Any], strict: bool = True, assign: bool = False
+    ) -> Any:
+        self.wait()
+        return super().load_state_dict(state_dict, strict=strict, assign=assign)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        self.wait()
+        state = self.__dict__.copy()
+        # the background thread is recreated on the next update
+        state["_executor"] = None
+        return state
+
+    def _averaged_and_current_tensors(
+        self, model: torch.nn.Module
+    ) -> Tuple[List[Tuple[torch.Tensor, bool]], List[torch.Tensor]]:
+        """
+        Returns pairs of each averaged tensor and whether it is averaged or copied, and the matching model tensors.
+        Buffers are averaged if ``use_buffers`` is set, and kept in sync with the model otherwise.
+        """
+        averaged = [(p.detach(), True) for p in self.module.parameters()] + [
+            (b.detach(), self.use_buffers) for b in self.module.buffers()
+        ]
+        current = [
+            t.detach() for t in itertools.chain(model.parameters(), model.buffers())
+        ]
+        if len(averaged) != len(current):
+            raise ValueError(
+                "The model does not have the same parameters and buffers as the averaged model."
             )
+        return averaged, current
+
+    def _stage(
+        self, current: List[torch.Tensor]
+    ) -> Tuple[List[torch.Tensor], Optional[torch.cuda.Event]]:
+        """Copies the model tensors to host memory, without blocking for tensors on CUDA devices."""
+        if self._staging_buffers is None:
+            self._staging_buffers = [
+                torch.empty(
+                    t.shape,
+                    dtype=t.dtype,
+                    device="cpu",
+                    pin_memory=torch.cuda.is_available(),
+                )
+                for t in current
+            ]
+        staged = self._staging_buffers
+        on_cuda = False
+        for buffer, tensor in zip(staged, current):
+            on_cuda = on_cuda or tensor.is_cuda
+            buffer.copy_(tensor, non_blocking=tensor.is_cuda)
+        event = None
+        if on_cuda:
+            event = torch.cuda.Event()
+            event.record()
+        return staged, event
+
 
-            self.multi_avg_fn = get_ema_multi_avg_fn(decay)
-        super().update_parameters(model)
+@torch.no_grad()
+def _average_(
+    averaged: List[Tuple[torch.Tensor, bool]],
+    current: List[torch.Tensor],
+    weight: torch.Tensor,
+    event: Optional[torch.cuda.Event] = None,
+) -> None:
+    """
+    Moves each averaged tensor towards the matching current tensor by ``weight``, or copies the current tensor
+    for averaged tensors which are not averaged, using fused foreach kernels grouped by device and dtype.
+    """
+    if event is not None:
+        event.synchronize()
+
+    averaged_tensors, copied_tensors = [], []
+    averaged_sources, copied_sources = [], []
+    for (tensor, is_averaged), source in zip(averaged, current):
+        source = source.to(device=tensor.device, dtype=tensor.dtype)
+        if is_averaged:
+            averaged_tensors.append(tensor)
+            averaged_sources.append(source)
+        else:
+            copied_tensors.append(tensor)
+            copied_sources.append(source)
+
+    if copied_tensors:
+        torch._foreach_copy_(copied_tensors, copied_sources)
+    if not averaged_tensors:
+        return
+
+    grouped = _group_tensors_by_device_and_dtype([averaged_tensors, averaged_sources])
+    for (device, dtype), ([tensors, sources], _) in grouped.items():
+        if dtype.is_floating_point or dtype.is_complex:
+            group_weight = weight.to(device=device, dtype=dtype)
+            torch._foreach_lerp_(tensors, sources, [group_weight] * len(tensors))
+        else:
+            # foreach lerp only handles float and complex
+            group_weight = weight.to(device=device)
+            for tensor, source in zip(tensors, sources):
+                tensor.copy_(tensor + (source - tensor) * group_weight)